@@ -0,0 +1,231 @@
+"""
+합성 데이터셋으로 Loader 파이프라인의 단계별 소요 시간을 측정해 JSON으로 출력합니다.
+
+    python -m benchmarks.run --databases 8 --rows 10000 --examples 1000 --output bench.json
+    python -m benchmarks.run --compare bench.json
+
+네트워크 없이 로컬 HTTP 서버에서 zip 파일을 받으므로 커밋 사이의 결과를 같은 조건에서 비교할 수 있습니다.
+"""
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from src.text_to_sql.bird_loader import BirdMiniDevLoader
+from src.text_to_sql.schema import clear_catalog_cache
+from src.text_to_sql.spider_ko_loader import SpiderKoLoader
+from src.text_to_sql.spider_loader import SpiderLoader
+from src.text_to_sql.transport import HttpMirror
+from tests.http_server import serve_files
+from .synthetic import SyntheticSpec, write_dataset_archive, write_spider_ko_source
+
+
+# 출력 형식이 바뀌면 올립니다. 비교할 때 형식이 다른 결과는 거부합니다.
+FORMAT_VERSION = 1
+
+LOADERS = ("spider", "bird", "spider_ko")
+
+
+class BenchmarkConfig(NamedTuple):
+    """
+    Attributes:
+        spec (SyntheticSpec): 합성 데이터셋 크기
+        loaders (Sequence[str]): 측정할 Loader. "spider", "bird", "spider_ko"
+        repeat (int): 단계마다 반복 측정할 횟수. 매번 새 save_path에서 다운로드부터 다시 합니다.
+        jobs (Optional[int]): 쿼리 실행 worker 프로세스 수
+        tokenize_jobs (Optional[int]): Spider-Ko 토큰화 worker 프로세스 수
+        segments (int): HTTP 다운로드의 Range 분할 수
+        in_memory (bool): 쿼리 실행에 Loader의 in_memory 모드(기본 MemoryPolicy)를 사용
+    """
+    spec: SyntheticSpec = SyntheticSpec()
+    loaders: Sequence[str] = LOADERS
+    repeat: int = 3
+    jobs: Optional[int] = None
+    tokenize_jobs: Optional[int] = None
+    segments: int = 4
+    in_memory: bool = False
+
+
+def run_benchmarks(config: BenchmarkConfig, work_dir: Optional[Path] = None) -> Dict:
+    """
+    config의 Loader마다 합성 zip 파일을 만들고 단계별 소요 시간(초)을 측정합니다.
+
+    측정하는 단계:
+        - download: 로컬 HTTP 서버에서 zip 파일 다운로드와 검증
+        - extract: 압축 해제와 manifest 기록
+        - already_downloaded: 이미 설치된 데이터셋 확인(fast 모드)
+        - verify_deep: CRC까지 비교하는 확인
+        - tokenize: Spider-Ko split 생성과 질문 토큰화 (spider_ko만)
+        - parse_schema: tables.json 파싱
+        - parse_examples: dev split JSON 파싱
+        - execute: dev split의 gold SQL 실행 채점
+
+    Returns:
+        Dict: 환경 정보, 설정, Loader -> {archive_bytes, phases: 단계 -> {runs, min, median, mean}}
+    """
+    unknown = [name for name in config.loaders if name not in LOADERS]
+    if unknown:
+        raise ValueError(f"Unknown loaders: {unknown} (expected some of {LOADERS})")
+
+    own_dir = work_dir is None
+    work_dir = Path(work_dir if work_dir is not None else tempfile.mkdtemp(prefix="text-to-sql-bench-"))
+    try:
+        results = {}
+        for name in config.loaders:
+            if name == "spider_ko" and importlib.util.find_spec("mecab") is None:
+                results[name] = {"skipped": "python-mecab-ko is not installed"}
+                continue
+            results[name] = _benchmark_loader(name, config, Path(work_dir, name))
+    finally:
+        if own_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        "version": FORMAT_VERSION,
+        "environment": _environment(),
+        "config": {**config._asdict(), "spec": config.spec._asdict(), "loaders": list(config.loaders)},
+        "results": results,
+    }
+
+
+def compare(baseline: Dict, current: Dict) -> Dict[str, Dict[str, float]]:
+    """
+    두 결과의 단계별 중앙값 비율(current / baseline)을 반환합니다. 1보다 크면 느려진 것입니다.
+
+    Raises:
+        ValueError: 출력 형식이 다른 경우
+    """
+    if baseline.get("version") != current.get("version"):
+        raise ValueError(f"Cannot compare benchmark format {baseline.get('version')} with {current.get('version')}")
+    ratios: Dict[str, Dict[str, float]] = {}
+    for loader, result in current["results"].items():
+        previous = baseline["results"].get(loader, {}).get("phases", {})
+        for phase, timing in result.get("phases", {}).items():
+            if phase in previous and previous[phase]["median"] > 0:
+                ratios.setdefault(loader, {})[phase] = timing["median"] / previous[phase]["median"]
+    return ratios
+
+
+def _benchmark_loader(name: str, config: BenchmarkConfig, root: Path) -> Dict:
+    # Spider-Ko는 Spider zip 파일을 그대로 받고 한국어 split은 source에서 만듦
+    archive_loader = _make_loader("spider" if name == "spider_ko" else name, Path(root, "archive"), config)
+    query_key = "SQL" if name == "bird" else "query"
+    archive_path = write_dataset_archive(archive_loader, config.spec, Path(root, "archive.zip"), query_key)
+    archive_name = archive_loader._get_archive_path().name
+    source = write_spider_ko_source(Path(root, "spider_ko_source"), config.spec) if name == "spider_ko" else None
+
+    runs: Dict[str, List[float]] = {}
+    with serve_files({archive_name: archive_path.read_bytes()}) as server:
+        for attempt in range(config.repeat):
+            mirror = HttpMirror(server.url(""), segments=config.segments)
+            loader = _make_loader(name, Path(root, f"run-{attempt}"), config, source, mirrors=[mirror])
+            try:
+                _run_phases(loader, config, runs)
+            finally:
+                loader.get_connection_manager().close()
+
+    return {
+        "archive_bytes": archive_path.stat().st_size,
+        "phases": {phase: _summarize(seconds) for phase, seconds in runs.items()},
+    }
+
+
+def _run_phases(loader, config: BenchmarkConfig, runs: Dict[str, List[float]]) -> None:
+    def timed(phase: str, function: Callable):
+        started = time.perf_counter()
+        result = function()
+        runs.setdefault(phase, []).append(time.perf_counter() - started)
+        return result
+
+    downloaded = timed("download", loader._download_archive)
+    timed("extract", lambda: loader.install(downloaded))
+    timed("already_downloaded", loader._is_dataset_already_downloaded)
+    timed("verify_deep", lambda: loader.verify_dataset("deep"))
+    if isinstance(loader, SpiderKoLoader):
+        timed("tokenize", loader.post_process)
+
+    clear_catalog_cache()
+    timed("parse_schema", loader.get_schema_catalog)
+    queries = timed("parse_examples", lambda: [example.query for example in loader.iter_examples("dev", cached=False)])
+    report = timed("execute", lambda: loader.evaluate_execution(queries, jobs=config.jobs, use_gold_cache=False))
+    if report.accuracy != 1.0:
+        raise RuntimeError(f"Gold SQL did not match itself on {loader.dataset_name}: {report!r}")
+
+
+def _make_loader(name: str, save_path: Path, config: BenchmarkConfig, source: Optional[Path] = None, **kwargs):
+    kwargs["in_memory"] = config.in_memory
+    if name == "spider":
+        return SpiderLoader(save_path=str(save_path), **kwargs)
+    if name == "bird":
+        return BirdMiniDevLoader(save_path=str(save_path), **kwargs)
+    return SpiderKoLoader(save_path=str(save_path), tokenize_jobs=config.tokenize_jobs, source=source, **kwargs)
+
+
+def _summarize(seconds: List[float]) -> Dict:
+    return {"runs": seconds, "min": min(seconds), "median": statistics.median(seconds),
+            "mean": statistics.mean(seconds)}
+
+
+def _environment() -> Dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=Path(__file__).resolve().parent,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run",
+                                     description="Benchmark the loader pipeline on synthetic datasets.")
+    defaults = SyntheticSpec()
+    parser.add_argument("--loaders", nargs="+", choices=LOADERS, default=list(LOADERS))
+    parser.add_argument("--databases", type=int, default=defaults.databases, help="sqlite databases per dataset")
+    parser.add_argument("--tables", type=int, default=defaults.tables, help="tables per database")
+    parser.add_argument("--rows", type=int, default=defaults.rows, help="rows per table")
+    parser.add_argument("--examples", type=int, default=defaults.examples, help="examples per split")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per phase")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes for query execution")
+    parser.add_argument("--tokenize-jobs", type=int, default=None, help="worker processes for tokenization")
+    parser.add_argument("--segments", type=int, default=4, help="parallel HTTP range segments")
+    parser.add_argument("--in-memory", action="store_true", help="execute queries on in-memory database copies")
+    parser.add_argument("--output", help="write results to this file instead of stdout")
+    parser.add_argument("--compare", metavar="BASELINE", help="print median ratios against a previous result")
+    args = parser.parse_args(argv)
+
+    spec = SyntheticSpec(args.databases, args.tables, args.rows, args.examples, args.seed)
+    config = BenchmarkConfig(spec, args.loaders, args.repeat, args.jobs, args.tokenize_jobs, args.segments,
+                             args.in_memory)
+    result = run_benchmarks(config)
+
+    text = json.dumps(result, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        for loader, phases in compare(baseline, result).items():
+            for phase, ratio in phases.items():
+                print(f"{loader:>10} {phase:<20} {ratio:6.2f}x", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
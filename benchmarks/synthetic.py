@@ -0,0 +1,188 @@
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+import gzip
+import json
+import random
+import shutil
+import sqlite3
+import tempfile
+import zipfile
+
+
+class SyntheticSpec(NamedTuple):
+    """
+    합성 데이터셋의 크기입니다.
+
+    Attributes:
+        databases (int): sqlite 데이터베이스 수
+        tables (int): 데이터베이스마다의 테이블 수
+        rows (int): 테이블마다의 행 수
+        examples (int): dev split의 예제 수. train split도 같은 수로 만듭니다.
+        seed (int): 값 생성에 사용하는 난수 seed
+    """
+    databases: int = 4
+    tables: int = 3
+    rows: int = 1000
+    examples: int = 200
+    seed: int = 0
+
+
+_CITIES = ["Seoul", "Busan", "Fresno", "Los Angeles", "San Diego", "Praha", "Brno", "Daegu"]
+
+# (SQL, 영어 질문, 한국어 질문). {table}, {child}는 테이블 이름으로 바뀝니다.
+_TEMPLATES = [
+    ("SELECT count(*) FROM {table}", "How many rows are in {table}?", "{table}에는 몇 개의 행이 있습니까?"),
+    ("SELECT name FROM {table} WHERE value > 50", "Which names in {table} have a value above 50?",
+     "{table}에서 value가 50보다 큰 이름은 무엇입니까?"),
+    ("SELECT city, count(*) FROM {table} GROUP BY city", "How many rows of {table} are in each city?",
+     "도시별 {table}의 행 수는 얼마입니까?"),
+    ("SELECT T1.name, T2.city FROM {table} AS T1 JOIN {child} AS T2 ON T1.id = T2.parent_id",
+     "List the names in {table} with the cities of their {child} rows.",
+     "{table}의 이름과 {child} 행의 도시를 나열하세요."),
+]
+
+
+def database_ids(spec: SyntheticSpec) -> List[str]:
+    return [f"synthetic_{i:03d}" for i in range(spec.databases)]
+
+
+def write_dataset_archive(loader, spec: SyntheticSpec, archive_path: Path, query_key: str = "query") -> Path:
+    """
+    loader가 기대하는 경로 구조 그대로 tables.json, split과 gold JSON, sqlite 데이터베이스를 담은 zip 파일을 만듭니다.
+
+    Args:
+        loader (Loader): 경로 구조를 가져올 Loader. save_path 아래의 상대 경로가 zip 안의 경로가 됩니다.
+        spec (SyntheticSpec): 데이터셋 크기
+        archive_path (Path): 만들 zip 파일 경로
+        query_key (str): 예제에서 SQL을 담는 key. Spider는 "query", BIRD는 "SQL"
+    """
+    rng = random.Random(spec.seed)
+    save_path = Path(loader.save_path)
+    staging = Path(tempfile.mkdtemp(prefix="synthetic-"))
+    try:
+        def member(path: Path) -> Path:
+            target = Path(staging, path.relative_to(save_path))
+            target.parent.mkdir(parents=True, exist_ok=True)
+            return target
+
+        db_ids = database_ids(spec)
+        for db_id in db_ids:
+            _write_database(member(Path(loader.get_sqlite_database(), db_id, f"{db_id}.sqlite")), spec, rng)
+
+        json_files = loader.get_sqlite_json_files()
+        _write_json(member(json_files["table"]), [_table_record(db_id, spec) for db_id in db_ids])
+        dev = [_example_record(db_id, sql, question, query_key) for db_id, sql, question, _ in _examples(spec, 0)]
+        _write_json(member(json_files["gold_sql"]), dev)
+        for split, paths in loader.get_split_files().items():
+            for offset, path in enumerate(paths):
+                records = dev if split == "dev" else [
+                    _example_record(db_id, sql, question, query_key)
+                    for db_id, sql, question, _ in _examples(spec, offset + 1)]
+                _write_json(member(path), records)
+
+        archive_path = Path(archive_path)
+        archive_path.parent.mkdir(parents=True, exist_ok=True)
+        with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED) as archive:
+            for path in sorted(staging.rglob("*")):
+                if path.is_file():
+                    archive.write(path, path.relative_to(staging).as_posix())
+    finally:
+        shutil.rmtree(staging)
+    return archive_path
+
+
+def write_spider_ko_source(root: Path, spec: SyntheticSpec) -> Path:
+    """
+    LocalDirectorySource로 읽을 수 있는 Spider-Ko split 파일(validation, train)을 만듭니다.
+    질문과 SQL은 write_dataset_archive()의 Spider 예제와 같은 순서로 대응합니다.
+    """
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    # train split은 train_spider.json과 train_others.json을 이어 붙인 순서
+    splits = {"validation": [0], "train": [1, 2]}
+    for hf_split, offsets in splits.items():
+        with gzip.open(Path(root, f"{hf_split}.jsonl.gz"), "wt", encoding="utf-8") as f:
+            for offset in offsets:
+                for db_id, sql, _, question_ko in _examples(spec, offset):
+                    tokens = sql.split()
+                    f.write(json.dumps({"db_id": db_id, "query": sql, "query_toks": tokens,
+                                        "query_toks_no_value": tokens, "question_ko": question_ko},
+                                       ensure_ascii=False) + "\n")
+    return root
+
+
+def _examples(spec: SyntheticSpec, offset: int) -> Iterator[Tuple[str, str, str, str]]:
+    """(db_id, SQL, 영어 질문, 한국어 질문)을 spec.examples개 만듭니다. offset이 다르면 다른 질문이 됩니다."""
+    db_ids = database_ids(spec)
+    for i in range(spec.examples):
+        n = i + offset * spec.examples
+        db_id = db_ids[n % len(db_ids)]
+        sql, question, question_ko = _TEMPLATES[(n // len(db_ids)) % len(_TEMPLATES)]
+        table_index = n % max(spec.tables - 1, 1)
+        names = {"table": f"t{table_index}", "child": f"t{min(table_index + 1, spec.tables - 1)}"}
+        # 질문이 모두 달라야 Spider-Ko 토큰 재사용과 예제 캐시가 실제 크기로 동작함
+        suffix = f" (#{n})"
+        yield (db_id, sql.format(**names), question.format(**names) + suffix,
+               question_ko.format(**names) + suffix)
+
+
+def _example_record(db_id: str, sql: str, question: str, query_key: str) -> Dict:
+    tokens = sql.split()
+    return {
+        "db_id": db_id,
+        query_key: sql,
+        "question": question,
+        "question_toks": question.split(),
+        "query_toks": tokens,
+        "query_toks_no_value": tokens,
+        "sql": {},
+    }
+
+
+def _table_record(db_id: str, spec: SyntheticSpec) -> Dict:
+    column_names = [[-1, "*"]]
+    column_types = ["text"]
+    primary_keys = []
+    foreign_keys = []
+    for table in range(spec.tables):
+        primary_keys.append(len(column_names))
+        for name, column_type in (("id", "number"), ("name", "text"), ("city", "text"), ("value", "number"),
+                                  ("parent_id", "number")):
+            column_names.append([table, name])
+            column_types.append(column_type)
+        if table > 0:
+            # parent_id -> 앞 테이블의 id
+            foreign_keys.append([len(column_names) - 1, primary_keys[table - 1]])
+    table_names = [f"t{table}" for table in range(spec.tables)]
+    return {
+        "db_id": db_id,
+        "table_names_original": table_names,
+        "table_names": table_names,
+        "column_names_original": column_names,
+        "column_names": [[table, name.replace("_", " ")] for table, name in column_names],
+        "column_types": column_types,
+        "primary_keys": primary_keys,
+        "foreign_keys": foreign_keys,
+    }
+
+
+def _write_database(path: Path, spec: SyntheticSpec, rng: random.Random) -> None:
+    connection = sqlite3.connect(path)
+    try:
+        for table in range(spec.tables):
+            reference = f" REFERENCES t{table - 1}(id)" if table > 0 else ""
+            connection.execute(f"CREATE TABLE t{table} (id INTEGER PRIMARY KEY, name TEXT, city TEXT, value REAL, "
+                               f"parent_id INTEGER{reference})")
+            connection.executemany(
+                f"INSERT INTO t{table} VALUES (?, ?, ?, ?, ?)",
+                ((row, f"name {rng.randrange(spec.rows)}", rng.choice(_CITIES), round(rng.uniform(0, 100), 2),
+                  rng.randrange(spec.rows) if table > 0 else None)
+                 for row in range(spec.rows)))
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def _write_json(path: Path, records: List[Dict]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(records, f, ensure_ascii=False, indent=4)
@@ -1,24 +1,24 @@
 from src.text_to_sql import BirdMiniDevLoader
 from src.text_to_sql import SpiderLoader
 from src.text_to_sql import SpiderKoLoader
+from src.text_to_sql.prefetch import prefetch
 
 
 def main():
     """Main function for the text-to-sql package."""
-    # bird_mini_dev_loader = BirdMiniDevLoader(save_path="data")
-    # bird_mini_dev_loader.download_dataset()
-    # print(bird_mini_dev_loader.get_sqlite_database())
-    # print(bird_mini_dev_loader.get_sqlite_json_files())
+    loaders = [
+        BirdMiniDevLoader(save_path="data"),
+        SpiderLoader(save_path="data"),
+        SpiderKoLoader(save_path="data"),
+    ]
 
-    # spider_loader = SpiderLoader(save_path="data")
-    # spider_loader.download_dataset()
-    # print(spider_loader.get_sqlite_database())
-    # print(spider_loader.get_sqlite_json_files())
+    # 세 데이터셋을 동시에 다운로드하고 압축 해제함
+    for result in prefetch(loaders, jobs=3):
+        print(result)
 
-    spider_ko_loader = SpiderKoLoader(save_path="data")
-    spider_ko_loader.download_dataset()
-    print(spider_ko_loader.get_sqlite_database())
-    print(spider_ko_loader.get_sqlite_json_files())
+    for loader in loaders:
+        print(loader.get_sqlite_database())
+        print(loader.get_sqlite_json_files())
 
 
 if __name__ == "__main__":
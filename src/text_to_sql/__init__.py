@@ -1,5 +1,44 @@
-from .bird_loader import BirdMiniDevLoader
-from .loader import Loader
-from .spider_loader import SpiderLoader
-from .spider_ko_loader import SpiderKoLoader
-__all__ = ["BirdMiniDevLoader", "Loader", "SpiderLoader", "SpiderKoLoader"]
\ No newline at end of file
+import importlib
+
+# 각 Loader는 처음 접근할 때 import 합니다. 경로만 필요한 짧은 작업에서 무거운 의존성을 불러오지 않기 위함입니다.
+_LAZY_ATTRIBUTES = {
+    "BirdMiniDevLoader": ".bird_loader",
+    "DatabaseInfo": ".introspection",
+    "DatasetCache": ".cache",
+    "DownloadError": ".downloader",
+    "DownloadManifest": ".downloader",
+    "Example": ".examples",
+    "ExactMatchEvaluator": ".exact_match",
+    "ExactMatchReport": ".exact_match",
+    "ExecutionReport": ".evaluation",
+    "FileMirror": ".transport",
+    "GoogleDriveMirror": ".transport",
+    "HttpMirror": ".transport",
+    "Loader": ".loader",
+    "LoaderObserver": ".observers",
+    "MemoryPolicy": ".memory_db",
+    "PhaseEvent": ".observers",
+    "QueryTimeout": ".connection",
+    "RecordingObserver": ".observers",
+    "S3Mirror": ".transport",
+    "SchemaCatalog": ".schema",
+    "SchemaRenderings": ".schema_render",
+    "Shard": ".sharding",
+    "SpiderLoader": ".spider_loader",
+    "SpiderKoLoader": ".spider_ko_loader",
+    "ValueIndex": ".value_index",
+}
+
+__all__ = ["BirdMiniDevLoader", "DatabaseInfo", "DatasetCache", "DownloadError", "DownloadManifest", "Example", "ExactMatchEvaluator", "ExactMatchReport", "ExecutionReport", "FileMirror", "GoogleDriveMirror", "HttpMirror", "Loader", "LoaderObserver", "MemoryPolicy", "PhaseEvent", "QueryTimeout", "RecordingObserver", "S3Mirror", "SchemaCatalog", "SchemaRenderings", "Shard", "SpiderLoader", "SpiderKoLoader", "ValueIndex"]
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
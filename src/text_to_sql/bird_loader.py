@@ -1,12 +1,12 @@
 from pathlib import Path
-from typing import List
+from typing import Dict, List
 from .loader import Loader
 
 
 class BirdMiniDevLoader(Loader):
 
-  def __init__(self, save_path: str):
-    super().__init__(save_path, "1UJyA6I6pTmmhYpwdn8iT9QKrcJqSQAcX", "Bird Mini Dev")
+  def __init__(self, save_path: str, **kwargs):
+    super().__init__(save_path, "1UJyA6I6pTmmhYpwdn8iT9QKrcJqSQAcX", "Bird Mini Dev", **kwargs)
 
   def get_sqlite_database(self) -> Path:
     """
@@ -25,6 +25,14 @@ class BirdMiniDevLoader(Loader):
       "dev" : Path(self._get_dataset_detail_path_root(), "mini_dev_sqlite_dev.json"),
     }
 
+  def get_split_files(self) -> Dict[str, List[Path]]:
+    """
+    Bird Mini Dev 데이터셋은 dev split만 제공합니다.
+    """
+    return {
+      "dev" : [Path(self._get_dataset_detail_path_root(), "mini_dev_sqlite_dev.json")],
+    }
+
 
   def _get_dataset_detail_path_root(self) -> Path:
     return Path(self.save_path, "data_minidev", "MINIDEV")
\ No newline at end of file
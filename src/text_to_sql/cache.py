@@ -0,0 +1,232 @@
+from pathlib import Path
+from typing import Callable, Optional, Set, Tuple
+import os
+import shutil
+import stat
+import time
+from .downloader import sha256_of
+from .extractor import FAST, ExtractionManifest, ManifestEntry, extract_archive
+from .utils import atomic_write
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+# linux/fs.h 의 FICLONE ioctl. btrfs, xfs 등 reflink를 지원하는 파일시스템에서 copy-on-write 복사를 만듭니다.
+_FICLONE = 0x40049409
+_WRITE_BITS = stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH
+
+
+class FileLock:
+    """
+    여러 프로세스가 같은 캐시 항목을 동시에 만들지 않도록 하는 파일 기반 배타 잠금입니다.
+
+    Args:
+        path (Path): 잠금 파일 경로
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._fd: Optional[int] = None
+
+    def __enter__(self) -> "FileLock":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if os.name == "nt":
+            while True:
+                try:
+                    msvcrt.locking(self._fd, msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.1)
+        else:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if os.name == "nt":
+            msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+        self._fd = None
+
+
+def link_or_copy(src: Path, dst: Path) -> None:
+    """
+    src를 dst에 hardlink 합니다. 다른 파일시스템이라 hardlink가 불가능하면 reflink를, 그것도 안 되면 일반 복사를 사용합니다.
+    """
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    if dst.exists() or dst.is_symlink():
+        dst.unlink()
+    try:
+        os.link(src, dst)
+        return
+    except OSError:
+        pass
+    clone_or_copy(src, dst)
+
+
+def clone_or_copy(src: Path, dst: Path) -> None:
+    """
+    src를 dst에 reflink(copy-on-write 복사) 합니다. reflink를 지원하지 않는 파일시스템이면 일반 복사를 사용합니다.
+    dst는 src와 내용을 공유하지 않는 별개의 파일이므로, 읽기 전용인 캐시 파일에서 만들었더라도 쓰기 권한을 줍니다.
+    """
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    if dst.exists() or dst.is_symlink():
+        dst.unlink()
+    if os.name == "nt" or not _reflink(src, dst):
+        shutil.copy2(src, dst)
+    os.chmod(dst, os.stat(dst).st_mode | stat.S_IWUSR)
+
+
+def _reflink(src: Path, dst: Path) -> bool:
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+    except OSError:
+        if dst.exists():
+            dst.unlink()
+        return False
+    shutil.copystat(src, dst)
+    return True
+
+
+class DatasetCache:
+    """
+    여러 save_path와 여러 Loader가 함께 쓰는 content-addressed 데이터셋 캐시입니다.
+
+    - `refs/<gdrive_id>`: 해당 Google Drive 파일의 sha256
+    - `objects/<sha256>.zip`: 다운로드가 끝난 zip 파일
+    - `trees/<sha256>/`: 압축 해제된 트리 (manifest는 `trees/<sha256>.json`)
+
+    한 호스트의 여러 프로세스가 동시에 같은 데이터셋을 요청하더라도 파일 잠금으로 다운로드와 압축 해제는 한 번만 일어나고,
+    각 save_path에는 reflink(지원하지 않으면 복사)로 트리를 만들어 줍니다.
+    트리의 파일은 읽기 전용으로 두므로, hardlink=True로 save_path와 inode를 공유하더라도 실수로 수정해 캐시를 망가뜨리지 않습니다.
+
+    Args:
+        root (Optional[Path]): 캐시 디렉토리. 지정하지 않으면 TEXT_TO_SQL_CACHE 환경 변수, 없으면 ~/.cache/text_to_sql
+        hardlink (bool): True이면 save_path의 파일을 캐시 트리에 hardlink 해 디스크를 아낌. 이 파일들은 읽기 전용
+    """
+
+    def __init__(self, root: Optional[Path] = None, hardlink: bool = False):
+        if root is None:
+            root = os.environ.get("TEXT_TO_SQL_CACHE") or Path(Path.home(), ".cache", "text_to_sql")
+        self.root = Path(root)
+        self.hardlink = hardlink
+
+    def lock(self, key: str) -> FileLock:
+        return FileLock(Path(self.root, "locks", f"{key}.lock"))
+
+    def fetch_archive(self, gdrive_id: str, download: Callable[[Path], Path],
+                      sha256: Optional[str] = None) -> Path:
+        """
+        gdrive_id의 zip 파일을 캐시에서 찾고, 없으면 download(dest)로 받아 캐시에 등록합니다.
+
+        Args:
+            gdrive_id (str): Google Drive 파일 id
+            download (Callable[[Path], Path]): dest 경로로 다운로드하고 검증까지 끝낸 파일 경로를 반환하는 함수
+            sha256 (Optional[str]): 기대하는 sha256. 알고 있다면 refs 없이도 캐시를 찾을 수 있음
+
+        Returns:
+            Path: 캐시에 있는 zip 파일 경로
+        """
+        with self.lock(f"archive-{gdrive_id}"):
+            digest = sha256 or self._read_ref(gdrive_id)
+            if digest and self._object_path(digest).exists():
+                return self._object_path(digest)
+
+            downloaded = download(Path(self.root, "downloads", f"{gdrive_id}.zip"))
+            digest = sha256_of(downloaded)
+            object_path = self._object_path(digest)
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(downloaded, object_path)
+            self._write_ref(gdrive_id, digest)
+            return object_path
+
+    def extract(self, archive_path: Path) -> Tuple[Path, ExtractionManifest]:
+        """
+        캐시의 zip 파일을 trees/<sha256>/ 아래에 한 번만 압축 해제하고 트리의 파일을 읽기 전용으로 만듭니다.
+
+        Returns:
+            Tuple[Path, ExtractionManifest]: 압축 해제된 트리와 그 manifest
+        """
+        digest = Path(archive_path).stem
+        tree = Path(self.root, "trees", digest)
+        manifest_path = Path(self.root, "trees", f"{digest}.json")
+        with self.lock(f"tree-{digest}"):
+            manifest = ExtractionManifest.load(manifest_path, tree)
+            if manifest is None or not manifest.verify(FAST):
+                manifest = extract_archive(archive_path, tree, manifest_path)
+            # 이전 버전이 쓰기 가능하게 만든 트리도 있으므로 이미 있는 트리도 확인
+            _make_read_only(manifest)
+        return tree, manifest
+
+    def materialize(self, manifest: ExtractionManifest, dest_dir: Path, manifest_path: Path) -> ExtractionManifest:
+        """
+        캐시 트리의 파일들을 dest_dir에 reflink/복사(hardlink=True이면 hardlink)로 만들고, dest_dir 기준 manifest를 마지막에 기록합니다.
+        이전 manifest에는 있지만 새 트리에는 없는 파일은 지웁니다. dest_dir에는 다른 데이터셋과 후처리 결과도 있으므로
+        manifest에 기록된 적 없는 파일은 건드리지 않습니다.
+        같은 dest_dir를 여러 프로세스가 동시에 구성하지 않도록 manifest_path 옆의 잠금 파일로 잠그며,
+        기다리는 동안 다른 프로세스가 같은 트리를 구성했으면 그대로 사용합니다.
+        """
+        with FileLock(manifest_path.with_name(f"{manifest_path.name}.lock")):
+            existing = ExtractionManifest.load(manifest_path, dest_dir)
+            if existing is not None and _same_files(existing, manifest) and existing.verify(FAST):
+                return existing
+            if manifest_path.exists():
+                manifest_path.unlink()
+            if existing is not None:
+                _prune(existing, {entry.name for entry in manifest.entries})
+
+            place = link_or_copy if self.hardlink else clone_or_copy
+            entries = []
+            for entry in manifest.entries:
+                target = Path(dest_dir, entry.name)
+                place(Path(manifest.root, entry.name), target)
+                entries.append(ManifestEntry(entry.name, entry.size, entry.crc, target.stat().st_mtime_ns))
+
+            materialized = ExtractionManifest(dest_dir, entries)
+            materialized.save(manifest_path)
+            return materialized
+
+    def _object_path(self, digest: str) -> Path:
+        return Path(self.root, "objects", f"{digest}.zip")
+
+    def _read_ref(self, gdrive_id: str) -> Optional[str]:
+        try:
+            return Path(self.root, "refs", gdrive_id).read_text(encoding="utf-8").strip() or None
+        except OSError:
+            return None
+
+    def _write_ref(self, gdrive_id: str, digest: str) -> None:
+        with atomic_write(Path(self.root, "refs", gdrive_id)) as f:
+            f.write(digest)
+
+
+def _make_read_only(manifest: ExtractionManifest) -> None:
+    for entry in manifest.entries:
+        path = Path(manifest.root, entry.name)
+        mode = os.stat(path).st_mode
+        if mode & _WRITE_BITS:
+            os.chmod(path, mode & ~_WRITE_BITS)
+
+
+def _prune(previous: ExtractionManifest, keep: Set[str]) -> None:
+    """previous에 기록된 파일 중 keep에 없는 파일을 지우고, 그래서 비게 된 디렉토리도 지웁니다."""
+    for entry in previous.entries:
+        if entry.name in keep:
+            continue
+        path = Path(previous.root, entry.name)
+        if path.exists() or path.is_symlink():
+            path.unlink()
+        parent = path.parent
+        while parent != previous.root and parent.is_dir() and not any(parent.iterdir()):
+            parent.rmdir()
+            parent = parent.parent
+
+
+def _same_files(first: ExtractionManifest, second: ExtractionManifest) -> bool:
+    return [(e.name, e.size, e.crc) for e in first.entries] == [(e.name, e.size, e.crc) for e in second.entries]
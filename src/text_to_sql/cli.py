@@ -1,9 +1,123 @@
-from text_to_sql import BirdMiniDevLoader, SpiderLoader, SpiderKoLoader
+from typing import List, Optional
+import argparse
+import sys
+from .bird_loader import BirdMiniDevLoader
+from .cache import DatasetCache
+from .evaluation import DEFAULT_TIMEOUT
+from .gold_cache import DEFAULT_MAX_BYTES, DEFAULT_MAX_ENTRIES
+from .prefetch import FAILED, prefetch
+from .spider_ko_loader import SpiderKoLoader
+from .spider_loader import SpiderLoader
 
 
-def main() -> None:
+LOADERS = {
+    "spider": SpiderLoader,
+    "bird": BirdMiniDevLoader,
+    "spider-ko": SpiderKoLoader,
+}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
     """Console entrypoint for text-to-sql utilities.
 
-    Provides a minimal runnable to verify installation; can be extended later.
+    Without a subcommand, prints the available loaders to verify installation.
     """
-    print("text-to-sql installed. Available loaders: BirdMiniDevLoader, SpiderLoader, SpiderKoLoader")
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        print("text-to-sql installed. Available loaders: BirdMiniDevLoader, SpiderLoader, SpiderKoLoader")
+        return 0
+    return args.handler(args)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="text-to-sql")
+    subparsers = parser.add_subparsers(dest="command")
+
+    prefetch_parser = subparsers.add_parser("prefetch", help="download and prepare datasets in parallel")
+    prefetch_parser.add_argument("--datasets", type=_parse_datasets, default=list(LOADERS),
+                                 help=f"comma separated subset of {','.join(LOADERS)} (default: all)")
+    prefetch_parser.add_argument("--jobs", type=int, default=4, help="concurrent downloads and extractions")
+    prefetch_parser.add_argument("--save-path", default="data", help="directory to store the datasets in")
+    prefetch_parser.add_argument("--cache", nargs="?", const="", default=None,
+                                 help="use the shared dataset cache (optionally at the given directory)")
+    prefetch_parser.add_argument("--hardlink", action="store_true",
+                                 help="hardlink files from the shared cache instead of copying them (read-only files)")
+    prefetch_parser.add_argument("--lazy", action="store_true", help="extract sqlite databases on first access")
+    prefetch_parser.add_argument("--streaming", action="store_true",
+                                 help="extract while downloading instead of saving the archive first")
+    prefetch_parser.add_argument("--pin", action="store_true",
+                                 help="record the size and sha256 of the first archive and verify later downloads")
+    prefetch_parser.set_defaults(handler=_run_prefetch)
+
+    warm_parser = subparsers.add_parser("warm-gold", help="precompute gold query results for execution evaluation")
+    warm_parser.add_argument("--datasets", type=_parse_datasets, default=list(LOADERS),
+                             help=f"comma separated subset of {','.join(LOADERS)} (default: all)")
+    warm_parser.add_argument("--split", default="dev", help="split whose gold queries are executed")
+    warm_parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    warm_parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="per-query limit in seconds")
+    warm_parser.add_argument("--save-path", default="data", help="directory the datasets are stored in")
+    warm_parser.add_argument("--max-entries", type=int, default=DEFAULT_MAX_ENTRIES,
+                             help="evict least recently used results beyond this many entries")
+    warm_parser.add_argument("--max-bytes", type=int, default=DEFAULT_MAX_BYTES,
+                             help="evict least recently used results beyond this total size")
+    warm_parser.set_defaults(handler=_run_warm_gold)
+
+    unpin_parser = subparsers.add_parser("unpin", help="forget pinned archive checksums so the next download re-pins")
+    unpin_parser.add_argument("--datasets", type=_parse_datasets, default=list(LOADERS),
+                              help=f"comma separated subset of {','.join(LOADERS)} (default: all)")
+    unpin_parser.add_argument("--save-path", default="data", help="directory the datasets are stored in")
+    unpin_parser.set_defaults(handler=_run_unpin)
+    return parser
+
+
+def _parse_datasets(value: str) -> List[str]:
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in LOADERS]
+    if unknown or not names:
+        raise argparse.ArgumentTypeError(f"unknown dataset(s): {', '.join(unknown) or value!r}; "
+                                         f"choose from {', '.join(LOADERS)}")
+    return names
+
+
+def _run_prefetch(args: argparse.Namespace) -> int:
+    cache = None
+    if args.cache is not None:
+        cache = DatasetCache(args.cache or None, hardlink=args.hardlink)
+    loaders = [LOADERS[name](save_path=args.save_path, cache=cache, lazy=args.lazy,
+                             streaming=args.streaming, pin=args.pin) for name in args.datasets]
+
+    failed = False
+    for name, result in zip(args.datasets, prefetch(loaders, jobs=args.jobs)):
+        if result.status == FAILED:
+            failed = True
+            print(f"{name}: failed after {result.seconds:.1f}s: {result.error}", file=sys.stderr)
+        else:
+            print(f"{name}: {result.status} in {result.seconds:.1f}s")
+    return 1 if failed else 0
+
+
+def _run_warm_gold(args: argparse.Namespace) -> int:
+    failed = False
+    for name in args.datasets:
+        loader = LOADERS[name](save_path=args.save_path)
+        try:
+            loader.get_gold_cache(max_entries=args.max_entries, max_bytes=args.max_bytes)
+            added = loader.warm_gold_cache(args.split, timeout=args.timeout, jobs=args.jobs)
+        except (OSError, ValueError) as e:
+            failed = True
+            print(f"{name}: failed: {e}", file=sys.stderr)
+            continue
+        print(f"{name}: cached {added} gold results")
+    return 1 if failed else 0
+
+
+def _run_unpin(args: argparse.Namespace) -> int:
+    for name in args.datasets:
+        removed = LOADERS[name](save_path=args.save_path).unpin_download()
+        print(f"{name}: {'unpinned' if removed else 'not pinned'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
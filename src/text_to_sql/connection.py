@@ -0,0 +1,225 @@
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Sequence, Tuple
+import re
+import sqlite3
+import threading
+import time
+import weakref
+
+if TYPE_CHECKING:
+    from .memory_db import MemoryDatabases, ResidentDatabase
+
+
+DEFAULT_MAX_CONNECTIONS_PER_THREAD = 16
+DEFAULT_MAX_MMAP_SIZE = 256 * 1024 * 1024
+
+# progress handler가 호출되는 SQLite VM 명령 간격. 작을수록 timeout이 정확하지만 오버헤드가 커집니다.
+_PROGRESS_INTERVAL = 1000
+
+_SIMPLE_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+# https://www.sqlite.org/lang_keywords.html. 이 이름들은 식별자로 쓸 때 따옴표가 필요함
+SQLITE_KEYWORDS = frozenset("""
+    ABORT ACTION ADD AFTER ALL ALTER ALWAYS ANALYZE AND AS ASC ATTACH AUTOINCREMENT BEFORE BEGIN BETWEEN BY CASCADE
+    CASE CAST CHECK COLLATE COLUMN COMMIT CONFLICT CONSTRAINT CREATE CROSS CURRENT CURRENT_DATE CURRENT_TIME
+    CURRENT_TIMESTAMP DATABASE DEFAULT DEFERRABLE DEFERRED DELETE DESC DETACH DISTINCT DO DROP EACH ELSE END ESCAPE
+    EXCEPT EXCLUDE EXCLUSIVE EXISTS EXPLAIN FAIL FILTER FIRST FOLLOWING FOR FOREIGN FROM FULL GENERATED GLOB GROUP
+    GROUPS HAVING IF IGNORE IMMEDIATE IN INDEX INDEXED INITIALLY INNER INSERT INSTEAD INTERSECT INTO IS ISNULL JOIN
+    KEY LAST LEFT LIKE LIMIT MATCH MATERIALIZED NATURAL NO NOT NOTHING NOTNULL NULL NULLS OF OFFSET ON OR ORDER
+    OTHERS OUTER OVER PARTITION PLAN PRAGMA PRECEDING PRIMARY QUERY RAISE RANGE RECURSIVE REFERENCES REGEXP REINDEX
+    RELEASE RENAME REPLACE RESTRICT RETURNING RIGHT ROLLBACK ROW ROWS SAVEPOINT SELECT SET TABLE TEMP TEMPORARY THEN
+    TIES TO TRANSACTION TRIGGER UNBOUNDED UNION UNIQUE UPDATE USING VACUUM VALUES VIEW VIRTUAL WHEN WHERE WINDOW WITH
+    WITHOUT
+""".split())
+
+
+class QueryTimeout(Exception):
+    """쿼리가 지정한 wall-clock 제한 시간을 넘겨 중단된 경우 발생하는 예외"""
+
+
+def quote_identifier(identifier: str) -> str:
+    """
+    SQL에 넣을 테이블/컬럼 이름. 영문자, 숫자, `_`로만 이루어지고 SQLite 키워드가 아니면 그대로 두고,
+    아니면(공백, 따옴표, order 같은 키워드 등) 큰따옴표로 감쌉니다.
+    """
+    if _SIMPLE_IDENTIFIER.match(identifier) and identifier.upper() not in SQLITE_KEYWORDS:
+        return identifier
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def open_readonly(path: Path, max_mmap_size: int = DEFAULT_MAX_MMAP_SIZE) -> sqlite3.Connection:
+    """
+    sqlite 파일을 `mode=ro&immutable=1` URI로 엽니다. 데이터셋 파일은 바뀌지 않으므로 잠금과 변경 감지를 생략하고,
+    mmap_size는 파일 크기에 맞춰(최대 max_mmap_size) 파일 전체를 매핑합니다.
+
+    Raises:
+        FileNotFoundError: sqlite 파일이 없는 경우
+    """
+    path = Path(path).resolve()
+    if not path.exists():
+        raise FileNotFoundError(f"SQLite database not found: {path}")
+    connection = sqlite3.connect(f"{path.as_uri()}?mode=ro&immutable=1", uri=True, check_same_thread=False)
+    connection.execute(f"PRAGMA mmap_size={min(path.stat().st_size, max_mmap_size)}")
+    connection.text_factory = decode_text
+    return connection
+
+
+def decode_text(value: bytes) -> str:
+    """TEXT 값을 decode 합니다. 데이터셋에는 UTF-8이 아닌 텍스트가 섞여 있는 경우가 있어 decode 오류 대신 대체 문자를 사용"""
+    return value.decode("utf-8", errors="replace")
+
+
+def execute_with_timeout(connection: sqlite3.Connection, sql: str, params: Sequence[Any] = (),
+                         timeout: Optional[float] = None) -> List[tuple]:
+    """
+    쿼리를 실행하고 모든 결과 행을 반환합니다. timeout(초)이 지나면 progress handler로 쿼리를 중단합니다.
+
+    Raises:
+        QueryTimeout: timeout을 넘긴 경우
+    """
+    if timeout is None:
+        return connection.execute(sql, params).fetchall()
+
+    deadline = time.monotonic() + timeout
+    connection.set_progress_handler(lambda: time.monotonic() > deadline, _PROGRESS_INTERVAL)
+    try:
+        return connection.execute(sql, params).fetchall()
+    except sqlite3.OperationalError as e:
+        if time.monotonic() > deadline and "interrupted" in str(e):
+            raise QueryTimeout(f"query exceeded {timeout}s: {sql[:200]}") from e
+        raise
+    finally:
+        connection.set_progress_handler(None, _PROGRESS_INTERVAL)
+
+
+# 스레드 하나의 db_id별 (연결, 메모리에 올린 데이터베이스) 목록
+_Entries = "OrderedDict[str, Tuple[sqlite3.Connection, Optional[ResidentDatabase]]]"
+
+
+class _ThreadPool:
+    """
+    스레드 하나의 연결 목록입니다. thread-local에만 저장되므로 스레드가 끝나 사라지면 finalizer가 연결을 닫습니다.
+    """
+
+    __slots__ = ("entries", "__weakref__")
+
+    def __init__(self):
+        self.entries: _Entries = OrderedDict()
+        weakref.finalize(self, _close_entries, self.entries)
+
+
+def _close_entry(connection: sqlite3.Connection, resident: Optional["ResidentDatabase"]) -> None:
+    if resident is not None:
+        resident.disconnect(connection)
+    else:
+        connection.close()
+
+
+def _close_entries(entries: _Entries) -> None:
+    while entries:
+        _, entry = entries.popitem()
+        _close_entry(*entry)
+
+
+class ConnectionManager:
+    """
+    db_id별 읽기 전용 SQLite 연결을 스레드마다 재사용하는 연결 관리자입니다.
+
+    각 스레드는 최대 max_connections_per_thread개의 연결을 가지며, 넘치면 가장 오래 사용하지 않은 연결을 닫습니다.
+    연결은 만든 스레드에서만 사용되므로 스레드 간 잠금이 필요 없습니다. 스레드가 끝나면 그 스레드의 연결도 닫힙니다.
+
+    memory를 지정하면 memory가 선택한 데이터베이스는 메모리에 올린 사본에 연결하고, 나머지는 파일에 연결합니다.
+    메모리에서 내려간 데이터베이스의 연결은 MemoryDatabases가 닫으므로 다음에 사용할 때 다시 엽니다.
+
+    Args:
+        resolve (Callable[[str], Path]): db_id를 sqlite 파일 경로로 바꾸는 함수 (Loader.get_sqlite_path)
+        max_connections_per_thread (int): 스레드당 유지할 연결 수
+        max_mmap_size (int): 연결마다 설정할 mmap_size의 상한
+        memory (Optional[MemoryDatabases]): 메모리에 올릴 데이터베이스를 관리하는 MemoryDatabases
+    """
+
+    def __init__(self, resolve: Callable[[str], Path],
+                 max_connections_per_thread: int = DEFAULT_MAX_CONNECTIONS_PER_THREAD,
+                 max_mmap_size: int = DEFAULT_MAX_MMAP_SIZE, memory: Optional["MemoryDatabases"] = None):
+        self.resolve = resolve
+        self.max_connections_per_thread = max_connections_per_thread
+        self.max_mmap_size = max_mmap_size
+        self.memory = memory
+        self._local = threading.local()
+        self._pools: "weakref.WeakSet[_ThreadPool]" = weakref.WeakSet()
+        self._pools_lock = threading.Lock()
+
+    def connection(self, db_id: str) -> sqlite3.Connection:
+        """
+        현재 스레드의 db_id 연결을 반환합니다. 없으면 새로 열고, 필요하면 가장 오래된 연결을 닫습니다.
+        메모리에 올린 데이터베이스의 연결은 메모리에서 내려갈 때 닫히므로 쿼리는 execute()로 실행하는 것이 안전합니다.
+        """
+        connection, resident = self._checkout(db_id)
+        if resident is not None:
+            resident.release(connection)
+        return connection
+
+    def execute(self, db_id: str, sql: str, params: Sequence[Any] = (), timeout: Optional[float] = None) -> List[tuple]:
+        """
+        db_id의 데이터베이스에서 쿼리를 실행하고 모든 결과 행을 반환합니다.
+
+        Raises:
+            QueryTimeout: timeout(초)을 넘긴 경우
+            sqlite3.Error: 쿼리 실행 중 오류
+        """
+        connection, resident = self._checkout(db_id)
+        try:
+            return execute_with_timeout(connection, sql, params, timeout)
+        finally:
+            if resident is not None:
+                resident.release(connection)
+
+    def close(self) -> None:
+        """모든 스레드의 연결을 닫습니다."""
+        with self._pools_lock:
+            for pool in list(self._pools):
+                _close_entries(pool.entries)
+        if self.memory is not None:
+            self.memory.clear()
+
+    def _checkout(self, db_id: str) -> Tuple[sqlite3.Connection, Optional["ResidentDatabase"]]:
+        """
+        현재 스레드의 db_id 연결과 그 연결이 가리키는 메모리 데이터베이스를 반환합니다.
+        메모리 데이터베이스의 연결은 acquire()한 상태이므로 사용이 끝나면 release() 해야 합니다.
+        """
+        entries = self._pool().entries
+        entry = entries.get(db_id)
+        if entry is not None:
+            connection, resident = entry
+            if resident is None or resident.acquire(connection):
+                if resident is not None:
+                    self.memory.touch(resident)
+                entries.move_to_end(db_id)
+                return entry
+            # 메모리에서 내려간 데이터베이스는 다시 선택해서 연결
+            del entries[db_id]
+            _close_entry(connection, resident)
+
+        connection, resident = None, None
+        while connection is None and self.memory is not None:
+            resident = self.memory.load(db_id)
+            if resident is None:
+                break
+            # 연결하기 전에 메모리에서 내려갔으면 다시 올림
+            connection = resident.connect()
+        if connection is None:
+            connection = open_readonly(self.resolve(db_id), self.max_mmap_size)
+        entries[db_id] = (connection, resident)
+        while len(entries) > self.max_connections_per_thread:
+            _, evicted = entries.popitem(last=False)
+            _close_entry(*evicted)
+        return connection, resident
+
+    def _pool(self) -> _ThreadPool:
+        pool = getattr(self._local, "pool", None)
+        if pool is None:
+            pool = _ThreadPool()
+            self._local.pool = pool
+            with self._pools_lock:
+                self._pools.add(pool)
+        return pool
@@ -0,0 +1,418 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+import hashlib
+import http.client
+import json
+import os
+import re
+import socket
+import threading
+import urllib.error
+import urllib.request
+from .utils import atomic_write
+
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+# 구간 병렬 다운로드에서 한 구간의 최소 크기. 이보다 작은 파일은 나누지 않음
+DEFAULT_MIN_SEGMENT_SIZE = 8 * 1024 * 1024
+USER_AGENT = "text-to-sql-downloader"
+
+_CONTENT_RANGE_PATTERN = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+|\*)")
+_UNSATISFIED_RANGE_PATTERN = re.compile(r"bytes\s+\*/(\d+)")
+
+
+class DownloadError(Exception):
+    """다운로드가 실패했거나 받은 파일이 manifest와 일치하지 않을 때 발생하는 예외"""
+
+
+class DownloadManifest:
+    """
+    다운로드한 파일을 압축 해제 전에 검증하기 위한 기대값입니다.
+
+    Args:
+        size (Optional[int]): 기대하는 파일 크기(byte)
+        sha256 (Optional[str]): 기대하는 SHA-256 hex digest
+    """
+
+    def __init__(self, size: Optional[int] = None, sha256: Optional[str] = None):
+        self.size = size
+        self.sha256 = sha256.lower() if sha256 else None
+
+    @classmethod
+    def of(cls, path: Path) -> "DownloadManifest":
+        """파일의 크기와 SHA-256으로 manifest를 만듭니다."""
+        return cls(path.stat().st_size, sha256_of(path))
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["DownloadManifest"]:
+        """save()로 기록한 manifest를 읽습니다. 없거나 읽을 수 없으면 None"""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return cls(data.get("size"), data.get("sha256"))
+
+    def save(self, path: Path) -> None:
+        with atomic_write(path) as f:
+            json.dump({"size": self.size, "sha256": self.sha256}, f)
+
+    def verify(self, path: Path) -> None:
+        """
+        파일이 manifest와 일치하는지 확인합니다. 크기를 먼저 비교하고, 크기가 맞을 때만 해시를 계산합니다.
+
+        Raises:
+            DownloadError: 크기 또는 해시가 일치하지 않는 경우
+        """
+        self.verify_digest(path.name, path.stat().st_size, lambda: sha256_of(path))
+
+    def verify_digest(self, name: str, size: int, sha256: Callable[[], str]) -> None:
+        """
+        이미 계산된 크기와 해시로 검증합니다. 파일로 저장하지 않고 스트림으로 받은 경우에 사용합니다.
+
+        Args:
+            name (str): 오류 메시지에 사용할 이름
+            size (int): 받은 byte 수
+            sha256 (Callable[[], str]): SHA-256 hex digest를 반환하는 함수. sha256이 manifest에 있을 때만 호출
+
+        Raises:
+            DownloadError: 크기 또는 해시가 일치하지 않는 경우
+        """
+        if self.size is not None and size != self.size:
+            raise DownloadError(f"{name}: expected {self.size} bytes, got {size} bytes")
+
+        if self.sha256 is not None:
+            actual_sha256 = sha256()
+            if actual_sha256 != self.sha256:
+                raise DownloadError(f"{name}: sha256 mismatch (expected {self.sha256}, got {actual_sha256})")
+
+
+def sha256_of(path: Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> str:
+    """파일 전체를 chunk 단위로 읽어 SHA-256 hex digest를 계산합니다."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class _IncompleteDownload(Exception):
+    """응답 본문이 서버가 알려준 크기보다 먼저 끝난 경우. 이어받기로 재시도합니다."""
+
+
+class _SegmentState:
+    """
+    구간 병렬 다운로드의 진행 상황입니다. 구간마다 다음에 받을 위치를 `<dest>.segments.json`에 기록하므로,
+    중단된 다운로드는 다음 호출에서 구간마다 받은 위치부터 이어받습니다.
+    """
+
+    def __init__(self, path: Path, url: str, size: int, bounds: List[int], positions: List[int]):
+        self.path = path
+        self.url = url
+        self.size = size
+        self.bounds = bounds
+        self.positions = positions
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Path, url: str, size: int, data_path: Path) -> Optional["_SegmentState"]:
+        """기록된 진행 상황을 읽습니다. 없거나 url, 크기, 구간 데이터 파일이 맞지 않으면 None"""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data["url"] != url or data["size"] != size or data_path.stat().st_size != size:
+                return None
+            return cls(path, url, size, data["bounds"], data["positions"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def advance(self, index: int, position: int) -> None:
+        with self._lock:
+            self.positions[index] = position
+            self.save()
+
+    def save(self) -> None:
+        with atomic_write(self.path) as f:
+            json.dump({"url": self.url, "size": self.size, "bounds": self.bounds, "positions": self.positions}, f)
+
+
+class Downloader:
+    """
+    HTTP Range 요청으로 이어받기가 가능한 다운로드 엔진입니다.
+
+    받는 중인 데이터는 `<dest>.part` 파일에 chunk 단위로 기록되므로, 중단되더라도
+    다음 호출에서 이미 받은 byte 이후부터 이어서 받습니다. 다운로드가 끝나면
+    manifest로 검증한 뒤에만 `<dest>`로 rename 합니다.
+
+    segments를 2 이상으로 지정하면 Range를 지원하는 서버에서 파일을 여러 구간으로 나눠 동시에 받습니다.
+
+    Args:
+        chunk_size (int): 한 번에 읽고 쓰는 byte 수
+        timeout (float): socket timeout(초)
+        retries (int): 네트워크 오류 시 이어받기를 재시도하는 횟수
+        min_segment_size (int): 구간 병렬 다운로드에서 한 구간의 최소 크기
+        on_progress (Optional[Callable[[int], None]]): chunk를 받을 때마다 받은 byte 수로 호출. 구간 병렬 다운로드에서는
+            여러 스레드에서 동시에 호출됨
+    """
+
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE, timeout: float = 60.0, retries: int = 3,
+                 min_segment_size: int = DEFAULT_MIN_SEGMENT_SIZE,
+                 on_progress: Optional[Callable[[int], None]] = None):
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.retries = retries
+        self.min_segment_size = min_segment_size
+        self.on_progress = on_progress
+
+    def download(self, url: str, dest: Path, manifest: Optional[DownloadManifest] = None, segments: int = 1) -> Path:
+        """
+        url의 파일을 dest로 다운로드합니다.
+
+        Args:
+            url (str): 다운로드할 URL
+            dest (Path): 최종 저장 경로
+            manifest (Optional[DownloadManifest]): 검증에 사용할 기대값
+            segments (int): 동시에 받을 구간 수. 서버가 Range를 지원하지 않거나 이어받을 partial 파일이 있으면 1개로 받음
+
+        Returns:
+            Path: 검증이 끝난 파일의 경로
+
+        Raises:
+            DownloadError: 재시도 후에도 다운로드가 실패했거나 검증에 실패한 경우
+        """
+        dest = Path(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+
+        # 이미 검증까지 끝난 파일이 있다면 다시 받지 않음
+        if dest.exists() and self._is_valid(dest, manifest):
+            return dest
+
+        part_path = self.part_path(dest)
+        fetched = False
+        if segments > 1 and not part_path.exists():
+            fetched = self._fetch_segmented(url, part_path, segments)
+        for attempt in range(0 if fetched else self.retries + 1):
+            try:
+                self._fetch(url, part_path)
+                break
+            except (_IncompleteDownload, urllib.error.URLError, http.client.HTTPException,
+                    ConnectionError, socket.timeout) as e:
+                if isinstance(e, urllib.error.HTTPError) and e.code < 500:
+                    raise DownloadError(f"Failed to download {url}: HTTP {e.code}") from e
+                if attempt == self.retries:
+                    raise DownloadError(f"Failed to download {url} after {attempt + 1} attempts: {e}") from e
+
+        if manifest is not None:
+            try:
+                manifest.verify(part_path)
+            except DownloadError:
+                # 손상된 partial 파일을 남겨두면 다음 호출도 같은 파일을 이어받게 되므로 삭제
+                part_path.unlink()
+                self._discard_segment_state(dest)
+                raise
+
+        os.replace(part_path, dest)
+        # 구간 진행 상황은 완성된 파일이 검증되어 제자리로 옮겨진 뒤에만 지움
+        self._discard_segment_state(dest)
+        return dest
+
+    def iter_chunks(self, url: str) -> Iterator[bytes]:
+        """
+        url의 본문을 파일에 저장하지 않고 chunk 단위로 반환합니다. 연결이 끊기면 받은 위치부터 Range 요청으로 이어서 받습니다.
+
+        Raises:
+            DownloadError: 재시도 후에도 실패했거나 서버가 Range를 지원하지 않아 이어받을 수 없는 경우
+        """
+        offset = 0
+        for attempt in range(self.retries + 1):
+            headers = {"User-Agent": USER_AGENT}
+            if offset:
+                headers["Range"] = f"bytes={offset}-"
+            try:
+                with urllib.request.urlopen(urllib.request.Request(url, headers=headers),
+                                            timeout=self.timeout) as response:
+                    if response.headers.get("Content-Type", "").startswith("text/html"):
+                        raise DownloadError(f"{url} returned an HTML page instead of the file")
+                    if offset and response.status != 206:
+                        # 이미 넘겨준 byte는 되돌릴 수 없으므로 처음부터 다시 받을 수 없음
+                        raise DownloadError(f"{url} does not support resuming at byte {offset}")
+                    total = self._expected_total(response, offset)
+                    for chunk in iter(lambda: response.read(self.chunk_size), b""):
+                        offset += len(chunk)
+                        if self.on_progress is not None:
+                            self.on_progress(len(chunk))
+                        yield chunk
+                if total is not None and offset < total:
+                    raise _IncompleteDownload(f"received {offset} of {total} bytes")
+                return
+            except (_IncompleteDownload, urllib.error.URLError, http.client.HTTPException,
+                    ConnectionError, socket.timeout) as e:
+                if isinstance(e, urllib.error.HTTPError) and e.code < 500:
+                    raise DownloadError(f"Failed to download {url}: HTTP {e.code}") from e
+                if attempt == self.retries:
+                    raise DownloadError(f"Failed to download {url} after {attempt + 1} attempts: {e}") from e
+
+    @staticmethod
+    def part_path(dest: Path) -> Path:
+        return dest.with_name(dest.name + ".part")
+
+    @staticmethod
+    def segments_path(dest: Path) -> Path:
+        """구간 병렬 다운로드 중인 데이터 파일"""
+        return dest.with_name(dest.name + ".segments")
+
+    @staticmethod
+    def segment_state_path(dest: Path) -> Path:
+        """구간 병렬 다운로드의 구간별 진행 상황 파일"""
+        return dest.with_name(dest.name + ".segments.json")
+
+    def _discard_segment_state(self, dest: Path) -> None:
+        for path in (self.segments_path(dest), self.segment_state_path(dest)):
+            if path.exists():
+                path.unlink()
+
+    def _is_valid(self, path: Path, manifest: Optional[DownloadManifest]) -> bool:
+        if manifest is None:
+            return True
+        try:
+            manifest.verify(path)
+        except DownloadError:
+            return False
+        return True
+
+    def _fetch(self, url: str, part_path: Path) -> None:
+        offset = part_path.stat().st_size if part_path.exists() else 0
+        headers: Dict[str, str] = {"User-Agent": USER_AGENT}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+
+        try:
+            response = urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            if e.code == 416 and offset:
+                # 416: 요청한 위치가 파일 끝 이후. `Content-Range: bytes */N`의 N이 partial 파일 크기와 같을 때만
+                # 이미 다 받은 것이고, 아니면(서버의 파일이 바뀌었거나 크기를 알 수 없음) partial 파일을 버리고 처음부터 받음
+                match = _UNSATISFIED_RANGE_PATTERN.match(e.headers.get("Content-Range", "") if e.headers else "")
+                if match and int(match.group(1)) == offset:
+                    return
+                part_path.unlink()
+                self._fetch(url, part_path)
+                return
+            raise
+
+        with response:
+            content_type = response.headers.get("Content-Type", "")
+            if content_type.startswith("text/html"):
+                raise DownloadError(f"{url} returned an HTML page instead of the file")
+
+            if offset and response.status != 206:
+                # 서버가 Range를 무시하고 전체 본문을 보내는 경우 처음부터 다시 씀
+                offset = 0
+            total = self._expected_total(response, offset)
+
+            with open(part_path, "ab" if offset else "wb") as f:
+                for chunk in iter(lambda: response.read(self.chunk_size), b""):
+                    f.write(chunk)
+                    if self.on_progress is not None:
+                        self.on_progress(len(chunk))
+
+        if total is not None and part_path.stat().st_size < total:
+            raise _IncompleteDownload(f"received {part_path.stat().st_size} of {total} bytes")
+
+    def _fetch_segmented(self, url: str, part_path: Path, segments: int) -> bool:
+        """
+        파일을 구간으로 나눠 동시에 받고 part_path에 기록합니다.
+
+        구간들은 `<dest>.segments` 파일에 기록한 뒤 모두 끝나야 part_path로 rename 합니다.
+        중간에 구멍이 있는 파일이 이어받기용 partial 파일로 오인되지 않도록 하기 위함입니다.
+        구간마다 받은 위치는 `<dest>.segments.json`에 기록되므로, 중단되더라도 다음 호출에서 같은 url이고
+        크기가 같으면 각 구간을 받은 위치부터 이어받습니다.
+
+        Returns:
+            bool: 구간 병렬로 받았으면 True, 서버가 Range를 지원하지 않거나 파일이 작아 나누지 않았으면 False
+        """
+        size = self._probe_size(url)
+        if size is None or size < 2 * self.min_segment_size:
+            return False
+
+        dest = part_path.with_name(part_path.name[:-len(".part")])
+        segments_path = self.segments_path(dest)
+        state = _SegmentState.load(self.segment_state_path(dest), url, size, segments_path)
+        if state is None:
+            segments = min(segments, size // self.min_segment_size)
+            bounds = [size * i // segments for i in range(segments + 1)]
+            with open(segments_path, "wb") as f:
+                f.truncate(size)
+            state = _SegmentState(self.segment_state_path(dest), url, size, bounds, bounds[:-1])
+            state.save()
+
+        pending = [index for index in range(len(state.positions))
+                   if state.positions[index] < state.bounds[index + 1]]
+        if pending:
+            with ThreadPoolExecutor(max_workers=len(pending)) as pool:
+                futures = [pool.submit(self._fetch_range, url, segments_path, state, index) for index in pending]
+                for future in futures:
+                    future.result()
+        os.replace(segments_path, part_path)
+        return True
+
+    def _probe_size(self, url: str) -> Optional[int]:
+        """1 byte Range 요청으로 서버의 Range 지원 여부와 전체 크기를 확인합니다. 지원하지 않으면 None"""
+        request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT, "Range": "bytes=0-0"})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                if response.status != 206:
+                    return None
+                if response.headers.get("Content-Type", "").startswith("text/html"):
+                    return None
+                return self._expected_total(response, 0)
+        except (urllib.error.URLError, http.client.HTTPException, ConnectionError, socket.timeout):
+            return None
+
+    def _fetch_range(self, url: str, path: Path, state: _SegmentState, index: int) -> None:
+        """
+        index번 구간의 남은 부분을 받아 path의 같은 위치에 기록합니다. chunk를 쓸 때마다 받은 위치를 state에 기록하고,
+        끊기면 받은 위치부터 이어서 재시도합니다.
+        """
+        start, end = state.positions[index], state.bounds[index + 1] - 1
+        position = start
+        for attempt in range(self.retries + 1):
+            headers = {"User-Agent": USER_AGENT, "Range": f"bytes={position}-{end}"}
+            try:
+                with urllib.request.urlopen(urllib.request.Request(url, headers=headers),
+                                            timeout=self.timeout) as response, open(path, "r+b") as f:
+                    if response.status != 206:
+                        raise DownloadError(f"{url} ignored the range request for bytes {position}-{end}")
+                    f.seek(position)
+                    for chunk in iter(lambda: response.read(min(self.chunk_size, end + 1 - position)), b""):
+                        f.write(chunk)
+                        # 기록한 위치가 실제로 쓴 데이터를 넘지 않도록 먼저 flush
+                        f.flush()
+                        position += len(chunk)
+                        state.advance(index, position)
+                        if self.on_progress is not None:
+                            self.on_progress(len(chunk))
+                        if position > end:
+                            break
+                if position > end:
+                    return
+                raise _IncompleteDownload(f"segment {start}-{end} stopped at {position}")
+            except (_IncompleteDownload, urllib.error.URLError, http.client.HTTPException,
+                    ConnectionError, socket.timeout) as e:
+                if isinstance(e, urllib.error.HTTPError) and e.code < 500:
+                    raise DownloadError(f"Failed to download {url}: HTTP {e.code}") from e
+                if attempt == self.retries:
+                    raise DownloadError(f"Failed to download bytes {start}-{end} of {url}: {e}") from e
+
+    @staticmethod
+    def _expected_total(response, offset: int) -> Optional[int]:
+        content_range = response.headers.get("Content-Range")
+        if content_range:
+            match = _CONTENT_RANGE_PATTERN.match(content_range)
+            if match and match.group(3) != "*":
+                return int(match.group(3))
+        content_length = response.headers.get("Content-Length")
+        if content_length is not None:
+            return offset + int(content_length)
+        return None
@@ -0,0 +1,243 @@
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+import os
+from .connection import ConnectionManager, QueryTimeout
+from .gold_cache import GoldResultCache, result_key
+from .memory_db import MemoryDatabases, MemoryPolicy
+from .utils import spawn_pool
+
+
+CORRECT = "correct"
+INCORRECT = "incorrect"
+ERROR = "error"
+TIMEOUT = "timeout"
+GOLD_ERROR = "gold_error"
+
+DEFAULT_TIMEOUT = 30.0
+
+# spawn된 worker 프로세스에서만 사용하는 연결. key는 sqlite 파일 경로
+_worker_connections: Optional[ConnectionManager] = None
+# in_memory 모드의 작업에 사용하는 worker 연결. 메모리에 올릴 데이터베이스는 부모 프로세스가 고르므로 worker는 budget만 적용
+_worker_memory_connections: Optional[ConnectionManager] = None
+
+
+class ExecutionResult(NamedTuple):
+    """예측 SQL 하나의 실행 정확도 채점 결과"""
+    index: int
+    db_id: str
+    status: str
+    error: Optional[str] = None
+
+    @property
+    def correct(self) -> bool:
+        return self.status == CORRECT
+
+
+class ExecutionReport:
+    """
+    evaluate_execution()의 결과입니다. results는 예제 index 순서로 정렬되어 있습니다.
+    """
+
+    def __init__(self, results: List[ExecutionResult]):
+        self.results = results
+
+    @property
+    def accuracy(self) -> float:
+        return sum(result.correct for result in self.results) / len(self.results) if self.results else 0.0
+
+    def count(self, status: str) -> int:
+        return sum(result.status == status for result in self.results)
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def __repr__(self) -> str:
+        return f"ExecutionReport(accuracy={self.accuracy:.4f}, n={len(self.results)})"
+
+
+def results_match(predicted: List[tuple], gold: List[tuple]) -> bool:
+    """두 결과를 행의 multiset으로 비교합니다. 행 순서는 무시하고 중복 횟수는 구분합니다."""
+    if len(predicted) != len(gold):
+        return False
+    if predicted == gold:
+        return True
+    return Counter(predicted) == Counter(gold)
+
+
+def evaluate_execution(loader, predictions: Union[Sequence[str], Mapping[int, str]], split: str = "dev",
+                       timeout: Optional[float] = DEFAULT_TIMEOUT, jobs: Optional[int] = None,
+                       gold_cache: Optional[GoldResultCache] = None) -> ExecutionReport:
+    """
+    예측 SQL과 gold SQL을 같은 데이터베이스에서 실행해 결과가 같은지 채점합니다.
+
+    db_id 하나의 예제들은 한 작업으로 묶여 한 worker에서 같은 연결로 실행되며, 예제가 많은 db_id부터 프로세스 풀에 넣습니다.
+    쿼리마다 SQLite progress handler로 timeout을 적용하므로 끝나지 않는 쿼리가 worker를 붙잡지 않습니다.
+
+    Args:
+        loader (Loader): 예제와 sqlite 데이터베이스를 제공하는 Loader
+        predictions (Union[Sequence[str], Mapping[int, str]]): split 순서와 같은 순서의 예측 SQL 목록,
+            또는 예제 index -> 예측 SQL
+        split (str): 채점할 split
+        timeout (Optional[float]): 쿼리 하나의 제한 시간(초). None이면 제한 없음
+        jobs (Optional[int]): worker 프로세스 수. 기본값은 CPU 수이며 1이면 현재 프로세스에서 실행
+        gold_cache (Optional[GoldResultCache]): 지정하면 gold 결과를 캐시에서 읽고 새로 계산한 결과를 저장
+
+    Returns:
+        ExecutionReport: 예제 index 순서의 채점 결과
+
+    Raises:
+        ValueError: 예측 목록의 길이가 split과 다르거나 split에 없는 index가 있는 경우
+    """
+    cache = loader.get_example_cache(split)
+    if isinstance(predictions, Mapping):
+        predicted_by_index = dict(predictions)
+    else:
+        if len(predictions) != len(cache):
+            raise ValueError(f"Expected {len(cache)} predictions for split {split!r}, got {len(predictions)}")
+        predicted_by_index = dict(enumerate(predictions))
+
+    groups: Dict[str, List[Tuple[int, Optional[str], str]]] = {}
+    for example in cache.iter_examples():
+        predicted = predicted_by_index.pop(example.index, None)
+        if predicted is not None:
+            groups.setdefault(example.db_id, []).append((example.index, predicted, example.query))
+    if predicted_by_index:
+        raise ValueError(f"Unknown example indices for split {split!r}: {sorted(predicted_by_index)[:10]}")
+
+    results, _ = _run(loader, groups, timeout, jobs, gold_cache)
+    results.sort(key=lambda result: result.index)
+    return ExecutionReport(results)
+
+
+def warm_gold_cache(loader, gold_cache: GoldResultCache, split: str = "dev",
+                    timeout: Optional[float] = DEFAULT_TIMEOUT, jobs: Optional[int] = None) -> int:
+    """
+    split의 gold SQL 중 아직 캐시에 없는 것들을 미리 실행해 gold_cache에 저장합니다.
+    실행에 실패하거나 timeout을 넘긴 gold SQL은 저장하지 않습니다.
+
+    Returns:
+        int: 새로 저장한 결과 수
+    """
+    groups: Dict[str, List[Tuple[int, Optional[str], str]]] = {}
+    for example in loader.get_example_cache(split).iter_examples():
+        groups.setdefault(example.db_id, []).append((example.index, None, example.query))
+    _, computed = _run(loader, groups, timeout, jobs, gold_cache)
+    return computed
+
+
+def _run(loader, groups: Dict[str, List[Tuple[int, Optional[str], str]]], timeout: Optional[float],
+         jobs: Optional[int], gold_cache: Optional[GoldResultCache]) -> Tuple[List[ExecutionResult], int]:
+    # sqlite 경로는 부모 프로세스에서 찾아 둠. lazy 모드의 압축 해제도 여기서 한 번만 일어남
+    tasks = []
+    keys: Dict[int, str] = {}
+    policy = loader.memory_policy
+    for db_id, items in groups.items():
+        sqlite_path = loader.get_sqlite_path(db_id)
+        memory_budget = None
+        if policy is not None and sqlite_path.exists() and policy.selects(db_id, sqlite_path.stat().st_size):
+            memory_budget = policy.budget
+        cached: Dict[str, List[tuple]] = {}
+        if gold_cache is not None:
+            fingerprint = loader.get_database_fingerprint(db_id)
+            keys.update((index, result_key(gold_sql, fingerprint)) for index, _, gold_sql in items)
+            cached = gold_cache.get_many(keys[index] for index, _, _ in items)
+        pending = [(index, predicted, gold_sql, cached.get(keys.get(index)))
+                   for index, predicted, gold_sql in items]
+        # 캐시된 gold만 있고 예측이 없는 항목(warm-up)은 실행할 필요가 없음
+        pending = [item for item in pending if item[1] is not None or item[3] is None]
+        if pending:
+            tasks.append((db_id, str(sqlite_path), pending, timeout, memory_budget))
+    # db_id마다 한 작업이므로 연결과 메모리 복사본이 worker 하나에만 생김. 큰 작업부터 넣어 마지막에 한 worker만 일하는 상황을 줄임
+    tasks.sort(key=lambda task: len(task[2]), reverse=True)
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(tasks) <= 1:
+        chunks = _evaluate_serially(tasks)
+    else:
+        with spawn_pool(min(jobs, len(tasks))) as pool:
+            chunks = list(pool.map(_evaluate_chunk, *zip(*tasks)))
+
+    results = [result for chunk_results, _ in chunks for result in chunk_results]
+    computed = [(index, rows) for _, chunk_computed in chunks for index, rows in chunk_computed]
+    if gold_cache is not None:
+        gold_cache.put_many([(keys[index], rows) for index, rows in computed])
+    return results, len(computed)
+
+
+def _evaluate_serially(tasks: List[tuple]) -> List[Tuple[List[ExecutionResult], List[Tuple[int, List[tuple]]]]]:
+    """현재 프로세스에서 작업들을 채점합니다. 연결은 이 호출에서만 사용하고 끝나면 닫습니다."""
+    connections = ConnectionManager(Path)
+    # 한 호출의 memory_budget은 모두 Loader의 MemoryPolicy.budget으로 같음
+    memory_connections: Optional[ConnectionManager] = None
+    try:
+        chunks = []
+        for db_id, sqlite_path, items, timeout, memory_budget in tasks:
+            manager = connections
+            if memory_budget is not None:
+                if memory_connections is None:
+                    memory_connections = _memory_connection_manager(memory_budget)
+                manager = memory_connections
+            chunks.append(_evaluate_chunk(db_id, sqlite_path, items, timeout, memory_budget, manager))
+        return chunks
+    finally:
+        connections.close()
+        if memory_connections is not None:
+            memory_connections.close()
+
+
+def _evaluate_chunk(db_id: str, sqlite_path: str, items: List[Tuple[int, Optional[str], str, Optional[List[tuple]]]],
+                    timeout: Optional[float], memory_budget: Optional[int] = None,
+                    connections: Optional[ConnectionManager] = None
+                    ) -> Tuple[List[ExecutionResult], List[Tuple[int, List[tuple]]]]:
+    """
+    items의 (index, 예측 SQL, gold SQL, 캐시된 gold 결과)를 채점합니다.
+    캐시된 gold 결과가 없으면 gold SQL을 실행하고, 새로 계산한 gold 결과를 함께 반환합니다.
+    memory_budget이 있으면 데이터베이스를 이 프로세스의 메모리에 올려 실행합니다.
+    connections를 주지 않으면(worker 프로세스) 프로세스에 유지하는 연결을 사용합니다.
+    """
+    if connections is None:
+        connections = _worker_connection_manager(memory_budget)
+
+    results = []
+    computed = []
+    for index, predicted_sql, gold_sql, gold in items:
+        if gold is None:
+            try:
+                gold = connections.execute(sqlite_path, gold_sql, timeout=timeout)
+            except Exception as e:
+                results.append(ExecutionResult(index, db_id, GOLD_ERROR, f"{type(e).__name__}: {e}"))
+                continue
+            computed.append((index, gold))
+        if predicted_sql is None:
+            continue
+        try:
+            predicted = connections.execute(sqlite_path, predicted_sql, timeout=timeout)
+        except QueryTimeout as e:
+            results.append(ExecutionResult(index, db_id, TIMEOUT, str(e)))
+            continue
+        except Exception as e:
+            # sqlite3.Error 외에도 여러 문장을 담은 SQL의 sqlite3.Warning 등이 발생할 수 있음
+            results.append(ExecutionResult(index, db_id, ERROR, f"{type(e).__name__}: {e}"))
+            continue
+        results.append(ExecutionResult(index, db_id, CORRECT if results_match(predicted, gold) else INCORRECT))
+    return results, computed
+
+
+def _worker_connection_manager(memory_budget: Optional[int]) -> ConnectionManager:
+    global _worker_connections, _worker_memory_connections
+    if memory_budget is None:
+        if _worker_connections is None:
+            _worker_connections = ConnectionManager(Path)
+        return _worker_connections
+
+    if _worker_memory_connections is None or _worker_memory_connections.memory.policy.budget != memory_budget:
+        if _worker_memory_connections is not None:
+            _worker_memory_connections.close()
+        _worker_memory_connections = _memory_connection_manager(memory_budget)
+    return _worker_memory_connections
+
+
+def _memory_connection_manager(memory_budget: int) -> ConnectionManager:
+    # 부모 프로세스가 이미 고른 데이터베이스이므로 budget 이하면 모두 메모리에 올림
+    return ConnectionManager(Path, memory=MemoryDatabases(Path, MemoryPolicy(memory_budget, memory_budget)))
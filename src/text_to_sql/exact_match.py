@@ -0,0 +1,861 @@
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Hashable, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+import json
+import os
+import re
+import threading
+import weakref
+from .evaluation import CORRECT, ERROR, GOLD_ERROR, INCORRECT
+from .schema import DatabaseSchema, SchemaCatalog
+from .utils import atomic_write, spawn_pool
+
+
+# Spider process_sql.py와 같은 토큰/연산자 목록. 트리의 숫자 id는 이 tuple들의 위치입니다.
+CLAUSE_KEYWORDS = ("select", "from", "where", "group", "order", "limit", "intersect", "union", "except")
+JOIN_KEYWORDS = ("join", "on", "as")
+WHERE_OPS = ("not", "between", "=", ">", "<", ">=", "<=", "!=", "in", "like", "is", "exists")
+UNIT_OPS = ("none", "-", "+", "*", "/")
+AGG_OPS = ("none", "max", "min", "count", "sum", "avg")
+COND_OPS = ("and", "or")
+SQL_OPS = ("intersect", "union", "except")
+ORDER_OPS = ("desc", "asc")
+
+# 저장 형식이나 정규화 방식이 바뀌면 올려서 기존 gold 형태를 다시 만들도록 합니다.
+FORMAT_VERSION = 2
+# 프로세스 안에서 기억할 예측 SQL 파싱 결과의 수
+DEFAULT_MEMO_SIZE = 100_000
+# 한 작업에 담을 최대 예측 SQL 수. 파싱은 가벼우므로 이보다 적은 batch는 현재 프로세스에서 처리
+DEFAULT_CHUNK_SIZE = 1024
+
+_TOKEN = re.compile(r"[\w.]+|[^\w\s]")
+_COMPARISON_PREFIXES = ("!", ">", "<")
+
+# (정규화한 형태, 파싱 오류). 둘 중 하나만 None이 아님
+Parsed = Tuple[Optional[Hashable], Optional[str]]
+
+
+class SqlParseError(ValueError):
+    """SQL을 Spider의 sql 트리로 파싱할 수 없는 경우 발생하는 예외"""
+
+
+class GoldForm(NamedTuple):
+    """
+    예제 하나의 정규화한 gold SQL입니다.
+
+    Attributes:
+        db_id (str): 예제의 데이터베이스 id
+        form (Optional[Hashable]): canonical_form()의 결과. gold SQL을 해석할 수 없으면 None
+        error (Optional[str]): form이 None인 이유
+    """
+    db_id: str
+    form: Optional[Hashable]
+    error: Optional[str] = None
+
+
+class ExactMatchResult(NamedTuple):
+    """
+    예측 SQL 하나의 exact-set-match 채점 결과입니다.
+    status는 "correct", "incorrect", "error"(예측 SQL을 파싱할 수 없음), "gold_error"(gold SQL을 해석할 수 없음) 중 하나입니다.
+    """
+    index: int
+    db_id: str
+    status: str
+    error: Optional[str] = None
+
+    @property
+    def correct(self) -> bool:
+        return self.status == CORRECT
+
+
+class ExactMatchReport:
+    """
+    ExactMatchEvaluator.evaluate()의 결과입니다. results는 예제 index 순서로 정렬되어 있습니다.
+    """
+
+    def __init__(self, results: List[ExactMatchResult]):
+        self.results = results
+
+    @property
+    def accuracy(self) -> float:
+        return sum(result.correct for result in self.results) / len(self.results) if self.results else 0.0
+
+    def count(self, status: str) -> int:
+        return sum(result.status == status for result in self.results)
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def __repr__(self) -> str:
+        return f"ExactMatchReport(accuracy={self.accuracy:.4f}, n={len(self.results)})"
+
+
+def tokenize(sql: str) -> List[str]:
+    """
+    Spider 방식으로 SQL을 토큰으로 나눕니다. 따옴표로 감싼 값은 하나의 토큰으로 유지하고 나머지는 소문자로 바꿉니다.
+
+    Raises:
+        SqlParseError: 따옴표 짝이 맞지 않는 경우
+    """
+    sql = sql.replace("'", '"')
+    quotes = [index for index, char in enumerate(sql) if char == '"']
+    if len(quotes) % 2:
+        raise SqlParseError("Unexpected quote")
+    values = {}
+    for i in range(len(quotes) - 1, -1, -2):
+        start, end = quotes[i - 1], quotes[i]
+        key = f"__val_{start}_{end}__"
+        values[key] = sql[start:end + 1]
+        sql = sql[:start] + key + sql[end + 1:]
+    tokens = [values[token] if token in values else token.lower() for token in _TOKEN.findall(sql)]
+
+    # "!", ">", "<" 뒤의 "="를 합쳐 "!=", ">=", "<="로 만듦
+    for index in range(len(tokens) - 1, 0, -1):
+        if tokens[index] == "=" and tokens[index - 1] in _COMPARISON_PREFIXES:
+            tokens[index - 1:index + 1] = [tokens[index - 1] + "="]
+    return tokens
+
+
+def parse_sql(sql: str, schema: DatabaseSchema) -> dict:
+    """
+    SQL을 Spider dev.json의 `sql` 필드와 같은 모양의 트리로 파싱합니다.
+    테이블과 컬럼은 tables.json의 table_names_original, column_names_original 위치(id)로 표현됩니다.
+
+    Spider process_sql.py와 같은 문법만 지원하므로 `AS` 없는 별칭이나 SELECT 절의 별칭 등은 파싱하지 않습니다.
+    LIMIT 값은 process_sql.py와 달리 정수이면 그대로 기록합니다.
+
+    Raises:
+        SqlParseError: 지원하지 않는 문법이거나 스키마에 없는 테이블/컬럼을 사용한 경우
+    """
+    tokens = tokenize(sql)
+    try:
+        parser = _SqlParser(tokens, _schema_index(schema))
+        _, tree = parser.parse_sql(0)
+    except SqlParseError:
+        raise
+    except (KeyError, IndexError, ValueError) as e:
+        raise SqlParseError(f"{type(e).__name__}: {e}") from e
+    return tree
+
+
+def canonical_form(tree: dict, schema: DatabaseSchema) -> Hashable:
+    """
+    sql 트리를 exact-set-match 비교용 hashable 형태로 만듭니다. 두 SQL의 형태가 같으면 Spider evaluation.py의
+    exact match(값 무시, DISTINCT 무시, 외래 키로 연결된 컬럼 동일 취급)가 1입니다.
+
+    SELECT, WHERE 조건, GROUP BY 컬럼 이름은 순서와 무관한 multiset으로, AND/OR와 키워드는 집합으로 비교하므로
+    비교 자체는 hash 한 번과 같습니다.
+
+    Args:
+        tree (dict): dev.json의 `sql` 필드(list) 또는 parse_sql()의 결과(tuple)
+        schema (DatabaseSchema): tree의 id가 가리키는 스키마
+    """
+    index = _schema_index(schema)
+    tree = _strip_values(tree)
+    table_ids = {unit[1] for unit in tree["from"]["table_units"] if unit[0] == "table_unit"}
+    valid = frozenset(column for column, table in enumerate(index.column_tables) if table in table_ids)
+    tree = _rebuild_columns(tree, valid, index.foreign_key_map)
+    return _form(tree, index)
+
+
+def build_gold_forms(records: Iterable[dict], catalog: SchemaCatalog) -> List[GoldForm]:
+    """
+    예제 record들의 gold SQL을 정규화합니다. Spider 계열처럼 `sql` 트리가 있으면 그대로 사용하고,
+    없으면(BIRD 등) `query` 또는 `SQL`을 파싱합니다.
+    """
+    forms = []
+    for record in records:
+        db_id = record["db_id"]
+        try:
+            schema = catalog[db_id]
+            tree = record.get("sql")
+            if tree is None:
+                tree = parse_sql(record["query"] if "query" in record else record["SQL"], schema)
+            forms.append(GoldForm(db_id, canonical_form(tree, schema)))
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            forms.append(GoldForm(db_id, None, f"{type(e).__name__}: {e}"))
+    return forms
+
+
+def load_gold_forms(path: Path, source: str) -> Optional[List[GoldForm]]:
+    """save_gold_forms()로 저장한 결과를 읽습니다. 없거나 손상되었거나 source가 다르면 None"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data["version"] != FORMAT_VERSION or data["source"] != source:
+            return None
+        return [GoldForm(db_id, _decode_form(form), error) for db_id, form, error in data["forms"]]
+    except (OSError, KeyError, TypeError, ValueError):
+        return None
+
+
+def save_gold_forms(path: Path, source: str, forms: Sequence[GoldForm]) -> None:
+    """gold 형태를 JSON으로 저장합니다. tuple은 배열, frozenset은 {"set": [...]}로 기록합니다."""
+    with atomic_write(path) as f:
+        json.dump({"version": FORMAT_VERSION, "source": source,
+                   "forms": [[form.db_id, _encode_form(form.form), form.error] for form in forms]},
+                  f, ensure_ascii=False, separators=(",", ":"))
+
+
+def _encode_form(value: Any) -> Any:
+    if isinstance(value, tuple):
+        return [_encode_form(item) for item in value]
+    if isinstance(value, frozenset):
+        return {"set": [_encode_form(item) for item in value]}
+    return value
+
+
+def _decode_form(value: Any) -> Hashable:
+    if isinstance(value, list):
+        return tuple(_decode_form(item) for item in value)
+    if isinstance(value, dict):
+        return frozenset(_decode_form(item) for item in value["set"])
+    return value
+
+
+class ExactMatchEvaluator:
+    """
+    split 하나의 exact-set-match 채점기입니다. gold SQL은 미리 정규화해 두고 예측 SQL만 파싱합니다.
+
+    예측 SQL의 파싱 결과는 (db_id, SQL)을 key로 최대 memo_size개까지 LRU로 기억하므로,
+    beam reranking처럼 같은 후보가 반복되는 경우 다시 파싱하지 않습니다. 비교는 정규화한 형태의 동등 비교입니다.
+
+    Args:
+        tables_path (Path): 스키마 파일(tables.json). worker 프로세스가 스키마를 읽을 때 사용
+        gold (Sequence[GoldForm]): 예제 index 순서의 정규화한 gold SQL
+        fingerprint (str): gold를 만든 원본 파일들의 fingerprint
+        memo_size (int): 기억할 예측 SQL 파싱 결과의 수
+    """
+
+    def __init__(self, tables_path: Path, gold: Sequence[GoldForm], fingerprint: str = "",
+                 memo_size: int = DEFAULT_MEMO_SIZE):
+        self.tables_path = Path(tables_path)
+        self.catalog = SchemaCatalog.load(self.tables_path)
+        self.gold = list(gold)
+        self.fingerprint = fingerprint
+        self.memo_size = memo_size
+        self._memo: "OrderedDict[Tuple[str, str], Parsed]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def predicted_form(self, db_id: str, sql: str) -> Parsed:
+        """예측 SQL의 (정규화한 형태, 파싱 오류). 기억한 결과가 있으면 다시 파싱하지 않습니다."""
+        key = (db_id, sql)
+        with self._lock:
+            parsed = self._memo.get(key)
+            if parsed is not None:
+                self._memo.move_to_end(key)
+                return parsed
+        parsed = _parse_form(self.catalog[db_id], sql)
+        self._remember({key: parsed})
+        return parsed
+
+    def match(self, index: int, sql: str) -> bool:
+        """예측 SQL이 index 예제의 gold SQL과 exact match 하면 True"""
+        gold = self._gold(index)
+        return gold.form is not None and self.predicted_form(gold.db_id, sql)[0] == gold.form
+
+    def score(self, pairs: Iterable[Tuple[int, str]], jobs: Optional[int] = None,
+              chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[ExactMatchResult]:
+        """
+        (예제 index, 예측 SQL) 목록을 채점합니다. 한 예제에 여러 후보가 있어도 되며 결과는 입력 순서입니다.
+
+        처음 보는 예측 SQL은 중복을 제거한 뒤 db_id별로 묶어 chunk_size개씩 프로세스 풀에서 파싱합니다.
+        작업이 하나뿐이면 프로세스를 띄우지 않고 현재 프로세스에서 파싱합니다.
+
+        Args:
+            pairs (Iterable[Tuple[int, str]]): (예제 index, 예측 SQL) 목록
+            jobs (Optional[int]): worker 프로세스 수. 기본값은 CPU 수이며 1이면 현재 프로세스에서 실행
+            chunk_size (int): 한 작업에 담을 최대 예측 SQL 수
+
+        Raises:
+            ValueError: split에 없는 index가 있는 경우
+        """
+        pairs = list(pairs)
+        unknown = sorted({index for index, _ in pairs if not 0 <= index < len(self.gold)})
+        if unknown:
+            raise ValueError(f"Unknown example indices: {unknown[:10]}")
+        forms = self._predicted_forms(pairs, jobs, chunk_size)
+
+        results = []
+        for index, sql in pairs:
+            gold = self.gold[index]
+            if gold.form is None:
+                results.append(ExactMatchResult(index, gold.db_id, GOLD_ERROR, gold.error))
+                continue
+            form, error = forms[(gold.db_id, sql)]
+            if form is None:
+                results.append(ExactMatchResult(index, gold.db_id, ERROR, error))
+            else:
+                results.append(ExactMatchResult(index, gold.db_id, CORRECT if form == gold.form else INCORRECT))
+        return results
+
+    def evaluate(self, predictions: Union[Sequence[str], Mapping[int, str]], jobs: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> ExactMatchReport:
+        """
+        예제마다 예측 SQL 하나를 채점합니다.
+
+        Args:
+            predictions (Union[Sequence[str], Mapping[int, str]]): split 순서의 예측 SQL 목록 또는 예제 index -> 예측 SQL
+
+        Returns:
+            ExactMatchReport: 예제 index 순서의 채점 결과
+
+        Raises:
+            ValueError: 예측 목록의 길이가 split과 다르거나 split에 없는 index가 있는 경우
+        """
+        if isinstance(predictions, Mapping):
+            pairs = sorted(predictions.items())
+        else:
+            if len(predictions) != len(self.gold):
+                raise ValueError(f"Expected {len(self.gold)} predictions, got {len(predictions)}")
+            pairs = list(enumerate(predictions))
+        return ExactMatchReport(self.score(pairs, jobs, chunk_size))
+
+    def __len__(self) -> int:
+        return len(self.gold)
+
+    def _gold(self, index: int) -> GoldForm:
+        if not 0 <= index < len(self.gold):
+            raise ValueError(f"Unknown example index: {index}")
+        return self.gold[index]
+
+    def _predicted_forms(self, pairs: List[Tuple[int, str]], jobs: Optional[int],
+                         chunk_size: int) -> Dict[Tuple[str, str], Parsed]:
+        forms: Dict[Tuple[str, str], Parsed] = {}
+        missing: Dict[str, Dict[str, None]] = {}
+        with self._lock:
+            for index, sql in pairs:
+                gold = self.gold[index]
+                key = (gold.db_id, sql)
+                if gold.form is None or key in forms:
+                    continue
+                parsed = self._memo.get(key)
+                if parsed is not None:
+                    self._memo.move_to_end(key)
+                    forms[key] = parsed
+                else:
+                    # dict로 순서를 유지하면서 중복을 제거
+                    missing.setdefault(gold.db_id, {})[sql] = None
+
+        tasks = []
+        for db_id, sqls in missing.items():
+            sqls = list(sqls)
+            for start in range(0, len(sqls), chunk_size):
+                tasks.append((str(self.tables_path), db_id, sqls[start:start + chunk_size]))
+        tasks.sort(key=lambda task: len(task[2]), reverse=True)
+
+        jobs = jobs or os.cpu_count() or 1
+        if jobs == 1 or len(tasks) <= 1:
+            chunks = [_parse_chunk(*task) for task in tasks]
+        else:
+            with spawn_pool(min(jobs, len(tasks))) as pool:
+                chunks = list(pool.map(_parse_chunk, *zip(*tasks)))
+
+        parsed = {(db_id, sql): form for (_, db_id, sqls), chunk in zip(tasks, chunks)
+                  for sql, form in zip(sqls, chunk)}
+        self._remember(parsed)
+        forms.update(parsed)
+        return forms
+
+    def _remember(self, parsed: Dict[Tuple[str, str], Parsed]) -> None:
+        with self._lock:
+            self._memo.update(parsed)
+            while len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+
+
+def _parse_chunk(tables_path: str, db_id: str, sqls: List[str]) -> List[Parsed]:
+    # SchemaCatalog.load()는 프로세스 전체 캐시를 사용하므로 worker마다 스키마 파일을 한 번만 읽음
+    schema = SchemaCatalog.load(Path(tables_path))[db_id]
+    return [_parse_form(schema, sql) for sql in sqls]
+
+
+def _parse_form(schema: DatabaseSchema, sql: str) -> Parsed:
+    try:
+        return canonical_form(parse_sql(sql, schema), schema), None
+    except SqlParseError as e:
+        return None, str(e)
+
+
+class _SchemaIndex(NamedTuple):
+    tables: Dict[str, int]
+    columns: Dict[str, Dict[str, int]]
+    column_names: List[str]
+    column_tables: List[int]
+    foreign_key_map: Dict[int, int]
+
+
+# 스키마 객체가 사라지면 색인도 함께 사라지도록 약한 참조로 기억함
+_schema_indexes: "weakref.WeakKeyDictionary[DatabaseSchema, _SchemaIndex]" = weakref.WeakKeyDictionary()
+_schema_indexes_lock = threading.Lock()
+
+
+def _schema_index(schema: DatabaseSchema) -> _SchemaIndex:
+    with _schema_indexes_lock:
+        index = _schema_indexes.get(schema)
+    if index is not None:
+        return index
+
+    tables = {table.name.lower(): table.index for table in schema.tables}
+    columns: Dict[str, Dict[str, int]] = {name: {} for name in tables}
+    for column in schema.columns:
+        if column.table is not None:
+            columns[column.table.name.lower()].setdefault(column.name.lower(), column.index)
+    column_names = [column.name.lower() if column.table is not None else "__all__" for column in schema.columns]
+    column_tables = [column.table.index if column.table is not None else -1 for column in schema.columns]
+
+    # evaluation.py의 build_foreign_key_map과 같이 외래 키로 이어진 컬럼들을 가장 작은 id로 모음
+    key_sets: List[set] = []
+    for foreign_key in schema.foreign_keys:
+        source, target = foreign_key.source.index, foreign_key.target.index
+        key_set = next((keys for keys in key_sets if source in keys or target in keys), None)
+        if key_set is None:
+            key_set = set()
+            key_sets.append(key_set)
+        key_set.update((source, target))
+    foreign_key_map = {}
+    for key_set in key_sets:
+        smallest = min(key_set)
+        foreign_key_map.update((column, smallest) for column in key_set)
+
+    index = _SchemaIndex(tables, columns, column_names, column_tables, foreign_key_map)
+    with _schema_indexes_lock:
+        _schema_indexes[schema] = index
+    return index
+
+
+class _SqlParser:
+    """Spider process_sql.py의 재귀 하강 파서를 tables.json id를 사용하도록 옮긴 것입니다."""
+
+    def __init__(self, tokens: List[str], index: _SchemaIndex):
+        self.tokens = tokens
+        self.index = index
+        self.aliases = self._scan_aliases()
+
+    def _scan_aliases(self) -> Dict[str, str]:
+        tokens = self.tokens
+        aliases = {tokens[i + 1]: tokens[i - 1] for i, token in enumerate(tokens) if token == "as"}
+        for name in self.index.tables:
+            _expect(name not in aliases, f"Alias {name} has the same name as a table")
+            aliases[name] = name
+        return aliases
+
+    def parse_col(self, start: int, default_tables: Optional[List[str]]) -> Tuple[int, int]:
+        token = self.tokens[start]
+        if token == "*":
+            return start + 1, 0
+        if "." in token:
+            alias, column = token.split(".")
+            return start + 1, self.index.columns[self.aliases[alias]][column]
+        _expect(bool(default_tables), "Default tables should not be empty")
+        for alias in default_tables:
+            column = self.index.columns[self.aliases[alias]].get(token)
+            if column is not None:
+                return start + 1, column
+        raise SqlParseError(f"Error col: {token}")
+
+    def parse_col_unit(self, start: int, default_tables: Optional[List[str]],
+                       tokens: Optional[List[str]] = None) -> Tuple[int, tuple]:
+        tokens = tokens if tokens is not None else self.tokens
+        idx = start
+        is_block = False
+        is_distinct = False
+        if tokens[idx] == "(":
+            is_block = True
+            idx += 1
+
+        if tokens[idx] in AGG_OPS:
+            agg_id = AGG_OPS.index(tokens[idx])
+            idx += 1
+            _expect(idx < len(tokens) and tokens[idx] == "(", "'(' expected after aggregate")
+            idx += 1
+            if tokens[idx] == "distinct":
+                idx += 1
+                is_distinct = True
+            idx, col_id = self._parse_col_in(tokens, idx, default_tables)
+            _expect(idx < len(tokens) and tokens[idx] == ")", "')' expected after aggregate")
+            idx += 1
+            return idx, (agg_id, col_id, is_distinct)
+
+        if tokens[idx] == "distinct":
+            idx += 1
+            is_distinct = True
+        idx, col_id = self._parse_col_in(tokens, idx, default_tables)
+        if is_block:
+            _expect(tokens[idx] == ")", "')' expected")
+            idx += 1
+        return idx, (AGG_OPS.index("none"), col_id, is_distinct)
+
+    def _parse_col_in(self, tokens: List[str], start: int, default_tables: Optional[List[str]]) -> Tuple[int, int]:
+        if tokens is self.tokens:
+            return self.parse_col(start, default_tables)
+        # parse_value()가 잘라낸 토큰 목록 안에서 컬럼을 찾는 경우
+        saved, self.tokens = self.tokens, tokens
+        try:
+            return self.parse_col(start, default_tables)
+        finally:
+            self.tokens = saved
+
+    def parse_val_unit(self, start: int, default_tables: Optional[List[str]]) -> Tuple[int, tuple]:
+        tokens = self.tokens
+        idx = start
+        is_block = False
+        if tokens[idx] == "(":
+            is_block = True
+            idx += 1
+
+        col_unit2 = None
+        unit_op = UNIT_OPS.index("none")
+        idx, col_unit1 = self.parse_col_unit(idx, default_tables)
+        if idx < len(tokens) and tokens[idx] in UNIT_OPS:
+            unit_op = UNIT_OPS.index(tokens[idx])
+            idx += 1
+            idx, col_unit2 = self.parse_col_unit(idx, default_tables)
+
+        if is_block:
+            _expect(tokens[idx] == ")", "')' expected")
+            idx += 1
+        return idx, (unit_op, col_unit1, col_unit2)
+
+    def parse_table_unit(self, start: int) -> Tuple[int, int, str]:
+        tokens = self.tokens
+        name = self.aliases[tokens[start]]
+        idx = start + 3 if start + 1 < len(tokens) and tokens[start + 1] == "as" else start + 1
+        return idx, self.index.tables[name], name
+
+    def parse_value(self, start: int, default_tables: Optional[List[str]]) -> Tuple[int, Any]:
+        tokens = self.tokens
+        idx = start
+        is_block = False
+        if tokens[idx] == "(":
+            is_block = True
+            idx += 1
+
+        if tokens[idx] == "select":
+            idx, value = self.parse_sql(idx)
+        elif '"' in tokens[idx]:
+            value = tokens[idx]
+            idx += 1
+        else:
+            try:
+                value = float(tokens[idx])
+                idx += 1
+            except ValueError:
+                end = idx
+                while end < len(tokens) and tokens[end] not in (",", ")", "and") \
+                        and tokens[end] not in CLAUSE_KEYWORDS and tokens[end] not in JOIN_KEYWORDS:
+                    end += 1
+                _, value = self.parse_col_unit(0, default_tables, tokens[start:end])
+                idx = end
+
+        if is_block:
+            _expect(tokens[idx] == ")", "')' expected")
+            idx += 1
+        return idx, value
+
+    def parse_condition(self, start: int, default_tables: Optional[List[str]]) -> Tuple[int, list]:
+        tokens = self.tokens
+        idx = start
+        conds: list = []
+        while idx < len(tokens):
+            idx, val_unit = self.parse_val_unit(idx, default_tables)
+            not_op = False
+            if tokens[idx] == "not":
+                not_op = True
+                idx += 1
+
+            _expect(idx < len(tokens) and tokens[idx] in WHERE_OPS, f"Error condition at token {idx}")
+            op_id = WHERE_OPS.index(tokens[idx])
+            idx += 1
+            val2 = None
+            if op_id == WHERE_OPS.index("between"):
+                idx, val1 = self.parse_value(idx, default_tables)
+                _expect(tokens[idx] == "and", "'and' expected after between")
+                idx += 1
+                idx, val2 = self.parse_value(idx, default_tables)
+            else:
+                idx, val1 = self.parse_value(idx, default_tables)
+            conds.append((not_op, op_id, val_unit, val1, val2))
+
+            if idx < len(tokens) and (tokens[idx] in CLAUSE_KEYWORDS or tokens[idx] in (")", ";")
+                                      or tokens[idx] in JOIN_KEYWORDS):
+                break
+            if idx < len(tokens) and tokens[idx] in COND_OPS:
+                conds.append(tokens[idx])
+                idx += 1
+        return idx, conds
+
+    def parse_select(self, start: int, default_tables: List[str]) -> Tuple[int, tuple]:
+        tokens = self.tokens
+        _expect(tokens[start] == "select", "'select' not found")
+        idx = start + 1
+        is_distinct = False
+        if idx < len(tokens) and tokens[idx] == "distinct":
+            idx += 1
+            is_distinct = True
+
+        val_units = []
+        while idx < len(tokens) and tokens[idx] not in CLAUSE_KEYWORDS:
+            agg_id = AGG_OPS.index("none")
+            if tokens[idx] in AGG_OPS:
+                agg_id = AGG_OPS.index(tokens[idx])
+                idx += 1
+            idx, val_unit = self.parse_val_unit(idx, default_tables)
+            val_units.append((agg_id, val_unit))
+            if idx < len(tokens) and tokens[idx] == ",":
+                idx += 1
+        return idx, (is_distinct, val_units)
+
+    def parse_from(self, start: int) -> Tuple[int, list, list, List[str]]:
+        tokens = self.tokens
+        _expect("from" in tokens[start:], "'from' not found")
+        idx = tokens.index("from", start) + 1
+        default_tables: List[str] = []
+        table_units = []
+        conds: list = []
+        while idx < len(tokens):
+            is_block = False
+            if tokens[idx] == "(":
+                is_block = True
+                idx += 1
+
+            if tokens[idx] == "select":
+                idx, sql = self.parse_sql(idx)
+                table_units.append(("sql", sql))
+            else:
+                if tokens[idx] == "join":
+                    idx += 1
+                idx, table_id, name = self.parse_table_unit(idx)
+                table_units.append(("table_unit", table_id))
+                default_tables.append(name)
+
+            if idx < len(tokens) and tokens[idx] == "on":
+                idx, this_conds = self.parse_condition(idx + 1, default_tables)
+                if conds:
+                    conds.append("and")
+                conds.extend(this_conds)
+
+            if is_block:
+                _expect(tokens[idx] == ")", "')' expected")
+                idx += 1
+            if idx < len(tokens) and (tokens[idx] in CLAUSE_KEYWORDS or tokens[idx] in (")", ";")):
+                break
+        return idx, table_units, conds, default_tables
+
+    def parse_conditions_after(self, keyword: str, start: int, default_tables: List[str]) -> Tuple[int, list]:
+        if start >= len(self.tokens) or self.tokens[start] != keyword:
+            return start, []
+        return self.parse_condition(start + 1, default_tables)
+
+    def parse_group_by(self, start: int, default_tables: List[str]) -> Tuple[int, list]:
+        tokens = self.tokens
+        col_units = []
+        if start >= len(tokens) or tokens[start] != "group":
+            return start, col_units
+        _expect(tokens[start + 1] == "by", "'by' expected after group")
+        idx = start + 2
+        while idx < len(tokens) and not (tokens[idx] in CLAUSE_KEYWORDS or tokens[idx] in (")", ";")):
+            idx, col_unit = self.parse_col_unit(idx, default_tables)
+            col_units.append(col_unit)
+            if idx < len(tokens) and tokens[idx] == ",":
+                idx += 1
+            else:
+                break
+        return idx, col_units
+
+    def parse_order_by(self, start: int, default_tables: List[str]) -> Tuple[int, Union[list, tuple]]:
+        tokens = self.tokens
+        val_units = []
+        order_type = "asc"
+        if start >= len(tokens) or tokens[start] != "order":
+            return start, val_units
+        _expect(tokens[start + 1] == "by", "'by' expected after order")
+        idx = start + 2
+        while idx < len(tokens) and not (tokens[idx] in CLAUSE_KEYWORDS or tokens[idx] in (")", ";")):
+            idx, val_unit = self.parse_val_unit(idx, default_tables)
+            val_units.append(val_unit)
+            if idx < len(tokens) and tokens[idx] in ORDER_OPS:
+                order_type = tokens[idx]
+                idx += 1
+            if idx < len(tokens) and tokens[idx] == ",":
+                idx += 1
+            else:
+                break
+        return idx, (order_type, val_units)
+
+    def parse_limit(self, start: int) -> Tuple[int, Optional[int]]:
+        tokens = self.tokens
+        if start < len(tokens) and tokens[start] == "limit":
+            value = tokens[start + 1] if start + 1 < len(tokens) else ""
+            return start + 2, int(value) if value.isdigit() else 1
+        return start, None
+
+    def skip_semicolon(self, start: int) -> int:
+        idx = start
+        while idx < len(self.tokens) and self.tokens[idx] == ";":
+            idx += 1
+        return idx
+
+    def parse_sql(self, start: int) -> Tuple[int, dict]:
+        tokens = self.tokens
+        idx = start
+        is_block = False
+        if tokens[idx] == "(":
+            is_block = True
+            idx += 1
+
+        # SELECT 절의 컬럼을 찾으려면 FROM 절의 테이블이 먼저 필요함
+        from_end, table_units, conds, default_tables = self.parse_from(start)
+        sql: Dict[str, Any] = {"from": {"table_units": table_units, "conds": conds}}
+        _, sql["select"] = self.parse_select(idx, default_tables)
+        idx, sql["where"] = self.parse_conditions_after("where", from_end, default_tables)
+        idx, sql["groupBy"] = self.parse_group_by(idx, default_tables)
+        idx, sql["having"] = self.parse_conditions_after("having", idx, default_tables)
+        idx, sql["orderBy"] = self.parse_order_by(idx, default_tables)
+        idx, sql["limit"] = self.parse_limit(idx)
+
+        idx = self.skip_semicolon(idx)
+        if is_block:
+            _expect(tokens[idx] == ")", "')' expected")
+            idx += 1
+        idx = self.skip_semicolon(idx)
+
+        for op in SQL_OPS:
+            sql[op] = None
+        if idx < len(tokens) and tokens[idx] in SQL_OPS:
+            op = tokens[idx]
+            idx, sql[op] = self.parse_sql(idx + 1)
+        return idx, sql
+
+
+def _expect(condition: bool, message: str) -> None:
+    if not condition:
+        raise SqlParseError(message)
+
+
+def _strip_values(sql: dict) -> dict:
+    """WHERE, HAVING, JOIN 조건의 값을 지웁니다. 값 자리의 하위 쿼리는 남기고 그 안의 값도 지웁니다."""
+    if sql is None:
+        return None
+    stripped = dict(sql)
+    stripped["from"] = {"table_units": sql["from"]["table_units"], "conds": _strip_condition(sql["from"]["conds"])}
+    stripped["where"] = _strip_condition(sql["where"])
+    stripped["having"] = _strip_condition(sql["having"])
+    for op in SQL_OPS:
+        stripped[op] = _strip_values(sql[op])
+    return stripped
+
+
+def _strip_condition(condition: Sequence) -> list:
+    stripped = []
+    for position, unit in enumerate(condition):
+        if position % 2 == 0:
+            not_op, op_id, val_unit, val1, val2 = unit
+            unit = (not_op, op_id, val_unit,
+                    _strip_values(val1) if isinstance(val1, dict) else None,
+                    _strip_values(val2) if isinstance(val2, dict) else None)
+        stripped.append(unit)
+    return stripped
+
+
+def _rebuild_columns(sql: dict, valid: FrozenSet[int], foreign_key_map: Dict[int, int]) -> dict:
+    """
+    FROM 절 테이블의 컬럼을 외래 키로 연결된 대표 컬럼으로 바꾸고 DISTINCT 표시를 지웁니다.
+    evaluation.py와 같이 값 자리와 FROM 절의 하위 쿼리는 바꾸지 않습니다.
+    """
+    if sql is None:
+        return None
+
+    def col_unit(unit):
+        if unit is None:
+            return None
+        agg_id, col_id, _ = unit
+        if col_id in valid:
+            col_id = foreign_key_map.get(col_id, col_id)
+        return agg_id, col_id, None
+
+    def val_unit(unit):
+        if unit is None:
+            return None
+        return unit[0], col_unit(unit[1]), col_unit(unit[2])
+
+    def condition(units):
+        return [(unit[0], unit[1], val_unit(unit[2]), unit[3], unit[4]) if position % 2 == 0 else unit
+                for position, unit in enumerate(units)]
+
+    rebuilt = dict(sql)
+    rebuilt["select"] = (None, [(agg_id, val_unit(unit)) for agg_id, unit in sql["select"][1]])
+    rebuilt["from"] = {"table_units": sql["from"]["table_units"], "conds": condition(sql["from"]["conds"])}
+    rebuilt["where"] = condition(sql["where"])
+    rebuilt["groupBy"] = [col_unit(unit) for unit in sql["groupBy"]]
+    if sql["orderBy"]:
+        rebuilt["orderBy"] = (sql["orderBy"][0], [val_unit(unit) for unit in sql["orderBy"][1]])
+    rebuilt["having"] = condition(sql["having"])
+    for op in SQL_OPS:
+        rebuilt[op] = _rebuild_columns(sql[op], valid, foreign_key_map)
+    return rebuilt
+
+
+def _form(sql: dict, index: _SchemaIndex) -> Hashable:
+    where = sql["where"]
+    group_by = sql["groupBy"]
+    group_columns = tuple(unit[1] for unit in group_by)
+    return (
+        # select, select(no AGG)
+        _multiset(_freeze(unit) for unit in sql["select"][1]),
+        # where, where(no OP)
+        _multiset(_freeze(unit) for unit in where[::2]),
+        # and/or
+        frozenset(where[1::2]),
+        # group(no Having): 테이블을 떼어낸 컬럼 이름으로 비교
+        _multiset(index.column_names[column] for column in group_columns),
+        # group: GROUP BY가 있을 때만 컬럼 순서와 HAVING을 비교
+        (group_columns, _freeze(sql["having"])) if group_by else None,
+        # order: ORDER BY가 있을 때만 LIMIT 유무를 함께 비교
+        (_freeze(sql["orderBy"]), sql["limit"] is not None) if sql["orderBy"] else None,
+        # IUEN
+        tuple(_form(sql[op], index) if sql[op] is not None else None for op in SQL_OPS),
+        _keywords(sql),
+        # FROM 절의 테이블
+        _multiset(_freeze(unit) for unit in sql["from"]["table_units"]),
+    )
+
+
+def _keywords(sql: dict) -> FrozenSet[str]:
+    keywords = set()
+    if sql["where"]:
+        keywords.add("where")
+    if sql["groupBy"]:
+        keywords.add("group")
+    if sql["having"]:
+        keywords.add("having")
+    if sql["orderBy"]:
+        keywords.update(("order", sql["orderBy"][0]))
+    if sql["limit"] is not None:
+        keywords.add("limit")
+    keywords.update(op for op in SQL_OPS if sql[op] is not None)
+
+    conditions = (sql["from"]["conds"], sql["where"], sql["having"])
+    if any("or" in condition[1::2] for condition in conditions):
+        keywords.add("or")
+    cond_units = [unit for condition in conditions for unit in condition[::2]]
+    if any(unit[0] for unit in cond_units):
+        keywords.add("not")
+    if any(unit[1] == WHERE_OPS.index("in") for unit in cond_units):
+        keywords.add("in")
+    if any(unit[1] == WHERE_OPS.index("like") for unit in cond_units):
+        keywords.add("like")
+    return frozenset(keywords)
+
+
+def _multiset(items: Iterable[Hashable]) -> FrozenSet[Tuple[Hashable, int]]:
+    return frozenset(Counter(items).items())
+
+
+def _freeze(value: Any) -> Hashable:
+    """JSON(list)과 파서(tuple)가 만든 트리를 같은 hashable 형태로 바꿉니다."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
@@ -0,0 +1,187 @@
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from .examples import Example, JsonExampleSource
+
+
+# 저장 형식이 바뀌면 올려서 기존 캐시를 다시 만들도록 합니다.
+FORMAT_VERSION = 1
+
+_TOKEN_SEPARATOR = "\x1f"
+_PAGE_SIZE = 1024
+_MMAP_SIZE = 256 * 1024 * 1024
+_COLUMNS = "idx, db_id, question, query, question_toks, query_toks, evidence"
+
+
+def source_fingerprint(paths: Sequence[Path]) -> str:
+    """원본 JSON 파일들의 (이름, 크기, mtime)으로 만든 fingerprint. stat만 하므로 파일 크기와 무관하게 빠릅니다."""
+    stats = []
+    for path in paths:
+        stat = Path(path).stat()
+        stats.append([Path(path).name, stat.st_size, stat.st_mtime_ns])
+    return json.dumps([FORMAT_VERSION, stats])
+
+
+class ExampleCache:
+    """
+    JSON split을 한 번 파싱해 만든 SQLite 캐시입니다.
+
+    원본 파일의 크기나 mtime이 바뀌면 open()이 캐시를 다시 만듭니다. index(rowid)와 db_id로 O(1) 조회가 가능하고,
+    순회는 페이지 단위로 읽으므로 메모리 사용량이 일정합니다. 읽기 전용 연결에 mmap을 사용합니다.
+
+    Args:
+        cache_path (Path): 캐시 SQLite 파일 경로
+    """
+
+    def __init__(self, cache_path: Path):
+        self.cache_path = Path(cache_path)
+        self._connection = sqlite3.connect(f"{self.cache_path.resolve().as_uri()}?mode=ro", uri=True,
+                                           check_same_thread=False)
+        self._connection.execute(f"PRAGMA mmap_size={_MMAP_SIZE}")
+        self._lock = threading.Lock()
+        self._length = self._query_one("SELECT COUNT(*) FROM examples")[0]
+        self.fingerprint = self._query_one("SELECT value FROM meta WHERE key = 'fingerprint'")[0]
+
+    @classmethod
+    def open(cls, cache_path: Path, source_paths: Sequence[Path]) -> "ExampleCache":
+        """
+        캐시를 엽니다. 캐시가 없거나 원본 파일과 fingerprint가 다르면 먼저 다시 만듭니다.
+        """
+        fingerprint = source_fingerprint(source_paths)
+        if read_fingerprint(cache_path) != fingerprint:
+            build(cache_path, source_paths, fingerprint)
+        return cls(cache_path)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: int) -> Example:
+        if index < 0:
+            index += self._length
+        row = self._query_one(f"SELECT {_COLUMNS} FROM examples WHERE idx = ?", (index,))
+        if row is None:
+            raise IndexError(f"example index out of range: {index}")
+        return _to_example(row)
+
+    def by_db_id(self, db_id: str) -> List[Example]:
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT {_COLUMNS} FROM examples WHERE db_id = ? ORDER BY idx", (db_id,)).fetchall()
+        return [_to_example(row) for row in rows]
+
+    def db_ids(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._connection.execute("SELECT DISTINCT db_id FROM examples ORDER BY db_id")]
+
+    def iter_examples(self, db_id: Optional[str] = None, max_count: Optional[int] = None) -> Iterator[Example]:
+        where = "idx > ?" if db_id is None else "db_id = ? AND idx > ?"
+        last_index = -1
+        remaining = max_count
+        while remaining is None or remaining > 0:
+            page_size = _PAGE_SIZE if remaining is None else min(_PAGE_SIZE, remaining)
+            params = (last_index, page_size) if db_id is None else (db_id, last_index, page_size)
+            with self._lock:
+                rows = self._connection.execute(
+                    f"SELECT {_COLUMNS} FROM examples WHERE {where} ORDER BY idx LIMIT ?", params).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield _to_example(row)
+            last_index = rows[-1][0]
+            if remaining is not None:
+                remaining -= len(rows)
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def _query_one(self, sql: str, params: tuple = ()):
+        with self._lock:
+            return self._connection.execute(sql, params).fetchone()
+
+
+def read_fingerprint(cache_path: Path) -> Optional[str]:
+    if not Path(cache_path).exists():
+        return None
+    try:
+        connection = sqlite3.connect(f"{Path(cache_path).resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            row = connection.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+        finally:
+            connection.close()
+    except sqlite3.DatabaseError:
+        return None
+    return row[0] if row else None
+
+
+def build(cache_path: Path, source_paths: Sequence[Path], fingerprint: Optional[str] = None) -> None:
+    """
+    원본 JSON 파일들을 스트리밍으로 파싱해 캐시를 만듭니다. 임시 파일에 만든 뒤 rename 하므로
+    동시에 읽고 있는 프로세스는 이전 캐시를 계속 볼 수 있습니다.
+    """
+    cache_path = Path(cache_path)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    fingerprint = fingerprint or source_fingerprint(source_paths)
+
+    fd, temp_name = tempfile.mkstemp(prefix=cache_path.name, suffix=".tmp", dir=cache_path.parent)
+    os.close(fd)
+    try:
+        connection = sqlite3.connect(temp_name)
+        try:
+            connection.executescript("""
+                PRAGMA journal_mode = OFF;
+                PRAGMA synchronous = OFF;
+                CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+                CREATE TABLE examples (
+                    idx INTEGER PRIMARY KEY,
+                    db_id TEXT NOT NULL,
+                    question TEXT NOT NULL,
+                    query TEXT NOT NULL,
+                    question_toks TEXT,
+                    query_toks TEXT,
+                    evidence TEXT
+                );
+            """)
+            connection.executemany(
+                "INSERT INTO examples VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (_to_row(example) for example in JsonExampleSource(source_paths).iter_examples()),
+            )
+            connection.execute("CREATE INDEX examples_db_id ON examples (db_id, idx)")
+            connection.execute("INSERT INTO meta VALUES ('fingerprint', ?)", (fingerprint,))
+            connection.commit()
+        finally:
+            connection.close()
+        os.replace(temp_name, cache_path)
+    except BaseException:
+        if os.path.exists(temp_name):
+            os.unlink(temp_name)
+        raise
+
+
+def _to_row(example: Example) -> tuple:
+    return (
+        example.index,
+        example.db_id,
+        example.question,
+        example.query,
+        _join_tokens(example.question_toks),
+        _join_tokens(example.query_toks),
+        example.evidence,
+    )
+
+
+def _to_example(row: tuple) -> Example:
+    return Example(row[0], row[1], row[2], row[3], _split_tokens(row[4]), _split_tokens(row[5]), row[6])
+
+
+def _join_tokens(tokens: Optional[List[str]]) -> Optional[str]:
+    return None if tokens is None else _TOKEN_SEPARATOR.join(tokens)
+
+
+def _split_tokens(value: Optional[str]) -> Optional[List[str]]:
+    if value is None:
+        return None
+    return value.split(_TOKEN_SEPARATOR) if value else []
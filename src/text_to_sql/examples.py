@@ -0,0 +1,179 @@
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence
+import json
+from .utils import atomic_write
+
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+# 배열 원소 뒤에 올 수 있는 문자
+_DELIMITERS = _WHITESPACE + ",]"
+
+
+class Example:
+    """
+    데이터셋의 질문-SQL 예제 하나입니다. 메모리를 줄이기 위해 __slots__를 사용합니다.
+
+    Spider 계열은 `query`, BIRD는 `SQL` 키에 정답 SQL이 있으며, 둘 다 query로 통일합니다.
+    토큰이 없는 데이터셋(BIRD)에서는 question_toks, query_toks가 None입니다.
+    """
+
+    __slots__ = ("index", "db_id", "question", "query", "question_toks", "query_toks", "evidence")
+
+    def __init__(self, index: int, db_id: str, question: str, query: str,
+                 question_toks: Optional[List[str]] = None, query_toks: Optional[List[str]] = None,
+                 evidence: Optional[str] = None):
+        self.index = index
+        self.db_id = db_id
+        self.question = question
+        self.query = query
+        self.question_toks = question_toks
+        self.query_toks = query_toks
+        self.evidence = evidence
+
+    @classmethod
+    def from_record(cls, index: int, record: dict) -> "Example":
+        return cls(
+            index,
+            record["db_id"],
+            record["question"],
+            record["query"] if "query" in record else record["SQL"],
+            record.get("question_toks"),
+            record.get("query_toks"),
+            record.get("evidence"),
+        )
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Example):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"Example(index={self.index}, db_id={self.db_id!r}, question={self.question!r})"
+
+
+def iter_json_array(path: Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    최상위가 배열인 JSON 파일에서 원소를 하나씩 읽습니다.
+
+    파일 전체를 읽지 않고 chunk 단위로 읽어 원소 하나를 decode 할 수 있을 때마다 yield 하므로,
+    메모리 사용량은 chunk 크기와 가장 큰 원소 하나 정도로 제한됩니다.
+
+    Raises:
+        ValueError: 최상위가 배열이 아니거나 JSON 형식이 잘못된 경우
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = f.read(chunk_size)
+        eof = not buffer
+        pos = _skip(buffer, 0, _WHITESPACE)
+        if pos >= len(buffer) or buffer[pos] != "[":
+            raise ValueError(f"{path} does not contain a JSON array")
+        pos += 1
+
+        while True:
+            pos = _skip(buffer, pos, _WHITESPACE + ",")
+            if pos < len(buffer) and buffer[pos] == "]":
+                return
+            try:
+                if pos >= len(buffer):
+                    raise json.JSONDecodeError("need more data", buffer, pos)
+                value, end = decoder.raw_decode(buffer, pos)
+                if not eof and (end >= len(buffer) or buffer[end] not in _DELIMITERS):
+                    # 숫자는 chunk 경계에서 앞부분만 decode 될 수 있으므로(`12|3`, `1.5|e3`) 구분자가 뒤따를 때만 끝난 것으로 봄
+                    raise json.JSONDecodeError("need more data", buffer, end)
+            except json.JSONDecodeError:
+                if eof:
+                    raise ValueError(f"{path} is truncated or malformed near offset {pos}")
+                # 원소가 chunk 경계에 걸친 경우: 소비한 부분을 버리고 더 읽음
+                more = f.read(max(chunk_size, len(buffer) - pos))
+                eof = not more
+                buffer = buffer[pos:] + more
+                pos = 0
+                continue
+            yield value
+            pos = end
+
+
+def write_json_array(path: Path, records: Iterable[Any], indent: int = 4) -> int:
+    """
+    records를 하나씩 JSON 배열로 기록합니다. `json.dump(records, indent=indent, ensure_ascii=False)`와 같은 형식이지만
+    전체 목록을 메모리에 올리지 않습니다. 임시 파일에 기록한 뒤 rename 하므로 중단되어도 기존 파일이 손상되지 않습니다.
+
+    Returns:
+        int: 기록한 원소 수
+    """
+    padding = " " * indent
+    count = 0
+    with atomic_write(path) as f:
+        f.write("[")
+        for record in records:
+            text = json.dumps(record, indent=indent, ensure_ascii=False)
+            f.write(",\n" if count else "\n")
+            f.write(padding + text.replace("\n", "\n" + padding))
+            count += 1
+        f.write("\n]" if count else "]")
+    return count
+
+
+def _skip(buffer: str, pos: int, characters: str) -> int:
+    while pos < len(buffer) and buffer[pos] in characters:
+        pos += 1
+    return pos
+
+
+class ExampleStream:
+    """
+    Example을 지연 평가로 읽어오는 iterable입니다. filter()와 limit()은 새 스트림을 반환하며,
+    실제 읽기는 순회할 때 source에서 일어납니다.
+
+    Args:
+        source: `iter_examples(db_id, max_count)`를 제공하는 객체 (JsonExampleSource, ExampleCache)
+    """
+
+    def __init__(self, source, db_id: Optional[str] = None, max_count: Optional[int] = None):
+        self.source = source
+        self._db_id = db_id
+        self._max_count = max_count
+
+    def filter(self, db_id: Optional[str] = None) -> "ExampleStream":
+        return ExampleStream(self.source, db_id if db_id is not None else self._db_id, self._max_count)
+
+    def limit(self, count: int) -> "ExampleStream":
+        if count < 0:
+            raise ValueError(f"limit must not be negative, got {count}")
+        max_count = count if self._max_count is None else min(count, self._max_count)
+        return ExampleStream(self.source, self._db_id, max_count)
+
+    def __iter__(self) -> Iterator[Example]:
+        if self._max_count == 0:
+            return iter(())
+        return self.source.iter_examples(self._db_id, self._max_count)
+
+
+class JsonExampleSource:
+    """
+    JSON 파일들을 iter_json_array로 직접 읽는 예제 source입니다.
+
+    Args:
+        paths (Sequence[Path]): 순서대로 읽을 JSON 파일들. index는 파일을 넘어 이어집니다.
+    """
+
+    def __init__(self, paths: Sequence[Path]):
+        self.paths = list(paths)
+
+    def iter_examples(self, db_id: Optional[str] = None, max_count: Optional[int] = None) -> Iterator[Example]:
+        yielded = 0
+        for index, record in enumerate(_chain(self.paths, iter_json_array)):
+            if db_id is not None and record["db_id"] != db_id:
+                continue
+            yield Example.from_record(index, record)
+            yielded += 1
+            if max_count is not None and yielded >= max_count:
+                return
+
+
+def _chain(paths: Iterable[Path], reader: Callable[[Path], Iterator[Any]]) -> Iterator[Any]:
+    for path in paths:
+        yield from reader(path)
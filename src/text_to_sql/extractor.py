@@ -0,0 +1,646 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+import hashlib
+import json
+import os
+import queue
+import shutil
+import struct
+import tempfile
+import threading
+import zipfile
+import zlib
+from .downloader import DownloadError, DownloadManifest
+from .utils import atomic_write
+
+
+FAST = "fast"
+DEEP = "deep"
+VERIFY_MODES = (FAST, DEEP)
+
+# 압축 해제에 사용할 최대 스레드 수
+DEFAULT_EXTRACT_JOBS = 4
+# 스트리밍 압축 해제에서 다운로드와 압축 해제 사이에 쌓아둘 수 있는 chunk 수
+DEFAULT_QUEUE_SIZE = 16
+
+_CRC_CHUNK_SIZE = 1024 * 1024
+# 이보다 큰 멤버(BIRD의 sqlite 파일 등)는 큰 버퍼로 직접 복사
+_LARGE_MEMBER_SIZE = 8 * 1024 * 1024
+_COPY_BUFFER_SIZE = 4 * 1024 * 1024
+
+_LOCAL_HEADER = struct.Struct("<4s5H3I2H")
+_LOCAL_SIGNATURE = b"PK\x03\x04"
+_DESCRIPTOR_SIGNATURE = b"PK\x07\x08"
+# central directory, end of central directory, zip64 end of central directory
+_END_SIGNATURES = (b"PK\x01\x02", b"PK\x05\x06", b"PK\x06\x06")
+_ZIP64_EXTRA_ID = 0x0001
+
+
+class StreamingUnsupported(Exception):
+    """zip 파일이 스트림으로 압축 해제할 수 없는 형식(암호화, 지원하지 않는 압축 방식 등)일 때 발생하는 예외"""
+
+
+class ManifestEntry(NamedTuple):
+    """압축 해제된 파일 하나의 기록. name은 zip 내부 경로(`/` 구분)입니다."""
+    name: str
+    size: int
+    crc: int
+    mtime_ns: int
+
+
+class ExtractionManifest:
+    """
+    압축 해제가 끝까지 완료된 데이터셋의 파일 목록입니다.
+
+    manifest 파일은 모든 파일이 제자리로 옮겨진 다음에 마지막으로 기록되므로,
+    manifest가 존재한다는 것 자체가 압축 해제가 완료되었다는 표시입니다.
+    lazy_prefix가 있다면 그 아래의 데이터베이스 폴더들은 zip에 남겨두고 필요할 때 압축 해제한 것입니다.
+    """
+
+    def __init__(self, root: Path, entries: List[ManifestEntry], lazy_prefix: Optional[str] = None):
+        self.root = Path(root)
+        self.entries = entries
+        self.lazy_prefix = lazy_prefix
+        self._entries_by_name: Optional[Dict[str, ManifestEntry]] = None
+
+    @classmethod
+    def from_zip_infos(cls, root: Path, infos: Iterable[zipfile.ZipInfo],
+                       lazy_prefix: Optional[str] = None) -> "ExtractionManifest":
+        entries = []
+        for info in infos:
+            stat = Path(root, info.filename).stat()
+            entries.append(ManifestEntry(info.filename, info.file_size, info.CRC, stat.st_mtime_ns))
+        return cls(root, entries, lazy_prefix)
+
+    @classmethod
+    def load(cls, manifest_path: Path, root: Path) -> Optional["ExtractionManifest"]:
+        """manifest 파일을 읽습니다. 파일이 없거나 손상된 경우 None을 반환합니다."""
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return cls(root, [ManifestEntry(*entry) for entry in data["members"]], data.get("lazy_prefix"))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, manifest_path: Path) -> None:
+        """임시 파일에 쓴 뒤 rename 하여, 중간에 중단되더라도 반쯤 쓰인 manifest가 남지 않도록 합니다."""
+        with atomic_write(manifest_path) as f:
+            json.dump({"members": [list(entry) for entry in self.entries], "lazy_prefix": self.lazy_prefix}, f)
+
+    def entry(self, path: Path) -> Optional[ManifestEntry]:
+        """root 아래 파일 경로의 기록. manifest에 없는 파일이면 None"""
+        try:
+            name = Path(path).relative_to(self.root).as_posix()
+        except ValueError:
+            return None
+        if self._entries_by_name is None:
+            self._entries_by_name = {entry.name: entry for entry in self.entries}
+        return self._entries_by_name.get(name)
+
+    def verify(self, mode: str = FAST, max_workers: Optional[int] = None) -> bool:
+        """
+        압축 해제된 파일들이 manifest와 일치하는지 확인합니다.
+
+        Args:
+            mode (str): "fast"는 파일마다 stat 한 번으로 크기와 mtime만 비교하고,
+                "deep"은 모든 파일의 CRC32를 여러 스레드에서 병렬로 다시 계산합니다.
+            max_workers (Optional[int]): deep 모드에서 사용할 스레드 수
+
+        Returns:
+            bool: 모든 파일이 일치하면 True
+        """
+        if mode not in VERIFY_MODES:
+            raise ValueError(f"Unknown verify mode: {mode!r} (expected one of {VERIFY_MODES})")
+
+        if mode == FAST:
+            return all(self._matches_stat(entry) for entry in self.entries)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return all(executor.map(self._matches_crc, self.entries))
+
+    def _matches_stat(self, entry: ManifestEntry) -> bool:
+        try:
+            stat = Path(self.root, entry.name).stat()
+        except OSError:
+            return False
+        return stat.st_size == entry.size and stat.st_mtime_ns == entry.mtime_ns
+
+    def _matches_crc(self, entry: ManifestEntry) -> bool:
+        path = Path(self.root, entry.name)
+        try:
+            if path.stat().st_size != entry.size:
+                return False
+            return file_crc32(path) == entry.crc
+        except OSError:
+            return False
+
+
+def file_crc32(path: Path) -> int:
+    """파일 내용의 CRC-32. zip 파일에 기록된 멤버의 CRC와 같은 값입니다."""
+    crc = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CRC_CHUNK_SIZE), b""):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def extract_archive(zip_path: Path, dest_dir: Path, manifest_path: Path,
+                    lazy_prefix: Optional[str] = None, jobs: Optional[int] = None) -> ExtractionManifest:
+    """
+    zip 파일을 dest_dir 아래의 staging 디렉토리에 압축 해제한 뒤, 최상위 항목들을 rename으로 제자리에 옮기고
+    마지막으로 manifest를 기록합니다.
+
+    중간에 프로세스가 죽더라도 manifest가 없으므로 불완전한 트리가 완료된 것으로 취급되지 않습니다.
+
+    Args:
+        zip_path (Path): 압축 해제할 zip 파일
+        dest_dir (Path): 압축 해제 결과를 둘 디렉토리
+        manifest_path (Path): 완료 후 manifest를 기록할 경로
+        lazy_prefix (Optional[str]): 지정하면 `<lazy_prefix><db_id>/` 아래의 파일은 압축 해제하지 않음.
+            이후 LazyArchive로 필요한 데이터베이스만 압축 해제합니다.
+        jobs (Optional[int]): 멤버들을 나눠 압축 해제할 스레드 수. 기본값은 DEFAULT_EXTRACT_JOBS와 CPU 수 중 작은 값
+
+    Returns:
+        ExtractionManifest: 기록된 manifest
+    """
+    dest_dir = Path(dest_dir)
+    dest_dir.mkdir(parents=True, exist_ok=True)
+
+    # 기존 manifest가 남아 있으면 교체 도중의 트리가 유효한 것으로 보일 수 있으므로 먼저 삭제
+    if manifest_path.exists():
+        manifest_path.unlink()
+
+    staging_dir = Path(tempfile.mkdtemp(prefix=".staging-", dir=dest_dir))
+    try:
+        with zipfile.ZipFile(zip_path, "r") as zip_ref:
+            members = [info for info in zip_ref.infolist() if _database_of(info.filename, lazy_prefix) is None]
+        file_infos = [info for info in members if not info.is_dir()]
+
+        # 여러 스레드가 같은 부모 디렉토리를 동시에 만들지 않도록 디렉토리는 모두 여기서 먼저 만듦
+        _create_directories(staging_dir, members)
+
+        # 파일들을 압축된 크기 기준으로 고르게 나눠 스레드마다 별도의 zip 핸들로 압축 해제 (zlib은 GIL을 놓음)
+        groups = _balanced_groups(file_infos, min(jobs or DEFAULT_EXTRACT_JOBS, os.cpu_count() or 1))
+        extract = partial(_extract_members, zip_path, staging_dir)
+        if len(groups) <= 1:
+            for group in groups:
+                extract(group)
+        else:
+            with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+                list(executor.map(extract, groups))
+
+        _install_staging(staging_dir, dest_dir)
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+    manifest = ExtractionManifest.from_zip_infos(dest_dir, file_infos, lazy_prefix)
+    manifest.save(manifest_path)
+    return manifest
+
+
+def extract_stream(chunks: Iterable[bytes], dest_dir: Path, manifest_path: Path,
+                   download_manifest: Optional[DownloadManifest] = None, name: str = "archive",
+                   queue_size: int = DEFAULT_QUEUE_SIZE) -> ExtractionManifest:
+    """
+    다운로드 중인 zip 바이트 스트림을 local file header 순서대로 읽으며 바로 압축 해제합니다.
+    zip 파일을 디스크에 저장하지 않으므로 디스크 사용량은 압축 해제된 크기만큼이고, 같은 데이터를 두 번 쓰지 않습니다.
+
+    chunks는 현재 스레드에서 읽고(네트워크 I/O와 해시 계산) 압축 해제와 쓰기는 백그라운드 스레드에서 하므로 두 작업이 겹칩니다.
+    스트림이 끝나면 download_manifest로 전체 크기와 sha256을 검증한 뒤에만 staging 디렉토리를 제자리로 옮기고 manifest를 기록합니다.
+
+    Args:
+        chunks (Iterable[bytes]): zip 파일의 바이트 스트림
+        dest_dir (Path): 압축 해제 결과를 둘 디렉토리
+        manifest_path (Path): 완료 후 manifest를 기록할 경로
+        download_manifest (Optional[DownloadManifest]): zip 파일 전체에 대한 크기/sha256 기대값
+        name (str): 오류 메시지에 사용할 zip 파일 이름
+        queue_size (int): 다운로드와 압축 해제 사이에 쌓아둘 수 있는 chunk 수
+
+    Returns:
+        ExtractionManifest: 기록된 manifest
+
+    Raises:
+        StreamingUnsupported: 스트림으로 압축 해제할 수 없는 zip 파일인 경우. extract_archive()를 사용해야 함
+        DownloadError: 스트림이 손상되었거나 download_manifest와 일치하지 않는 경우
+    """
+    dest_dir = Path(dest_dir)
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    if manifest_path.exists():
+        manifest_path.unlink()
+
+    staging_dir = Path(tempfile.mkdtemp(prefix=".staging-", dir=dest_dir))
+    try:
+        extractor = _StreamExtractor(staging_dir, name)
+        digest = hashlib.sha256() if download_manifest is not None and download_manifest.sha256 else None
+        size = _pipe(chunks, extractor.feed, digest, queue_size)
+        extractor.close()
+        if download_manifest is not None:
+            download_manifest.verify_digest(name, size, digest.hexdigest if digest is not None else None)
+
+        _install_staging(staging_dir, dest_dir)
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+    entries = [ManifestEntry(member, size, crc, Path(dest_dir, member).stat().st_mtime_ns)
+               for member, size, crc in extractor.entries]
+    manifest = ExtractionManifest(dest_dir, entries)
+    manifest.save(manifest_path)
+    return manifest
+
+
+def _pipe(chunks: Iterable[bytes], consume: Callable[[bytes], None], digest, queue_size: int) -> int:
+    """chunks를 읽어 백그라운드 스레드의 consume에 넘깁니다. 읽은 byte 수를 반환합니다."""
+    pending: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=queue_size)
+    failures: List[BaseException] = []
+
+    def worker() -> None:
+        while True:
+            data = pending.get()
+            if data is None:
+                return
+            if failures:
+                # 실패한 뒤에는 다운로드 쪽이 멈출 때까지 남은 chunk를 버림
+                continue
+            try:
+                consume(data)
+            except BaseException as e:
+                failures.append(e)
+
+    thread = threading.Thread(target=worker, name="extract-stream", daemon=True)
+    thread.start()
+    size = 0
+    try:
+        for chunk in chunks:
+            if failures:
+                break
+            size += len(chunk)
+            if digest is not None:
+                digest.update(chunk)
+            pending.put(chunk)
+    finally:
+        pending.put(None)
+        thread.join()
+    if failures:
+        raise failures[0]
+    return size
+
+
+class _StreamMember:
+    """스트림에서 압축 해제 중인 멤버 하나의 상태"""
+
+    def __init__(self, name: str, path: Optional[Path], method: int, crc: int, compressed_size: Optional[int],
+                 file_size: Optional[int], has_descriptor: bool, zip64: bool):
+        self.name = name
+        self.method = method
+        self.crc = crc
+        self.remaining = compressed_size
+        self.file_size = file_size
+        self.has_descriptor = has_descriptor
+        self.zip64 = zip64
+        self.data_done = False
+        self.written = 0
+        self.actual_crc = 0
+        self.decompressor = zlib.decompressobj(-zlib.MAX_WBITS) if method == zipfile.ZIP_DEFLATED else None
+        self.file = open(path, "wb", buffering=_COPY_BUFFER_SIZE) if path is not None else None
+
+    def write(self, data: bytes) -> None:
+        if not data:
+            return
+        self.actual_crc = zlib.crc32(data, self.actual_crc)
+        self.written += len(data)
+        if self.file is not None:
+            self.file.write(data)
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+
+
+class _StreamExtractor:
+    """
+    zip 바이트 스트림을 local file header 순서대로 해석해 멤버들을 staging 디렉토리에 기록합니다.
+    stored와 deflate 멤버, data descriptor, zip64 크기를 지원합니다.
+    """
+
+    def __init__(self, staging_dir: Path, name: str):
+        self.staging_dir = staging_dir
+        self.name = name
+        self.entries: List[Tuple[str, int, int]] = []
+        self._buffer = bytearray()
+        self._member: Optional[_StreamMember] = None
+        self._done = False
+
+    def feed(self, data: bytes) -> None:
+        if self._done:
+            # central directory 이후는 압축 해제할 내용이 없음
+            return
+        self._buffer += data
+        try:
+            while not self._done and self._step():
+                pass
+        except zlib.error as e:
+            raise DownloadError(f"{self.name}: corrupt deflate data in {self._member.name}: {e}") from e
+
+    def close(self) -> None:
+        if self._member is not None:
+            self._member.close()
+        if not self._done:
+            raise DownloadError(f"{self.name}: archive ended before the central directory")
+
+    def _step(self) -> bool:
+        """진행했으면 True, 더 많은 데이터가 필요하면 False"""
+        if self._member is None:
+            return self._read_header()
+        if not self._member.data_done:
+            return self._read_data()
+        return self._read_descriptor()
+
+    def _read_header(self) -> bool:
+        buffer = self._buffer
+        if len(buffer) < 4:
+            return False
+        signature = bytes(buffer[:4])
+        if signature in _END_SIGNATURES:
+            self._done = True
+            self._buffer = bytearray()
+            return False
+        if signature != _LOCAL_SIGNATURE:
+            raise DownloadError(f"{self.name}: unexpected zip signature {signature!r}")
+        if len(buffer) < _LOCAL_HEADER.size:
+            return False
+        (_, _, flags, method, _, _, crc, compressed_size, file_size,
+         name_length, extra_length) = _LOCAL_HEADER.unpack_from(buffer)
+        header_length = _LOCAL_HEADER.size + name_length + extra_length
+        if len(buffer) < header_length:
+            return False
+        raw_name = bytes(buffer[_LOCAL_HEADER.size:_LOCAL_HEADER.size + name_length])
+        extra = bytes(buffer[_LOCAL_HEADER.size + name_length:header_length])
+        del buffer[:header_length]
+
+        member_name = raw_name.decode("utf-8" if flags & 0x800 else "cp437")
+        if flags & 0x1:
+            raise StreamingUnsupported(f"{member_name} is encrypted")
+        if method not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+            raise StreamingUnsupported(f"{member_name} uses compression method {method}")
+        has_descriptor = bool(flags & 0x8)
+        if has_descriptor and method == zipfile.ZIP_STORED:
+            # 압축하지 않은 멤버는 끝을 알 수 없음
+            raise StreamingUnsupported(f"{member_name} is stored with a data descriptor")
+
+        zip64_sizes = _zip64_sizes(extra, file_size, compressed_size)
+        if zip64_sizes is not None:
+            file_size, compressed_size = zip64_sizes
+        is_dir = member_name.endswith("/")
+        path = _member_path(self.staging_dir, member_name)
+        if is_dir:
+            path.mkdir(parents=True, exist_ok=True)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+        self._member = _StreamMember(member_name, None if is_dir else path, method, crc,
+                                     None if has_descriptor else compressed_size,
+                                     None if has_descriptor else file_size, has_descriptor, zip64_sizes is not None)
+        return True
+
+    def _read_data(self) -> bool:
+        member, buffer = self._member, self._buffer
+        if member.remaining == 0 and member.decompressor is None:
+            member.data_done = True
+            return True
+        if not buffer:
+            return False
+        count = len(buffer) if member.remaining is None else min(len(buffer), member.remaining)
+        data = bytes(buffer[:count])
+
+        decompressor = member.decompressor
+        if decompressor is None:
+            member.write(data)
+            consumed = count
+        else:
+            # 압축률이 높은 멤버에서도 메모리를 제한하도록 출력 크기를 나눠서 압축 해제
+            member.write(decompressor.decompress(data, _COPY_BUFFER_SIZE))
+            while decompressor.unconsumed_tail and not decompressor.eof:
+                member.write(decompressor.decompress(decompressor.unconsumed_tail, _COPY_BUFFER_SIZE))
+            consumed = count - len(decompressor.unused_data)
+        del buffer[:consumed]
+        if member.remaining is not None:
+            member.remaining -= consumed
+
+        if decompressor is None:
+            member.data_done = member.remaining == 0
+        elif decompressor.eof:
+            member.write(decompressor.flush())
+            if member.remaining not in (None, 0):
+                raise DownloadError(f"{self.name}: deflate data of {member.name} ends before its compressed size")
+            member.data_done = True
+        elif member.remaining == 0:
+            raise DownloadError(f"{self.name}: deflate data of {member.name} is truncated")
+        return member.data_done
+
+    def _read_descriptor(self) -> bool:
+        member, buffer = self._member, self._buffer
+        if member.has_descriptor:
+            size_format = "<IQQ" if member.zip64 else "<III"
+            length = struct.calcsize(size_format)
+            if len(buffer) < 4:
+                return False
+            offset = 4 if bytes(buffer[:4]) == _DESCRIPTOR_SIGNATURE else 0
+            if len(buffer) < offset + length:
+                return False
+            member.crc, _, member.file_size = struct.unpack_from(size_format, buffer, offset)
+            del buffer[:offset + length]
+        self._finish_member()
+        return True
+
+    def _finish_member(self) -> None:
+        member = self._member
+        member.close()
+        self._member = None
+        if member.written != member.file_size or member.actual_crc != member.crc:
+            raise DownloadError(f"{self.name}: {member.name} is corrupt (size or CRC mismatch)")
+        if member.file is not None:
+            self.entries.append((_member_name(member.name), member.file_size, member.crc))
+
+
+class LazyArchive:
+    """
+    zip 파일을 풀지 않고 보관한 채, 데이터베이스 폴더 단위로 필요할 때만 압축 해제합니다.
+
+    central directory는 생성 시 한 번만 읽어 `db_id -> 멤버 목록` 색인을 만들고,
+    각 데이터베이스는 여러 스레드에서 동시에 요청하더라도 한 번만 압축 해제됩니다.
+
+    Args:
+        zip_path (Path): 보관 중인 데이터셋 zip 파일
+        prefix (str): 데이터베이스 폴더들이 있는 zip 내부 경로 (예: "spider_data/database/")
+        dest_dir (Path): zip 내부 경로가 풀릴 기준 디렉토리
+    """
+
+    def __init__(self, zip_path: Path, prefix: str, dest_dir: Path):
+        self.prefix = prefix
+        self.dest_dir = Path(dest_dir)
+        self._zip = zipfile.ZipFile(zip_path, "r")
+        self._index: Dict[str, List[zipfile.ZipInfo]] = {}
+        for info in self._zip.infolist():
+            db_id = _database_of(info.filename, prefix)
+            if db_id is not None:
+                self._index.setdefault(db_id, []).append(info)
+        self._locks = {db_id: threading.Lock() for db_id in self._index}
+
+    def db_ids(self) -> List[str]:
+        return sorted(self._index)
+
+    def database_size(self, db_id: str) -> int:
+        """
+        압축 해제하지 않고 central directory에서 읽은 db_id 폴더의 sqlite 파일 크기(압축 해제 후 byte 수)
+
+        Raises:
+            KeyError: zip에 없는 db_id인 경우
+        """
+        if db_id not in self._index:
+            raise KeyError(f"Unknown db_id: {db_id}")
+        return sum(info.file_size for info in self._index[db_id] if info.filename.endswith(".sqlite"))
+
+    def extract(self, db_id: str) -> Path:
+        """
+        db_id의 데이터베이스 폴더를 압축 해제하고 그 경로를 반환합니다. 이미 풀려 있으면 바로 반환합니다.
+
+        Raises:
+            KeyError: zip에 없는 db_id인 경우
+        """
+        if db_id not in self._index:
+            raise KeyError(f"Unknown db_id: {db_id}")
+
+        target = Path(self.dest_dir, self.prefix, db_id)
+        if target.exists():
+            return target
+
+        with self._locks[db_id]:
+            if target.exists():
+                return target
+
+            target.parent.mkdir(parents=True, exist_ok=True)
+            staging_dir = Path(tempfile.mkdtemp(prefix=".staging-", dir=self.dest_dir))
+            try:
+                for info in self._index[db_id]:
+                    self._zip.extract(info, staging_dir)
+                try:
+                    os.replace(Path(staging_dir, self.prefix, db_id), target)
+                except OSError:
+                    # 다른 프로세스가 먼저 같은 폴더를 옮겨 놓은 경우
+                    if not target.exists():
+                        raise
+            finally:
+                shutil.rmtree(staging_dir, ignore_errors=True)
+        return target
+
+    def close(self) -> None:
+        self._zip.close()
+
+
+def _create_directories(staging_dir: Path, members: List[zipfile.ZipInfo]) -> None:
+    """디렉토리 멤버와 파일 멤버들의 부모 디렉토리를 만듭니다."""
+    directories = set()
+    for info in members:
+        name = _member_name(info.filename)
+        if not name:
+            continue
+        path = _member_path(staging_dir, name)
+        directories.add(path if info.is_dir() else path.parent)
+    for directory in sorted(directories):
+        os.makedirs(directory, exist_ok=True)
+
+
+def _extract_members(zip_path: Path, staging_dir: Path, members: List[zipfile.ZipInfo]) -> None:
+    """
+    파일 멤버들을 별도의 zip 핸들로 압축 해제합니다. 디렉토리는 _create_directories()로 미리 만들어 두어야 합니다.
+    큰 멤버는 큰 버퍼로 복사합니다.
+    """
+    with zipfile.ZipFile(zip_path, "r") as zip_ref:
+        for info in members:
+            name = _member_name(info.filename)
+            if not name:
+                continue
+            buffer_size = _COPY_BUFFER_SIZE if info.file_size >= _LARGE_MEMBER_SIZE else shutil.COPY_BUFSIZE
+            with zip_ref.open(info) as source, open(_member_path(staging_dir, name), "wb") as f:
+                shutil.copyfileobj(source, f, buffer_size)
+
+
+def _balanced_groups(members: List[zipfile.ZipInfo], count: int) -> List[List[zipfile.ZipInfo]]:
+    """압축된 크기가 큰 멤버부터 가장 가벼운 그룹에 넣어 count개 이하의 그룹으로 나눕니다."""
+    groups: List[List[zipfile.ZipInfo]] = [[] for _ in range(max(1, min(count, len(members))))]
+    loads = [0] * len(groups)
+    for info in sorted(members, key=lambda info: info.compress_size, reverse=True):
+        index = loads.index(min(loads))
+        groups[index].append(info)
+        loads[index] += info.compress_size
+    return [group for group in groups if group]
+
+
+def _install_staging(staging_dir: Path, dest_dir: Path) -> None:
+    """
+    staging 디렉토리의 최상위 항목들을 dest_dir로 옮깁니다. 기존 항목은 먼저 rename으로 옆에 치워 두고 새 항목을 rename으로
+    넣으므로, dest_dir에 지우다 만 디렉토리가 남지 않습니다. 도중에 실패하면 이미 넣은 항목을 빼고 치워 둔 항목을 되돌립니다.
+    dest_dir은 다른 데이터셋과 함께 쓰는 디렉토리라 통째로 바꿀 수 없으므로, 최상위 항목이 여러 개일 때 교체 전체의 완료는
+    그 다음에 기록하는 manifest가 표시합니다.
+    """
+    backup_dir = Path(tempfile.mkdtemp(prefix=".replaced-", dir=dest_dir))
+    installed: List[Tuple[Path, Optional[Path]]] = []
+    try:
+        for entry in sorted(staging_dir.iterdir()):
+            target = Path(dest_dir, entry.name)
+            backup = None
+            if target.exists() or target.is_symlink():
+                backup = Path(backup_dir, entry.name)
+                os.replace(target, backup)
+            installed.append((target, backup))
+            os.replace(entry, target)
+    except BaseException:
+        for target, backup in reversed(installed):
+            _remove(target)
+            if backup is not None:
+                os.replace(backup, target)
+        raise
+    finally:
+        shutil.rmtree(backup_dir, ignore_errors=True)
+
+
+def _member_name(name: str) -> str:
+    """zipfile.extract와 같은 방식으로 절대 경로와 `..`을 제거한 zip 내부 경로"""
+    name = os.path.splitdrive(name)[1]
+    return "/".join(part for part in name.split("/") if part not in ("", ".", ".."))
+
+
+def _member_path(root: Path, name: str) -> Path:
+    return Path(root, *_member_name(name).split("/"))
+
+
+def _zip64_sizes(extra: bytes, file_size: int, compressed_size: int) -> Optional[Tuple[int, int]]:
+    """local header의 zip64 extra field에서 (file_size, compressed_size)를 읽습니다. zip64가 아니면 None"""
+    offset = 0
+    while offset + 4 <= len(extra):
+        header_id, length = struct.unpack_from("<HH", extra, offset)
+        if header_id == _ZIP64_EXTRA_ID:
+            values = list(struct.unpack_from(f"<{length // 8}Q", extra, offset + 4))
+            if file_size == 0xFFFFFFFF and values:
+                file_size = values.pop(0)
+            if compressed_size == 0xFFFFFFFF and values:
+                compressed_size = values.pop(0)
+            return file_size, compressed_size
+        offset += 4 + length
+    return None
+
+
+def _database_of(name: str, prefix: Optional[str]) -> Optional[str]:
+    """zip 멤버가 `<prefix><db_id>/...` 아래에 있다면 db_id를, 아니면 None을 반환합니다."""
+    if not prefix or not name.startswith(prefix):
+        return None
+    db_id, sep, _ = name[len(prefix):].partition("/")
+    return db_id if sep and db_id else None
+
+
+def _remove(path: Path) -> None:
+    if path.is_dir() and not path.is_symlink():
+        shutil.rmtree(path)
+    elif path.exists() or path.is_symlink():
+        path.unlink()
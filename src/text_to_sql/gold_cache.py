@@ -0,0 +1,197 @@
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import base64
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from .extractor import ExtractionManifest, file_crc32
+
+
+DEFAULT_MAX_ENTRIES = 100_000
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+# 저장 형식이 바뀌면 올려서 기존 캐시를 비우도록 합니다.
+FORMAT_VERSION = 2
+
+# 따옴표로 감싼 문자열/식별자는 그대로 두고 나머지 부분만 정규화함
+_QUOTED = re.compile(r"""('(?:[^']|'')*'|"(?:[^"]|"")*"|`[^`]*`|\[[^\]]*\])""")
+_WHITESPACE = re.compile(r"\s+")
+
+# 파일 경로 -> (크기, mtime, CRC). manifest에 없는 파일의 CRC를 프로세스 안에서 한 번만 계산하기 위함
+_file_crcs: Dict[str, Tuple[int, int, int]] = {}
+_file_crcs_lock = threading.Lock()
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    캐시 key를 만들기 위해 SQL을 정규화합니다. 따옴표 밖의 공백을 하나로 줄이고 소문자로 바꾸며 끝의 `;`를 제거합니다.
+    SQLite의 키워드와 식별자는 대소문자를 구분하지 않으므로 결과가 달라지지 않습니다.
+    """
+    parts = _QUOTED.split(sql.strip().rstrip(";").strip())
+    for i in range(0, len(parts), 2):
+        parts[i] = _WHITESPACE.sub(" ", parts[i]).lower()
+    return "".join(parts)
+
+
+def database_fingerprint(sqlite_path: Path, manifest: Optional[ExtractionManifest] = None) -> str:
+    """
+    sqlite 파일 내용의 (크기, CRC-32)로 만든 fingerprint. 같은 내용을 다시 압축 해제해도 바뀌지 않습니다.
+
+    manifest에 파일이 있고 크기와 mtime이 기록과 같으면 압축 해제할 때 기록한 CRC를 사용하고,
+    아니면 파일을 읽어 계산한 뒤 크기와 mtime이 그대로인 동안 프로세스 안에서 재사용합니다.
+    """
+    path = Path(sqlite_path)
+    stat = path.stat()
+    entry = manifest.entry(path) if manifest is not None else None
+    if entry is not None and entry.size == stat.st_size and entry.mtime_ns == stat.st_mtime_ns:
+        crc = entry.crc
+    else:
+        key = str(path.resolve())
+        with _file_crcs_lock:
+            cached = _file_crcs.get(key)
+        if cached is not None and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+            crc = cached[2]
+        else:
+            crc = file_crc32(path)
+            with _file_crcs_lock:
+                _file_crcs[key] = (stat.st_size, stat.st_mtime_ns, crc)
+    return f"{stat.st_size}:{crc:08x}"
+
+
+def result_key(sql: str, fingerprint: str) -> str:
+    return hashlib.sha256(f"{fingerprint}\0{normalize_sql(sql)}".encode("utf-8")).hexdigest()
+
+
+class GoldResultCache:
+    """
+    gold SQL의 실행 결과를 저장하는 SQLite 캐시입니다.
+
+    key는 정규화된 SQL과 sqlite 파일 fingerprint의 해시이므로 데이터베이스가 바뀌면 자연히 다른 key가 됩니다.
+    결과는 행마다 값 배열인 JSON으로 저장하며, BLOB 값은 {"blob": base64}로 기록합니다.
+    항목 수나 전체 크기가 제한을 넘으면 가장 오래 사용하지 않은 항목부터 삭제합니다.
+    여러 프로세스가 같은 파일을 함께 사용할 수 있도록 WAL 모드를 사용합니다.
+
+    Args:
+        cache_path (Path): 캐시 SQLite 파일 경로
+        max_entries (Optional[int]): 최대 항목 수. None이면 제한 없음
+        max_bytes (Optional[int]): 저장된 결과의 최대 전체 크기. None이면 제한 없음
+    """
+
+    def __init__(self, cache_path: Path, max_entries: Optional[int] = DEFAULT_MAX_ENTRIES,
+                 max_bytes: Optional[int] = DEFAULT_MAX_BYTES):
+        self.cache_path = Path(cache_path)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.cache_path, timeout=30, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._connection.executescript("PRAGMA journal_mode = WAL; PRAGMA synchronous = NORMAL;")
+        if self._connection.execute("PRAGMA user_version").fetchone()[0] != FORMAT_VERSION:
+            self._connection.executescript(f"""
+                DROP TABLE IF EXISTS results;
+                PRAGMA user_version = {FORMAT_VERSION};
+            """)
+        self._connection.executescript("""
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                rows TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+        """)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, List[tuple]]:
+        """keys 중 캐시에 있는 항목들의 결과를 반환하고 마지막 사용 시각을 갱신합니다."""
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, List[tuple]] = {}
+        with self._lock:
+            # SQLite의 변수 개수 제한을 넘지 않도록 나눠서 조회
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                placeholders = ", ".join("?" * len(batch))
+                for key, rows in self._connection.execute(
+                        f"SELECT key, rows FROM results WHERE key IN ({placeholders})", batch):
+                    found[key] = _decode_rows(rows)
+            if found:
+                now = time.time()
+                self._connection.executemany("UPDATE results SET last_used = ? WHERE key = ?",
+                                             [(now, key) for key in found])
+                self._connection.commit()
+        return found
+
+    def get(self, key: str) -> Optional[List[tuple]]:
+        return self.get_many([key]).get(key)
+
+    def put_many(self, items: Sequence[Tuple[str, List[tuple]]]) -> None:
+        """결과들을 저장한 뒤 제한을 넘으면 오래된 항목을 삭제합니다."""
+        if not items:
+            return
+        now = time.time()
+        rows = []
+        for key, result in items:
+            encoded = _encode_rows(result)
+            rows.append((key, encoded, len(encoded.encode("utf-8")), now))
+        with self._lock:
+            self._connection.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)", rows)
+            self._evict()
+            self._connection.commit()
+
+    def put(self, key: str, result: List[tuple]) -> None:
+        self.put_many([(key, result)])
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM results")
+            self._connection.commit()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def _evict(self) -> None:
+        count, total = self._connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        excess_entries = count - self.max_entries if self.max_entries is not None else 0
+        excess_bytes = total - self.max_bytes if self.max_bytes is not None else 0
+        if excess_entries <= 0 and excess_bytes <= 0:
+            return
+
+        evicted = []
+        for key, size in self._connection.execute("SELECT key, size FROM results ORDER BY last_used, key"):
+            if excess_entries <= 0 and excess_bytes <= 0:
+                break
+            evicted.append((key,))
+            excess_entries -= 1
+            excess_bytes -= size
+        self._connection.executemany("DELETE FROM results WHERE key = ?", evicted)
+
+
+def _encode_rows(rows: List[tuple]) -> str:
+    return json.dumps([[_encode_value(value) for value in row] for row in rows],
+                      ensure_ascii=False, separators=(",", ":"))
+
+
+def _decode_rows(text: str) -> List[tuple]:
+    return [tuple(_decode_value(value) for value in row) for row in json.loads(text)]
+
+
+def _encode_value(value: Any) -> Any:
+    # SQLite 값 중 JSON으로 표현할 수 없는 것은 BLOB뿐임
+    if isinstance(value, bytes):
+        return {"blob": base64.b64encode(value).decode("ascii")}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return base64.b64decode(value["blob"])
+    return value
@@ -0,0 +1,214 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Mapping, NamedTuple, Optional, Tuple
+import json
+import sqlite3
+from .cache import FileLock
+from .connection import open_readonly, quote_identifier
+from .extractor import ExtractionManifest
+from .gold_cache import database_fingerprint
+from .utils import atomic_write
+
+
+# 저장 형식이 바뀌면 올려서 기존 캐시를 무시하도록 합니다.
+FORMAT_VERSION = 1
+
+
+class ColumnInfo(NamedTuple):
+    """PRAGMA table_info의 컬럼 하나. primary_key는 기본 키 안에서의 순서(1부터)이며 기본 키가 아니면 0입니다."""
+    name: str
+    type: str
+    not_null: bool
+    default: Optional[str]
+    primary_key: int
+
+
+class ForeignKeyInfo(NamedTuple):
+    """PRAGMA foreign_key_list의 외래 키 하나. 복합 키는 columns와 ref_columns가 같은 순서로 여러 개입니다."""
+    columns: Tuple[str, ...]
+    ref_table: str
+    # 참조 컬럼을 생략한 선언(REFERENCES t)은 None으로, 참조 테이블의 기본 키를 뜻함
+    ref_columns: Tuple[Optional[str], ...]
+    on_update: str
+    on_delete: str
+
+
+class IndexInfo(NamedTuple):
+    """PRAGMA index_list의 인덱스 하나. origin은 "c"(CREATE INDEX), "u"(UNIQUE 제약), "pk"(기본 키)입니다."""
+    name: str
+    columns: Tuple[Optional[str], ...]
+    unique: bool
+    origin: str
+    partial: bool
+
+
+class TableInfo(NamedTuple):
+    """
+    테이블 하나의 실제 스키마입니다.
+    estimated_rows는 sqlite_stat1이 있으면 그 값, 없으면 max(rowid)로 추정한 행 수입니다(WITHOUT ROWID 테이블은 COUNT(*)).
+    """
+    name: str
+    columns: List[ColumnInfo]
+    foreign_keys: List[ForeignKeyInfo]
+    indexes: List[IndexInfo]
+    estimated_rows: int
+
+
+class DatabaseInfo(NamedTuple):
+    """sqlite 파일 하나를 읽어 만든 스키마. fingerprint는 읽을 당시 파일의 database_fingerprint()입니다."""
+    db_id: str
+    fingerprint: str
+    tables: List[TableInfo]
+
+    def table(self, name: str) -> Optional[TableInfo]:
+        """이름으로 테이블을 찾습니다. SQLite와 같이 대소문자를 구분하지 않습니다."""
+        name = name.lower()
+        return next((table for table in self.tables if table.name.lower() == name), None)
+
+
+def introspect_database(db_id: str, sqlite_path: Path, manifest: Optional[ExtractionManifest] = None) -> DatabaseInfo:
+    """
+    sqlite 파일에서 테이블, 컬럼 타입, 외래 키, 인덱스, 추정 행 수를 읽습니다.
+
+    Raises:
+        FileNotFoundError: sqlite 파일이 없는 경우
+    """
+    fingerprint = database_fingerprint(sqlite_path, manifest)
+    connection = open_readonly(sqlite_path)
+    try:
+        names = [row[0] for row in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite\\_%' ESCAPE '\\'")]
+        stats = _read_stat1(connection)
+        tables = [_introspect_table(connection, name, stats.get(name)) for name in names]
+    finally:
+        connection.close()
+    return DatabaseInfo(db_id, fingerprint, tables)
+
+
+def introspect_databases(sqlite_paths: Mapping[str, Path], cache_path: Optional[Path] = None,
+                         jobs: Optional[int] = None,
+                         manifest: Optional[ExtractionManifest] = None) -> Dict[str, DatabaseInfo]:
+    """
+    여러 sqlite 파일을 스레드 풀에서 동시에 읽습니다. SQLite는 쿼리 중에 GIL을 놓으므로 스레드로 충분합니다.
+
+    cache_path를 지정하면 결과를 JSON으로 보관하고, 파일 내용(database_fingerprint())이 그대로인 데이터베이스는 다시 읽지 않습니다.
+    여러 프로세스가 같은 cache_path를 갱신해도 서로의 결과를 덮어쓰지 않도록 잠근 상태에서 다시 읽어 합친 뒤 기록합니다.
+
+    Args:
+        sqlite_paths (Mapping[str, Path]): db_id -> sqlite 파일 경로
+        cache_path (Optional[Path]): 결과를 보관할 JSON 파일 경로
+        jobs (Optional[int]): 스레드 수. 기본값은 ThreadPoolExecutor의 기본값
+        manifest (Optional[ExtractionManifest]): sqlite 파일들을 압축 해제한 manifest. 기록된 CRC로 fingerprint를 만듦
+
+    Returns:
+        Dict[str, DatabaseInfo]: sqlite_paths와 같은 순서의 db_id -> DatabaseInfo
+    """
+    cached = _read_cache(cache_path) if cache_path is not None else {}
+    results: Dict[str, DatabaseInfo] = {}
+    stale = []
+    for db_id, sqlite_path in sqlite_paths.items():
+        info = cached.get(db_id)
+        if info is not None and info.fingerprint == database_fingerprint(sqlite_path, manifest):
+            results[db_id] = info
+        else:
+            stale.append((db_id, sqlite_path))
+
+    if stale:
+        if len(stale) == 1 or jobs == 1:
+            computed = [introspect_database(db_id, sqlite_path, manifest) for db_id, sqlite_path in stale]
+        else:
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                computed = list(executor.map(lambda item: introspect_database(*item, manifest), stale))
+        for info in computed:
+            results[info.db_id] = info
+        if cache_path is not None:
+            _update_cache(cache_path, computed)
+
+    return {db_id: results[db_id] for db_id in sqlite_paths}
+
+
+def _introspect_table(connection: sqlite3.Connection, name: str, stat_rows: Optional[int]) -> TableInfo:
+    columns = [ColumnInfo(column_name, column_type, bool(not_null), default, primary_key)
+               for _, column_name, column_type, not_null, default, primary_key
+               in connection.execute("SELECT * FROM pragma_table_info(?)", (name,))]
+
+    foreign_keys: Dict[int, list] = {}
+    for key_id, _, ref_table, column, ref_column, on_update, on_delete, _ in connection.execute(
+            "SELECT * FROM pragma_foreign_key_list(?) ORDER BY id, seq", (name,)):
+        entry = foreign_keys.setdefault(key_id, [[], ref_table, [], on_update, on_delete])
+        entry[0].append(column)
+        entry[2].append(ref_column)
+
+    indexes = []
+    for _, index_name, unique, origin, partial in connection.execute("SELECT * FROM pragma_index_list(?)", (name,)):
+        index_columns = tuple(row[2] for row in connection.execute(
+            "SELECT * FROM pragma_index_info(?) ORDER BY seqno", (index_name,)))
+        indexes.append(IndexInfo(index_name, index_columns, bool(unique), origin, bool(partial)))
+
+    return TableInfo(name, columns,
+                     [ForeignKeyInfo(tuple(cols), ref_table, tuple(ref_cols), on_update, on_delete)
+                      for cols, ref_table, ref_cols, on_update, on_delete in foreign_keys.values()],
+                     indexes, stat_rows if stat_rows is not None else _estimate_rows(connection, name))
+
+
+def _read_stat1(connection: sqlite3.Connection) -> Dict[str, int]:
+    """ANALYZE가 기록한 sqlite_stat1의 테이블별 행 수. 없으면 빈 dict"""
+    try:
+        rows = connection.execute("SELECT tbl, stat FROM sqlite_stat1").fetchall()
+    except sqlite3.OperationalError:
+        return {}
+    stats = {}
+    for table, stat in rows:
+        try:
+            stats.setdefault(table, int(str(stat).split()[0]))
+        except (ValueError, IndexError):
+            continue
+    return stats
+
+
+def _estimate_rows(connection: sqlite3.Connection, name: str) -> int:
+    quoted = quote_identifier(name)
+    try:
+        # rowid 테이블에서는 B-tree의 마지막 항목만 읽으므로 테이블 크기와 무관하게 빠름
+        return connection.execute(f"SELECT max(rowid) FROM {quoted}").fetchone()[0] or 0
+    except sqlite3.OperationalError:
+        return connection.execute(f"SELECT COUNT(*) FROM {quoted}").fetchone()[0]
+
+
+def _read_cache(cache_path: Path) -> Dict[str, DatabaseInfo]:
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != FORMAT_VERSION:
+            return {}
+        return {db_id: _from_record(record) for db_id, record in data["databases"].items()}
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+
+
+def _update_cache(cache_path: Path, computed: List[DatabaseInfo]) -> None:
+    with FileLock(Path(cache_path).with_name(f"{Path(cache_path).name}.lock")):
+        cached = _read_cache(cache_path)
+        for info in computed:
+            cached[info.db_id] = info
+        _write_cache(cache_path, cached)
+
+
+def _write_cache(cache_path: Path, databases: Dict[str, DatabaseInfo]) -> None:
+    with atomic_write(cache_path) as f:
+        # NamedTuple은 JSON 배열로 기록됨
+        json.dump({"version": FORMAT_VERSION, "databases": databases}, f, ensure_ascii=False)
+
+
+def _from_record(record: list) -> DatabaseInfo:
+    db_id, fingerprint, tables = record
+    return DatabaseInfo(db_id, fingerprint, [
+        TableInfo(name,
+                  [ColumnInfo(*column) for column in columns],
+                  [ForeignKeyInfo(tuple(cols), ref_table, tuple(ref_cols), on_update, on_delete)
+                   for cols, ref_table, ref_cols, on_update, on_delete in foreign_keys],
+                  [IndexInfo(index_name, tuple(index_columns), unique, origin, partial)
+                   for index_name, index_columns, unique, origin, partial in indexes],
+                  estimated_rows)
+        for name, columns, foreign_keys, indexes, estimated_rows in tables
+    ])
@@ -1,19 +1,84 @@
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import List
-import tempfile
-import os
+from concurrent.futures import Executor
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+import hashlib
+import json
+import threading
 import zipfile
-import gdown
+from .cache import DatasetCache, link_or_copy
+from .connection import ConnectionManager
+from .evaluation import DEFAULT_TIMEOUT, ExecutionReport, evaluate_execution, warm_gold_cache
+from .downloader import Downloader, DownloadError, DownloadManifest
+from .example_cache import ExampleCache, source_fingerprint
+from .examples import ExampleStream, JsonExampleSource
+from .schema import DatabaseSchema, SchemaCatalog
+from .schema_render import DDL, RENDER_FORMATS, SchemaRenderings
+from .introspection import DatabaseInfo, introspect_databases
+from .memory_db import MemoryDatabases, MemoryPolicy
+from .sharding import Shard, estimate_costs, group_by_db_id, plan_shards
+from .value_index import (DEFAULT_MAX_VALUE_LENGTH, DEFAULT_MAX_VALUES_PER_COLUMN, ValueIndex, build_value_indexes,
+                          is_index_current, read_header as read_value_index_header)
+from .gold_cache import DEFAULT_MAX_BYTES, DEFAULT_MAX_ENTRIES, GoldResultCache, database_fingerprint
+from .extractor import FAST, ExtractionManifest, LazyArchive, StreamingUnsupported, extract_archive, extract_stream
+from .observers import NULL_OBSERVER, LoaderObserver, observe_phase
+from .transport import Mirror, Transport, default_mirrors
 
 
 
 class Loader(ABC):
 
-  def __init__(self, save_path: str, gdrive_id: str, dataset_name: str):
+  def __init__(self, save_path: str, gdrive_id: str, dataset_name: str,
+               manifest: Optional[DownloadManifest] = None, verify_mode: str = FAST, lazy: bool = False,
+               cache: Optional[DatasetCache] = None, mirrors: Optional[Sequence[Mirror]] = None,
+               streaming: bool = False, observer: Optional[LoaderObserver] = None,
+               in_memory: Union[bool, MemoryPolicy] = False, pin: bool = False):
+    """
+    Args:
+        save_path (str): 데이터를 저장할 경로
+        gdrive_id (str): 데이터셋 zip 파일의 Google Drive id
+        dataset_name (str): 데이터셋 이름
+        manifest (Optional[DownloadManifest]): 압축 해제 전에 zip 파일을 검증할 크기/sha256.
+            None이면 pin으로 save_path/.manifests에 기록해 둔 크기/sha256이 있을 때 그것을 사용
+        verify_mode (str): 이미 다운로드된 데이터셋을 확인하는 방식. "fast"(크기, mtime) 또는 "deep"(CRC)
+        lazy (bool): True이면 zip 파일을 보관하고 sqlite 데이터베이스는 get_sqlite_path()로 처음 접근할 때 압축 해제
+        cache (Optional[DatasetCache]): 지정하면 다운로드와 압축 해제를 공유 캐시에서 한 번만 하고 save_path에는 reflink(또는 복사)로 구성
+        mirrors (Optional[Sequence[Mirror]]): zip 파일을 가져올 mirror 순서. 기본값은 TEXT_TO_SQL_MIRRORS 환경 변수의 mirror들 뒤에 Google Drive
+        streaming (bool): True이면 zip 파일을 저장하지 않고 다운로드와 동시에 압축 해제. lazy 모드와 공유 캐시에서는 사용하지 않음
+        observer (Optional[LoaderObserver]): 단계별 소요 시간, byte 수, 캐시 적중 여부를 받을 observer. 기본값은 아무것도 하지 않음
+        in_memory (Union[bool, MemoryPolicy]): 쿼리를 실행할 때 작은 sqlite 데이터베이스를 메모리에 복사해 사용.
+            True이면 기본 MemoryPolicy(16MB 이하, 전체 512MB)를 사용하고, 선택되지 않은 데이터베이스는 파일에서 실행
+        pin (bool): True이면 manifest가 없을 때 처음 검증을 통과한 zip 파일의 크기/sha256을 기록해 이후 다운로드와
+            재설치에서 같은 파일인지 검증. 원본이 바뀌었다면 unpin_download()로 기록을 지운 뒤 다시 받음
+    """
     self.save_path = save_path
     self.gdrive_id = gdrive_id
     self.dataset_name = dataset_name
+    self.manifest = manifest
+    self.verify_mode = verify_mode
+    self.lazy = lazy
+    self.cache = cache
+    self.streaming = streaming
+    self.pin = pin
+    self.memory_policy: Optional[MemoryPolicy] = MemoryPolicy() if in_memory is True else (in_memory or None)
+    self.observer = observer if observer is not None else NULL_OBSERVER
+    # observer가 없으면 chunk마다 호출되는 callback도 두지 않음
+    self.downloader = Downloader(on_progress=self._report_progress if observer is not None else None)
+    self.transport = Transport(mirrors if mirrors is not None else default_mirrors(), self.downloader)
+    self._lazy_archive: Optional[LazyArchive] = None
+    self._lazy_archive_lock = threading.Lock()
+    self._extraction_manifest: Optional[Tuple[Tuple[int, int], Optional[ExtractionManifest]]] = None
+    self._extraction_manifest_lock = threading.Lock()
+    self._example_caches: Dict[str, ExampleCache] = {}
+    self._example_caches_lock = threading.Lock()
+    self._connection_manager: Optional[ConnectionManager] = None
+    self._connection_manager_lock = threading.Lock()
+    self._gold_cache: Optional[GoldResultCache] = None
+    self._gold_cache_lock = threading.Lock()
+    self._value_indexes: Dict[str, ValueIndex] = {}
+    self._value_indexes_lock = threading.Lock()
+    self._schema_renderings: Dict[Tuple[str, int], SchemaRenderings] = {}
+    self._schema_renderings_lock = threading.Lock()
 
 
   def download_dataset(self):
@@ -31,22 +96,413 @@ class Loader(ABC):
       save_path_obj.mkdir(parents=True, exist_ok=True)
       
       # 이미 데이터가 존재하는지 확인
-      if self._is_dataset_already_downloaded():
+      if self.is_installed():
           print(f"{self.dataset_name} dataset already exists at {self.save_path}. Skipping download.")
           return
-      
-      # 1. google drive에서 zip 파일 다운로드. 이 때 zip 파일은 temporary directory에 저장됨.
-      with tempfile.TemporaryDirectory() as temp_dir:
-          temp_zip_name = f"{self.dataset_name.replace(' ', '_')}.zip"
-          temp_zip_path = os.path.join(temp_dir, temp_zip_name)
-          gdown.download(f"https://drive.google.com/uc?id={self.gdrive_id}", temp_zip_path, quiet=False)
-          
-          # 2. zip 파일 압축 해제
-          with zipfile.ZipFile(temp_zip_path, 'r') as zip_ref:
-              zip_ref.extractall(self.save_path)
-      
+
+      # 1. zip 파일 준비. 중단되더라도 save_path/.downloads(또는 공유 캐시)의 partial 파일에서 이어받음.
+      #    streaming 모드에서는 다운로드와 압축 해제를 한 번에 끝냄
+      archive_path = self.fetch()
+      if archive_path is not None:
+          # 2. staging 디렉토리에 압축 해제 후 제자리로 rename, 마지막으로 manifest 기록
+          self.install(archive_path)
+
       print(f"{self.dataset_name} dataset has been successfully downloaded to {self.save_path}.")
 
+  def is_installed(self) -> bool:
+      """
+      데이터셋이 이미 설치되어 있는지 확인합니다. "verify" 단계로 측정하고 결과를 "dataset" 캐시 적중 여부로 알립니다.
+      """
+      with observe_phase(self.observer, self.dataset_name, "verify"):
+          installed = self._is_dataset_already_downloaded()
+      self.observer.cache_lookup(self.dataset_name, "dataset", installed)
+      return installed
+
+  def fetch(self) -> Optional[Path]:
+      """
+      download_dataset()의 네트워크 단계입니다. 압축 해제할 zip 파일을 준비해 경로를 반환합니다.
+      streaming 모드에서는 다운로드하면서 압축 해제까지 끝내고 None을 반환합니다.
+      """
+      if self._stream_install():
+          return None
+      return self._fetch_archive()
+
+  def install(self, archive_path: Path, executor: Optional[Executor] = None) -> None:
+      """
+      download_dataset()의 압축 해제 단계입니다. executor(프로세스 풀 등)를 지정하면 압축 해제를 executor에서 실행합니다.
+      """
+      extract, args = self._extraction_task(archive_path)
+      with observe_phase(self.observer, self.dataset_name, "extract") as metrics:
+          result = executor.submit(extract, *args).result() if executor is not None else extract(*args)
+          _record_extraction(metrics, result[1] if isinstance(result, tuple) else result)
+          self._complete_install(archive_path, result)
+
+  def post_process(self, executor: Optional[Executor] = None) -> None:
+      """
+      압축 해제가 끝난 데이터셋의 후처리 단계입니다. executor(프로세스 풀)를 지정하면 후처리의 CPU 작업을 executor에서 실행합니다.
+      """
+      self._post_process(executor)
+
+  def _stream_install(self) -> bool:
+      """
+      streaming 모드에서 zip 파일을 디스크에 저장하지 않고 다운로드하면서 압축 해제합니다.
+      디스크 사용량은 압축 해제된 크기만큼이며, 다운로드와 압축 해제가 겹쳐서 진행됩니다.
+
+      Returns:
+          bool: 설치했으면 True. streaming을 쓰지 않거나 zip 파일이 스트림으로 풀 수 없는 형식이면 False
+      """
+      # lazy 모드와 공유 캐시는 zip 파일 자체를 보관해야 하므로 제외
+      if not self.streaming or self.lazy or self.cache is not None:
+          return False
+      try:
+          with observe_phase(self.observer, self.dataset_name, "stream") as metrics:
+              def extract(chunks) -> ExtractionManifest:
+                  metrics["bytes"] = 0
+                  result = self._extract_stream(_count_bytes(chunks, metrics))
+                  _record_extraction(metrics, result, prefix="extracted_")
+                  return result
+
+              self.transport.stream(self._get_archive_path().name, self.gdrive_id, extract)
+      except StreamingUnsupported as e:
+          print(f"{self.dataset_name} archive cannot be extracted while downloading ({e}). Downloading it first.")
+          return False
+      return True
+
+  def _extract_stream(self, chunks) -> ExtractionManifest:
+      return extract_stream(chunks, Path(self.save_path), self._get_extraction_manifest_path(),
+                            self._get_download_manifest(), self._get_archive_path().name)
+
+  def _report_progress(self, count: int) -> None:
+      self.observer.bytes_received(self.dataset_name, count)
+
+  def _fetch_archive(self) -> Path:
+      """
+      압축 해제할 zip 파일을 준비합니다. 네트워크 I/O가 일어나는 단계입니다.
+      공유 캐시를 사용하는 lazy 모드에서는 캐시의 zip 파일을 save_path/.downloads에 hardlink 합니다.
+      """
+      with observe_phase(self.observer, self.dataset_name, "download") as metrics:
+          if self.cache is None:
+              archive_path = self._download_archive()
+          else:
+              downloaded = []
+
+              def download(dest: Path) -> Path:
+                  downloaded.append(dest)
+                  return self._download_archive(dest)
+
+              manifest = self._get_download_manifest()
+              sha256 = manifest.sha256 if manifest is not None else None
+              archive_path = self.cache.fetch_archive(self.gdrive_id, download, sha256)
+              self.observer.cache_lookup(self.dataset_name, "archive", not downloaded)
+              if self.lazy:
+                  link_or_copy(archive_path, self._get_archive_path())
+                  archive_path = self._get_archive_path()
+          metrics["bytes"] = archive_path.stat().st_size
+      return archive_path
+
+  def _extraction_task(self, archive_path: Path) -> Tuple[Callable, tuple]:
+      """
+      압축 해제 단계를 (함수, 인자)로 반환합니다. 둘 다 pickle 가능하므로 별도 프로세스에서 실행할 수 있습니다.
+
+      - lazy 모드: 데이터베이스 폴더를 제외하고 풀고, zip 파일은 이후 압축 해제를 위해 보관
+      - 공유 캐시: 캐시 트리에 한 번만 압축 해제
+      - 그 외: save_path에 바로 압축 해제
+      """
+      manifest_path = self._get_extraction_manifest_path()
+      if self.lazy:
+          return extract_archive, (archive_path, Path(self.save_path), manifest_path, self._get_database_member_prefix())
+      if self.cache is not None:
+          return self.cache.extract, (archive_path,)
+      return extract_archive, (archive_path, Path(self.save_path), manifest_path)
+
+  def _complete_install(self, archive_path: Path, extraction_result) -> None:
+      """압축 해제 이후의 마무리 단계. 캐시 트리를 save_path에 hardlink 하거나 다 쓴 zip 파일을 삭제합니다."""
+      if self.lazy:
+          return
+      if self.cache is not None:
+          _, tree_manifest = extraction_result
+          self.cache.materialize(tree_manifest, Path(self.save_path), self._get_extraction_manifest_path())
+          return
+      archive_path.unlink()
+
+  def _post_process(self, executor: Optional[Executor] = None) -> None:
+      """post_process()에서 호출하는 후처리. 기본 Loader는 할 일이 없습니다."""
+
+  def _download_archive(self, dest: Optional[Path] = None) -> Path:
+      """
+      데이터셋 zip 파일을 다운로드하고, 압축 해제 전에 manifest 및 zip 구조를 검증합니다.
+
+      Args:
+          dest (Optional[Path]): 저장 경로. 지정하지 않으면 save_path/.downloads 아래에 저장
+
+      Returns:
+          Path: 검증이 끝난 zip 파일 경로
+
+      Raises:
+          DownloadError: 다운로드 실패, manifest 불일치 또는 zip 파일이 손상된 경우
+      """
+      # mirror를 순서대로 시도하며, zip 구조 검증에 실패해도 다음 mirror로 넘어감
+      manifest = self._get_download_manifest()
+      try:
+          archive_path = self.transport.fetch(self._get_archive_path().name, self.gdrive_id,
+                                              dest or self._get_archive_path(), manifest, self._validate_archive)
+      except DownloadError as e:
+          if self.manifest is None and manifest is not None:
+              raise DownloadError(
+                  f"{e} (checked against the archive pinned in {self._get_download_manifest_path()}; if the "
+                  f"{self.dataset_name} archive changed upstream, call unpin_download() or run "
+                  f"`text-to-sql unpin` and download again)") from e
+          raise
+      if manifest is None and self.pin:
+          # 처음 받은 zip 파일로 고정해 이후 다른 mirror나 재설치에서 받은 파일도 같은지 검증
+          DownloadManifest.of(archive_path).save(self._get_download_manifest_path())
+      return archive_path
+
+  def _get_download_manifest(self) -> Optional[DownloadManifest]:
+      """지정한 manifest. 없으면 pin으로 처음 검증을 통과한 zip 파일에서 기록해 둔 manifest (streaming 모드에서는 기록하지 않음)"""
+      if self.manifest is not None:
+          return self.manifest
+      return DownloadManifest.load(self._get_download_manifest_path())
+
+  def unpin_download(self) -> bool:
+      """
+      pin으로 기록해 둔 zip 파일의 크기/sha256을 지웁니다. 다음 다운로드는 검증 없이 받으며, pin=True이면 그 파일로 다시 기록합니다.
+
+      Returns:
+          bool: 지운 기록이 있었으면 True
+      """
+      path = self._get_download_manifest_path()
+      if not path.exists():
+          return False
+      path.unlink()
+      return True
+
+  def _validate_archive(self, zip_path: Path) -> None:
+      # manifest가 없더라도 잘린 zip 파일은 central directory가 없으므로 여기서 걸러짐
+      if not zipfile.is_zipfile(zip_path):
+          zip_path.unlink()
+          raise DownloadError(f"{self.dataset_name} archive at {zip_path} is not a valid zip file")
+
+  def _get_archive_path(self) -> Path:
+      return Path(self.save_path, ".downloads", f"{self.dataset_name.replace(' ', '_')}.zip")
+
+  def _get_download_manifest_path(self) -> Path:
+      return Path(self.save_path, ".manifests", f"{self.dataset_name.replace(' ', '_')}.download.json")
+
+  def _get_extraction_manifest_path(self) -> Path:
+      return Path(self.save_path, ".manifests", f"{self.dataset_name.replace(' ', '_')}.json")
+
+  def verify_dataset(self, mode: Optional[str] = None) -> bool:
+      """
+      압축 해제된 데이터셋이 manifest와 일치하는지 확인합니다.
+
+      Args:
+          mode (Optional[str]): "fast" 또는 "deep". 지정하지 않으면 self.verify_mode를 사용
+
+      Returns:
+          bool: manifest가 존재하고 모든 파일이 일치하면 True
+      """
+      manifest = ExtractionManifest.load(self._get_extraction_manifest_path(), Path(self.save_path))
+      if manifest is None:
+          return False
+      # 데이터베이스가 lazy 하게 풀리는 트리는 zip 파일이 남아 있고 lazy 모드로 사용할 때만 완전함
+      if manifest.lazy_prefix and not (self.lazy and self._get_archive_path().exists()):
+          return False
+      return manifest.verify(mode or self.verify_mode)
+
+  def get_sqlite_path(self, db_id: str) -> Path:
+      """
+      db_id에 해당하는 sqlite 파일 경로를 반환합니다.
+      lazy 모드에서는 처음 접근할 때 보관 중인 zip에서 해당 데이터베이스 폴더만 압축 해제합니다.
+
+      Args:
+          db_id (str): 데이터베이스 id
+
+      Returns:
+          Path: `<get_sqlite_database()>/<db_id>/<db_id>.sqlite`
+      """
+      database_dir = Path(self.get_sqlite_database(), db_id)
+      if self.lazy and not database_dir.exists():
+          self._get_lazy_archive().extract(db_id)
+      return Path(database_dir, f"{db_id}.sqlite")
+
+  def get_database_fingerprint(self, db_id: str) -> str:
+      """
+      db_id의 sqlite 파일 내용으로 만든 fingerprint를 반환합니다. gold 결과, 스키마, 값 색인 캐시의 key로 사용합니다.
+      압축 해제 manifest에 기록된 CRC를 사용하므로 같은 zip을 다시 압축 해제해도 바뀌지 않습니다.
+
+      Raises:
+          FileNotFoundError: sqlite 파일이 없는 경우
+      """
+      return database_fingerprint(self.get_sqlite_path(db_id), self._get_extraction_manifest())
+
+  def _get_extraction_manifest(self) -> Optional[ExtractionManifest]:
+      # manifest 파일이 바뀌지 않았으면 이전에 읽은 것을 재사용
+      path = self._get_extraction_manifest_path()
+      try:
+          stat = path.stat()
+      except OSError:
+          return None
+      key = (stat.st_size, stat.st_mtime_ns)
+      with self._extraction_manifest_lock:
+          if self._extraction_manifest is None or self._extraction_manifest[0] != key:
+              self._extraction_manifest = (key, ExtractionManifest.load(path, Path(self.save_path)))
+          return self._extraction_manifest[1]
+
+  def get_db_ids(self) -> List[str]:
+      """
+      데이터셋에 포함된 db_id 목록을 반환합니다. lazy 모드에서는 아직 풀리지 않은 데이터베이스도 포함합니다.
+      """
+      if self.lazy and self._get_archive_path().exists():
+          return self._get_lazy_archive().db_ids()
+      database_root = self.get_sqlite_database()
+      return sorted(p.name for p in database_root.iterdir() if p.is_dir() and not p.name.startswith("."))
+
+  def get_database_size(self, db_id: str) -> int:
+      """
+      db_id의 sqlite 파일 크기를 반환합니다. lazy 모드에서는 압축 해제하지 않고 zip의 central directory에서 읽습니다.
+      데이터베이스가 없으면 0입니다.
+      """
+      if self.lazy and self._get_archive_path().exists():
+          try:
+              return self._get_lazy_archive().database_size(db_id)
+          except KeyError:
+              return 0
+      path = Path(self.get_sqlite_database(), db_id, f"{db_id}.sqlite")
+      return path.stat().st_size if path.exists() else 0
+
+  def shard_examples(self, num_shards: int, split: str = "dev",
+                     query_times: Optional[Mapping[str, float]] = None) -> List[Shard]:
+      """
+      split의 예제를 db_id 단위로 묶어 num_shards개의 shard로 나눕니다. 여러 노드에서 나눠 채점할 때 사용합니다.
+
+      같은 db_id의 예제는 한 shard에만 들어가고, shard마다 추정 비용(데이터베이스 크기 또는 과거 실행 시간 x 예제 수)이
+      비슷하도록 나눕니다. 데이터셋과 query_times가 같으면 어느 노드에서 호출해도 같은 결과를 반환합니다.
+      lazy 모드에서도 데이터베이스를 압축 해제하지 않습니다.
+
+      Args:
+          num_shards (int): shard 수
+          split (str): 나눌 split
+          query_times (Optional[Mapping[str, float]]): db_id -> 과거에 측정한 예제 하나당 실행 시간(초)
+
+      Returns:
+          List[Shard]: shard 번호 순서의 shard들. shard.example_indices를 evaluate_execution()의 예측 index로 사용
+
+      Raises:
+          ValueError: num_shards가 1보다 작거나 데이터셋에 없는 split인 경우
+      """
+      examples_by_db = group_by_db_id(self.get_example_cache(split).iter_examples())
+      sizes = {db_id: self.get_database_size(db_id) for db_id in examples_by_db}
+      return plan_shards(examples_by_db, estimate_costs(examples_by_db, sizes, query_times), num_shards)
+
+  def get_shard(self, shard_index: int, num_shards: int, split: str = "dev",
+                query_times: Optional[Mapping[str, float]] = None) -> Shard:
+      """
+      shard_examples()의 shard_index번째 shard를 반환합니다.
+
+      Raises:
+          ValueError: shard_index가 0 이상 num_shards 미만이 아닌 경우
+      """
+      if not 0 <= shard_index < num_shards:
+          raise ValueError(f"shard_index must be in [0, {num_shards}), got {shard_index}")
+      return self.shard_examples(num_shards, split, query_times)[shard_index]
+
+  def prepare_shard(self, shard: Shard) -> List[Path]:
+      """
+      shard가 사용하는 데이터베이스만 준비하고 sqlite 파일 경로들을 반환합니다.
+      lazy 모드에서는 이 데이터베이스들만 압축 해제됩니다.
+      """
+      return [self.get_sqlite_path(db_id) for db_id in shard.db_ids]
+
+  def get_connection_manager(self) -> ConnectionManager:
+      """
+      db_id별 읽기 전용 SQLite 연결을 재사용하는 ConnectionManager를 반환합니다.
+      경로는 get_sqlite_path()로 찾으므로 lazy 모드에서는 처음 연결할 때 압축 해제됩니다.
+      in_memory 모드에서는 memory_policy가 선택한 데이터베이스를 메모리에 올려 연결합니다.
+      """
+      with self._connection_manager_lock:
+          if self._connection_manager is None:
+              memory = MemoryDatabases(self.get_sqlite_path, self.memory_policy) if self.memory_policy else None
+              self._connection_manager = ConnectionManager(self.get_sqlite_path, memory=memory)
+          return self._connection_manager
+
+  def execute(self, db_id: str, sql: str, timeout: Optional[float] = None) -> List[tuple]:
+      """
+      db_id의 데이터베이스에서 쿼리를 실행하고 모든 결과 행을 반환합니다.
+
+      Args:
+          db_id (str): 데이터베이스 id
+          sql (str): 실행할 쿼리
+          timeout (Optional[float]): 쿼리 제한 시간(초)
+
+      Raises:
+          QueryTimeout: timeout을 넘긴 경우
+          sqlite3.Error: 쿼리 실행 중 오류
+      """
+      return self.get_connection_manager().execute(db_id, sql, timeout=timeout)
+
+  def evaluate_execution(self, predictions: Union[Sequence[str], Mapping[int, str]], split: str = "dev",
+                         timeout: Optional[float] = DEFAULT_TIMEOUT, jobs: Optional[int] = None,
+                         use_gold_cache: bool = True) -> ExecutionReport:
+      """
+      예측 SQL을 split의 gold SQL과 같은 데이터베이스에서 실행해 실행 정확도를 채점합니다.
+      db_id별로 묶어 프로세스 풀에서 실행하며 쿼리마다 timeout(초)을 적용합니다.
+
+      Args:
+          predictions (Union[Sequence[str], Mapping[int, str]]): split 순서의 예측 SQL 목록 또는 예제 index -> 예측 SQL
+          split (str): 채점할 split
+          timeout (Optional[float]): 쿼리 하나의 제한 시간(초)
+          jobs (Optional[int]): worker 프로세스 수. 기본값은 CPU 수
+          use_gold_cache (bool): True이면 get_gold_cache()의 gold 결과를 재사용
+
+      Returns:
+          ExecutionReport: 예제별 결과와 accuracy
+      """
+      gold_cache = self._current_gold_cache() if use_gold_cache else None
+      return evaluate_execution(self, predictions, split, timeout=timeout, jobs=jobs, gold_cache=gold_cache)
+
+  def get_gold_cache(self, max_entries: Optional[int] = DEFAULT_MAX_ENTRIES,
+                     max_bytes: Optional[int] = DEFAULT_MAX_BYTES) -> GoldResultCache:
+      """
+      save_path/.cache/gold_results.sqlite에 저장되는 gold SQL 실행 결과 캐시를 반환합니다.
+      key에 sqlite 파일의 fingerprint가 포함되므로 같은 데이터베이스를 쓰는 데이터셋끼리 결과를 공유합니다.
+
+      Args:
+          max_entries (Optional[int]): 최대 항목 수. None이면 제한 없음
+          max_bytes (Optional[int]): 저장된 결과의 최대 전체 크기. None이면 제한 없음
+      """
+      with self._gold_cache_lock:
+          if self._gold_cache is None:
+              self._gold_cache = GoldResultCache(self._get_cache_path("gold_results.sqlite"))
+          self._gold_cache.max_entries = max_entries
+          self._gold_cache.max_bytes = max_bytes
+          return self._gold_cache
+
+  def warm_gold_cache(self, split: str = "dev", timeout: Optional[float] = DEFAULT_TIMEOUT,
+                      jobs: Optional[int] = None) -> int:
+      """
+      split의 gold SQL을 미리 실행해 get_gold_cache()에 저장합니다. 이미 저장된 결과는 다시 실행하지 않습니다.
+
+      Returns:
+          int: 새로 저장한 결과 수
+      """
+      return warm_gold_cache(self, self._current_gold_cache(), split, timeout=timeout, jobs=jobs)
+
+  def _current_gold_cache(self) -> GoldResultCache:
+      # get_gold_cache()로 설정한 크기 제한을 기본값으로 되돌리지 않도록 이미 열린 캐시를 그대로 사용
+      return self._gold_cache if self._gold_cache is not None else self.get_gold_cache()
+
+  def _get_lazy_archive(self) -> LazyArchive:
+      with self._lazy_archive_lock:
+          if self._lazy_archive is None:
+              self._lazy_archive = LazyArchive(self._get_archive_path(), self._get_database_member_prefix(),
+                                               Path(self.save_path))
+          return self._lazy_archive
+
+  def _get_database_member_prefix(self) -> str:
+      """zip 파일 내부에서 데이터베이스 폴더들이 위치한 경로 (예: "spider_data/database/")"""
+      return self.get_sqlite_database().relative_to(self.save_path).as_posix() + "/"
+
   def _is_dataset_already_downloaded(self) -> bool:
       """
       데이터셋이 이미 다운로드되었는지 확인합니다.
@@ -54,18 +510,252 @@ class Loader(ABC):
       Returns:
           bool: 데이터셋이 이미 존재하면 True, 그렇지 않으면 False
       """
-      # 실제 데이터셋 디렉토리가 존재하고 비어있지 않으면 다운로드된 것으로 간주
-      dataset_path = self._get_dataset_detail_path_root()
-      return dataset_path.exists() and any(dataset_path.iterdir())
+      # 압축 해제가 끝까지 완료되어 manifest가 기록되었고, 파일들이 manifest와 일치하면 다운로드된 것으로 간주
+      return self.verify_dataset()
+
+  def iter_examples(self, split: str = "dev", limit: Optional[int] = None, cached: bool = True) -> ExampleStream:
+      """
+      split의 예제들을 JSON 파일 전체를 메모리에 올리지 않고 하나씩 읽어오는 스트림을 반환합니다.
+
+      Args:
+          split (str): get_split_files()의 key (예: "dev", "train")
+          limit (Optional[int]): 최대 예제 수
+          cached (bool): True이면 get_example_cache()의 캐시에서, False이면 JSON 파일에서 직접 읽음
+
+      Returns:
+          ExampleStream: 순회 가능한 Example 스트림. filter(db_id=...), limit(n)으로 좁힐 수 있음
+
+      Raises:
+          ValueError: 데이터셋에 없는 split인 경우
+      """
+      source = self.get_example_cache(split) if cached else JsonExampleSource(self._get_split_paths(split))
+      stream = ExampleStream(source)
+      return stream if limit is None else stream.limit(limit)
+
+  def get_example_cache(self, split: str = "dev") -> ExampleCache:
+      """
+      split의 파싱된 예제 캐시를 반환합니다. index와 db_id로 O(1) 조회가 가능합니다.
+      처음 호출할 때나 원본 JSON 파일의 크기/mtime이 바뀐 경우에만 JSON을 다시 파싱합니다.
+
+      Raises:
+          ValueError: 데이터셋에 없는 split인 경우
+      """
+      split_paths = self._get_split_paths(split)
+      fingerprint = source_fingerprint(split_paths)
+      with self._example_caches_lock:
+          cache = self._example_caches.get(split)
+          if cache is None or cache.fingerprint != fingerprint:
+              if cache is not None:
+                  cache.close()
+              cache = ExampleCache.open(self._get_example_cache_path(split_paths), split_paths)
+              self._example_caches[split] = cache
+          return cache
+
+  def get_schema_catalog(self) -> SchemaCatalog:
+      """
+      get_sqlite_json_files()["table"]의 스키마 정보를 파싱한 SchemaCatalog를 반환합니다.
+      파싱 결과는 프로세스 전체에서 공유되며 파일이 바뀌었을 때만 다시 파싱합니다.
+      """
+      return SchemaCatalog.load(self.get_sqlite_json_files()["table"])
+
+  def get_schema(self, db_id: str) -> DatabaseSchema:
+      """
+      db_id의 스키마를 반환합니다.
+
+      Raises:
+          KeyError: 스키마 파일에 없는 db_id인 경우
+      """
+      return self.get_schema_catalog()[db_id]
+
+  def render_schema(self, db_id: str, format: str = DDL, sample_rows: int = 0) -> str:
+      """
+      db_id의 스키마를 프롬프트용 문자열로 반환합니다. get_schema_renderings()의 미리 렌더링한 결과에서 조회합니다.
+
+      Args:
+          db_id (str): 데이터베이스 id
+          format (str): "ddl"(CREATE TABLE 문) 또는 "compact"(table(col, col))
+          sample_rows (int): 테이블마다 sqlite 파일에서 읽어 붙일 예시 행 수
+
+      Raises:
+          KeyError: 스키마 파일에 없는 db_id인 경우
+          ValueError: 지원하지 않는 format인 경우
+      """
+      return self.get_schema_renderings(format, sample_rows)[db_id]
+
+  def get_schema_renderings(self, format: str = DDL, sample_rows: int = 0,
+                            jobs: Optional[int] = None) -> SchemaRenderings:
+      """
+      모든 db_id의 스키마를 format으로 렌더링한 결과와 길이를 반환합니다.
+
+      결과는 save_path/.cache/schemas 아래에 저장되고 프로세스 안에서는 메모리에 유지되므로, 스키마 파일이 바뀌지 않는 한
+      한 번만 렌더링합니다. sample_rows가 있으면 데이터셋이 다시 설치되었을 때도 다시 렌더링합니다.
+
+      Args:
+          format (str): "ddl" 또는 "compact"
+          sample_rows (int): 테이블마다 포함할 예시 행 수
+          jobs (Optional[int]): 예시 행을 읽을 스레드 수
+      """
+      if format not in RENDER_FORMATS:
+          raise ValueError(f"Unknown schema format: {format!r} (expected one of {RENDER_FORMATS})")
+      tables_path = self.get_sqlite_json_files()["table"]
+      source = self._get_schema_source_fingerprint(tables_path, sample_rows)
+      # 여러 스레드가 처음 요청해도 한 번만 렌더링하도록 잠근 상태에서 확인하고 만듦
+      with self._schema_renderings_lock:
+          renderings = self._schema_renderings.get((format, sample_rows))
+          if renderings is not None and renderings.source == source:
+              return renderings
+
+          path = self._get_schema_renderings_path(tables_path, format, sample_rows)
+          renderings = SchemaRenderings.load(path)
+          self.observer.cache_lookup(self.dataset_name, "schema_renderings",
+                                     renderings is not None and renderings.source == source)
+          if renderings is None or renderings.source != source:
+              renderings = SchemaRenderings.build(self.get_schema_catalog(), format, sample_rows, source,
+                                                  self.get_sqlite_path, jobs)
+              renderings.save(path)
+          self._schema_renderings[(format, sample_rows)] = renderings
+          return renderings
+
+  def _get_schema_source_fingerprint(self, tables_path: Path, sample_rows: int) -> str:
+      stat = tables_path.stat()
+      parts = [tables_path.name, stat.st_size, stat.st_mtime_ns]
+      if sample_rows:
+          # 예시 행은 sqlite 파일에서 읽으므로 데이터셋이 다시 설치되면(manifest가 다시 기록됨) 다시 렌더링
+          try:
+              manifest_stat = self._get_extraction_manifest_path().stat()
+              parts += [manifest_stat.st_size, manifest_stat.st_mtime_ns]
+          except FileNotFoundError:
+              pass
+      return json.dumps(parts)
+
+  def _get_schema_renderings_path(self, tables_path: Path, format: str, sample_rows: int) -> Path:
+      return self._get_source_cache_path("schemas", [tables_path], f"-{format}-{sample_rows}.json")
+
+  def introspect_databases(self, db_ids: Optional[Iterable[str]] = None,
+                           jobs: Optional[int] = None) -> Dict[str, DatabaseInfo]:
+      """
+      sqlite 파일에서 직접 읽은 실제 스키마(컬럼 타입, 외래 키, 인덱스, 추정 행 수)를 반환합니다.
+      여러 데이터베이스를 스레드 풀에서 동시에 읽고, 결과는 save_path/.cache/introspection.json에 보관해
+      sqlite 파일의 내용(get_database_fingerprint())이 그대로이면 다시 읽지 않습니다.
+
+      Args:
+          db_ids (Optional[Iterable[str]]): 읽을 db_id들. 기본값은 get_db_ids()
+          jobs (Optional[int]): 스레드 수
+
+      Returns:
+          Dict[str, DatabaseInfo]: db_id -> DatabaseInfo
+      """
+      db_ids = self.get_db_ids() if db_ids is None else list(db_ids)
+      sqlite_paths = {db_id: self.get_sqlite_path(db_id) for db_id in db_ids}
+      return introspect_databases(sqlite_paths, self._get_cache_path("introspection.json"), jobs=jobs,
+                                  manifest=self._get_extraction_manifest())
+
+  def introspect_database(self, db_id: str) -> DatabaseInfo:
+      """
+      db_id 하나의 실제 스키마를 반환합니다. introspect_databases()와 같은 캐시를 사용합니다.
+
+      Raises:
+          FileNotFoundError: sqlite 파일이 없는 경우
+      """
+      return self.introspect_databases([db_id])[db_id]
+
+  def build_value_indexes(self, db_ids: Optional[Iterable[str]] = None, jobs: Optional[int] = None,
+                          max_values_per_column: int = DEFAULT_MAX_VALUES_PER_COLUMN,
+                          max_value_length: int = DEFAULT_MAX_VALUE_LENGTH) -> Dict[str, int]:
+      """
+      데이터베이스마다 텍스트 컬럼 값 표본과 n-gram 역색인을 만들어 save_path/.cache/value_index/<db_id>.idx에 저장합니다.
+      sqlite 파일과 옵션이 그대로인 색인은 다시 만들지 않으며, 나머지는 프로세스 풀에서 동시에 만듭니다.
+
+      Args:
+          db_ids (Optional[Iterable[str]]): 색인할 db_id들. 기본값은 get_db_ids()
+          jobs (Optional[int]): worker 프로세스 수. 기본값은 CPU 수
+          max_values_per_column (int): 컬럼마다 보관할 최대 값 수 (많이 나오는 값부터)
+          max_value_length (int): 이보다 긴 값은 제외
+
+      Returns:
+          Dict[str, int]: 새로 만든 색인의 db_id -> 값의 수
+      """
+      infos = self.introspect_databases(db_ids)
+      tasks = []
+      for db_id, info in infos.items():
+          index_path = self._get_value_index_path(db_id)
+          if not is_index_current(index_path, info.fingerprint, max_values_per_column, max_value_length):
+              tasks.append((info, self.get_sqlite_path(db_id), index_path))
+      return build_value_indexes(tasks, jobs, max_values_per_column, max_value_length)
+
+  def get_value_index(self, db_id: str) -> ValueIndex:
+      """
+      db_id의 컬럼 값 색인을 mmap으로 열어 반환합니다. 색인이 없거나 sqlite 파일이 바뀌었으면 먼저 만듭니다.
+      같은 Loader에서는 열린 색인을 재사용합니다.
+
+      Raises:
+          FileNotFoundError: sqlite 파일이 없는 경우
+      """
+      fingerprint = self.get_database_fingerprint(db_id)
+      with self._value_indexes_lock:
+          index = self._value_indexes.get(db_id)
+          if index is not None and index.header["fingerprint"] == fingerprint:
+              return index
+          if index is not None:
+              index.close()
+          index_path = self._get_value_index_path(db_id)
+          # build_value_indexes()에서 다른 옵션으로 만든 색인도 sqlite 파일이 그대로이면 사용
+          header = read_value_index_header(index_path)
+          self.observer.cache_lookup(self.dataset_name, "value_index",
+                                     header is not None and header["fingerprint"] == fingerprint)
+          if header is None or header["fingerprint"] != fingerprint:
+              self.build_value_indexes([db_id], jobs=1)
+          index = ValueIndex(index_path)
+          self._value_indexes[db_id] = index
+          return index
+
+  def _get_value_index_path(self, db_id: str) -> Path:
+      return self._get_cache_path("value_index", f"{db_id}.idx")
+
+  def _get_split_paths(self, split: str) -> List[Path]:
+      split_files = self.get_split_files()
+      if split not in split_files:
+          raise ValueError(f"Unknown split {split!r} for {self.dataset_name} (available: {', '.join(split_files)})")
+      return split_files[split]
+
+  def _get_example_cache_path(self, split_paths: List[Path]) -> Path:
+      return self._get_source_cache_path("examples", split_paths, ".sqlite")
+
+  def _get_cache_path(self, *parts: str) -> Path:
+      """save_path/.cache 아래의 경로. 원본 데이터에서 만든 캐시는 모두 이 아래에 둡니다."""
+      return Path(self.save_path, ".cache", *parts)
+
+  def _get_source_cache_path(self, kind: str, source_paths: Sequence[Path], suffix: str) -> Path:
+      """
+      원본 파일들에서 만든 캐시의 경로 `.cache/<kind>/<첫 파일 이름>-<sha1><suffix>`.
+      Spider와 Spider Korean처럼 같은 save_path를 쓰는 데이터셋이 겹치지 않도록 원본 파일 경로들의 sha1로 이름을 만듭니다.
+      """
+      key = hashlib.sha1("|".join(p.as_posix() for p in source_paths).encode("utf-8")).hexdigest()[:12]
+      return self._get_cache_path(kind, f"{source_paths[0].stem}-{key}{suffix}")
 
   @abstractmethod
   def get_sqlite_database(self) -> Path:
     pass
 
+  @abstractmethod
+  def get_split_files(self) -> Dict[str, List[Path]]:
+    pass
+
   @abstractmethod
   def get_sqlite_json_files(self) -> List[Path]:
     pass
 
   @abstractmethod
   def _get_dataset_detail_path_root(self) -> Path:
-    pass
\ No newline at end of file
+    pass
+
+
+def _count_bytes(chunks: Iterable[bytes], metrics: Dict[str, float]) -> Iterable[bytes]:
+    for chunk in chunks:
+        metrics["bytes"] += len(chunk)
+        yield chunk
+
+
+def _record_extraction(metrics: Dict[str, float], manifest: ExtractionManifest, prefix: str = "") -> None:
+    metrics[prefix + "members"] = len(manifest.entries)
+    metrics[prefix + "bytes"] = sum(entry.size for entry in manifest.entries)
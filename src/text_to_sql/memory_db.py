@@ -0,0 +1,213 @@
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, Iterable, NamedTuple, Optional, Set
+import itertools
+import sqlite3
+import threading
+import urllib.parse
+from .connection import decode_text, open_readonly
+
+
+DEFAULT_MEMORY_BUDGET = 512 * 1024 * 1024
+# Spider 데이터베이스는 대부분 수 MB 이하이고 BIRD 데이터베이스는 수백 MB이므로, 기본값으로는 Spider 쪽만 메모리에 올라감
+DEFAULT_MAX_DATABASE_SIZE = 16 * 1024 * 1024
+
+# 프로세스 안에서 메모리 데이터베이스 이름이 겹치지 않도록 붙이는 번호
+_names = itertools.count()
+
+
+class MemoryPolicy(NamedTuple):
+    """
+    메모리에 올릴 데이터베이스를 고르는 기준입니다.
+
+    Attributes:
+        budget (int): 메모리에 올린 데이터베이스들의 전체 크기 상한(byte). 넘치면 가장 오래 사용하지 않은 것부터 내림
+        max_size (int): db_ids가 없을 때 이 크기 이하의 sqlite 파일만 메모리에 올림
+        db_ids (Optional[FrozenSet[str]]): 지정하면 크기와 관계없이(budget 이내) 이 db_id들만 메모리에 올림
+    """
+    budget: int = DEFAULT_MEMORY_BUDGET
+    max_size: int = DEFAULT_MAX_DATABASE_SIZE
+    db_ids: Optional[FrozenSet[str]] = None
+
+    @classmethod
+    def for_db_ids(cls, db_ids: Iterable[str], budget: int = DEFAULT_MEMORY_BUDGET) -> "MemoryPolicy":
+        return cls(budget, budget, frozenset(db_ids))
+
+    def selects(self, db_id: str, size: int) -> bool:
+        if size > self.budget:
+            return False
+        if self.db_ids is not None:
+            return db_id in self.db_ids
+        return size <= self.max_size
+
+
+class ResidentDatabase:
+    """
+    메모리에 올린 데이터베이스 하나입니다. shared-cache `:memory:` 데이터베이스이므로 같은 프로세스의 연결들이 한 사본을 공유하며,
+    마지막 연결이 닫히면 메모리에서 사라집니다. 그래서 connect()로 연 연결을 모두 기록해 두었다가 메모리에서 내릴 때 함께 닫습니다.
+    쿼리를 실행 중인(acquire()한) 연결은 release()할 때 닫습니다.
+    """
+
+    __slots__ = ("db_id", "uri", "size", "evicted", "_anchor", "_connections", "_in_use", "_lock")
+
+    def __init__(self, db_id: str, uri: str, size: int, anchor: sqlite3.Connection):
+        self.db_id = db_id
+        self.uri = uri
+        self.size = size
+        self.evicted = False
+        # 다른 연결이 모두 닫혀도 데이터베이스가 유지되도록 내릴 때까지 열어 두는 연결
+        self._anchor = anchor
+        self._connections: Set[sqlite3.Connection] = set()
+        # acquire()한 연결별 횟수
+        self._in_use: Dict[sqlite3.Connection, int] = {}
+        self._lock = threading.Lock()
+
+    def connect(self) -> Optional[sqlite3.Connection]:
+        """읽기 전용 연결을 열어 acquire()한 상태로 반환합니다. 이미 메모리에서 내려갔으면 None"""
+        with self._lock:
+            # 내려간 뒤에 연결하면 같은 이름의 빈 데이터베이스가 새로 만들어지므로 잠근 상태에서 확인
+            if self.evicted:
+                return None
+            connection = sqlite3.connect(self.uri, uri=True, check_same_thread=False)
+            connection.execute("PRAGMA query_only=1")
+            connection.text_factory = decode_text
+            self._connections.add(connection)
+            self._in_use[connection] = 1
+            return connection
+
+    def acquire(self, connection: sqlite3.Connection) -> bool:
+        """connection을 release()할 때까지 닫지 않도록 표시합니다. 이미 메모리에서 내려갔으면 False"""
+        with self._lock:
+            if self.evicted:
+                return False
+            self._in_use[connection] = self._in_use.get(connection, 0) + 1
+            return True
+
+    def release(self, connection: sqlite3.Connection) -> None:
+        """acquire()한 연결의 사용이 끝났음을 표시합니다. 그사이 메모리에서 내려갔으면 연결을 닫습니다."""
+        with self._lock:
+            count = self._in_use.pop(connection) - 1
+            if count:
+                self._in_use[connection] = count
+            elif self.evicted:
+                self._connections.discard(connection)
+                connection.close()
+
+    def disconnect(self, connection: sqlite3.Connection) -> None:
+        """connect()로 연 연결을 닫습니다."""
+        with self._lock:
+            self._connections.discard(connection)
+        connection.close()
+
+    @property
+    def connection_count(self) -> int:
+        """connect()로 열어 아직 닫히지 않은 연결 수"""
+        return len(self._connections)
+
+    def _release(self) -> None:
+        with self._lock:
+            self.evicted = True
+            for connection in self._connections - self._in_use.keys():
+                self._connections.discard(connection)
+                connection.close()
+            self._anchor.close()
+
+
+class MemoryDatabases:
+    """
+    선택한 sqlite 파일을 SQLite backup API로 shared-cache `:memory:` 데이터베이스에 복사해 두고 LRU로 관리합니다.
+
+    작은 데이터베이스에 수천 번 쿼리하는 채점에서 파일 시스템과 page cache를 거치지 않게 합니다.
+    policy가 선택하지 않은 데이터베이스(큰 BIRD 데이터베이스 등)는 load()가 None을 반환하므로 호출하는 쪽이 파일을 사용합니다.
+    budget은 프로세스마다 적용되므로 여러 worker 프로세스가 각자 올리면 전체 사용량은 worker 수에 비례합니다.
+
+    Args:
+        resolve (Callable[[str], Path]): db_id를 sqlite 파일 경로로 바꾸는 함수
+        policy (MemoryPolicy): 메모리에 올릴 데이터베이스를 고르는 기준
+    """
+
+    def __init__(self, resolve: Callable[[str], Path], policy: MemoryPolicy = MemoryPolicy()):
+        self.resolve = resolve
+        self.policy = policy
+        self._residents: "OrderedDict[str, ResidentDatabase]" = OrderedDict()
+        self._used = 0
+        self._lock = threading.Lock()
+
+    @property
+    def used_bytes(self) -> int:
+        """메모리에 올린 데이터베이스들의 전체 크기"""
+        return self._used
+
+    def load(self, db_id: str) -> Optional[ResidentDatabase]:
+        """
+        db_id를 메모리에 올려 반환합니다. 이미 올라가 있으면 그대로 반환하고, policy가 선택하지 않으면 None입니다.
+
+        Raises:
+            FileNotFoundError: sqlite 파일이 없는 경우
+        """
+        with self._lock:
+            resident = self._residents.get(db_id)
+            if resident is not None:
+                self._residents.move_to_end(db_id)
+                return resident
+
+            path = Path(self.resolve(db_id))
+            size = path.stat().st_size
+            if not self.policy.selects(db_id, size):
+                return None
+            self._evict_until(self.policy.budget - size)
+            resident = self._copy(db_id, path)
+            self._residents[db_id] = resident
+            self._used += resident.size
+            return resident
+
+    def touch(self, resident: ResidentDatabase) -> bool:
+        """resident를 최근에 사용한 것으로 표시합니다. 이미 메모리에서 내려갔으면 False"""
+        with self._lock:
+            if resident.evicted:
+                return False
+            self._residents.move_to_end(resident.db_id)
+            return True
+
+    def evict(self, db_id: str) -> bool:
+        """db_id를 메모리에서 내리고 그 연결들을 닫습니다. ConnectionManager는 닫힌 연결을 다음에 사용할 때 다시 엽니다."""
+        with self._lock:
+            resident = self._residents.pop(db_id, None)
+            if resident is None:
+                return False
+            self._used -= resident.size
+            resident._release()
+            return True
+
+    def clear(self) -> None:
+        """모든 데이터베이스를 메모리에서 내립니다."""
+        with self._lock:
+            self._evict_until(-1)
+
+    def __contains__(self, db_id: str) -> bool:
+        return db_id in self._residents
+
+    def __len__(self) -> int:
+        return len(self._residents)
+
+    def _evict_until(self, limit: int) -> None:
+        while self._residents and self._used > limit:
+            _, resident = self._residents.popitem(last=False)
+            self._used -= resident.size
+            resident._release()
+
+    @staticmethod
+    def _copy(db_id: str, path: Path) -> ResidentDatabase:
+        uri = f"file:text_to_sql_{next(_names)}_{urllib.parse.quote(db_id, safe='')}?mode=memory&cache=shared"
+        anchor = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        source = open_readonly(path)
+        try:
+            source.backup(anchor)
+        except BaseException:
+            anchor.close()
+            raise
+        finally:
+            source.close()
+        page_count = anchor.execute("PRAGMA page_count").fetchone()[0]
+        page_size = anchor.execute("PRAGMA page_size").fetchone()[0]
+        return ResidentDatabase(db_id, uri, page_count * page_size, anchor)
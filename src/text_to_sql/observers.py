@@ -0,0 +1,109 @@
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+import threading
+import time
+
+
+# 단계가 끝날 때 metrics에 이 key가 있으면 초당 처리량을 함께 기록
+_RATES = {"bytes": "bytes_per_second", "records": "records_per_second"}
+
+
+class PhaseEvent(NamedTuple):
+    """
+    Loader 작업의 한 단계가 끝났을 때 observer에 전달되는 결과입니다.
+
+    Attributes:
+        dataset (str): Loader의 dataset_name
+        phase (str): "verify", "download", "stream", "extract", "tokenize:<split>" 등
+        seconds (float): 소요 시간(초)
+        metrics (Dict[str, float]): byte 수, 파일 수, 처리한 행 수와 초당 처리량
+        error (Optional[BaseException]): 단계가 실패했다면 그 예외
+    """
+    dataset: str
+    phase: str
+    seconds: float
+    metrics: Dict[str, float]
+    error: Optional[BaseException] = None
+
+
+class LoaderObserver:
+    """
+    Loader 작업의 단계와 지표를 받는 observer의 기본 클래스입니다. 모든 메서드는 아무것도 하지 않으므로
+    필요한 메서드만 override 하면 됩니다.
+
+    다운로드 구간들은 여러 스레드에서 받으므로 bytes_received()는 동시에 호출될 수 있습니다.
+    """
+
+    def phase_started(self, dataset: str, phase: str) -> None:
+        """단계가 시작될 때 호출됩니다."""
+
+    def phase_finished(self, event: PhaseEvent) -> None:
+        """단계가 끝나거나 실패했을 때 호출됩니다."""
+
+    def bytes_received(self, dataset: str, count: int) -> None:
+        """다운로드 중 chunk를 받을 때마다 받은 byte 수로 호출됩니다."""
+
+    def cache_lookup(self, dataset: str, cache: str, hit: bool) -> None:
+        """
+        이전 결과를 재사용할 수 있는지 확인했을 때 호출됩니다.
+        cache는 "dataset", "archive", "spider_ko:<split>", "schema_renderings", "value_index", "exact_match" 중 하나입니다.
+        """
+
+
+# observer를 지정하지 않은 Loader가 사용하는 observer
+NULL_OBSERVER = LoaderObserver()
+
+
+class RecordingObserver(LoaderObserver):
+    """
+    받은 이벤트를 메모리에 모으는 observer입니다. 작업이 끝난 뒤 지표를 한 번에 보내거나 테스트에서 사용합니다.
+
+    Attributes:
+        phases (List[PhaseEvent]): 끝난 단계들의 결과 (끝난 순서)
+        cache_lookups (List[Tuple[str, str, bool]]): (dataset, cache, hit) 목록
+        received_bytes (Dict[str, int]): dataset -> 다운로드 중 받은 byte 수
+    """
+
+    def __init__(self):
+        self.phases: List[PhaseEvent] = []
+        self.cache_lookups: List[Tuple[str, str, bool]] = []
+        self.received_bytes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def phase_finished(self, event: PhaseEvent) -> None:
+        with self._lock:
+            self.phases.append(event)
+
+    def bytes_received(self, dataset: str, count: int) -> None:
+        with self._lock:
+            self.received_bytes[dataset] = self.received_bytes.get(dataset, 0) + count
+
+    def cache_lookup(self, dataset: str, cache: str, hit: bool) -> None:
+        with self._lock:
+            self.cache_lookups.append((dataset, cache, hit))
+
+    def phase(self, name: str) -> Optional[PhaseEvent]:
+        """name 단계의 마지막 결과. 없으면 None"""
+        with self._lock:
+            return next((event for event in reversed(self.phases) if event.phase == name), None)
+
+
+@contextmanager
+def observe_phase(observer: LoaderObserver, dataset: str, phase: str) -> Iterator[Dict[str, float]]:
+    """
+    with 블록을 phase 단계로 측정해 observer에 알립니다. 블록 안에서 yield 된 dict에 지표를 기록하면
+    "bytes", "records"에 대해서는 초당 처리량이 추가됩니다.
+    """
+    metrics: Dict[str, float] = {}
+    observer.phase_started(dataset, phase)
+    started = time.perf_counter()
+    try:
+        yield metrics
+    except BaseException as e:
+        observer.phase_finished(PhaseEvent(dataset, phase, time.perf_counter() - started, metrics, e))
+        raise
+    seconds = time.perf_counter() - started
+    for key, rate in _RATES.items():
+        if key in metrics and seconds > 0:
+            metrics[rate] = metrics[key] / seconds
+    observer.phase_finished(PhaseEvent(dataset, phase, seconds, metrics))
@@ -0,0 +1,92 @@
+from concurrent.futures import Executor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+import os
+import threading
+import time
+from .loader import Loader
+from .utils import spawn_pool
+
+
+SKIPPED = "skipped"
+DOWNLOADED = "downloaded"
+FAILED = "failed"
+
+
+class PrefetchResult(NamedTuple):
+    """prefetch()가 Loader 하나에 대해 반환하는 결과"""
+    dataset_name: str
+    save_path: str
+    status: str
+    seconds: float
+    error: Optional[BaseException] = None
+
+
+def prefetch(loaders: Iterable[Loader], jobs: int = 4) -> List[PrefetchResult]:
+    """
+    여러 Loader의 다운로드, 압축 해제, 후처리를 동시에 실행합니다.
+
+    - 다운로드(네트워크 I/O)는 스레드에서 실행되며 동시에 최대 jobs개로 제한됩니다.
+    - 압축 해제와 후처리(Spider-Ko 질문 토큰화 등)의 CPU 작업은 최대 jobs개의 프로세스 풀 하나에서 실행됩니다.
+    - 같은 save_path와 gdrive_id를 쓰는 Loader들(SpiderLoader와 SpiderKoLoader 등)은
+      다운로드와 압축 해제를 한 번만 하고, 후처리만 각각 실행합니다.
+
+    한 Loader의 실패가 다른 Loader를 멈추지 않으며, 실패는 결과의 error로 전달됩니다.
+
+    Args:
+        loaders (Iterable[Loader]): 준비할 Loader들
+        jobs (int): 동시에 실행할 다운로드 및 압축 해제 작업 수
+
+    Returns:
+        List[PrefetchResult]: 입력 순서와 같은 순서의 결과
+    """
+    loaders = list(loaders)
+    if jobs < 1:
+        raise ValueError(f"jobs must be at least 1, got {jobs}")
+
+    groups: Dict[Tuple[str, str], List[Loader]] = {}
+    for loader in loaders:
+        key = (os.path.abspath(loader.save_path), loader.gdrive_id)
+        groups.setdefault(key, []).append(loader)
+
+    results: Dict[int, PrefetchResult] = {}
+    network_slots = threading.BoundedSemaphore(jobs)
+    with spawn_pool(jobs) as cpu_pool, \
+         ThreadPoolExecutor(max_workers=len(groups) or 1) as group_pool:
+        futures = [group_pool.submit(_prefetch_group, group, network_slots, cpu_pool) for group in groups.values()]
+        for group, future in zip(groups.values(), futures):
+            for loader, result in zip(group, future.result()):
+                results[id(loader)] = result
+
+    return [results[id(loader)] for loader in loaders]
+
+
+def _prefetch_group(group: List[Loader], network_slots: threading.BoundedSemaphore,
+                    cpu_pool: Executor) -> List[PrefetchResult]:
+    started = time.perf_counter()
+    primary = group[0]
+    status = SKIPPED
+    try:
+        Path(primary.save_path).mkdir(parents=True, exist_ok=True)
+        if not primary.is_installed():
+            with network_slots:
+                # streaming 모드는 다운로드하면서 압축 해제까지 끝내고 None을 반환
+                archive_path = primary.fetch()
+            if archive_path is not None:
+                primary.install(archive_path, cpu_pool)
+            status = DOWNLOADED
+    except Exception as e:
+        elapsed = time.perf_counter() - started
+        return [PrefetchResult(loader.dataset_name, loader.save_path, FAILED, elapsed, e) for loader in group]
+
+    results = []
+    for loader in group:
+        try:
+            # Spider-Ko 질문 토큰화 등 후처리의 CPU 작업도 같은 프로세스 풀에서 실행
+            loader.post_process(cpu_pool)
+            results.append(PrefetchResult(loader.dataset_name, loader.save_path, status,
+                                          time.perf_counter() - started))
+        except Exception as e:
+            results.append(PrefetchResult(loader.dataset_name, loader.save_path, FAILED,
+                                          time.perf_counter() - started, e))
+    return results
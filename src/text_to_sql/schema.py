@@ -0,0 +1,185 @@
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional
+import json
+import sys
+
+
+# 프로세스 전체에서 유지할 tables.json 파싱 결과의 수
+CATALOG_CACHE_SIZE = 8
+
+
+class Column:
+    """
+    테이블의 컬럼 하나입니다. Spider의 0번 컬럼 `*`은 table이 None입니다.
+
+    Attributes:
+        index (int): tables.json의 column_names_original 내 위치
+        table (Optional[Table]): 소속 테이블
+        name (str): 원본 컬럼 이름 (column_names_original)
+        natural_name (str): 자연어 컬럼 이름 (column_names)
+        type (str): column_types의 타입
+        is_primary_key (bool): 기본 키에 포함되는지 여부
+    """
+
+    __slots__ = ("index", "table", "name", "natural_name", "type", "is_primary_key")
+
+    def __init__(self, index: int, table: Optional["Table"], name: str, natural_name: str, type: str):
+        self.index = index
+        self.table = table
+        self.name = name
+        self.natural_name = natural_name
+        self.type = type
+        self.is_primary_key = False
+
+    def __repr__(self) -> str:
+        table_name = self.table.name if self.table is not None else None
+        return f"Column({table_name}.{self.name})"
+
+
+class ForeignKey(NamedTuple):
+    """source 컬럼이 target 컬럼을 참조하는 외래 키"""
+    source: Column
+    target: Column
+
+
+class Table:
+    """
+    테이블 하나와 그 컬럼들입니다. 컬럼 이름 조회는 대소문자를 구분하지 않으며 O(1)입니다.
+    """
+
+    __slots__ = ("index", "name", "natural_name", "columns", "primary_keys", "_columns_by_name")
+
+    def __init__(self, index: int, name: str, natural_name: str):
+        self.index = index
+        self.name = name
+        self.natural_name = natural_name
+        self.columns: List[Column] = []
+        self.primary_keys: List[Column] = []
+        self._columns_by_name: Dict[str, Column] = {}
+
+    def column(self, name: str) -> Optional[Column]:
+        return self._columns_by_name.get(name.lower())
+
+    def __repr__(self) -> str:
+        return f"Table({self.name})"
+
+
+class DatabaseSchema:
+    """
+    db_id 하나의 스키마입니다. 테이블, 컬럼, 기본 키, 외래 키 그래프를 O(1)로 조회할 수 있습니다.
+    """
+
+    def __init__(self, db_id: str, tables: List[Table], columns: List[Column], foreign_keys: List[ForeignKey]):
+        self.db_id = db_id
+        self.tables = tables
+        self.columns = columns
+        self.foreign_keys = foreign_keys
+        self._tables_by_name = {table.name.lower(): table for table in tables}
+        self._foreign_key_graph: Dict[str, Dict[str, List[ForeignKey]]] = {table.name.lower(): {} for table in tables}
+        for foreign_key in foreign_keys:
+            source_table = foreign_key.source.table.name.lower()
+            target_table = foreign_key.target.table.name.lower()
+            self._foreign_key_graph[source_table].setdefault(target_table, []).append(foreign_key)
+            self._foreign_key_graph[target_table].setdefault(source_table, []).append(foreign_key)
+
+    def table(self, name: str) -> Optional[Table]:
+        return self._tables_by_name.get(name.lower())
+
+    def column(self, table_name: str, column_name: str) -> Optional[Column]:
+        table = self.table(table_name)
+        return table.column(column_name) if table is not None else None
+
+    def primary_keys(self, table_name: str) -> List[Column]:
+        table = self.table(table_name)
+        return table.primary_keys if table is not None else []
+
+    def neighbors(self, table_name: str) -> Dict[str, List[ForeignKey]]:
+        """외래 키로 연결된 테이블 이름(소문자) -> 두 테이블을 잇는 외래 키 목록. 방향과 무관하게 양쪽에서 조회됩니다."""
+        return self._foreign_key_graph.get(table_name.lower(), {})
+
+    def join_keys(self, left_table: str, right_table: str) -> List[ForeignKey]:
+        return self.neighbors(left_table).get(right_table.lower(), [])
+
+    @classmethod
+    def from_record(cls, record: dict) -> "DatabaseSchema":
+        intern = sys.intern
+        tables = [
+            Table(index, intern(name), intern(natural_name))
+            for index, (name, natural_name) in enumerate(zip(record["table_names_original"], record["table_names"]))
+        ]
+        columns = []
+        for index, ((table_index, name), (_, natural_name), column_type) in enumerate(
+                zip(record["column_names_original"], record["column_names"], record["column_types"])):
+            table = tables[table_index] if table_index >= 0 else None
+            column = Column(index, table, intern(name), intern(natural_name), intern(column_type))
+            columns.append(column)
+            if table is not None:
+                table.columns.append(column)
+                table._columns_by_name.setdefault(name.lower(), column)
+
+        # BIRD는 복합 기본 키를 [col, col] 형태로 기록함
+        for primary_key in record.get("primary_keys", []):
+            for index in (primary_key if isinstance(primary_key, list) else [primary_key]):
+                column = columns[index]
+                column.is_primary_key = True
+                if column.table is not None:
+                    column.table.primary_keys.append(column)
+
+        foreign_keys = [ForeignKey(columns[source], columns[target]) for source, target in record.get("foreign_keys", [])
+                        if columns[source].table is not None and columns[target].table is not None]
+        return cls(intern(record["db_id"]), tables, columns, foreign_keys)
+
+    def __repr__(self) -> str:
+        return f"DatabaseSchema({self.db_id}, tables={len(self.tables)})"
+
+
+class SchemaCatalog:
+    """
+    tables.json(또는 dev_tables.json) 전체를 파싱한 결과입니다. db_id로 DatabaseSchema를 조회합니다.
+
+    SchemaCatalog.load()는 파일의 (경로, 크기, mtime)을 key로 프로세스 전체 LRU 캐시를 사용하므로,
+    같은 파일을 여러 Loader나 여러 번 요청하더라도 한 번만 파싱합니다.
+    """
+
+    def __init__(self, schemas: Dict[str, DatabaseSchema]):
+        self._schemas = schemas
+
+    @classmethod
+    def load(cls, path: Path) -> "SchemaCatalog":
+        path = Path(path).resolve()
+        stat = path.stat()
+        return _load_catalog(str(path), stat.st_size, stat.st_mtime_ns)
+
+    @classmethod
+    def from_records(cls, records: List[dict]) -> "SchemaCatalog":
+        return cls({record["db_id"]: DatabaseSchema.from_record(record) for record in records})
+
+    def __getitem__(self, db_id: str) -> DatabaseSchema:
+        try:
+            return self._schemas[db_id]
+        except KeyError:
+            raise KeyError(f"Unknown db_id: {db_id}") from None
+
+    def __contains__(self, db_id: str) -> bool:
+        return db_id in self._schemas
+
+    def __iter__(self) -> Iterator[DatabaseSchema]:
+        return iter(self._schemas.values())
+
+    def __len__(self) -> int:
+        return len(self._schemas)
+
+    def db_ids(self) -> List[str]:
+        return list(self._schemas)
+
+
+@lru_cache(maxsize=CATALOG_CACHE_SIZE)
+def _load_catalog(path: str, size: int, mtime_ns: int) -> SchemaCatalog:
+    with open(path, "r", encoding="utf-8") as f:
+        return SchemaCatalog.from_records(json.load(f))
+
+
+def clear_catalog_cache() -> None:
+    """프로세스 전체 SchemaCatalog 캐시를 비웁니다."""
+    _load_catalog.cache_clear()
@@ -0,0 +1,204 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import json
+import sqlite3
+from .connection import open_readonly, quote_identifier
+from .schema import DatabaseSchema, SchemaCatalog, Table
+from .utils import atomic_write
+
+
+DDL = "ddl"
+COMPACT = "compact"
+RENDER_FORMATS = (DDL, COMPACT)
+
+# 저장 형식이 바뀌면 올려서 기존 결과를 다시 만들도록 합니다.
+FORMAT_VERSION = 2
+# 프로세스 전체에서 유지할 렌더링 결과 파일의 수
+RENDERINGS_CACHE_SIZE = 16
+# 예시 행의 값이 이보다 길면 잘라서 표시
+MAX_SAMPLE_VALUE_LENGTH = 50
+
+
+
+def render_database(schema: DatabaseSchema, format: str = DDL,
+                    sample_rows: Optional[Dict[str, Tuple[List[str], List[tuple]]]] = None) -> str:
+    """
+    스키마 하나를 프롬프트에 넣을 문자열로 만듭니다.
+
+    - "ddl": 테이블마다 `CREATE TABLE` 문. 기본 키와 외래 키 제약을 포함합니다.
+    - "compact": 테이블마다 `table(col, col)` 한 줄
+
+    Args:
+        schema (DatabaseSchema): 렌더링할 스키마
+        format (str): "ddl" 또는 "compact"
+        sample_rows (Optional[Dict[str, Tuple[List[str], List[tuple]]]]): 테이블 이름 -> (컬럼 이름들, 예시 행들)
+
+    Raises:
+        ValueError: 지원하지 않는 format인 경우
+    """
+    if format not in RENDER_FORMATS:
+        raise ValueError(f"Unknown schema format: {format!r} (expected one of {RENDER_FORMATS})")
+    sample_rows = sample_rows or {}
+    render_table = _render_ddl_table if format == DDL else _render_compact_table
+    separator = "\n\n" if format == DDL else "\n"
+    return separator.join(render_table(schema, table, sample_rows.get(table.name)) for table in schema.tables)
+
+
+def read_sample_rows(sqlite_path: Path, table_names: List[str], count: int) -> Dict[str, Tuple[List[str], List[tuple]]]:
+    """sqlite 파일의 테이블마다 앞에서부터 count개의 행을 읽습니다. 읽을 수 없는 테이블은 건너뜁니다."""
+    rows: Dict[str, Tuple[List[str], List[tuple]]] = {}
+    connection = open_readonly(sqlite_path)
+    try:
+        for name in table_names:
+            try:
+                cursor = connection.execute(f"SELECT * FROM {quote_identifier(name)} LIMIT ?", (count,))
+            except sqlite3.Error:
+                continue
+            rows[name] = ([description[0] for description in cursor.description], cursor.fetchall())
+    finally:
+        connection.close()
+    return rows
+
+
+class SchemaRenderings:
+    """
+    데이터셋의 모든 db_id에 대해 미리 렌더링한 스키마 문자열과 그 길이입니다.
+
+    SchemaRenderings.load()는 파일의 (경로, 크기, mtime)을 key로 프로세스 전체 LRU 캐시를 사용하므로,
+    같은 결과 파일은 프로세스마다 한 번만 읽습니다.
+
+    Attributes:
+        format (str): "ddl" 또는 "compact"
+        sample_rows (int): 테이블마다 포함한 예시 행 수
+        source (str): 렌더링에 사용한 원본 파일들의 fingerprint
+    """
+
+    def __init__(self, format: str, sample_rows: int, source: str, schemas: Dict[str, Tuple[str, int]]):
+        self.format = format
+        self.sample_rows = sample_rows
+        self.source = source
+        self._schemas = schemas
+
+    @classmethod
+    def build(cls, catalog: SchemaCatalog, format: str, sample_rows: int, source: str,
+              sqlite_path: Optional[Callable[[str], Path]] = None, jobs: Optional[int] = None) -> "SchemaRenderings":
+        """
+        catalog의 모든 db_id를 렌더링합니다. sample_rows가 있으면 sqlite 파일에서 예시 행을 스레드 풀로 동시에 읽습니다.
+
+        Args:
+            catalog (SchemaCatalog): 렌더링할 스키마들
+            format (str): "ddl" 또는 "compact"
+            sample_rows (int): 테이블마다 포함할 예시 행 수
+            source (str): 원본 파일들의 fingerprint
+            sqlite_path (Optional[Callable[[str], Path]]): db_id -> sqlite 파일 경로. sample_rows가 있을 때 필요
+            jobs (Optional[int]): 예시 행을 읽을 스레드 수
+        """
+        if format not in RENDER_FORMATS:
+            raise ValueError(f"Unknown schema format: {format!r} (expected one of {RENDER_FORMATS})")
+
+        def render(schema: DatabaseSchema) -> Tuple[str, Tuple[str, int]]:
+            rows = None
+            if sample_rows and sqlite_path is not None:
+                try:
+                    rows = read_sample_rows(sqlite_path(schema.db_id), [table.name for table in schema.tables],
+                                            sample_rows)
+                except FileNotFoundError:
+                    # 스키마 파일에는 있지만 데이터베이스가 없는 db_id는 예시 행 없이 렌더링
+                    rows = None
+            text = render_database(schema, format, rows)
+            return schema.db_id, (text, len(text))
+
+        if sample_rows and sqlite_path is not None and jobs != 1:
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                schemas = dict(executor.map(render, catalog))
+        else:
+            schemas = dict(render(schema) for schema in catalog)
+        return cls(format, sample_rows, source, schemas)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["SchemaRenderings"]:
+        """저장된 결과를 읽습니다. 파일이 없거나 손상되었으면 None"""
+        path = Path(path).resolve()
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return _load_renderings(str(path), stat.st_size, stat.st_mtime_ns)
+
+    def save(self, path: Path) -> None:
+        with atomic_write(path) as f:
+            json.dump({"version": FORMAT_VERSION, "format": self.format, "sample_rows": self.sample_rows,
+                       "source": self.source, "schemas": self._schemas}, f, ensure_ascii=False)
+
+    def __getitem__(self, db_id: str) -> str:
+        try:
+            return self._schemas[db_id][0]
+        except KeyError:
+            raise KeyError(f"Unknown db_id: {db_id}") from None
+
+    def length(self, db_id: str) -> int:
+        """렌더링한 문자열의 길이(문자 수). 프롬프트 길이 예산을 계산할 때 문자열을 만들지 않고 사용합니다."""
+        try:
+            return self._schemas[db_id][1]
+        except KeyError:
+            raise KeyError(f"Unknown db_id: {db_id}") from None
+
+    def __contains__(self, db_id: str) -> bool:
+        return db_id in self._schemas
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._schemas)
+
+    def __len__(self) -> int:
+        return len(self._schemas)
+
+
+@lru_cache(maxsize=RENDERINGS_CACHE_SIZE)
+def _load_renderings(path: str, size: int, mtime_ns: int) -> Optional[SchemaRenderings]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data["version"] != FORMAT_VERSION:
+            return None
+        schemas = {db_id: (text, length) for db_id, (text, length) in data["schemas"].items()}
+        return SchemaRenderings(data["format"], data["sample_rows"], data["source"], schemas)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def clear_renderings_cache() -> None:
+    """프로세스 전체 SchemaRenderings 캐시를 비웁니다."""
+    _load_renderings.cache_clear()
+
+
+def _render_ddl_table(schema: DatabaseSchema, table: Table, rows: Optional[Tuple[List[str], List[tuple]]]) -> str:
+    lines = [f"  {quote_identifier(column.name)} {column.type}" for column in table.columns]
+    if table.primary_keys:
+        lines.append(f"  PRIMARY KEY ({', '.join(quote_identifier(column.name) for column in table.primary_keys)})")
+    for foreign_key in schema.foreign_keys:
+        if foreign_key.source.table is table:
+            lines.append(f"  FOREIGN KEY ({quote_identifier(foreign_key.source.name)}) REFERENCES "
+                         f"{quote_identifier(foreign_key.target.table.name)}({quote_identifier(foreign_key.target.name)})")
+    text = f"CREATE TABLE {quote_identifier(table.name)} (\n" + ",\n".join(lines) + "\n);"
+    if rows is not None and rows[1]:
+        names, values = rows
+        sample = "\n".join("\t".join(_format_value(value) for value in row) for row in values)
+        text += (f"\n/*\n{len(values)} example rows:\nSELECT * FROM {quote_identifier(table.name)} LIMIT {len(values)};\n"
+                 + "\t".join(names) + "\n" + sample + "\n*/")
+    return text
+
+
+def _render_compact_table(schema: DatabaseSchema, table: Table, rows: Optional[Tuple[List[str], List[tuple]]]) -> str:
+    text = f"{table.name}({', '.join(column.name for column in table.columns)})"
+    if rows is not None and rows[1]:
+        text += "".join("\n  (" + ", ".join(_format_value(value) for value in row) + ")" for row in rows[1])
+    return text
+
+
+def _format_value(value) -> str:
+    if isinstance(value, bytes):
+        return "<blob>"
+    text = str(value).replace("\n", " ")
+    return text if len(text) <= MAX_SAMPLE_VALUE_LENGTH else text[:MAX_SAMPLE_VALUE_LENGTH] + "..."
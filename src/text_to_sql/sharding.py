@@ -0,0 +1,82 @@
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+import heapq
+
+
+# 과거 실행 시간이 없는 데이터베이스의 예제 하나당 비용(초) 추정: 고정 비용 + 데이터베이스 크기 / 읽기 속도
+BASE_QUERY_SECONDS = 0.001
+SCAN_BYTES_PER_SECOND = 500 * 1024 * 1024
+
+
+class Shard(NamedTuple):
+    """
+    여러 노드로 나눠 채점할 때 한 노드가 맡는 예제들입니다.
+
+    Attributes:
+        index (int): shard 번호 (0부터)
+        db_ids (List[str]): 이 shard의 예제가 사용하는 데이터베이스. 노드는 이 데이터베이스만 준비하면 됩니다.
+        example_indices (List[int]): 이 shard가 맡은 split 안의 예제 index (오름차순)
+        cost (float): 추정 비용(초)
+    """
+    index: int
+    db_ids: List[str]
+    example_indices: List[int]
+    cost: float
+
+
+def estimate_costs(examples_by_db: Mapping[str, Sequence[int]], database_sizes: Mapping[str, int],
+                   query_times: Optional[Mapping[str, float]] = None) -> Dict[str, float]:
+    """
+    db_id마다 그 데이터베이스의 예제를 모두 실행하는 비용(초)을 추정합니다.
+
+    Args:
+        examples_by_db (Mapping[str, Sequence[int]]): db_id -> 예제 index들
+        database_sizes (Mapping[str, int]): db_id -> sqlite 파일 크기. 없는 db_id는 0으로 봄
+        query_times (Optional[Mapping[str, float]]): db_id -> 과거에 측정한 예제 하나당 실행 시간(초).
+            있으면 크기로 추정한 값 대신 사용
+    """
+    query_times = query_times or {}
+    costs = {}
+    for db_id, indices in examples_by_db.items():
+        per_example = query_times.get(db_id)
+        if per_example is None:
+            per_example = BASE_QUERY_SECONDS + database_sizes.get(db_id, 0) / SCAN_BYTES_PER_SECOND
+        costs[db_id] = len(indices) * per_example
+    return costs
+
+
+def plan_shards(examples_by_db: Mapping[str, Sequence[int]], costs: Mapping[str, float],
+                num_shards: int) -> List[Shard]:
+    """
+    예제를 db_id 단위로 묶어 num_shards개의 shard로 나눕니다.
+
+    같은 db_id의 예제는 항상 같은 shard에 들어가므로 노드마다 필요한 데이터베이스만 열게 됩니다.
+    비용이 큰 db_id부터 현재 비용이 가장 작은 shard에 넣으며(LPT), 비용이 같으면 db_id와 shard 번호 순으로 정하므로
+    입력이 같으면 어느 노드에서 계산해도 같은 결과가 나옵니다.
+
+    Raises:
+        ValueError: num_shards가 1보다 작은 경우
+    """
+    if num_shards < 1:
+        raise ValueError(f"num_shards must be at least 1, got {num_shards}")
+
+    heap: List[Tuple[float, int]] = [(0.0, index) for index in range(num_shards)]
+    assigned: List[List[str]] = [[] for _ in range(num_shards)]
+    loads = [0.0] * num_shards
+    for db_id in sorted(examples_by_db, key=lambda db_id: (-costs[db_id], db_id)):
+        load, index = heapq.heappop(heap)
+        assigned[index].append(db_id)
+        loads[index] = load + costs[db_id]
+        heapq.heappush(heap, (loads[index], index))
+
+    return [
+        Shard(index, sorted(db_ids), sorted(i for db_id in db_ids for i in examples_by_db[db_id]), loads[index])
+        for index, db_ids in enumerate(assigned)
+    ]
+
+
+def group_by_db_id(examples: Iterable) -> Dict[str, List[int]]:
+    """Example들을 db_id -> index 목록으로 묶습니다."""
+    groups: Dict[str, List[int]] = {}
+    for example in examples:
+        groups.setdefault(example.db_id, []).append(example.index)
+    return groups
@@ -1,17 +1,58 @@
+from concurrent.futures import Executor
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Union
+import itertools
 import json
+from .downloader import sha256_of
+from .examples import iter_json_array, write_json_array
+from .observers import observe_phase
+from .spider_ko_sources import HuggingFaceSource, LocalDirectorySource, SpiderKoSnapshot, SpiderKoSource
 from .spider_loader import SpiderLoader
-from datasets import load_dataset
-from mecab import MeCab
+from .tokenization import create_tokenizer, tokenize_questions, tokenizer_version
+from .utils import atomic_write
+
+
+# 한국어 split -> (huggingface split, sql을 가져올 Spider 원본 파일들)
+KO_SPLITS = {
+    "dev": ("validation", ["dev.json"]),
+    "train": ("train", ["train_spider.json", "train_others.json"]),
+}
+
 
 class SpiderKoLoader(SpiderLoader):
     """Spider Korean 데이터셋을 위한 로더"""
 
-    def __init__(self, save_path: str):
-        super().__init__(save_path)
+    def __init__(self, save_path: str, tokenize_jobs: Optional[int] = None, hf_revision: Optional[str] = None,
+                 source: Optional[Union[str, Path, SpiderKoSource]] = None, refresh_source: bool = False, **kwargs):
+        """
+        Args:
+            save_path (str): 데이터를 저장할 경로
+            tokenize_jobs (Optional[int]): 질문 토큰화에 사용할 프로세스 수. 기본값은 CPU 수이며 1이면 현재 프로세스에서 실행
+            hf_revision (Optional[str]): huggingface 데이터셋의 revision(브랜치, 태그, 커밋). None이면 기본 브랜치
+            source (Optional[Union[str, Path, SpiderKoSource]]): Spider-Ko 행을 가져올 source.
+                경로를 주면 해당 디렉토리의 split 파일을 읽고, None이면 huggingface에서 필요한 split만 가져옴
+            refresh_source (bool): True이면 snapshot이 있어도 huggingface의 현재 커밋을 조회해 바뀌었으면 다시 가져옴.
+                기본값은 snapshot이 있으면 hub에 접근하지 않음
+        """
+        super().__init__(save_path, **kwargs)
         self.hf_dataset_name = "huggingface-KREW/spider-ko"
-        self.tokenizer = MeCab()  # Mecab 한국어 토크나이저 초기화
+        self.hf_revision = hf_revision
+        if source is None:
+            source = HuggingFaceSource(self.hf_dataset_name, hf_revision, refresh=refresh_source)
+        elif isinstance(source, (str, Path)):
+            source = LocalDirectorySource(Path(source))
+        self.source = source
+        # 가져온 split은 spider_data 옆에 보관해 다음 실행부터 네트워크 없이 사용
+        self.snapshot = SpiderKoSnapshot(Path(save_path, "spider_ko"))
+        self.tokenize_jobs = tokenize_jobs
+        self._tokenizer = None
+
+    @property
+    def tokenizer(self):
+        """Mecab 한국어 토크나이저. 경로만 필요한 경우를 위해 처음 사용할 때 초기화합니다."""
+        if self._tokenizer is None:
+            self._tokenizer = create_tokenizer()
+        return self._tokenizer
 
     def get_sqlite_json_files(self):
         """
@@ -22,53 +63,158 @@ class SpiderKoLoader(SpiderLoader):
         base_files["dev"] = Path(self._get_dataset_detail_path_root(), "dev_ko.json")
         return base_files
 
+    def get_split_files(self):
+        """
+        Spider Korean 데이터셋의 split별 JSON 파일들을 반환합니다.
+        """
+        return {split: [self._get_ko_split_path(split)] for split in KO_SPLITS}
+
     def download_dataset(self):
         """
         Spider 데이터셋을 다운로드하고, 한국어 데이터셋을 추가로 처리합니다.
         """
         # 1. super의 download_dataset 호출
         super().download_dataset()
-        
-        if self._is_spider_ko_dataset_already_downloaded():
+        self.post_process()
+
+    def _post_process(self, executor: Optional[Executor] = None):
+        """
+        다운로드된 Spider 데이터셋을 바탕으로 dev_ko.json, train_ko.json을 생성합니다.
+        입력(Spider-Ko source와 revision, Spider 원본 파일, 토크나이저 버전)이 바뀐 split만 다시 만듭니다.
+        executor를 지정하면 질문 토큰화를 그 프로세스 풀에서 실행합니다.
+        """
+        stale_splits = self._get_stale_splits()
+        for split in KO_SPLITS:
+            self.observer.cache_lookup(self.dataset_name, f"spider_ko:{split}", split not in stale_splits)
+        if not stale_splits and super()._is_dataset_already_downloaded():
             print("Spider Korean 데이터셋이 이미 다운로드되었습니다. Skipping download.")
             return
-        
-        # 2. huggingface로부터 spider-ko 데이터셋 다운로드
-        dataset = load_dataset(self.hf_dataset_name)
-        
-        # 3. 2의 데이터셋을 기반으로 dev_ko.json 생성
-        content = []
-        
-        # 4. spider의 dev.json 불러오기
-        with open(Path(self._get_dataset_detail_path_root(), "dev.json"), "r", encoding="utf-8") as f:
-            dev_data = json.load(f)
-
-
-        dev_kv = {}
-        for item in dev_data:
-            dev_kv[item["query"]] = item
-
-        
-        for item in dataset["validation"]:
-            # 한국어 질문을 토큰화
-            question_ko = item["question_ko"]
-            question_toks_ko = self.tokenizer.morphs(question_ko)  # Mecab 형태소 단위로 토큰화
-            
-            content.append({
+
+        # 2. 필요한 split만 로컬 snapshot에서 읽거나, 없으면 source(huggingface 등)에서 가져와 snapshot에 저장
+        # 3. split마다 Spider 원본의 sql을 붙이고 질문을 토큰화해 <split>_ko.json 생성
+        for split, fingerprint in stale_splits.items():
+            hf_split, spider_files = KO_SPLITS[split]
+            with observe_phase(self.observer, self.dataset_name, f"fetch:{split}"):
+                revision, rows = self.snapshot.fetch(self.source, hf_split)
+            with observe_phase(self.observer, self.dataset_name, f"tokenize:{split}") as metrics:
+                metrics["records"] = self._build_split(split, rows, spider_files, dict(fingerprint, revision=revision),
+                                                      executor)
+
+    def _build_split(self, split: str, rows, spider_files: List[str], fingerprint: dict,
+                     executor: Optional[Executor] = None) -> int:
+        """
+        Spider-Ko split의 행들을 토큰화하면서 <split>_ko.json에 순서대로 기록하고 fingerprint를 남깁니다.
+
+        이전 빌드와 토크나이저 버전이 같으면 질문이 바뀌지 않은 행은 기존 토큰을 재사용하고, 새로운 질문만 토큰화합니다.
+        전체 결과를 메모리에 모으지 않고 토큰화가 끝나는 batch부터 파일에 씁니다.
+        """
+        output_path = self._get_ko_split_path(split)
+
+        # Spider 원본 파일에서 query -> sql 매핑만 만듦
+        sql_by_query = {}
+        for name in spider_files:
+            for item in iter_json_array(Path(self._get_dataset_detail_path_root(), name)):
+                sql_by_query[item["query"]] = item["sql"]
+
+        previous_tokens = {}
+        previous = self._read_build_record(split)
+        if previous is not None and previous.get("tokenizer") == fingerprint["tokenizer"] and output_path.exists():
+            for item in iter_json_array(output_path):
+                previous_tokens[item["question"]] = item["question_toks"]
+
+        tokenizer = self.tokenizer if self.tokenize_jobs == 1 else None
+        # 토큰화 쪽이 앞서 읽은 행만 tee에 남으므로 split 전체를 메모리에 두지 않음
+        question_rows, rows = itertools.tee(rows)
+        new_tokens = tokenize_questions(
+            (item["question_ko"] for item in question_rows if item["question_ko"] not in previous_tokens),
+            jobs=self.tokenize_jobs, tokenizer=tokenizer, executor=executor)
+        records = (
+            {
                 "db_id": item["db_id"],
                 "query": item["query"],
                 "query_toks": item["query_toks"],
                 "query_toks_no_value": item["query_toks_no_value"],
-                "question": question_ko,
-                "question_toks": question_toks_ko,
-                "sql": dev_kv[item["query"]]["sql"]
-            })
+                "question": item["question_ko"],
+                # Mecab 형태소 단위로 토큰화. 바뀌지 않은 질문은 이전 결과를 사용
+                "question_toks": previous_tokens[item["question_ko"]] if item["question_ko"] in previous_tokens
+                else next(new_tokens),
+                "sql": sql_by_query[item["query"]],
+            }
+            for item in rows
+        )
+        count = write_json_array(output_path, records)
+
+        stat = output_path.stat()
+        self._write_build_record(split, dict(fingerprint, output=[stat.st_size, stat.st_mtime_ns]))
+        return count
+
+    def _get_stale_splits(self) -> Dict[str, dict]:
+        """
+        다시 만들어야 하는 split -> 현재 입력의 fingerprint.
+        Spider 원본 파일은 크기와 mtime이 이전 빌드와 같으면 해시를 다시 계산하지 않습니다.
+        """
+        stale = {}
+        for split, (hf_split, spider_files) in KO_SPLITS.items():
+            previous = self._read_build_record(split) or {}
+            previous_files = previous.get("spider_files", {})
+            files = {}
+            for name in spider_files:
+                path = Path(self._get_dataset_detail_path_root(), name)
+                if not path.exists():
+                    files = None
+                    break
+                stat = path.stat()
+                size_and_mtime = [stat.st_size, stat.st_mtime_ns]
+                cached = previous_files.get(name)
+                digest = cached[2] if cached and cached[:2] == size_and_mtime else sha256_of(path)
+                files[name] = size_and_mtime + [digest]
+
+            fingerprint = {
+                "source": self.source.key,
+                "hf_split": hf_split,
+                "revision": self.snapshot.revision(self.source, hf_split),
+                "spider_files": files,
+                "tokenizer": tokenizer_version(),
+            }
+            if not self._is_build_current(split, previous, fingerprint):
+                stale[split] = fingerprint
+        return stale
+
+    def _is_build_current(self, split: str, previous: dict, fingerprint: dict) -> bool:
+        if fingerprint["spider_files"] is None or fingerprint["revision"] is None or not previous:
+            return False
+        # mtime은 같은 내용의 파일을 다시 풀어도 바뀌므로 해시만 비교
+        digests = {name: entry[2] for name, entry in fingerprint["spider_files"].items()}
+        previous_digests = {name: entry[2] for name, entry in previous.get("spider_files", {}).items()}
+        if digests != previous_digests:
+            return False
+        if any(previous.get(key) != fingerprint[key] for key in ("source", "hf_split", "revision", "tokenizer")):
+            return False
+        output_path = self._get_ko_split_path(split)
+        if not output_path.exists():
+            return False
+        stat = output_path.stat()
+        return previous.get("output") == [stat.st_size, stat.st_mtime_ns]
+
+    def _get_build_record_path(self, split: str) -> Path:
+        return Path(self.save_path, ".manifests", f"SpiderKo-{split}.json")
+
+    def _read_build_record(self, split: str) -> Optional[dict]:
+        try:
+            with open(self._get_build_record_path(split), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_build_record(self, split: str, record: dict) -> None:
+        with atomic_write(self._get_build_record_path(split)) as f:
+            json.dump(record, f)
 
-        with open(Path(self._get_dataset_detail_path_root(), "dev_ko.json"), "w", encoding="utf-8") as f:
-            json.dump(content, f, indent=4, ensure_ascii=False)
+    def _get_ko_split_path(self, split: str) -> Path:
+        return Path(self._get_dataset_detail_path_root(), f"{split}_ko.json")
 
     def _is_spider_ko_dataset_already_downloaded(self) -> bool:
         """
-        Spider Korean 데이터셋이 이미 다운로드되었는지 확인합니다.
+        Spider Korean 데이터셋이 이미 다운로드되었고, 모든 split이 현재 입력으로 만들어졌는지 확인합니다.
         """
-        return super()._is_dataset_already_downloaded() and Path(self._get_dataset_detail_path_root(), "dev_ko.json").exists()
\ No newline at end of file
+        return super()._is_dataset_already_downloaded() and not self._get_stale_splits()
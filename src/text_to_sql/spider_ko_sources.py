@@ -0,0 +1,220 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+import gzip
+import json
+import os
+from .examples import iter_json_array
+from .utils import atomic_write
+
+
+# Spider-Ko 행에서 dev_ko.json, train_ko.json을 만드는 데 필요한 필드
+ROW_FIELDS = ("db_id", "query", "query_toks", "query_toks_no_value", "question_ko")
+
+
+def load_dataset(*args, **kwargs):
+    """datasets 패키지는 import 비용이 크므로(pyarrow, pandas 등) 실제로 huggingface 데이터셋이 필요할 때 import 합니다."""
+    from datasets import load_dataset as _load_dataset
+    return _load_dataset(*args, **kwargs)
+
+
+def dataset_revision(dataset_name: str, revision: Optional[str] = None) -> str:
+    """huggingface hub에서 revision(브랜치, 태그, 커밋. None이면 기본 브랜치)이 가리키는 커밋 sha를 조회합니다."""
+    from huggingface_hub import HfApi
+    return HfApi().dataset_info(dataset_name, revision=revision).sha
+
+
+def hub_offline() -> bool:
+    """HF_HUB_OFFLINE 또는 HF_DATASETS_OFFLINE 환경 변수로 huggingface hub 접근을 끈 경우 True"""
+    return any(os.environ.get(name, "").upper() in ("1", "ON", "YES", "TRUE")
+               for name in ("HF_HUB_OFFLINE", "HF_DATASETS_OFFLINE"))
+
+
+class SpiderKoSource(ABC):
+    """
+    Spider-Ko 행을 split 단위로 제공하는 source의 기본 클래스입니다.
+
+    key는 source를 식별하는 문자열로, 로컬 snapshot이 같은 source에서 만들어졌는지 확인하는 데 사용합니다.
+    """
+
+    key: str
+
+    def current_revision(self, split: str) -> Optional[str]:
+        """
+        split의 현재 revision. 알 수 없으면 None이며, 이 경우 snapshot을 그대로 사용합니다.
+        """
+        return None
+
+    @abstractmethod
+    def fetch(self, split: str) -> Tuple[str, List[dict]]:
+        """
+        split의 행들을 가져옵니다.
+
+        Returns:
+            Tuple[str, List[dict]]: (revision, ROW_FIELDS만 남긴 행 목록)
+        """
+        pass
+
+
+class HuggingFaceSource(SpiderKoSource):
+    """
+    huggingface hub의 데이터셋에서 요청한 split만 가져오는 source입니다.
+
+    가져온 split의 revision은 hub API로 조회한 커밋 sha입니다. 기본적으로 snapshot이 있으면 hub에 접근하지 않으며,
+    refresh=True일 때만 current_revision()이 기본 브랜치의 커밋을 조회해 바뀌었으면 snapshot을 다시 가져옵니다.
+    hub에 접근할 수 없으면(오프라인, 네트워크나 hub 오류) current_revision()이 None이 되어 기존 snapshot을 그대로 사용합니다.
+
+    Args:
+        dataset_name (str): huggingface 데이터셋 이름
+        revision (Optional[str]): 브랜치, 태그, 커밋. None이면 기본 브랜치
+        refresh (bool): True이면 snapshot이 있어도 hub의 현재 커밋과 비교
+    """
+
+    def __init__(self, dataset_name: str, revision: Optional[str] = None, refresh: bool = False):
+        self.dataset_name = dataset_name
+        self.revision = revision
+        self.refresh = refresh
+        self.key = f"hf:{dataset_name}@{revision or 'default'}"
+        self._sha: Optional[str] = None
+        self._sha_resolved = False
+
+    def current_revision(self, split: str) -> Optional[str]:
+        if not self.refresh:
+            return None
+        return self._resolve_sha()
+
+    def fetch(self, split: str) -> Tuple[str, List[dict]]:
+        sha = self._resolve_sha()
+        # streaming으로 읽으면 요청한 split의 파일만 받고 다른 split은 받거나 준비하지 않음
+        dataset = load_dataset(self.dataset_name, split=split, revision=sha or self.revision, streaming=True)
+        return sha or self.revision or "default", [_compact(row) for row in dataset]
+
+    def _resolve_sha(self) -> Optional[str]:
+        # 모든 split이 같은 커밋에 있으므로 source마다 한 번만 조회
+        if not self._sha_resolved:
+            self._sha = None
+            if not hub_offline():
+                try:
+                    self._sha = dataset_revision(self.dataset_name, self.revision)
+                except Exception:
+                    # 연결 오류는 설치된 HTTP 라이브러리(httpx, requests)와 hub의 예외로 올라오므로 모두 오프라인으로 취급
+                    pass
+            self._sha_resolved = True
+        return self._sha
+
+
+class LocalDirectorySource(SpiderKoSource):
+    """
+    로컬 디렉토리의 `<split>.jsonl.gz`, `<split>.jsonl` 또는 `<split>.json`(배열)에서 행을 읽는 source입니다.
+    네트워크 없이 동작하며, SpiderKoSnapshot 디렉토리도 그대로 source로 사용할 수 있습니다.
+
+    Args:
+        root (Path): split 파일들이 있는 디렉토리
+    """
+
+    SUFFIXES = (".jsonl.gz", ".jsonl", ".json")
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.key = f"dir:{self.root.resolve()}"
+
+    def current_revision(self, split: str) -> Optional[str]:
+        # 파일 이름, 크기, mtime. 파일이 바뀌면 snapshot과 이를 바탕으로 만든 split이 다시 만들어짐
+        path = self.split_path(split)
+        if path is None:
+            return None
+        stat = path.stat()
+        return f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    def fetch(self, split: str) -> Tuple[str, List[dict]]:
+        path = self.split_path(split)
+        if path is None:
+            raise FileNotFoundError(f"No {split} split in {self.root} (expected {split}{{{','.join(self.SUFFIXES)}}})")
+        revision = self.current_revision(split)
+        return revision, [_compact(row) for row in _read_rows(path)]
+
+    def split_path(self, split: str) -> Optional[Path]:
+        for suffix in self.SUFFIXES:
+            path = Path(self.root, f"{split}{suffix}")
+            if path.exists():
+                return path
+        return None
+
+
+class SpiderKoSnapshot:
+    """
+    source에서 가져온 split들을 gzip JSON Lines로 보관하는 로컬 snapshot입니다.
+    snapshot.json에 source key와 split별 revision을 기록하며, 같은 source로 다시 요청하면 네트워크 없이 snapshot에서 읽습니다.
+
+    Args:
+        root (Path): snapshot 디렉토리
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def revision(self, source: SpiderKoSource, split: str) -> Optional[str]:
+        """
+        source에서 가져온 split이 snapshot에 있고 source의 현재 revision과 같으면 그 revision, 아니면 None
+        """
+        meta = self._read_meta()
+        if meta.get("source") != source.key or not Path(self.root, f"{split}.jsonl.gz").exists():
+            return None
+        revision = meta.get("revisions", {}).get(split)
+        current = source.current_revision(split)
+        return revision if current is None or current == revision else None
+
+    def read(self, split: str) -> Iterator[dict]:
+        """snapshot의 split 행들을 파일에서 하나씩 읽습니다."""
+        return _read_rows(Path(self.root, f"{split}.jsonl.gz"))
+
+    def write(self, source_key: str, split: str, revision: str, rows: List[dict]) -> None:
+        """split을 기록합니다. source가 바뀌었으면 다른 source의 split들은 버립니다."""
+        # mtime을 0으로 고정해 같은 내용이면 같은 파일이 되도록 함
+        with atomic_write(Path(self.root, f"{split}.jsonl.gz"), "wb") as raw, \
+                gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+                f.write(b"\n")
+
+        meta = self._read_meta()
+        revisions = meta.get("revisions", {}) if meta.get("source") == source_key else {}
+        revisions[split] = revision
+        self._write_meta({"source": source_key, "revisions": revisions})
+
+    def fetch(self, source: SpiderKoSource, split: str) -> Tuple[str, Iterator[dict]]:
+        """
+        snapshot에 source의 split이 있으면 읽고, 없으면 source에서 가져와 기록합니다.
+        행은 어느 경우든 snapshot 파일에서 하나씩 읽으므로 split 전체를 메모리에 두지 않습니다.
+        """
+        revision = self.revision(source, split)
+        if revision is None:
+            revision, rows = source.fetch(split)
+            self.write(source.key, split, revision, rows)
+        return revision, self.read(split)
+
+    def _read_meta(self) -> dict:
+        try:
+            with open(Path(self.root, "snapshot.json"), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_meta(self, meta: Dict) -> None:
+        with atomic_write(Path(self.root, "snapshot.json")) as f:
+            json.dump(meta, f)
+
+
+def _compact(row) -> dict:
+    return {field: row[field] for field in ROW_FIELDS}
+
+
+def _read_rows(path: Path) -> Iterator[dict]:
+    if path.name.endswith(".json"):
+        yield from iter_json_array(path)
+        return
+    opener = gzip.open if path.name.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
@@ -1,13 +1,20 @@
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Mapping, Optional, Sequence, Union
+import threading
+from .example_cache import source_fingerprint
+from .examples import iter_json_array
+from .exact_match import (ExactMatchEvaluator, ExactMatchReport, build_gold_forms, load_gold_forms,
+                          save_gold_forms)
 from .loader import Loader
 
 
 
 class SpiderLoader(Loader):
 
-  def __init__(self, save_path: str):
-    super().__init__(save_path, "1403EGqzIDoHMdQF4c9Bkyl7dZLZ5Wt6J", "Spider")
+  def __init__(self, save_path: str, **kwargs):
+    super().__init__(save_path, "1403EGqzIDoHMdQF4c9Bkyl7dZLZ5Wt6J", "Spider", **kwargs)
+    self._exact_match_evaluators: Dict[str, ExactMatchEvaluator] = {}
+    self._exact_match_evaluators_lock = threading.Lock()
 
   def get_sqlite_database(self) -> Path:
     return Path(self._get_dataset_detail_path_root(), "database")
@@ -19,5 +26,59 @@ class SpiderLoader(Loader):
       "dev" : Path(self._get_dataset_detail_path_root(), "dev.json"),
     }
 
+  def get_split_files(self) -> Dict[str, List[Path]]:
+    return {
+      "dev" : [Path(self._get_dataset_detail_path_root(), "dev.json")],
+      "train" : [
+        Path(self._get_dataset_detail_path_root(), "train_spider.json"),
+        Path(self._get_dataset_detail_path_root(), "train_others.json"),
+      ],
+    }
+
+  def get_exact_match_evaluator(self, split: str = "dev") -> ExactMatchEvaluator:
+    """
+    split의 exact-set-match 채점기를 반환합니다. gold SQL은 dev.json 등의 `sql` 트리를 그대로 정규화하고
+    (트리가 없는 예제는 gold SQL을 파싱), 그 결과를 save_path/.cache/exact_match/ 아래에 저장해 재사용합니다.
+    split 파일이나 스키마 파일의 크기/mtime이 바뀐 경우에만 다시 만듭니다.
+
+    Raises:
+        ValueError: 데이터셋에 없는 split인 경우
+    """
+    split_paths = self._get_split_paths(split)
+    tables_path = self.get_sqlite_json_files()["table"]
+    fingerprint = source_fingerprint(split_paths + [tables_path])
+    with self._exact_match_evaluators_lock:
+      evaluator = self._exact_match_evaluators.get(split)
+      if evaluator is None or evaluator.fingerprint != fingerprint:
+        path = self._get_exact_match_path(split_paths)
+        gold = load_gold_forms(path, fingerprint)
+        self.observer.cache_lookup(self.dataset_name, "exact_match", gold is not None)
+        if gold is None:
+          records = (record for split_path in split_paths for record in iter_json_array(split_path))
+          gold = build_gold_forms(records, self.get_schema_catalog())
+          save_gold_forms(path, fingerprint, gold)
+        evaluator = ExactMatchEvaluator(tables_path, gold, fingerprint)
+        self._exact_match_evaluators[split] = evaluator
+      return evaluator
+
+  def evaluate_exact_match(self, predictions: Union[Sequence[str], Mapping[int, str]], split: str = "dev",
+                           jobs: Optional[int] = None) -> ExactMatchReport:
+    """
+    예측 SQL을 split의 gold SQL과 Spider exact-set-match 방식으로 채점합니다. 값은 비교하지 않습니다.
+    예측 SQL만 파싱하며, 같은 예측은 get_exact_match_evaluator()의 채점기가 기억한 결과를 재사용합니다.
+
+    Args:
+        predictions (Union[Sequence[str], Mapping[int, str]]): split 순서의 예측 SQL 목록 또는 예제 index -> 예측 SQL
+        split (str): 채점할 split
+        jobs (Optional[int]): 처음 보는 예측 SQL을 파싱할 worker 프로세스 수. 기본값은 CPU 수
+
+    Returns:
+        ExactMatchReport: 예제별 결과와 accuracy. 파싱할 수 없는 예측은 "error", gold는 "gold_error"
+    """
+    return self.get_exact_match_evaluator(split).evaluate(predictions, jobs=jobs)
+
+  def _get_exact_match_path(self, split_paths: List[Path]) -> Path:
+    return self._get_source_cache_path("exact_match", split_paths, ".json")
+
   def _get_dataset_detail_path_root(self) -> Path:
     return Path(self.save_path, "spider_data")
@@ -0,0 +1,103 @@
+from collections import deque
+from concurrent.futures import Executor
+from typing import Iterable, Iterator, List, Optional
+import importlib.metadata as metadata
+import itertools
+import os
+from .utils import spawn_pool
+
+
+DEFAULT_BATCH_SIZE = 256
+# worker 하나당 미리 제출해 둘 batch 수. 질문을 이 이상 앞서 읽지 않으므로 메모리 사용량이 split 크기와 무관함
+_PENDING_BATCHES_PER_JOB = 2
+
+_TOKENIZER_PACKAGES = ("python-mecab-ko", "python-mecab-ko-dic")
+
+# worker 프로세스마다 한 번만 만드는 MeCab 인스턴스
+_worker_tokenizer = None
+
+
+def create_tokenizer():
+    """Mecab 한국어 토크나이저를 만듭니다. python-mecab-ko는 사용할 때 import 합니다."""
+    from mecab import MeCab
+    return MeCab()
+
+
+def tokenizer_version() -> str:
+    """
+    토큰화 결과에 영향을 주는 패키지(python-mecab-ko와 사전)의 버전 문자열입니다.
+    mecab을 import 하지 않고 설치된 패키지 메타데이터만 읽습니다.
+    """
+    versions = []
+    for package in _TOKENIZER_PACKAGES:
+        try:
+            versions.append(f"{package}=={metadata.version(package)}")
+        except metadata.PackageNotFoundError:
+            versions.append(f"{package}==unknown")
+    return ";".join(versions)
+
+
+def tokenize_questions(questions: Iterable[str], jobs: Optional[int] = None, batch_size: int = DEFAULT_BATCH_SIZE,
+                       tokenizer=None, executor: Optional[Executor] = None) -> Iterator[List[str]]:
+    """
+    질문들을 Mecab 형태소 단위로 토큰화해 입력 순서대로 하나씩 반환합니다.
+
+    jobs가 1이 아니면 질문을 batch_size개씩 묶어 프로세스 풀(executor를 지정하면 그 풀)에서 토큰화하며,
+    각 worker는 MeCab을 처음 사용할 때 한 번만 초기화합니다.
+    결과는 batch가 끝나는 대로 순서대로 yield 되므로 호출하는 쪽에서 바로 파일에 기록할 수 있습니다.
+    worker에는 최대 jobs * 2개의 batch만 제출해 두고, 앞의 batch 결과를 yield 한 뒤에 다음 질문을 읽습니다.
+
+    Args:
+        questions (Iterable[str]): 토큰화할 질문들
+        jobs (Optional[int]): worker 프로세스 수. 기본값은 CPU 수이며 1이면 현재 프로세스에서 토큰화
+        batch_size (int): worker에 한 번에 보낼 질문 수
+        tokenizer: jobs가 1일 때 사용할 토크나이저. None이면 새로 만듦
+        executor (Optional[Executor]): 토큰화할 프로세스 풀. None이면 jobs개의 worker로 새로 만들고 끝나면 종료
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1:
+        tokenizer = tokenizer or create_tokenizer()
+        for question in questions:
+            yield tokenizer.morphs(question)
+        return
+
+    batches = _batches(questions, batch_size)
+    first = next(batches, None)
+    if first is None:
+        # 토큰화할 질문이 없으면 worker를 띄우지 않음
+        return
+    if executor is not None:
+        yield from _tokenize_in(executor, itertools.chain([first], batches), jobs)
+        return
+    with spawn_pool(jobs) as pool:
+        yield from _tokenize_in(pool, itertools.chain([first], batches), jobs)
+
+
+def _tokenize_in(pool: Executor, batches: Iterable[List[str]], jobs: int) -> Iterator[List[str]]:
+    # pool.map은 모든 batch를 한 번에 제출하므로(질문 전체를 읽어 들임) 제출해 둔 batch 수를 제한
+    pending = deque()
+    for batch in batches:
+        pending.append(pool.submit(_tokenize_batch, batch))
+        if len(pending) >= jobs * _PENDING_BATCHES_PER_JOB:
+            yield from pending.popleft().result()
+    while pending:
+        yield from pending.popleft().result()
+
+
+def _tokenize_batch(questions: List[str]) -> List[List[str]]:
+    # 다른 작업과 함께 쓰는 풀에서도 동작하도록 initializer 대신 처음 호출될 때 만듦
+    global _worker_tokenizer
+    if _worker_tokenizer is None:
+        _worker_tokenizer = create_tokenizer()
+    return [_worker_tokenizer.morphs(question) for question in questions]
+
+
+def _batches(items: Iterable[str], batch_size: int) -> Iterator[List[str]]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
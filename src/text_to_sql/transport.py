@@ -0,0 +1,286 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Sequence, TypeVar
+import os
+import urllib.parse
+import urllib.request
+from .cache import link_or_copy
+from .downloader import Downloader, DownloadError, DownloadManifest
+
+
+# 쉼표로 구분한 mirror URL 목록. Google Drive보다 먼저 순서대로 시도합니다.
+MIRRORS_ENV = "TEXT_TO_SQL_MIRRORS"
+
+T = TypeVar("T")
+
+
+class Mirror(ABC):
+    """
+    데이터셋 zip 파일을 가져올 수 있는 위치 하나입니다.
+    """
+
+    @abstractmethod
+    def fetch(self, downloader: Downloader, archive_name: str, gdrive_id: str, dest: Path,
+              manifest: Optional[DownloadManifest]) -> Path:
+        """
+        archive_name(예: "Spider.zip")을 dest로 가져오고 manifest로 검증합니다.
+
+        Raises:
+            DownloadError: 가져오지 못했거나 검증에 실패한 경우
+        """
+        pass
+
+    @abstractmethod
+    def open_stream(self, downloader: Downloader, archive_name: str, gdrive_id: str) -> Iterator[bytes]:
+        """archive_name의 내용을 파일에 저장하지 않고 chunk 단위로 반환합니다."""
+        pass
+
+
+class GoogleDriveMirror(Mirror):
+    """Google Drive 원본. gdrive_id로 파일을 찾습니다."""
+
+    def fetch(self, downloader, archive_name, gdrive_id, dest, manifest):
+        return downloader.download(self.url(gdrive_id), dest, manifest)
+
+    def open_stream(self, downloader, archive_name, gdrive_id):
+        return downloader.iter_chunks(self.url(gdrive_id))
+
+    @staticmethod
+    def url(gdrive_id: str) -> str:
+        return f"https://drive.usercontent.google.com/download?id={gdrive_id}&export=download&confirm=t"
+
+    def __repr__(self) -> str:
+        return "GoogleDriveMirror()"
+
+
+class HttpMirror(Mirror):
+    """
+    `<base_url>/<archive_name>`으로 파일을 제공하는 HTTP mirror입니다.
+    서버가 Range를 지원하면 segments개의 구간으로 나눠 동시에 받습니다.
+
+    Args:
+        base_url (str): mirror의 기본 URL
+        segments (int): 동시에 받을 구간 수
+    """
+
+    def __init__(self, base_url: str, segments: int = 4):
+        self.base_url = base_url.rstrip("/")
+        self.segments = segments
+
+    def fetch(self, downloader, archive_name, gdrive_id, dest, manifest):
+        return downloader.download(self.url(archive_name), dest, manifest, segments=self.segments)
+
+    def open_stream(self, downloader, archive_name, gdrive_id):
+        return downloader.iter_chunks(self.url(archive_name))
+
+    def url(self, archive_name: str) -> str:
+        return f"{self.base_url}/{urllib.parse.quote(archive_name)}"
+
+    def __repr__(self) -> str:
+        return f"HttpMirror({self.base_url!r})"
+
+
+class S3Mirror(HttpMirror):
+    """
+    S3 호환 저장소(MinIO 등)의 bucket을 path-style URL `<endpoint>/<bucket>/<prefix><archive_name>`으로 읽는 mirror입니다.
+    공개 bucket이나 익명 읽기가 허용된 endpoint를 대상으로 합니다.
+
+    Args:
+        endpoint (str): S3 호환 endpoint URL (예: "http://minio.internal:9000")
+        bucket (str): bucket 이름
+        prefix (str): 객체 key 앞에 붙는 경로
+        segments (int): 동시에 받을 구간 수
+    """
+
+    def __init__(self, endpoint: str, bucket: str, prefix: str = "", segments: int = 4):
+        prefix = prefix.strip("/")
+        super().__init__("/".join(part for part in (endpoint.rstrip("/"), bucket, prefix) if part), segments)
+        self.endpoint = endpoint
+        self.bucket = bucket
+        self.prefix = prefix
+
+    def __repr__(self) -> str:
+        return f"S3Mirror({self.endpoint!r}, {self.bucket!r}, {self.prefix!r})"
+
+
+class FileMirror(Mirror):
+    """
+    로컬 또는 네트워크 파일 시스템의 디렉토리 `<root>/<archive_name>`에서 파일을 가져오는 mirror입니다.
+    같은 파일 시스템이면 복사하지 않고 hardlink 합니다.
+
+    Args:
+        root (Path): zip 파일들이 있는 디렉토리
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def fetch(self, downloader, archive_name, gdrive_id, dest, manifest):
+        source = Path(self.root, archive_name)
+        if not source.is_file():
+            raise DownloadError(f"{source} does not exist")
+        dest = Path(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        part_path = Downloader.part_path(dest)
+        if part_path.exists():
+            part_path.unlink()
+        link_or_copy(source, part_path)
+        if manifest is not None:
+            try:
+                manifest.verify(part_path)
+            except DownloadError:
+                part_path.unlink()
+                raise
+        os.replace(part_path, dest)
+        return dest
+
+    def open_stream(self, downloader, archive_name, gdrive_id):
+        source = Path(self.root, archive_name)
+        if not source.is_file():
+            raise DownloadError(f"{source} does not exist")
+        return self._read_chunks(source, downloader.chunk_size)
+
+    @staticmethod
+    def _read_chunks(path: Path, chunk_size: int) -> Iterator[bytes]:
+        with open(path, "rb") as f:
+            yield from iter(lambda: f.read(chunk_size), b"")
+
+    def __repr__(self) -> str:
+        return f"FileMirror({str(self.root)!r})"
+
+
+def parse_mirror(spec: str) -> Mirror:
+    """
+    mirror URL을 Mirror로 바꿉니다.
+
+    - `http://...`, `https://...`: HttpMirror
+    - `s3+http://endpoint/bucket/prefix`, `s3+https://...`: S3Mirror
+    - `file:///path` 또는 로컬 경로: FileMirror
+    - `gdrive`: GoogleDriveMirror
+
+    Raises:
+        ValueError: 지원하지 않는 형식인 경우
+    """
+    spec = spec.strip()
+    if spec == "gdrive":
+        return GoogleDriveMirror()
+    parsed = urllib.parse.urlparse(spec)
+    if parsed.scheme in ("http", "https"):
+        return HttpMirror(spec)
+    if parsed.scheme in ("s3+http", "s3+https"):
+        bucket, _, prefix = parsed.path.lstrip("/").partition("/")
+        if not bucket:
+            raise ValueError(f"S3 mirror needs a bucket: {spec}")
+        return S3Mirror(f"{parsed.scheme[3:]}://{parsed.netloc}", bucket, prefix)
+    if parsed.scheme == "file":
+        return FileMirror(Path(urllib.request.url2pathname(parsed.path)))
+    if parsed.scheme == "" or len(parsed.scheme) == 1:
+        # 로컬 경로. 한 글자 scheme은 Windows 드라이브 문자
+        return FileMirror(Path(spec))
+    raise ValueError(f"Unsupported mirror: {spec}")
+
+
+def default_mirrors() -> List[Mirror]:
+    """TEXT_TO_SQL_MIRRORS 환경 변수의 mirror들 뒤에 Google Drive 원본을 붙인 목록"""
+    specs = [spec for spec in os.environ.get(MIRRORS_ENV, "").split(",") if spec.strip()]
+    mirrors = [parse_mirror(spec) for spec in specs]
+    if not any(isinstance(mirror, GoogleDriveMirror) for mirror in mirrors):
+        mirrors.append(GoogleDriveMirror())
+    return mirrors
+
+
+class Transport:
+    """
+    순서가 있는 mirror 목록에서 zip 파일을 가져옵니다. 한 mirror가 실패하면 다음 mirror로 넘어갑니다.
+
+    Args:
+        mirrors (Sequence[Mirror]): 시도할 mirror 순서
+        downloader (Downloader): HTTP mirror가 사용하는 다운로드 엔진
+    """
+
+    def __init__(self, mirrors: Sequence[Mirror], downloader: Downloader):
+        if not mirrors:
+            raise ValueError("Transport needs at least one mirror")
+        self.mirrors = list(mirrors)
+        self.downloader = downloader
+
+    def fetch(self, archive_name: str, gdrive_id: str, dest: Path, manifest: Optional[DownloadManifest] = None,
+              validate: Optional[Callable[[Path], None]] = None) -> Path:
+        """
+        mirror를 순서대로 시도해 archive_name을 dest로 가져옵니다.
+        실패한 다운로드의 partial 파일은 남겨 두므로, 다음 실행에서 같은 mirror를 시도하면 받은 위치부터 이어받습니다.
+
+        Args:
+            archive_name (str): mirror에서의 파일 이름 (예: "Spider.zip")
+            gdrive_id (str): Google Drive 원본의 파일 id
+            dest (Path): 저장 경로
+            manifest (Optional[DownloadManifest]): 검증에 사용할 기대값
+            validate (Optional[Callable[[Path], None]]): 받은 파일을 추가로 검증하는 함수. 실패하면 DownloadError를 발생
+
+        Raises:
+            DownloadError: 모든 mirror가 실패한 경우. 각 mirror의 오류를 메시지에 포함
+            OSError: mirror가 하나뿐이고 파일 I/O가 실패한 경우
+        """
+        dest = Path(dest)
+
+        def attempt(mirror: Mirror) -> Path:
+            self._claim_partial(dest, mirror)
+            path = mirror.fetch(self.downloader, archive_name, gdrive_id, dest, manifest)
+            if validate is not None:
+                validate(path)
+            return path
+
+        path = self._first_success(archive_name, attempt)
+        source_path = self.source_path(dest)
+        if source_path.exists():
+            source_path.unlink()
+        return path
+
+    def stream(self, archive_name: str, gdrive_id: str, consume: Callable[[Iterator[bytes]], T]) -> T:
+        """
+        mirror를 순서대로 시도해 archive_name의 바이트 스트림을 consume에 넘기고 그 결과를 반환합니다.
+        consume이 DownloadError나 OSError로 실패하면 다음 mirror의 스트림으로 처음부터 다시 호출합니다.
+
+        Raises:
+            DownloadError: 모든 mirror가 실패한 경우
+        """
+        return self._first_success(
+            archive_name, lambda mirror: consume(mirror.open_stream(self.downloader, archive_name, gdrive_id)))
+
+    @staticmethod
+    def source_path(dest: Path) -> Path:
+        """`<dest>.part`를 받고 있던 mirror를 기록하는 파일"""
+        return dest.with_name(dest.name + ".source")
+
+    def _claim_partial(self, dest: Path, mirror: Mirror) -> None:
+        """
+        dest의 partial 파일을 mirror가 이어받을 수 있게 합니다. 다른 mirror에서 받던 partial 파일은 내용이 같다는 보장이
+        없으므로 버리고, 같은 mirror라면 이전 실행에서 받던 파일을 그대로 이어받습니다.
+        기록이 없는 partial 파일(Downloader를 직접 사용한 경우 등)은 처음 시도하는 mirror가 이어받습니다.
+        """
+        source = repr(mirror)
+        source_path = self.source_path(dest)
+        try:
+            recorded = source_path.read_text(encoding="utf-8")
+        except OSError:
+            recorded = None
+        if recorded == source:
+            return
+        if recorded is not None:
+            part_path = Downloader.part_path(dest)
+            if part_path.exists():
+                part_path.unlink()
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        source_path.write_text(source, encoding="utf-8")
+
+    def _first_success(self, archive_name: str, attempt: Callable[[Mirror], T]) -> T:
+        errors = []
+        for mirror in self.mirrors:
+            try:
+                return attempt(mirror)
+            except (DownloadError, OSError) as e:
+                if len(self.mirrors) == 1:
+                    # mirror가 하나뿐이면 원래 예외를 그대로 전달
+                    raise
+                errors.append(f"{mirror!r}: {e}")
+        raise DownloadError(f"Failed to fetch {archive_name} from all mirrors:\n  " + "\n  ".join(errors))
@@ -0,0 +1,39 @@
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator
+import multiprocessing
+import os
+import threading
+
+
+def spawn_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    CPU 작업용 프로세스 풀을 만듭니다.
+    이 패키지는 다운로드, 압축 해제 등에서 스레드를 띄워 두므로 그 상태에서 fork 하지 않도록 spawn 컨텍스트를 사용합니다.
+    """
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+@contextmanager
+def atomic_write(path: Path, mode: str = "w") -> Iterator[IO]:
+    """
+    path 옆의 임시 파일을 열어 주고, 블록이 끝나면 path로 rename 합니다.
+    중간에 실패하거나 중단되면 임시 파일을 지우므로 반쯤 쓰인 파일이 path에 남지 않습니다.
+    임시 파일 이름에 프로세스와 스레드를 넣어 같은 path를 동시에 쓰는 writer끼리 임시 파일을 덮어쓰지 않도록 합니다.
+
+    Args:
+        path (Path): 기록할 파일 경로. 상위 디렉토리가 없으면 만듦
+        mode (str): "w"(UTF-8 텍스트) 또는 "wb"
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(temp_path, mode, encoding=None if "b" in mode else "utf-8") as f:
+            yield f
+        os.replace(temp_path, path)
+    except BaseException:
+        if temp_path.exists():
+            temp_path.unlink()
+        raise
@@ -0,0 +1,286 @@
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import unicodedata
+from .connection import open_readonly, quote_identifier
+from .introspection import DatabaseInfo
+from .utils import atomic_write, spawn_pool
+
+
+# 저장 형식이 바뀌면 올려서 기존 색인을 다시 만들도록 합니다.
+FORMAT_VERSION = 1
+DEFAULT_MAX_VALUES_PER_COLUMN = 1000
+DEFAULT_MAX_VALUE_LENGTH = 100
+NGRAM_SIZE = 3
+
+_MAGIC = b"TSVI"
+_PREFIX = struct.Struct("<4sI")
+# 구두점과 공백은 모두 단어 경계로 취급 (질문의 "San Diego?"가 값 "San Diego"와 맞도록)
+_SEPARATORS = re.compile(r"[\W_]+")
+# SQLite의 type affinity 규칙에서 TEXT affinity가 되는 선언 타입
+_TEXT_TYPES = ("CHAR", "CLOB", "TEXT")
+
+
+class ValueMatch(NamedTuple):
+    """색인에서 찾은 컬럼 값 하나와 점수(0~1)"""
+    table: str
+    column: str
+    value: str
+    score: float
+
+
+def normalize_value(text: str) -> str:
+    """NFKC 정규화, casefold, 구두점과 공백을 공백 하나로 정리. 색인과 검색에 같은 정규화를 사용합니다."""
+    return _SEPARATORS.sub(" ", unicodedata.normalize("NFKC", text).casefold()).strip()
+
+
+def ngram_keys(text: str, n: int = NGRAM_SIZE) -> List[int]:
+    """정규화한 text 앞뒤에 공백을 붙여 만든 문자 n-gram들의 64bit 해시. 중복은 제거됩니다."""
+    padded = f" {normalize_value(text)} "
+    grams = {padded[i:i + n] for i in range(max(1, len(padded) - n + 1))}
+    return sorted(int.from_bytes(hashlib.blake2b(gram.encode("utf-8"), digest_size=8).digest(), "little")
+                  for gram in grams)
+
+
+class ValueIndex:
+    """
+    db_id 하나의 텍스트 컬럼 값 표본과 문자 n-gram 역색인입니다.
+
+    파일은 `build_value_index()`가 만든 단일 바이너리 파일이며, 열 때 mmap으로 매핑하고 배열 구간을 memoryview로 그대로 사용하므로
+    여는 비용과 메모리 사용량이 색인 크기와 거의 무관합니다. 검색은 질의 n-gram마다 정렬된 해시 배열을 이진 탐색한 뒤
+    posting 목록만 읽습니다.
+
+    Args:
+        path (Path): 색인 파일 경로
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.header = read_header(self.path)
+        if self.header is None:
+            raise ValueError(f"{self.path} is not a value index (version {FORMAT_VERSION})")
+        self.columns: List[Tuple[str, str]] = [tuple(column) for column in self.header["columns"]]
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        self._blob = self._section("value_blob", "B")
+        self._value_offsets = self._section("value_offsets", "I")
+        self._value_columns = self._section("value_columns", "I")
+        self._value_grams = self._section("value_grams", "I")
+        self._gram_keys = self._section("gram_keys", "Q")
+        self._gram_offsets = self._section("gram_offsets", "I")
+        self._postings = self._section("postings", "I")
+
+    def _section(self, name: str, typecode: str) -> memoryview:
+        offset, length = self.header["sections"][name]
+        return self._view[offset:offset + length].cast(typecode)
+
+    def __len__(self) -> int:
+        return len(self._value_columns)
+
+    def value(self, value_id: int) -> ValueMatch:
+        table, column = self.columns[self._value_columns[value_id]]
+        start, end = self._value_offsets[value_id], self._value_offsets[value_id + 1]
+        return ValueMatch(table, column, bytes(self._blob[start:end]).decode("utf-8"), 1.0)
+
+    def search(self, text: str, limit: int = 10, min_score: float = 0.5) -> List[ValueMatch]:
+        """
+        text와 비슷한 값을 찾습니다. 점수는 두 n-gram 집합의 Dice 계수이며 같은 값이면 1입니다.
+
+        Args:
+            text (str): 찾을 값 (예: 질문에서 뽑은 고유명사)
+            limit (int): 최대 결과 수
+            min_score (float): 이보다 점수가 낮은 값은 제외
+        """
+        keys = ngram_keys(text)
+        hits = self._count_hits(keys)
+        scored = [(2.0 * count / (len(keys) + self._value_grams[value_id]), value_id)
+                  for value_id, count in hits.items()]
+        return self._top(scored, limit, min_score)
+
+    def find_mentions(self, question: str, limit: int = 10, min_score: float = 0.9) -> List[ValueMatch]:
+        """
+        question 안에 등장하는 값을 찾습니다. 점수는 값의 n-gram 중 question에 포함된 비율입니다.
+
+        Args:
+            question (str): 자연어 질문
+            limit (int): 최대 결과 수
+            min_score (float): 이보다 점수가 낮은 값은 제외
+        """
+        hits = self._count_hits(ngram_keys(question))
+        scored = [(count / self._value_grams[value_id], value_id) for value_id, count in hits.items()]
+        return self._top(scored, limit, min_score)
+
+    def close(self) -> None:
+        # mmap을 닫기 전에 mmap을 참조하는 memoryview를 모두 해제해야 함
+        for name in ("_blob", "_value_offsets", "_value_columns", "_value_grams", "_gram_keys", "_gram_offsets",
+                     "_postings", "_view"):
+            getattr(self, name).release()
+        self._mmap.close()
+
+    def _count_hits(self, keys: Iterable[int]) -> Counter:
+        hits: Counter = Counter()
+        gram_keys = self._gram_keys
+        for key in keys:
+            position = bisect_left(gram_keys, key)
+            if position < len(gram_keys) and gram_keys[position] == key:
+                hits.update(self._postings[self._gram_offsets[position]:self._gram_offsets[position + 1]])
+        return hits
+
+    def _top(self, scored: List[Tuple[float, int]], limit: int, min_score: float) -> List[ValueMatch]:
+        scored = sorted((item for item in scored if item[0] >= min_score), key=lambda item: (-item[0], item[1]))
+        return [self.value(value_id)._replace(score=score) for score, value_id in scored[:limit]]
+
+
+def read_header(path: Path) -> Optional[dict]:
+    """색인 파일의 header. 파일이 없거나 형식, 버전, byte order가 다르면 None"""
+    try:
+        with open(path, "rb") as f:
+            magic, length = _PREFIX.unpack(f.read(_PREFIX.size))
+            if magic != _MAGIC:
+                return None
+            header = json.loads(f.read(length).decode("utf-8"))
+    except (OSError, ValueError, struct.error):
+        return None
+    if header.get("version") != FORMAT_VERSION or header.get("byteorder") != sys.byteorder:
+        return None
+    return header
+
+
+def build_value_index(info: DatabaseInfo, sqlite_path: Path, index_path: Path,
+                      max_values_per_column: int = DEFAULT_MAX_VALUES_PER_COLUMN,
+                      max_value_length: int = DEFAULT_MAX_VALUE_LENGTH) -> int:
+    """
+    sqlite 파일의 텍스트 컬럼마다 가장 자주 나오는 값을 최대 max_values_per_column개 모아 색인 파일을 만듭니다.
+
+    Args:
+        info (DatabaseInfo): introspect_database()의 결과. 텍스트 컬럼을 고르는 데 사용
+        sqlite_path (Path): sqlite 파일 경로
+        index_path (Path): 만들 색인 파일 경로
+        max_values_per_column (int): 컬럼마다 보관할 최대 값 수
+        max_value_length (int): 이보다 긴 값은 제외
+
+    Returns:
+        int: 색인에 들어간 값의 수
+    """
+    columns: List[Tuple[str, str]] = []
+    values: List[Tuple[int, str]] = []
+    connection = open_readonly(sqlite_path)
+    try:
+        for table in info.tables:
+            for column in table.columns:
+                if not _is_text(column.type):
+                    continue
+                column_id = len(columns)
+                columns.append((table.name, column.name))
+                quoted_column, quoted_table = quote_identifier(column.name), quote_identifier(table.name)
+                rows = connection.execute(
+                    f"SELECT {quoted_column} FROM {quoted_table} "
+                    f"WHERE {quoted_column} IS NOT NULL AND length({quoted_column}) BETWEEN 1 AND ? "
+                    f"GROUP BY {quoted_column} ORDER BY COUNT(*) DESC, {quoted_column} LIMIT ?",
+                    (max_value_length, max_values_per_column))
+                values.extend((column_id, value) for value, in rows if isinstance(value, str) and value.strip())
+    finally:
+        connection.close()
+
+    params = {"max_values_per_column": max_values_per_column, "max_value_length": max_value_length}
+    _write_index(index_path, info.fingerprint, params, columns, values)
+    return len(values)
+
+
+def is_index_current(index_path: Path, fingerprint: str, max_values_per_column: int, max_value_length: int) -> bool:
+    header = read_header(index_path)
+    params = {"max_values_per_column": max_values_per_column, "max_value_length": max_value_length}
+    return header is not None and header["fingerprint"] == fingerprint and header["params"] == params
+
+
+def build_value_indexes(tasks: Sequence[Tuple[DatabaseInfo, Path, Path]], jobs: Optional[int] = None,
+                        max_values_per_column: int = DEFAULT_MAX_VALUES_PER_COLUMN,
+                        max_value_length: int = DEFAULT_MAX_VALUE_LENGTH) -> Dict[str, int]:
+    """
+    (DatabaseInfo, sqlite 경로, 색인 경로) 목록의 색인을 프로세스 풀에서 동시에 만듭니다.
+    n-gram 계산은 Python 코드이므로 스레드 대신 프로세스를 사용합니다.
+
+    Returns:
+        Dict[str, int]: db_id -> 색인에 들어간 값의 수
+    """
+    arguments = [(info, sqlite_path, index_path, max_values_per_column, max_value_length)
+                 for info, sqlite_path, index_path in tasks]
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(arguments) <= 1:
+        counts = [build_value_index(*args) for args in arguments]
+    else:
+        with spawn_pool(min(jobs, len(arguments))) as pool:
+            counts = list(pool.map(_build_task, arguments))
+    return {args[0].db_id: count for args, count in zip(arguments, counts)}
+
+
+def _build_task(args) -> int:
+    return build_value_index(*args)
+
+
+def _write_index(index_path: Path, fingerprint: str, params: dict, columns: List[Tuple[str, str]],
+                 values: List[Tuple[int, str]]) -> None:
+    blob = bytearray()
+    value_offsets, value_columns, value_grams = array("I", [0]), array("I"), array("I")
+    postings_by_key: Dict[int, List[int]] = {}
+    for value_id, (column_id, value) in enumerate(values):
+        blob += value.encode("utf-8")
+        value_offsets.append(len(blob))
+        value_columns.append(column_id)
+        keys = ngram_keys(value)
+        value_grams.append(len(keys))
+        for key in keys:
+            postings_by_key.setdefault(key, []).append(value_id)
+
+    gram_keys, gram_offsets, postings = array("Q"), array("I", [0]), array("I")
+    for key in sorted(postings_by_key):
+        gram_keys.append(key)
+        postings.extend(postings_by_key[key])
+        gram_offsets.append(len(postings))
+
+    payloads = [("value_offsets", value_offsets.tobytes()), ("value_columns", value_columns.tobytes()),
+                ("value_grams", value_grams.tobytes()), ("gram_keys", gram_keys.tobytes()),
+                ("gram_offsets", gram_offsets.tobytes()), ("postings", postings.tobytes()),
+                ("value_blob", bytes(blob))]
+    header = {"version": FORMAT_VERSION, "byteorder": sys.byteorder, "fingerprint": fingerprint, "params": params,
+              "columns": columns, "ngram_size": NGRAM_SIZE, "sections": {}}
+    # section 위치가 header 길이에 따라 달라지므로 길이가 고정될 때까지 다시 계산
+    header_length = 0
+    while True:
+        offset = _align(_PREFIX.size + header_length)
+        for name, payload in payloads:
+            header["sections"][name] = [offset, len(payload)]
+            offset = _align(offset + len(payload))
+        encoded = json.dumps(header, ensure_ascii=False).encode("utf-8")
+        if len(encoded) <= header_length:
+            break
+        header_length = len(encoded) + 64
+    encoded = encoded.ljust(header_length)
+
+    with atomic_write(index_path, "wb") as f:
+        f.write(_PREFIX.pack(_MAGIC, header_length))
+        f.write(encoded)
+        for name, payload in payloads:
+            f.seek(header["sections"][name][0])
+            f.write(payload)
+
+
+def _align(offset: int) -> int:
+    # 8byte 배열을 memoryview로 바로 읽을 수 있도록 section을 8byte 경계에 둠
+    return (offset + 7) // 8 * 8
+
+
+def _is_text(declared_type: str) -> bool:
+    declared_type = declared_type.upper()
+    # 선언 타입이 없는 컬럼(BIRD에 흔함)도 텍스트가 들어 있을 수 있으므로 포함
+    return not declared_type or any(name in declared_type for name in _TEXT_TYPES)
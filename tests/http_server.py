@@ -0,0 +1,102 @@
+import re
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+
+class StandInServer:
+    """
+    테스트용 로컬 HTTP 서버입니다. Range 요청을 지원하고, 받은 요청 헤더를 기록합니다.
+
+    `truncate_after`에 byte 수를 지정하면 그만큼만 보내고 연결을 끊어 네트워크 중단을 흉내냅니다.
+    `truncate_times`번 끊은 뒤에는 정상적으로 응답합니다.
+    """
+
+    def __init__(self, files: Dict[str, bytes]):
+        self.files = files
+        self.requests: List[Dict[str, str]] = []
+        self.truncate_after = None
+        self.truncate_times = 0
+        self.failing_paths = set()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}/{path.lstrip('/')}"
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_HEAD(self):
+                self._respond(send_body=False)
+
+            def do_GET(self):
+                self._respond(send_body=True)
+
+            def _respond(self, send_body: bool):
+                path = self.path.split("?")[0].lstrip("/")
+                server.requests.append({"path": path, **dict(self.headers.items())})
+                if path in server.failing_paths:
+                    self.send_error(503)
+                    return
+                if path not in server.files:
+                    self.send_error(404)
+                    return
+
+                body = server.files[path]
+                start, end = 0, len(body) - 1
+                match = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+                if match:
+                    start = int(match.group(1))
+                    if match.group(2):
+                        end = min(int(match.group(2)), end)
+                    if start >= len(body):
+                        self.send_response(416)
+                        self.send_header("Content-Range", f"bytes */{len(body)}")
+                        self.end_headers()
+                        return
+                    self.send_response(206)
+                    self.send_header("Content-Range", f"bytes {start}-{end}/{len(body)}")
+                else:
+                    self.send_response(200)
+
+                payload = body[start:end + 1]
+                self.send_header("Content-Type", "application/octet-stream")
+                self.send_header("Content-Length", str(len(payload)))
+                self.send_header("Accept-Ranges", "bytes")
+                self.end_headers()
+                if not send_body:
+                    return
+
+                if server.truncate_after is not None and server.truncate_times > 0:
+                    server.truncate_times -= 1
+                    self.wfile.write(payload[:server.truncate_after])
+                    self.wfile.flush()
+                    self.close_connection = True
+                    return
+                self.wfile.write(payload)
+
+        return Handler
+
+    def start(self):
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@contextmanager
+def serve_files(files: Dict[str, bytes]):
+    """files(경로 -> 내용)를 서비스하는 StandInServer를 띄웠다가 종료합니다."""
+    server = StandInServer(files)
+    server.start()
+    try:
+        yield server
+    finally:
+        server.stop()
@@ -0,0 +1,66 @@
+import json
+import pytest
+import tempfile
+import shutil
+import zipfile
+from pathlib import Path
+from benchmarks.run import BenchmarkConfig, compare, run_benchmarks
+from benchmarks.synthetic import SyntheticSpec, write_dataset_archive
+from src.text_to_sql.bird_loader import BirdMiniDevLoader
+
+
+class TestBenchmarks:
+    """합성 데이터셋 벤치마크에 대한 테스트 케이스들"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """테스트용 임시 디렉토리 생성"""
+        temp_path = tempfile.mkdtemp()
+        yield temp_path
+        shutil.rmtree(temp_path)
+
+    def test_synthetic_archive_matches_loader_layout(self, temp_dir):
+        """
+        Given: 데이터베이스 2개, 예제 6개 크기의 SyntheticSpec
+        When: BirdMiniDevLoader의 경로 구조로 zip 파일을 만들 때
+        Then: 압축을 풀면 Loader가 바로 예제와 스키마, 데이터베이스를 읽을 수 있어야 함
+        """
+        loader = BirdMiniDevLoader(save_path=temp_dir)
+        archive_path = write_dataset_archive(loader, SyntheticSpec(databases=2, rows=10, examples=6),
+                                             Path(temp_dir, "bird.zip"), query_key="SQL")
+        with zipfile.ZipFile(archive_path) as archive:
+            archive.extractall(temp_dir)
+
+        examples = list(loader.iter_examples("dev", cached=False))
+        assert len(examples) == 6
+        assert loader.get_db_ids() == ["synthetic_000", "synthetic_001"]
+        assert loader.get_schema("synthetic_000").join_keys("t0", "t1")
+        assert loader.execute(examples[0].db_id, examples[0].query) == [(10,)]
+
+    def test_run_emits_json_for_every_phase(self, temp_dir):
+        """
+        Given: 작은 합성 데이터셋과 로컬 HTTP 서버
+        When: Spider와 BIRD Loader에 대해 run_benchmarks()를 실행할 때
+        Then: 모든 단계의 측정값을 JSON으로 직렬화할 수 있는 형태로 반환하고, 자신과 비교하면 비율이 1이어야 함
+        """
+        config = BenchmarkConfig(SyntheticSpec(databases=2, rows=20, examples=8), loaders=["spider", "bird"],
+                                 repeat=2, jobs=1, tokenize_jobs=1)
+
+        result = json.loads(json.dumps(run_benchmarks(config, Path(temp_dir))))
+
+        assert result["config"]["spec"]["examples"] == 8
+        for name in ["spider", "bird"]:
+            phases = result["results"][name]["phases"]
+            assert list(phases) == ["download", "extract", "already_downloaded", "verify_deep", "parse_schema",
+                                    "parse_examples", "execute"]
+            assert all(len(timing["runs"]) == 2 for timing in phases.values())
+        assert set(compare(result, result)["bird"].values()) == {1.0}
+
+    def test_unknown_loader_raises(self):
+        """
+        Given: 지원하지 않는 Loader 이름
+        When: run_benchmarks()를 호출할 때
+        Then: ValueError가 발생해야 함
+        """
+        with pytest.raises(ValueError):
+            run_benchmarks(BenchmarkConfig(loaders=["wikisql"]))
@@ -3,6 +3,7 @@ import tempfile
 import shutil
 from pathlib import Path
 from unittest.mock import patch, MagicMock
+from src.text_to_sql.downloader import DownloadError
 from src.text_to_sql.bird_loader import BirdMiniDevLoader
 
 
@@ -25,60 +26,94 @@ class TestBirdMiniDevLoader:
     class TestDownloadDataset:
         """데이터셋 다운로드 테스트"""
 
-        @patch('src.text_to_sql.loader.gdown.download')
-        @patch('src.text_to_sql.loader.zipfile.ZipFile')
-        def test_download_dataset_success(self, mock_zipfile, mock_gdown, bird_loader):
+        @patch('src.text_to_sql.loader.zipfile.is_zipfile', return_value=True)
+        @patch('src.text_to_sql.loader.Downloader.download')
+        @patch('src.text_to_sql.loader.extract_archive')
+        def test_download_dataset_success(self, mock_extract, mock_download, mock_is_zipfile, bird_loader):
             """
             Given: 정상적인 네트워크 환경과 Google Drive 파일
             When: download_dataset()을 호출할 때
             Then: 데이터셋이 성공적으로 다운로드되고 압축 해제되어야 함
             """
             # Arrange: Mock 설정 및 예상 동작 정의
-            mock_gdown.return_value = "temp_bird_mini_dev.zip"
-            mock_zip_instance = MagicMock()
-            mock_zipfile.return_value.__enter__.return_value = mock_zip_instance
+            def fake_download(url, dest, manifest):
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                dest.write_bytes(b"")
+                return dest
+
+            mock_download.side_effect = fake_download
             
             # Act: download_dataset() 호출
             bird_loader.download_dataset()
             
             # Assert: 다운로드 및 압축 해제 성공 확인
-            # gdown.download이 올바른 URL과 경로로 호출되었는지 확인
-            expected_url = f"https://drive.google.com/uc?id={bird_loader.gdrive_id}"
-            mock_gdown.assert_called_once()
-            call_args = mock_gdown.call_args
-            assert call_args[0][0] == expected_url
-            assert call_args[0][1].endswith("Bird_Mini_Dev.zip")
-            assert call_args[1]["quiet"] == False
-            
-            # zipfile.ZipFile이 올바른 경로로 호출되었는지 확인
-            mock_zipfile.assert_called_once()
-            zip_call_args = mock_zipfile.call_args[0]
-            assert zip_call_args[0].endswith("Bird_Mini_Dev.zip")
-            assert zip_call_args[1] == 'r'
+            # Downloader.download가 올바른 URL과 경로로 호출되었는지 확인
+            mock_download.assert_called_once()
+            call_args = mock_download.call_args
+            assert f"id={bird_loader.gdrive_id}" in call_args[0][0]
+            assert call_args[0][1].name == "Bird_Mini_Dev.zip"
+            assert call_args[0][2] is bird_loader.manifest
             
-            # extractall(압축 해제)이 올바른 경로로 호출되었는지 확인
-            mock_zip_instance.extractall.assert_called_once_with(bird_loader.save_path)
+            # extract_archive(압축 해제)가 올바른 경로로 호출되었는지 확인
+            mock_extract.assert_called_once()
+            extract_call_args = mock_extract.call_args[0]
+            assert extract_call_args[0].name == "Bird_Mini_Dev.zip"
+            assert extract_call_args[1] == Path(bird_loader.save_path)
+            assert extract_call_args[2] == bird_loader._get_extraction_manifest_path()
+
+            # 압축 해제가 끝난 zip 파일은 삭제되어야 함
+            assert not extract_call_args[0].exists()
+
+        @patch('src.text_to_sql.loader.zipfile.is_zipfile', return_value=False)
+        @patch('src.text_to_sql.loader.Downloader.download')
+        @patch('src.text_to_sql.loader.extract_archive')
+        def test_download_dataset_rejects_truncated_archive(self, mock_extract, mock_download, mock_is_zipfile, bird_loader, temp_dir):
+            """
+            Given: 다운로드된 파일이 올바른 zip 파일이 아닌 상태
+            When: download_dataset()을 호출할 때
+            Then: 압축 해제 전에 DownloadError가 발생해야 함
+            """
+            # Arrange: 잘린 zip 파일이 받아진 것처럼 Mock
+            truncated = Path(temp_dir, "truncated.zip")
+            truncated.write_bytes(b"PK")
+            mock_download.return_value = truncated
+
+            # Act & Assert
+            with pytest.raises(DownloadError):
+                bird_loader.download_dataset()
+            mock_extract.assert_not_called()
+            assert not truncated.exists()
 
-        @patch('src.text_to_sql.loader.gdown.download')
-        @patch('src.text_to_sql.loader.zipfile.ZipFile')
-        def test_download_dir_already_exists(self, mock_zipfile, mock_gdown, bird_loader):
+        @patch('src.text_to_sql.loader.Downloader.download')
+        @patch('src.text_to_sql.loader.extract_archive')
+        def test_download_dir_already_exists(self, mock_extract, mock_download, bird_loader):
             """
             Given: 저장 디렉토리에 이미 데이터셋이 존재하는 상태
             When: download_dataset()을 호출할 때
             Then: 데이터셋이 다운로드되지 않아야 함
             """
-            # Arrange: _get_dataset_detail_path_root가 존재하는 디렉토리를 반환하도록 Mock
-            mock_dataset_path = MagicMock()
-            mock_dataset_path.exists.return_value = True
-            mock_dataset_path.iterdir.return_value = ['existing_file.txt']  # 디렉토리가 비어있지 않다고 가정
-            
-            with patch.object(bird_loader, '_get_dataset_detail_path_root', return_value=mock_dataset_path):
+            # Arrange: manifest 검증이 통과하도록 Mock
+            with patch.object(bird_loader, 'verify_dataset', return_value=True):
                 # Act: download_dataset() 호출
                 bird_loader.download_dataset()
                 
                 # Assert: 다운로드 관련 메서드들이 호출되지 않았는지 확인
-                mock_gdown.assert_not_called()
-                mock_zipfile.assert_not_called()
+                mock_download.assert_not_called()
+                mock_extract.assert_not_called()
+
+        def test_partial_tree_without_manifest_is_not_downloaded(self, bird_loader):
+            """
+            Given: 압축 해제 도중 중단되어 manifest 없이 일부 파일만 남은 상태
+            When: _is_dataset_already_downloaded()를 호출할 때
+            Then: 다운로드되지 않은 것으로 판단해야 함
+            """
+            # Arrange: 데이터셋 디렉토리에 파일 하나만 남아 있는 상태
+            dataset_path = bird_loader._get_dataset_detail_path_root()
+            dataset_path.mkdir(parents=True)
+            Path(dataset_path, "existing_file.txt").write_text("partial")
+
+            # Act & Assert
+            assert bird_loader._is_dataset_already_downloaded() == False
 
 
     class TestGetSqliteDatabase:
@@ -0,0 +1,209 @@
+import pytest
+import stat
+import tempfile
+import shutil
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+from src.text_to_sql.cache import DatasetCache, clone_or_copy
+from src.text_to_sql.extractor import extract_archive
+from src.text_to_sql.spider_loader import SpiderLoader
+
+
+class TestDatasetCache:
+    """DatasetCache 클래스에 대한 테스트 케이스들"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """테스트용 임시 디렉토리 생성"""
+        temp_path = tempfile.mkdtemp()
+        yield temp_path
+        shutil.rmtree(temp_path)
+
+    @pytest.fixture
+    def cache(self, temp_dir):
+        """임시 디렉토리를 root로 하는 DatasetCache 생성"""
+        return DatasetCache(Path(temp_dir, "cache"))
+
+    @pytest.fixture
+    def source_zip(self, temp_dir):
+        """Spider zip 구조를 흉내낸 원본 zip 파일 생성"""
+        path = Path(temp_dir, "source.zip")
+        with zipfile.ZipFile(path, "w") as zf:
+            zf.writestr("spider_data/dev.json", "[]")
+            zf.writestr("spider_data/database/concert_singer/concert_singer.sqlite", b"sqlite")
+        return path
+
+    @pytest.fixture
+    def mock_download(self, source_zip):
+        """Downloader.download 대신 원본 zip을 복사하는 Mock"""
+        calls = []
+        lock = threading.Lock()
+
+        def fake_download(url, dest, manifest):
+            with lock:
+                calls.append(dest)
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy(source_zip, dest)
+            return dest
+
+        with patch("src.text_to_sql.loader.Downloader.download", side_effect=fake_download):
+            yield calls
+
+    def test_two_save_paths_share_one_download(self, cache, temp_dir, mock_download):
+        """
+        Given: 같은 캐시를 쓰는 서로 다른 save_path의 SpiderLoader 두 개
+        When: 각각 download_dataset()을 호출할 때
+        Then: 다운로드는 한 번만 일어나고 두 save_path의 파일은 서로 다른 파일로 구성되어야 함
+        """
+        # Arrange
+        first = SpiderLoader(save_path=str(Path(temp_dir, "a")), cache=cache)
+        second = SpiderLoader(save_path=str(Path(temp_dir, "b")), cache=cache)
+
+        # Act
+        first.download_dataset()
+        second.download_dataset()
+
+        # Assert
+        assert len(mock_download) == 1
+        first_dev = first.get_sqlite_json_files()["dev"]
+        second_dev = second.get_sqlite_json_files()["dev"]
+        assert first_dev.read_text() == "[]"
+        assert first_dev.stat().st_ino != second_dev.stat().st_ino
+        assert first._is_dataset_already_downloaded() == True
+        assert second._is_dataset_already_downloaded() == True
+
+    def test_hardlinked_save_paths_cannot_corrupt_cache(self, temp_dir, mock_download):
+        """
+        Given: hardlink=True인 캐시를 쓰는 서로 다른 save_path의 SpiderLoader 두 개
+        When: 각각 download_dataset()을 호출한 뒤 한쪽 파일에 쓰려고 할 때
+        Then: 두 save_path는 캐시와 inode를 공유하고, 파일은 읽기 전용이라 쓸 수 없어야 함
+        """
+        # Arrange
+        cache = DatasetCache(Path(temp_dir, "cache"), hardlink=True)
+        first = SpiderLoader(save_path=str(Path(temp_dir, "a")), cache=cache)
+        second = SpiderLoader(save_path=str(Path(temp_dir, "b")), cache=cache)
+
+        # Act
+        first.download_dataset()
+        second.download_dataset()
+
+        # Assert
+        first_dev = first.get_sqlite_json_files()["dev"]
+        assert first_dev.stat().st_ino == second.get_sqlite_json_files()["dev"].stat().st_ino
+        assert not first_dev.stat().st_mode & (stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH)
+
+    def test_copied_save_path_is_writable_and_cache_is_read_only(self, cache, temp_dir, mock_download):
+        """
+        Given: 기본 설정의 캐시를 쓰는 SpiderLoader
+        When: download_dataset() 후 save_path의 파일을 수정할 때
+        Then: save_path의 파일은 수정할 수 있고 캐시 트리의 파일은 그대로여야 함
+        """
+        # Arrange
+        loader = SpiderLoader(save_path=str(Path(temp_dir, "a")), cache=cache)
+        loader.download_dataset()
+        dev_path = loader.get_sqlite_json_files()["dev"]
+
+        # Act
+        dev_path.write_text("[1]")
+
+        # Assert
+        cached_dev, = Path(cache.root, "trees").glob("*/spider_data/dev.json")
+        assert cached_dev.read_text() == "[]"
+        assert not cached_dev.stat().st_mode & (stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH)
+
+    def test_materialize_prunes_files_missing_from_new_tree(self, cache, temp_dir):
+        """
+        Given: 이전 트리로 구성된 save_path와, 파일 하나가 빠진 새 트리
+        When: 새 트리로 materialize()를 호출할 때
+        Then: 이전 manifest에만 있던 파일과 빈 디렉토리는 지워지고, manifest에 없던 파일은 남아야 함
+        """
+        # Arrange
+        old_zip = Path(temp_dir, "old.zip")
+        with zipfile.ZipFile(old_zip, "w") as zf:
+            zf.writestr("spider_data/dev.json", "[]")
+            zf.writestr("spider_data/database/removed/removed.sqlite", b"old")
+        new_zip = Path(temp_dir, "new.zip")
+        with zipfile.ZipFile(new_zip, "w") as zf:
+            zf.writestr("spider_data/dev.json", "[1]")
+        dest_dir = Path(temp_dir, "save")
+        manifest_path = Path(dest_dir, ".manifests", "Spider.json")
+
+        def copy_from(source):
+            def download(dest):
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy(source, dest)
+                return dest
+            return download
+
+        _, old_manifest = cache.extract(cache.fetch_archive("old", copy_from(old_zip)))
+        cache.materialize(old_manifest, dest_dir, manifest_path)
+        Path(dest_dir, "spider_data", "dev_ko.json").write_text("[]")
+
+        # Act
+        _, new_manifest = cache.extract(cache.fetch_archive("new", copy_from(new_zip)))
+        materialized = cache.materialize(new_manifest, dest_dir, manifest_path)
+
+        # Assert
+        assert [entry.name for entry in materialized.entries] == ["spider_data/dev.json"]
+        assert Path(dest_dir, "spider_data", "dev.json").read_text() == "[1]"
+        assert not Path(dest_dir, "spider_data", "database").exists()
+        assert Path(dest_dir, "spider_data", "dev_ko.json").exists()
+
+    def test_parallel_workers_download_once(self, cache, temp_dir, mock_download):
+        """
+        Given: 같은 캐시를 쓰는 여러 워커
+        When: 동시에 download_dataset()을 호출할 때
+        Then: 다운로드와 압축 해제는 한 번만 일어나야 함
+        """
+        # Arrange
+        loaders = [SpiderLoader(save_path=str(Path(temp_dir, f"worker{i}")), cache=cache) for i in range(10)]
+
+        # Act
+        with patch("src.text_to_sql.cache.extract_archive", wraps=extract_archive) as mock_extract:
+            with ThreadPoolExecutor(max_workers=10) as executor:
+                list(executor.map(lambda loader: loader.download_dataset(), loaders))
+
+        # Assert
+        assert len(mock_download) == 1
+        assert mock_extract.call_count == 1
+        assert all(loader.get_sqlite_path("concert_singer").exists() for loader in loaders)
+
+    def test_parallel_workers_materialize_one_save_path_once(self, cache, temp_dir, mock_download):
+        """
+        Given: 같은 캐시와 같은 save_path를 쓰는 여러 워커
+        When: 동시에 download_dataset()을 호출할 때
+        Then: save_path의 파일은 한 번만 구성되고 나머지 워커는 기록된 manifest를 그대로 사용해야 함
+        """
+        # Arrange
+        save_path = str(Path(temp_dir, "shared"))
+        loaders = [SpiderLoader(save_path=save_path, cache=cache) for _ in range(8)]
+
+        # Act
+        with patch("src.text_to_sql.cache.clone_or_copy", wraps=clone_or_copy) as mock_link:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(executor.map(lambda loader: loader.download_dataset(), loaders))
+
+        # Assert
+        assert mock_link.call_count == 2  # dev.json, concert_singer.sqlite
+        assert all(loader.verify_dataset() for loader in loaders)
+
+    def test_lazy_loader_links_archive_from_cache(self, cache, temp_dir, mock_download):
+        """
+        Given: 캐시를 쓰는 lazy 모드 SpiderLoader
+        When: download_dataset() 후 get_sqlite_path()를 호출할 때
+        Then: zip 파일은 캐시에서 hardlink 되고, 데이터베이스는 접근할 때 압축 해제되어야 함
+        """
+        # Arrange
+        loader = SpiderLoader(save_path=str(Path(temp_dir, "lazy")), cache=cache, lazy=True)
+
+        # Act
+        loader.download_dataset()
+
+        # Assert
+        assert not loader.get_sqlite_database().exists()
+        assert loader.get_sqlite_path("concert_singer").read_bytes() == b"sqlite"
+        cached_archives = list(Path(cache.root, "objects").iterdir())
+        assert loader._get_archive_path().stat().st_ino == cached_archives[0].stat().st_ino
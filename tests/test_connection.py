@@ -0,0 +1,124 @@
+import pytest
+import sqlite3
+import tempfile
+import shutil
+import threading
+from pathlib import Path
+from src.text_to_sql.connection import ConnectionManager, QueryTimeout
+from src.text_to_sql.spider_loader import SpiderLoader
+
+
+def _create_database(path: Path, rows: int = 3) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE singer (singer_id INTEGER PRIMARY KEY, name TEXT)")
+    connection.executemany("INSERT INTO singer VALUES (?, ?)", [(i, f"singer {i}") for i in range(rows)])
+    connection.commit()
+    connection.close()
+
+
+class TestConnectionManager:
+    """ConnectionManager와 Loader.execute에 대한 테스트 케이스들"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """테스트용 임시 디렉토리 생성"""
+        temp_path = tempfile.mkdtemp()
+        yield temp_path
+        shutil.rmtree(temp_path)
+
+    @pytest.fixture
+    def spider_loader(self, temp_dir):
+        """sqlite 데이터베이스 두 개가 준비된 SpiderLoader 인스턴스 생성"""
+        loader = SpiderLoader(save_path=temp_dir)
+        for db_id in ["concert_singer", "pets_1"]:
+            _create_database(Path(loader.get_sqlite_database(), db_id, f"{db_id}.sqlite"))
+        yield loader
+        loader.get_connection_manager().close()
+
+    def test_execute_returns_rows(self, spider_loader):
+        """
+        Given: sqlite 데이터베이스가 준비된 SpiderLoader
+        When: execute(db_id, sql)를 호출할 때
+        Then: 모든 결과 행을 반환하고 같은 스레드에서는 연결을 재사용해야 함
+        """
+        rows = spider_loader.execute("concert_singer", "SELECT name FROM singer ORDER BY singer_id")
+
+        assert rows == [("singer 0",), ("singer 1",), ("singer 2",)]
+        manager = spider_loader.get_connection_manager()
+        assert manager.connection("concert_singer") is manager.connection("concert_singer")
+
+    def test_connections_are_read_only(self, spider_loader):
+        """
+        Given: sqlite 데이터베이스가 준비된 SpiderLoader
+        When: 데이터를 변경하는 쿼리를 실행할 때
+        Then: sqlite3.OperationalError가 발생해야 함
+        """
+        with pytest.raises(sqlite3.OperationalError):
+            spider_loader.execute("concert_singer", "DELETE FROM singer")
+
+    def test_idle_connections_are_evicted(self, spider_loader):
+        """
+        Given: 스레드당 연결 수가 1개로 제한된 ConnectionManager
+        When: 두 번째 데이터베이스에 연결할 때
+        Then: 가장 오래 사용하지 않은 연결이 닫혀야 함
+        """
+        manager = ConnectionManager(spider_loader.get_sqlite_path, max_connections_per_thread=1)
+        first = manager.connection("concert_singer")
+        manager.connection("pets_1")
+
+        with pytest.raises(sqlite3.ProgrammingError):
+            first.execute("SELECT 1")
+        assert manager.connection("concert_singer") is not first
+        manager.close()
+
+    def test_each_thread_has_its_own_connection(self, spider_loader):
+        """
+        Given: 하나의 ConnectionManager
+        When: 다른 스레드에서 같은 db_id로 연결할 때
+        Then: 스레드마다 별도의 연결을 사용해야 함
+        """
+        manager = spider_loader.get_connection_manager()
+        connections = []
+        thread = threading.Thread(target=lambda: connections.append(manager.connection("concert_singer")))
+        thread.start()
+        thread.join()
+
+        assert connections[0] is not manager.connection("concert_singer")
+
+    def test_finished_thread_connections_are_closed(self, spider_loader):
+        """
+        Given: 연결을 연 뒤 끝난 스레드
+        When: 스레드가 끝났을 때
+        Then: ConnectionManager가 그 스레드의 연결 목록을 버리고 연결을 닫아야 함
+        """
+        manager = spider_loader.get_connection_manager()
+        connections = []
+        thread = threading.Thread(target=lambda: connections.append(manager.connection("concert_singer")))
+        thread.start()
+        thread.join()
+
+        assert len(manager._pools) == 0
+        with pytest.raises(sqlite3.ProgrammingError):
+            connections[0].execute("SELECT 1")
+
+    def test_slow_query_times_out(self, spider_loader):
+        """
+        Given: 끝나지 않는 재귀 쿼리
+        When: timeout을 지정해 execute()를 호출할 때
+        Then: QueryTimeout이 발생하고 연결은 계속 사용할 수 있어야 함
+        """
+        endless = "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n) SELECT COUNT(*) FROM n"
+
+        with pytest.raises(QueryTimeout):
+            spider_loader.execute("concert_singer", endless, timeout=0.1)
+        assert spider_loader.execute("concert_singer", "SELECT COUNT(*) FROM singer") == [(3,)]
+
+    def test_missing_database_raises(self, spider_loader):
+        """
+        Given: 존재하지 않는 db_id
+        When: execute()를 호출할 때
+        Then: FileNotFoundError가 발생해야 함
+        """
+        with pytest.raises(FileNotFoundError):
+            spider_loader.execute("missing_db", "SELECT 1")
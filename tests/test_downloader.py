@@ -0,0 +1,180 @@
+import hashlib
+import os
+import pytest
+import tempfile
+import shutil
+from pathlib import Path
+from src.text_to_sql.downloader import Downloader, DownloadError, DownloadManifest
+from tests.http_server import serve_files
+
+
+PAYLOAD = os.urandom(256 * 1024 + 17)
+
+
+class TestDownloader:
+    """Downloader 클래스에 대한 테스트 케이스들"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """테스트용 임시 디렉토리 생성"""
+        temp_path = tempfile.mkdtemp()
+        yield temp_path
+        shutil.rmtree(temp_path)
+
+    @pytest.fixture
+    def downloader(self):
+        """작은 chunk를 사용하는 Downloader 인스턴스 생성"""
+        return Downloader(chunk_size=4096, timeout=5, retries=2)
+
+    def test_download_verifies_manifest(self, downloader, temp_dir):
+        """
+        Given: 로컬 서버와 올바른 크기/sha256 manifest
+        When: download()를 호출할 때
+        Then: 파일이 저장되고 partial 파일은 남지 않아야 함
+        """
+        manifest = DownloadManifest(size=len(PAYLOAD), sha256=hashlib.sha256(PAYLOAD).hexdigest())
+        dest = Path(temp_dir, "data.zip")
+
+        with serve_files({"data.zip": PAYLOAD}) as server:
+            result = downloader.download(server.url("data.zip"), dest, manifest)
+
+        assert result == dest
+        assert dest.read_bytes() == PAYLOAD
+        assert not Downloader.part_path(dest).exists()
+
+    def test_download_resumes_from_partial_file(self, downloader, temp_dir):
+        """
+        Given: 앞부분이 이미 받아진 partial 파일
+        When: download()를 호출할 때
+        Then: Range 요청으로 나머지 부분만 받아 이어 붙여야 함
+        """
+        dest = Path(temp_dir, "data.zip")
+        Downloader.part_path(dest).write_bytes(PAYLOAD[:1000])
+
+        with serve_files({"data.zip": PAYLOAD}) as server:
+            downloader.download(server.url("data.zip"), dest)
+
+        assert dest.read_bytes() == PAYLOAD
+        assert server.requests[0]["Range"] == "bytes=1000-"
+
+    def test_download_restarts_when_partial_file_exceeds_remote_size(self, downloader, temp_dir):
+        """
+        Given: 서버의 파일보다 긴 partial 파일 (서버의 파일이 바뀐 경우)
+        When: download()를 호출해 서버가 416과 `Content-Range: bytes */N`을 반환할 때
+        Then: partial 파일을 버리고 처음부터 받아야 함
+        """
+        dest = Path(temp_dir, "data.zip")
+        Downloader.part_path(dest).write_bytes(os.urandom(len(PAYLOAD) + 100))
+
+        with serve_files({"data.zip": PAYLOAD}) as server:
+            downloader.download(server.url("data.zip"), dest)
+
+        assert dest.read_bytes() == PAYLOAD
+        assert server.requests[0]["Range"] == f"bytes={len(PAYLOAD) + 100}-"
+        assert "Range" not in server.requests[1]
+
+    def test_download_accepts_complete_partial_file_on_416(self, downloader, temp_dir):
+        """
+        Given: 서버의 파일과 크기가 같은 partial 파일
+        When: download()를 호출해 서버가 416을 반환할 때
+        Then: 다시 받지 않고 partial 파일을 그대로 완성된 파일로 옮겨야 함
+        """
+        dest = Path(temp_dir, "data.zip")
+        Downloader.part_path(dest).write_bytes(PAYLOAD)
+
+        with serve_files({"data.zip": PAYLOAD}) as server:
+            downloader.download(server.url("data.zip"), dest)
+
+        assert dest.read_bytes() == PAYLOAD
+        assert len(server.requests) == 1
+
+    def test_download_retries_interrupted_transfer(self, downloader, temp_dir):
+        """
+        Given: 첫 응답 도중 연결이 끊기는 서버
+        When: download()를 호출할 때
+        Then: 끊긴 지점부터 이어받아 완전한 파일을 만들어야 함
+        """
+        dest = Path(temp_dir, "data.zip")
+
+        with serve_files({"data.zip": PAYLOAD}) as server:
+            server.truncate_after = 50000
+            server.truncate_times = 1
+            downloader.download(server.url("data.zip"), dest)
+
+        assert dest.read_bytes() == PAYLOAD
+        assert len(server.requests) == 2
+        assert "Range" not in server.requests[0]
+        assert server.requests[1]["Range"].startswith("bytes=")
+
+    def test_interrupted_segmented_download_resumes_each_segment(self, temp_dir):
+        """
+        Given: 구간 병렬 다운로드 도중 모든 구간의 연결이 끊겨 실패한 상황
+        When: 같은 url로 download()를 다시 호출할 때
+        Then: 구간 진행 상황이 남아 있어 각 구간을 받은 위치부터 이어받고, 완료 후에는 지워져야 함
+        """
+        downloader = Downloader(chunk_size=4096, timeout=5, retries=1, min_segment_size=32 * 1024)
+        dest = Path(temp_dir, "data.zip")
+        manifest = DownloadManifest(size=len(PAYLOAD), sha256=hashlib.sha256(PAYLOAD).hexdigest())
+
+        with serve_files({"data.zip": PAYLOAD}) as server:
+            server.truncate_after = 20000
+            # 크기 확인 요청 1번 + 구간 4개가 두 번씩 시도
+            server.truncate_times = 9
+            with pytest.raises(DownloadError):
+                downloader.download(server.url("data.zip"), dest, manifest, segments=4)
+            assert Downloader.segments_path(dest).exists()
+            assert Downloader.segment_state_path(dest).exists()
+
+            server.requests.clear()
+            downloader.download(server.url("data.zip"), dest, manifest, segments=4)
+
+        bounds = [len(PAYLOAD) * i // 4 for i in range(4)]
+        resumed = sorted(int(request["Range"][len("bytes="):].split("-")[0]) for request in server.requests[1:])
+        assert resumed == [bound + 40000 for bound in bounds]
+        assert dest.read_bytes() == PAYLOAD
+        assert not Downloader.segments_path(dest).exists()
+        assert not Downloader.segment_state_path(dest).exists()
+
+    def test_iter_chunks_resumes_interrupted_stream(self, downloader):
+        """
+        Given: 첫 응답 도중 연결이 끊기는 서버
+        When: iter_chunks()로 본문을 읽을 때
+        Then: 끊긴 지점부터 Range 요청으로 이어받아 전체 본문을 반환해야 함
+        """
+        with serve_files({"data.zip": PAYLOAD}) as server:
+            server.truncate_after = 50000
+            server.truncate_times = 1
+            body = b"".join(downloader.iter_chunks(server.url("data.zip")))
+
+        assert body == PAYLOAD
+        assert server.requests[1]["Range"] == "bytes=50000-"
+
+    def test_download_rejects_manifest_mismatch(self, downloader, temp_dir):
+        """
+        Given: 실제 파일과 다른 sha256이 담긴 manifest
+        When: download()를 호출할 때
+        Then: DownloadError가 발생하고 손상된 partial 파일은 삭제되어야 함
+        """
+        manifest = DownloadManifest(sha256="0" * 64)
+        dest = Path(temp_dir, "data.zip")
+
+        with serve_files({"data.zip": PAYLOAD}) as server:
+            with pytest.raises(DownloadError):
+                downloader.download(server.url("data.zip"), dest, manifest)
+
+        assert not dest.exists()
+        assert not Downloader.part_path(dest).exists()
+
+    def test_download_skips_already_verified_file(self, downloader, temp_dir):
+        """
+        Given: manifest와 일치하는 파일이 이미 존재하는 상태
+        When: download()를 호출할 때
+        Then: 서버에 요청하지 않아야 함
+        """
+        dest = Path(temp_dir, "data.zip")
+        dest.write_bytes(PAYLOAD)
+
+        with serve_files({"data.zip": PAYLOAD}) as server:
+            downloader.download(server.url("data.zip"), dest, DownloadManifest(size=len(PAYLOAD)))
+
+        assert server.requests == []
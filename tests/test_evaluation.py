@@ -0,0 +1,132 @@
+import json
+import pytest
+import sqlite3
+import tempfile
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+from src.text_to_sql import evaluation
+from src.text_to_sql.evaluation import CORRECT, ERROR, GOLD_ERROR, INCORRECT, TIMEOUT, results_match
+from src.text_to_sql.spider_loader import SpiderLoader
+
+
+ENDLESS_QUERY = "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n) SELECT COUNT(*) FROM n"
+
+
+def _create_database(path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE singer (singer_id INTEGER PRIMARY KEY, name TEXT, age INTEGER)")
+    connection.executemany("INSERT INTO singer VALUES (?, ?, ?)", [(1, "Joe", 30), (2, "Ann", 25), (3, "Tom", 30)])
+    connection.commit()
+    connection.close()
+
+
+class TestEvaluateExecution:
+    """evaluate_execution과 results_match에 대한 테스트 케이스들"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """테스트용 임시 디렉토리 생성"""
+        temp_path = tempfile.mkdtemp()
+        yield temp_path
+        shutil.rmtree(temp_path)
+
+    @pytest.fixture
+    def spider_loader(self, temp_dir):
+        """dev.json과 sqlite 데이터베이스 두 개가 준비된 SpiderLoader 인스턴스 생성"""
+        loader = SpiderLoader(save_path=temp_dir)
+        for db_id in ["concert_singer", "singer"]:
+            _create_database(Path(loader.get_sqlite_database(), db_id, f"{db_id}.sqlite"))
+        records = [
+            {"db_id": "concert_singer", "question": "names", "query": "SELECT name FROM singer"},
+            {"db_id": "singer", "question": "ages", "query": "SELECT age FROM singer"},
+            {"db_id": "concert_singer", "question": "count", "query": "SELECT count(*) FROM singer"},
+            {"db_id": "singer", "question": "broken", "query": "SELECT missing FROM singer"},
+        ]
+        dev_path = loader.get_split_files()["dev"][0]
+        dev_path.write_text(json.dumps(records), encoding="utf-8")
+        return loader
+
+    def test_results_match_compares_multisets(self):
+        """
+        Given: 행 순서나 중복 횟수가 다른 결과들
+        When: results_match()로 비교할 때
+        Then: 순서는 무시하고 중복 횟수는 구분해야 함
+        """
+        assert results_match([(1,), (2,)], [(2,), (1,)])
+        assert not results_match([(1,), (1,), (2,)], [(1,), (2,), (2,)])
+        assert not results_match([(1,)], [(1,), (1,)])
+
+    def test_scores_predictions_against_gold(self, spider_loader):
+        """
+        Given: 정답, 오답, 오류, 무한 쿼리가 섞인 예측
+        When: evaluate_execution()을 호출할 때
+        Then: 예제 index 순서로 각 상태를 반환해야 함
+        """
+        predictions = [
+            "SELECT name FROM singer ORDER BY name",
+            "SELECT DISTINCT age FROM singer",
+            ENDLESS_QUERY,
+            "SELECT name FROM singer",
+        ]
+
+        report = spider_loader.evaluate_execution(predictions, timeout=0.2, jobs=1)
+
+        assert [result.status for result in report.results] == [CORRECT, INCORRECT, TIMEOUT, GOLD_ERROR]
+        assert report.accuracy == 0.25
+        assert report.count(TIMEOUT) == 1
+
+    def test_process_pool_matches_serial_results(self, spider_loader):
+        """
+        Given: 여러 db_id에 걸친 예측
+        When: jobs=2로 프로세스 풀에서 채점할 때
+        Then: 현재 프로세스에서 채점한 결과와 같아야 함
+        """
+        predictions = {0: "SELECT name FROM singer", 1: "SELECT age FROM singer", 2: "SELEC 1"}
+
+        parallel = spider_loader.evaluate_execution(predictions, jobs=2)
+        serial = spider_loader.evaluate_execution(predictions, jobs=1)
+
+        assert parallel.results == serial.results
+        assert [result.status for result in parallel.results] == [CORRECT, CORRECT, ERROR]
+
+    def test_serial_run_closes_its_connections(self, spider_loader):
+        """
+        Given: 두 db_id에 걸친 예측
+        When: jobs=1로 현재 프로세스에서 채점할 때
+        Then: db_id마다 한 작업으로 채점하고, 끝나면 사용한 연결을 닫으며 모듈의 worker 연결은 만들지 않아야 함
+        """
+        managers = []
+        chunk_db_ids = []
+        original_close = evaluation.ConnectionManager.close
+        original_chunk = evaluation._evaluate_chunk
+
+        def record_close(self):
+            managers.append(self)
+            original_close(self)
+
+        def record_chunk(db_id, *args, **kwargs):
+            chunk_db_ids.append(db_id)
+            return original_chunk(db_id, *args, **kwargs)
+
+        with patch.object(evaluation.ConnectionManager, "close", record_close), \
+             patch.object(evaluation, "_evaluate_chunk", record_chunk):
+            report = spider_loader.evaluate_execution(["SELECT name FROM singer", "SELECT age FROM singer",
+                                                       "SELECT count(*) FROM singer", "SELECT 1"], jobs=1)
+
+        assert [result.status for result in report.results] == [CORRECT, CORRECT, CORRECT, GOLD_ERROR]
+        assert sorted(chunk_db_ids) == ["concert_singer", "singer"]
+        assert len(managers) == 1
+        assert evaluation._worker_connections is None
+
+    def test_prediction_count_must_match_split(self, spider_loader):
+        """
+        Given: split보다 적은 예측 목록
+        When: evaluate_execution()을 호출할 때
+        Then: ValueError가 발생해야 함
+        """
+        with pytest.raises(ValueError):
+            spider_loader.evaluate_execution(["SELECT 1"])
+        with pytest.raises(ValueError):
+            spider_loader.evaluate_execution({10: "SELECT 1"})
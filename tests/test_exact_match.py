@@ -0,0 +1,191 @@
+import gc
+import json
+import pytest
+import tempfile
+import shutil
+import weakref
+from pathlib import Path
+from src.text_to_sql.evaluation import CORRECT, ERROR, GOLD_ERROR, INCORRECT
+from src.text_to_sql import exact_match
+from src.text_to_sql.bird_loader import BirdMiniDevLoader
+from src.text_to_sql.exact_match import (ExactMatchReport, SqlParseError, build_gold_forms, canonical_form,
+                                         load_gold_forms, parse_sql, save_gold_forms)
+from src.text_to_sql.observers import RecordingObserver
+from src.text_to_sql.schema import DatabaseSchema
+from src.text_to_sql.spider_loader import SpiderLoader
+
+
+TABLES = [{
+    "db_id": "concert_singer",
+    "table_names_original": ["singer", "concert"],
+    "table_names": ["singer", "concert"],
+    "column_names_original": [[-1, "*"], [0, "Singer_ID"], [0, "Name"], [0, "Age"],
+                              [1, "concert_ID"], [1, "concert_Name"], [1, "Singer_ID"]],
+    "column_names": [[-1, "*"], [0, "singer id"], [0, "name"], [0, "age"],
+                     [1, "concert id"], [1, "concert name"], [1, "singer id"]],
+    "column_types": ["text", "number", "text", "number", "number", "text", "number"],
+    "primary_keys": [1, 4],
+    "foreign_keys": [[6, 1]],
+}]
+
+
+def _tree(select, table_units, conds=(), where=(), group_by=(), having=(), order_by=(), limit=None):
+    """Spider dev.json의 `sql` 필드와 같은 모양의 트리"""
+    return {"select": select, "from": {"table_units": list(table_units), "conds": list(conds)},
+            "where": list(where), "groupBy": list(group_by), "having": list(having), "orderBy": list(order_by),
+            "limit": limit, "intersect": None, "union": None, "except": None}
+
+
+GOLD = [
+    {"db_id": "concert_singer", "question": "count", "query": "SELECT count(*) FROM singer",
+     "sql": _tree([False, [[3, [0, [0, 0, False], None]]]], [["table_unit", 0]])},
+    {"db_id": "concert_singer", "question": "oldest", "query": "SELECT name FROM singer WHERE age > 20 ORDER BY age DESC LIMIT 3",
+     "sql": _tree([False, [[0, [0, [0, 2, False], None]]]], [["table_unit", 0]],
+                  where=[[False, 3, [0, [0, 3, False], None], 20.0, None]],
+                  order_by=["desc", [[0, [0, 3, False], None]]], limit=3)},
+    {"db_id": "concert_singer", "question": "concerts",
+     "query": "SELECT T2.concert_name FROM singer AS T1 JOIN concert AS T2 ON T1.singer_id = T2.singer_id WHERE T1.name = 'Joe'",
+     "sql": _tree([False, [[0, [0, [0, 5, False], None]]]], [["table_unit", 0], ["table_unit", 1]],
+                  conds=[[False, 2, [0, [0, 1, False], None], [0, 6, False], None]],
+                  where=[[False, 2, [0, [0, 2, False], None], "\"Joe\"", None]])},
+    {"db_id": "concert_singer", "question": "broken", "query": "SELECT missing FROM singer"},
+]
+
+
+class TestExactMatch:
+    """exact_match 모듈과 SpiderLoader.evaluate_exact_match에 대한 테스트 케이스들"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """테스트용 임시 디렉토리 생성"""
+        temp_path = tempfile.mkdtemp()
+        yield temp_path
+        shutil.rmtree(temp_path)
+
+    @pytest.fixture
+    def schema(self):
+        return DatabaseSchema.from_record(TABLES[0])
+
+    @pytest.fixture
+    def spider_loader(self, temp_dir):
+        """sql 트리가 있는 dev.json과 tables.json이 준비된 SpiderLoader 인스턴스 생성"""
+        loader = SpiderLoader(save_path=temp_dir)
+        files = loader.get_sqlite_json_files()
+        files["table"].parent.mkdir(parents=True, exist_ok=True)
+        files["table"].write_text(json.dumps(TABLES), encoding="utf-8")
+        loader.get_split_files()["dev"][0].write_text(json.dumps(GOLD), encoding="utf-8")
+        return loader
+
+    def test_parsed_sql_matches_precomputed_gold_trees(self, schema):
+        """
+        Given: dev.json 형식으로 기록된 gold sql 트리와 같은 gold SQL 문자열
+        When: SQL 문자열을 파싱해 정규화할 때
+        Then: 미리 계산된 트리를 정규화한 형태와 같아야 함
+        """
+        for record in GOLD[:3]:
+            assert canonical_form(parse_sql(record["query"], schema), schema) == canonical_form(record["sql"], schema)
+
+    def test_set_semantics_values_and_foreign_keys(self, schema):
+        """
+        Given: SELECT 순서, 값, 별칭, JOIN 조건 방향만 다른 SQL과 구조가 다른 SQL
+        When: 정규화한 형태를 비교할 때
+        Then: 앞의 것들은 같고 연산자나 DISTINCT 외의 구조가 다르면 달라야 함
+        """
+        def form(sql):
+            return canonical_form(parse_sql(sql, schema), schema)
+
+        assert form("SELECT name, age FROM singer") == form("select Age, NAME from singer;")
+        assert form("SELECT name FROM singer WHERE age > 20 ORDER BY age DESC LIMIT 3") == \
+            form('SELECT name FROM singer WHERE age > 45 ORDER BY age DESC LIMIT 1')
+        assert form(GOLD[2]["query"]) == form("SELECT B.concert_name FROM singer AS A JOIN concert AS B "
+                                              "ON B.singer_id = A.singer_id WHERE A.name = 'Ann'")
+        assert form("SELECT name FROM singer WHERE age > 20") != form("SELECT name FROM singer WHERE age < 20")
+        assert form("SELECT name FROM singer") != form("SELECT name FROM singer LIMIT 1")
+        assert form("SELECT name FROM singer INTERSECT SELECT name FROM singer") != \
+            form("SELECT name FROM singer UNION SELECT name FROM singer")
+        with pytest.raises(SqlParseError):
+            parse_sql("SELECT missing FROM singer", schema)
+        with pytest.raises(SqlParseError):
+            parse_sql("SELECT name FROM singer WHERE name = 'Joe", schema)
+
+    def test_schema_index_is_released_with_schema(self):
+        """
+        Given: canonical_form()에 사용한 스키마 객체
+        When: 스키마 객체에 대한 참조가 모두 사라질 때
+        Then: 모듈의 스키마 색인 캐시에서도 사라져야 함
+        """
+        schema = DatabaseSchema.from_record(TABLES[0])
+        canonical_form(GOLD[0]["sql"], schema)
+        assert schema in exact_match._schema_indexes
+        schema_ref = weakref.ref(schema)
+
+        del schema
+        gc.collect()
+
+        assert schema_ref() is None
+
+    def test_gold_forms_round_trip_through_json(self, spider_loader, temp_dir):
+        """
+        Given: sql 트리와 파싱할 수 없는 gold SQL로 만든 gold 형태
+        When: save_gold_forms()로 저장한 뒤 load_gold_forms()로 읽을 때
+        Then: JSON 파일에서 같은 형태로 복원되고, source가 다르면 None이어야 함
+        """
+        forms = build_gold_forms(GOLD, spider_loader.get_schema_catalog())
+        path = Path(temp_dir, "gold.json")
+
+        save_gold_forms(path, "source-1", forms)
+
+        assert json.loads(path.read_text(encoding="utf-8"))["source"] == "source-1"
+        assert load_gold_forms(path, "source-1") == forms
+        assert load_gold_forms(path, "source-2") is None
+
+    def test_evaluate_exact_match_reuses_cached_gold_forms(self, spider_loader, temp_dir):
+        """
+        Given: 정답, 오답, 파싱 오류가 섞인 예측과 파싱할 수 없는 gold SQL
+        When: evaluate_exact_match()로 채점한 뒤 새 Loader로 다시 채점할 때
+        Then: 예제 순서로 상태를 반환하고, 두 번째 Loader는 저장된 gold 형태를 재사용해야 함
+        """
+        predictions = [
+            "SELECT count(*) FROM singer",
+            "SELECT name FROM singer WHERE age > 20 ORDER BY age ASC LIMIT 3",
+            "SELECT T2.concert_name FROM singer T1 JOIN concert T2",
+            "SELECT name FROM singer",
+        ]
+
+        report = spider_loader.evaluate_exact_match(predictions, jobs=1)
+
+        assert isinstance(report, ExactMatchReport)
+        assert [result.status for result in report.results] == [CORRECT, INCORRECT, ERROR, GOLD_ERROR]
+        assert report.accuracy == 0.25
+        assert list(Path(temp_dir, ".cache", "exact_match").glob("dev-*.json"))
+
+        observer = RecordingObserver()
+        reloaded = SpiderLoader(save_path=temp_dir, observer=observer)
+        assert reloaded.evaluate_exact_match(predictions, jobs=1).results == report.results
+        assert ("Spider", "exact_match", True) in observer.cache_lookups
+        with pytest.raises(ValueError):
+            spider_loader.evaluate_exact_match(predictions[:2])
+        # gold sql 트리가 없는 BIRD에는 exact-set-match 채점을 제공하지 않음
+        assert not hasattr(BirdMiniDevLoader(save_path=temp_dir), "evaluate_exact_match")
+
+    def test_memoized_and_parallel_scoring_match_serial(self, spider_loader):
+        """
+        Given: 한 예제에 반복되는 후보가 많은 beam reranking 형태의 예측
+        When: score()를 프로세스 풀과 현재 프로세스에서 각각 실행할 때
+        Then: 결과가 같고 중복 후보는 한 번만 파싱되어 기억되어야 함
+        """
+        evaluator = spider_loader.get_exact_match_evaluator()
+        candidates = ["SELECT count(*) FROM singer", "SELECT count(name) FROM singer", "SELEC"] * 20
+        pairs = [(0, sql) for sql in candidates] + [(1, GOLD[1]["query"]), (2, GOLD[2]["query"])]
+
+        parallel = evaluator.score(pairs, jobs=2, chunk_size=1)
+        evaluator._memo.clear()
+        serial = evaluator.score(pairs, jobs=1)
+
+        assert parallel == serial
+        assert [result.status for result in serial[:3]] == [CORRECT, INCORRECT, ERROR]
+        assert serial[-2].correct and serial[-1].correct
+        assert len(evaluator._memo) == 5
+        assert evaluator.match(0, "select COUNT(*) from SINGER")
+        with pytest.raises(ValueError):
+            evaluator.score([(10, "SELECT 1")])
@@ -0,0 +1,119 @@
+import json
+import os
+import pytest
+import tempfile
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+from src.text_to_sql import example_cache
+from src.text_to_sql.example_cache import ExampleCache
+from src.text_to_sql.spider_loader import SpiderLoader
+
+
+def _records(count, prefix="SELECT"):
+    return [
+        {
+            "db_id": f"db_{i % 3}",
+            "query": f"{prefix} {i}",
+            "query_toks": [prefix, str(i)],
+            "question": f"question {i}",
+            "question_toks": ["question", str(i)],
+        }
+        for i in range(count)
+    ]
+
+
+class TestExampleCache:
+    """ExampleCache와 Loader.get_example_cache에 대한 테스트 케이스들"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """테스트용 임시 디렉토리 생성"""
+        temp_path = tempfile.mkdtemp()
+        yield temp_path
+        shutil.rmtree(temp_path)
+
+    @pytest.fixture
+    def spider_loader(self, temp_dir):
+        """dev.json이 준비된 SpiderLoader 인스턴스 생성"""
+        loader = SpiderLoader(save_path=temp_dir)
+        dev_path = loader.get_split_files()["dev"][0]
+        dev_path.parent.mkdir(parents=True)
+        dev_path.write_text(json.dumps(_records(10)), encoding="utf-8")
+        return loader
+
+    def test_cache_supports_random_access(self, spider_loader):
+        """
+        Given: dev.json이 준비된 SpiderLoader
+        When: get_example_cache("dev")로 캐시를 열 때
+        Then: index와 db_id로 예제를 바로 조회할 수 있어야 함
+        """
+        cache = spider_loader.get_example_cache("dev")
+
+        assert len(cache) == 10
+        assert cache[4].query == "SELECT 4"
+        assert cache[-1].index == 9
+        assert cache[4].question_toks == ["question", "4"]
+        assert [example.index for example in cache.by_db_id("db_1")] == [1, 4, 7]
+        assert cache.db_ids() == ["db_0", "db_1", "db_2"]
+        with pytest.raises(IndexError):
+            cache[10]
+
+    def test_cache_is_reused_across_loaders(self, spider_loader):
+        """
+        Given: 한 번 캐시가 만들어진 상태
+        When: 새 Loader 인스턴스에서 다시 캐시를 열 때
+        Then: JSON을 다시 파싱하지 않아야 함
+        """
+        spider_loader.get_example_cache("dev")
+        fresh_loader = SpiderLoader(save_path=spider_loader.save_path)
+
+        with patch.object(example_cache, "build") as mock_build:
+            cache = fresh_loader.get_example_cache("dev")
+
+        mock_build.assert_not_called()
+        assert len(cache) == 10
+
+    def test_cache_is_rebuilt_when_source_changes(self, spider_loader):
+        """
+        Given: 캐시가 만들어진 뒤 dev.json이 바뀐 상태
+        When: 같은 Loader에서 다시 캐시를 열 때
+        Then: 바뀐 내용으로 캐시가 다시 만들어져야 함
+        """
+        first = spider_loader.get_example_cache("dev")
+        dev_path = spider_loader.get_split_files()["dev"][0]
+        dev_path.write_text(json.dumps(_records(12, prefix="select")), encoding="utf-8")
+        stat = dev_path.stat()
+        os.utime(dev_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        second = spider_loader.get_example_cache("dev")
+
+        assert second is not first
+        assert len(second) == 12
+        assert second[0].query == "select 0"
+
+    def test_iter_examples_reads_from_cache(self, spider_loader):
+        """
+        Given: 캐시가 만들어진 상태
+        When: iter_examples()에 filter와 limit을 사용할 때
+        Then: 캐시에서 JSON 경로와 같은 결과를 반환해야 함
+        """
+        cached = list(spider_loader.iter_examples("dev").filter(db_id="db_2").limit(2))
+        uncached = list(spider_loader.iter_examples("dev", cached=False).filter(db_id="db_2").limit(2))
+
+        assert cached == uncached
+        assert [example.index for example in cached] == [2, 5]
+
+    def test_corrupt_cache_file_is_rebuilt(self, spider_loader, temp_dir):
+        """
+        Given: 손상된 캐시 파일
+        When: ExampleCache.open()을 호출할 때
+        Then: 캐시를 다시 만들어야 함
+        """
+        source_paths = spider_loader.get_split_files()["dev"]
+        cache_path = Path(temp_dir, "broken.sqlite")
+        cache_path.write_bytes(b"not a sqlite file")
+
+        cache = ExampleCache.open(cache_path, source_paths)
+
+        assert len(cache) == 10
@@ -0,0 +1,156 @@
+import json
+import pytest
+import tempfile
+import shutil
+from pathlib import Path
+from src.text_to_sql.bird_loader import BirdMiniDevLoader
+from src.text_to_sql.examples import Example, iter_json_array
+from src.text_to_sql.spider_loader import SpiderLoader
+
+
+SPIDER_RECORDS = [
+    {
+        "db_id": "concert_singer" if i % 2 == 0 else "pets_1",
+        "query": f"SELECT {i}",
+        "query_toks": ["SELECT", str(i)],
+        "query_toks_no_value": ["select", "value"],
+        "question": f"질문 {i} \"따옴표\" }} ]",
+        "question_toks": ["질문", str(i)],
+        "sql": {"select": [False, [[0, [0, [0, i, False], None]]]]},
+    }
+    for i in range(50)
+]
+
+
+class TestIterJsonArray:
+    """iter_json_array 함수에 대한 테스트 케이스들"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """테스트용 임시 디렉토리 생성"""
+        temp_path = tempfile.mkdtemp()
+        yield temp_path
+        shutil.rmtree(temp_path)
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 20])
+    def test_iter_json_array_matches_json_load(self, temp_dir, chunk_size):
+        """
+        Given: 원소가 chunk 경계에 걸치는 JSON 배열 파일
+        When: 다양한 chunk 크기로 iter_json_array()를 호출할 때
+        Then: json.load와 같은 결과를 순서대로 반환해야 함
+        """
+        path = Path(temp_dir, "dev.json")
+        path.write_text(json.dumps(SPIDER_RECORDS, indent=4, ensure_ascii=False), encoding="utf-8")
+
+        assert list(iter_json_array(path, chunk_size=chunk_size)) == SPIDER_RECORDS
+
+    @pytest.mark.parametrize("chunk_size", [2, 3, 4, 5])
+    def test_iter_json_array_reads_numbers_split_across_chunks(self, temp_dir, chunk_size):
+        """
+        Given: 최상위 원소가 숫자인 JSON 배열 파일
+        When: 숫자가 chunk 경계에서 나뉘는 chunk 크기로 iter_json_array()를 호출할 때
+        Then: 나뉜 앞부분이 아니라 숫자 전체를 반환해야 함
+        """
+        path = Path(temp_dir, "numbers.json")
+        path.write_text("[12345,-6.78e+9, 0,1024]", encoding="utf-8")
+
+        assert list(iter_json_array(path, chunk_size=chunk_size)) == [12345, -6.78e+9, 0, 1024]
+
+    def test_iter_json_array_rejects_truncated_file(self, temp_dir):
+        """
+        Given: 중간에 잘린 JSON 배열 파일
+        When: iter_json_array()로 끝까지 읽을 때
+        Then: 온전한 원소는 반환하고 잘린 부분에서 ValueError가 발생해야 함
+        """
+        path = Path(temp_dir, "dev.json")
+        path.write_text(json.dumps(SPIDER_RECORDS[:2])[:-10], encoding="utf-8")
+
+        iterator = iter_json_array(path, chunk_size=16)
+        assert next(iterator) == SPIDER_RECORDS[0]
+        with pytest.raises(ValueError):
+            list(iterator)
+
+    def test_iter_json_array_rejects_non_array(self, temp_dir):
+        """
+        Given: 최상위가 객체인 JSON 파일
+        When: iter_json_array()를 호출할 때
+        Then: ValueError가 발생해야 함
+        """
+        path = Path(temp_dir, "tables.json")
+        path.write_text("{}", encoding="utf-8")
+
+        with pytest.raises(ValueError):
+            list(iter_json_array(path))
+
+
+class TestIterExamples:
+    """Loader.iter_examples에 대한 테스트 케이스들"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """테스트용 임시 디렉토리 생성"""
+        temp_path = tempfile.mkdtemp()
+        yield temp_path
+        shutil.rmtree(temp_path)
+
+    @pytest.fixture
+    def spider_loader(self, temp_dir):
+        """dev.json이 준비된 SpiderLoader 인스턴스 생성"""
+        loader = SpiderLoader(save_path=temp_dir)
+        dev_path = loader.get_split_files()["dev"][0]
+        dev_path.parent.mkdir(parents=True)
+        dev_path.write_text(json.dumps(SPIDER_RECORDS), encoding="utf-8")
+        return loader
+
+    def test_iter_examples_yields_slotted_examples(self, spider_loader):
+        """
+        Given: dev.json이 준비된 SpiderLoader
+        When: iter_examples("dev")를 순회할 때
+        Then: 모든 레코드가 __slots__ 기반 Example로 순서대로 반환되어야 함
+        """
+        examples = list(spider_loader.iter_examples("dev"))
+
+        assert len(examples) == len(SPIDER_RECORDS)
+        assert examples[3] == Example(3, "pets_1", SPIDER_RECORDS[3]["question"], "SELECT 3",
+                                      ["질문", "3"], ["SELECT", "3"])
+        assert not hasattr(examples[0], "__dict__")
+
+    def test_iter_examples_supports_filter_and_limit(self, spider_loader):
+        """
+        Given: dev.json이 준비된 SpiderLoader
+        When: filter(db_id=...)와 limit을 함께 사용할 때
+        Then: 해당 db_id의 예제만 limit 개수만큼, 원래 index를 유지한 채 반환되어야 함
+        """
+        examples = list(spider_loader.iter_examples("dev", limit=3).filter(db_id="pets_1"))
+
+        assert [example.index for example in examples] == [1, 3, 5]
+        assert all(example.db_id == "pets_1" for example in examples)
+
+    def test_iter_examples_rejects_unknown_split(self, spider_loader):
+        """
+        Given: SpiderLoader
+        When: 존재하지 않는 split으로 iter_examples()를 호출할 때
+        Then: ValueError가 발생해야 함
+        """
+        with pytest.raises(ValueError):
+            spider_loader.iter_examples("validation")
+
+    def test_bird_examples_use_sql_key(self, temp_dir):
+        """
+        Given: SQL, evidence 키를 사용하는 Bird Mini Dev dev 파일
+        When: iter_examples("dev")를 순회할 때
+        Then: SQL이 query로, evidence가 그대로 담겨야 함
+        """
+        loader = BirdMiniDevLoader(save_path=temp_dir)
+        dev_path = loader.get_split_files()["dev"][0]
+        dev_path.parent.mkdir(parents=True)
+        dev_path.write_text(json.dumps([{
+            "question_id": 0, "db_id": "debit_card_specializing", "question": "q",
+            "evidence": "hint", "SQL": "SELECT 1", "difficulty": "simple",
+        }]), encoding="utf-8")
+
+        example = next(iter(loader.iter_examples("dev")))
+
+        assert example.query == "SELECT 1"
+        assert example.evidence == "hint"
+        assert example.question_toks is None
@@ -0,0 +1,357 @@
+import hashlib
+import io
+import os
+import pytest
+import tempfile
+import shutil
+import zipfile
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from src.text_to_sql.downloader import DownloadError, DownloadManifest
+from src.text_to_sql.extractor import ExtractionManifest, LazyArchive, StreamingUnsupported, extract_archive, extract_stream
+
+
+class TestExtractArchive:
+    """extract_archive 함수와 ExtractionManifest에 대한 테스트 케이스들"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """테스트용 임시 디렉토리 생성"""
+        temp_path = tempfile.mkdtemp()
+        yield temp_path
+        shutil.rmtree(temp_path)
+
+    @pytest.fixture
+    def zip_path(self, temp_dir):
+        """spider_data 구조를 흉내낸 zip 파일 생성"""
+        path = Path(temp_dir, "Spider.zip")
+        with zipfile.ZipFile(path, "w") as zf:
+            zf.writestr("spider_data/", "")
+            zf.writestr("spider_data/dev.json", "[]")
+            zf.writestr("spider_data/database/concert_singer/concert_singer.sqlite", b"\x00" * 4096)
+            zf.writestr("spider_data/database/concert_singer/schema.sql", "CREATE TABLE singer(id int);")
+            zf.writestr("spider_data/database/pets_1/pets_1.sqlite", b"\x01" * 4096)
+        return path
+
+    @pytest.fixture
+    def dest_dir(self, temp_dir):
+        return Path(temp_dir, "data")
+
+    @pytest.fixture
+    def manifest_path(self, dest_dir):
+        return Path(dest_dir, ".manifests", "Spider.json")
+
+    def test_extract_archive_writes_manifest(self, zip_path, dest_dir, manifest_path):
+        """
+        Given: 정상적인 zip 파일
+        When: extract_archive()를 호출할 때
+        Then: 파일들이 제자리에 놓이고, staging 디렉토리 없이 manifest가 기록되어야 함
+        """
+        # Act
+        manifest = extract_archive(zip_path, dest_dir, manifest_path)
+
+        # Assert
+        assert Path(dest_dir, "spider_data", "dev.json").read_text() == "[]"
+        assert manifest_path.exists()
+        assert sorted(entry.name for entry in manifest.entries) == [
+            "spider_data/database/concert_singer/concert_singer.sqlite",
+            "spider_data/database/concert_singer/schema.sql",
+            "spider_data/database/pets_1/pets_1.sqlite",
+            "spider_data/dev.json",
+        ]
+        assert not any(p.name.startswith(".staging-") for p in dest_dir.iterdir())
+
+    def test_crash_during_extraction_leaves_no_manifest(self, zip_path, dest_dir, manifest_path):
+        """
+        Given: 압축 해제 도중 예외가 발생하는 상황
+        When: extract_archive()를 호출할 때
+        Then: manifest도, 반쯤 채워진 트리도 남지 않아야 함
+        """
+        # Arrange
+        with patch("src.text_to_sql.extractor.zipfile.ZipFile.open", side_effect=OSError("disk full")):
+            # Act
+            with pytest.raises(OSError):
+                extract_archive(zip_path, dest_dir, manifest_path)
+
+        # Assert
+        assert ExtractionManifest.load(manifest_path, dest_dir) is None
+        assert list(dest_dir.iterdir()) == []
+
+    def test_failed_install_restores_previous_tree(self, temp_dir, dest_dir, manifest_path):
+        """
+        Given: 최상위 항목 a, b가 압축 해제되어 있는 상태에서 두 항목을 모두 바꾸는 zip 파일
+        When: b를 제자리로 옮기는 rename이 실패할 때
+        Then: a도 이전 내용으로 되돌아가고 치워 둔 항목이나 manifest가 남지 않아야 함
+        """
+        # Arrange
+        def make_zip(name, text):
+            path = Path(temp_dir, name)
+            with zipfile.ZipFile(path, "w") as zf:
+                zf.writestr("a/x.txt", text)
+                zf.writestr("b/y.txt", text)
+            return path
+
+        extract_archive(make_zip("old.zip", "old"), dest_dir, manifest_path)
+        original_replace = os.replace
+
+        def failing_replace(source, target):
+            if Path(source).parent.name.startswith(".staging-") and Path(target).name == "b":
+                raise OSError("disk full")
+            return original_replace(source, target)
+
+        # Act
+        with patch("src.text_to_sql.extractor.os.replace", side_effect=failing_replace):
+            with pytest.raises(OSError):
+                extract_archive(make_zip("new.zip", "new"), dest_dir, manifest_path)
+
+        # Assert
+        assert Path(dest_dir, "a", "x.txt").read_text() == "old"
+        assert Path(dest_dir, "b", "y.txt").read_text() == "old"
+        assert sorted(p.name for p in dest_dir.iterdir()) == [".manifests", "a", "b"]
+        assert ExtractionManifest.load(manifest_path, dest_dir) is None
+
+    def test_fast_verify_detects_size_change(self, zip_path, dest_dir, manifest_path):
+        """
+        Given: 압축 해제 후 파일 크기가 바뀐 상태
+        When: fast 모드로 verify()를 호출할 때
+        Then: False를 반환해야 함
+        """
+        # Arrange
+        extract_archive(zip_path, dest_dir, manifest_path)
+        Path(dest_dir, "spider_data", "dev.json").write_text("[1]")
+
+        # Act
+        manifest = ExtractionManifest.load(manifest_path, dest_dir)
+
+        # Assert
+        assert manifest.verify("fast") == False
+
+    def test_deep_verify_detects_content_change_with_same_stat(self, zip_path, dest_dir, manifest_path):
+        """
+        Given: 크기와 mtime은 그대로이지만 내용이 바뀐 파일
+        When: fast / deep 모드로 verify()를 호출할 때
+        Then: fast는 통과하고 deep은 CRC 불일치를 찾아내야 함
+        """
+        # Arrange
+        extract_archive(zip_path, dest_dir, manifest_path)
+        db_path = Path(dest_dir, "spider_data", "database", "concert_singer", "concert_singer.sqlite")
+        stat = db_path.stat()
+        db_path.write_bytes(b"\x01" * 4096)
+        os.utime(db_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        # Act
+        manifest = ExtractionManifest.load(manifest_path, dest_dir)
+
+        # Assert
+        assert manifest.verify("fast") == True
+        assert manifest.verify("deep") == False
+
+    def test_verify_rejects_unknown_mode(self, zip_path, dest_dir, manifest_path):
+        """
+        Given: 압축 해제가 완료된 상태
+        When: 알 수 없는 모드로 verify()를 호출할 때
+        Then: ValueError가 발생해야 함
+        """
+        manifest = extract_archive(zip_path, dest_dir, manifest_path)
+
+        with pytest.raises(ValueError):
+            manifest.verify("quick")
+
+    def test_parallel_extraction_matches_single_thread(self, zip_path, temp_dir):
+        """
+        Given: 여러 멤버를 가진 zip 파일
+        When: jobs=1과 jobs=4로 각각 extract_archive()를 호출할 때
+        Then: 같은 파일과 같은 manifest 항목이 만들어져야 함
+        """
+        single = extract_archive(zip_path, Path(temp_dir, "single"), Path(temp_dir, "single.json"), jobs=1)
+        parallel = extract_archive(zip_path, Path(temp_dir, "parallel"), Path(temp_dir, "parallel.json"), jobs=4)
+
+        assert [entry[:3] for entry in sorted(single.entries)] == [entry[:3] for entry in sorted(parallel.entries)]
+        assert parallel.verify("deep")
+
+    def test_parallel_workers_share_parent_directories(self, temp_dir):
+        """
+        Given: 같은 디렉토리에 파일이 여러 개씩 있는 많은 디렉토리를 가진 zip 파일과 CPU 8개
+        When: 여러 스레드로 extract_archive()를 반복 호출할 때
+        Then: 부모 디렉토리 생성이 겹쳐도 실패하지 않고 모든 파일이 압축 해제되어야 함
+        """
+        zip_path = Path(temp_dir, "many.zip")
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            for db in range(200):
+                if db % 2:
+                    zf.writestr(f"root/db{db}/", "")
+                for name in ("a.sqlite", "schema.sql", "notes.txt"):
+                    zf.writestr(f"root/db{db}/{name}", f"{db}-{name}")
+
+        with patch("os.cpu_count", return_value=8):
+            for run in range(5):
+                manifest = extract_archive(zip_path, Path(temp_dir, f"out{run}"), Path(temp_dir, f"out{run}.json"),
+                                           jobs=8)
+                assert len(manifest.entries) == 600
+                assert manifest.verify("deep")
+        assert Path(temp_dir, "out4", "root", "db199", "notes.txt").read_text() == "199-notes.txt"
+
+
+class _Unseekable(io.RawIOBase):
+    """data descriptor가 붙은 zip 파일을 만들기 위한 seek 할 수 없는 출력"""
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self.data += b
+        return len(b)
+
+
+class TestExtractStream:
+    """extract_stream 함수에 대한 테스트 케이스들"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """테스트용 임시 디렉토리 생성"""
+        temp_path = tempfile.mkdtemp()
+        yield temp_path
+        shutil.rmtree(temp_path)
+
+    @staticmethod
+    def _zip_bytes(compression=zipfile.ZIP_DEFLATED, seekable=True) -> bytes:
+        output = io.BytesIO() if seekable else _Unseekable()
+        with zipfile.ZipFile(output, "w", compression) as zf:
+            zf.writestr("spider_data/dev.json", "[]" * 1000)
+            zf.writestr("spider_data/empty.txt", "")
+            zf.writestr("spider_data/database/pets_1/pets_1.sqlite", os.urandom(50000) + b"\x00" * 500000)
+        return bytes(output.getvalue() if seekable else output.data)
+
+    @staticmethod
+    def _chunks(data: bytes, size: int = 1000):
+        return (data[i:i + size] for i in range(0, len(data), size))
+
+    @pytest.mark.parametrize("compression, seekable", [
+        (zipfile.ZIP_DEFLATED, True),
+        (zipfile.ZIP_STORED, True),
+        (zipfile.ZIP_DEFLATED, False),
+    ])
+    def test_extract_stream_matches_extract_archive(self, temp_dir, compression, seekable):
+        """
+        Given: deflate, stored 또는 data descriptor가 붙은 zip 바이트 스트림
+        When: 작은 chunk로 나눠 extract_stream()을 호출할 때
+        Then: extract_archive()와 같은 파일과 manifest가 만들어져야 함
+        """
+        data = self._zip_bytes(compression, seekable)
+        zip_path = Path(temp_dir, "Spider.zip")
+        zip_path.write_bytes(data)
+        download_manifest = DownloadManifest(size=len(data), sha256=hashlib.sha256(data).hexdigest())
+
+        streamed = extract_stream(self._chunks(data), Path(temp_dir, "stream"), Path(temp_dir, "stream.json"),
+                                  download_manifest)
+        expected = extract_archive(zip_path, Path(temp_dir, "archive"), Path(temp_dir, "archive.json"))
+
+        assert sorted(entry[:3] for entry in streamed.entries) == sorted(entry[:3] for entry in expected.entries)
+        assert ExtractionManifest.load(Path(temp_dir, "stream.json"), Path(temp_dir, "stream")).verify("deep")
+        assert not any(p.name.startswith(".staging-") for p in Path(temp_dir, "stream").iterdir())
+
+    @pytest.mark.parametrize("damage", ["truncate", "flip", "manifest"])
+    def test_damaged_stream_leaves_nothing_behind(self, temp_dir, damage):
+        """
+        Given: 중간에 끊긴 스트림, 내용이 손상된 스트림 또는 manifest와 다른 스트림
+        When: extract_stream()을 호출할 때
+        Then: DownloadError가 발생하고 압축 해제된 파일도 manifest도 남지 않아야 함
+        """
+        data = bytearray(self._zip_bytes())
+        download_manifest = None
+        if damage == "truncate":
+            data = data[:len(data) // 2]
+        elif damage == "flip":
+            data[len(data) // 2] ^= 0xFF
+        else:
+            download_manifest = DownloadManifest(sha256="0" * 64)
+        dest_dir = Path(temp_dir, "data")
+        manifest_path = Path(dest_dir, ".manifests", "Spider.json")
+
+        with pytest.raises(DownloadError):
+            extract_stream(self._chunks(bytes(data)), dest_dir, manifest_path, download_manifest)
+
+        assert list(dest_dir.iterdir()) == []
+
+    def test_stored_member_with_data_descriptor_is_unsupported(self, temp_dir):
+        """
+        Given: 압축하지 않은 멤버에 data descriptor가 붙어 끝을 알 수 없는 zip 스트림
+        When: extract_stream()을 호출할 때
+        Then: extract_archive()로 대신 처리하도록 StreamingUnsupported가 발생해야 함
+        """
+        data = self._zip_bytes(zipfile.ZIP_STORED, seekable=False)
+
+        with pytest.raises(StreamingUnsupported):
+            extract_stream(self._chunks(data), Path(temp_dir, "data"), Path(temp_dir, "manifest.json"))
+
+
+class TestLazyArchive:
+    """LazyArchive 클래스에 대한 테스트 케이스들"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """테스트용 임시 디렉토리 생성"""
+        temp_path = tempfile.mkdtemp()
+        yield temp_path
+        shutil.rmtree(temp_path)
+
+    @pytest.fixture
+    def zip_path(self, temp_dir):
+        """데이터베이스 폴더 두 개를 가진 zip 파일 생성"""
+        path = Path(temp_dir, "Spider.zip")
+        with zipfile.ZipFile(path, "w") as zf:
+            zf.writestr("spider_data/dev.json", "[]")
+            zf.writestr("spider_data/database/concert_singer/concert_singer.sqlite", b"\x00" * 4096)
+            zf.writestr("spider_data/database/pets_1/pets_1.sqlite", b"\x01" * 4096)
+        return path
+
+    def test_extract_archive_skips_lazy_databases(self, zip_path, temp_dir):
+        """
+        Given: lazy_prefix를 지정한 상태
+        When: extract_archive()를 호출할 때
+        Then: 데이터베이스 폴더는 풀지 않고 manifest에 lazy_prefix를 기록해야 함
+        """
+        dest_dir = Path(temp_dir, "data")
+        manifest_path = Path(dest_dir, ".manifests", "Spider.json")
+
+        extract_archive(zip_path, dest_dir, manifest_path, lazy_prefix="spider_data/database/")
+
+        assert Path(dest_dir, "spider_data", "dev.json").exists()
+        assert not Path(dest_dir, "spider_data", "database").exists()
+        assert ExtractionManifest.load(manifest_path, dest_dir).lazy_prefix == "spider_data/database/"
+
+    def test_extract_only_requested_database_once(self, zip_path, temp_dir):
+        """
+        Given: 데이터베이스 두 개를 가진 zip 파일
+        When: 여러 스레드에서 같은 db_id로 extract()를 동시에 호출할 때
+        Then: 요청한 데이터베이스만 한 번 압축 해제되어야 함
+        """
+        dest_dir = Path(temp_dir, "data")
+        archive = LazyArchive(zip_path, "spider_data/database/", dest_dir)
+
+        with patch.object(archive._zip, "extract", wraps=archive._zip.extract) as mock_extract:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(executor.map(archive.extract, ["concert_singer"] * 16))
+        archive.close()
+
+        assert archive.db_ids() == ["concert_singer", "pets_1"]
+        assert all(result == Path(dest_dir, "spider_data", "database", "concert_singer") for result in results)
+        assert mock_extract.call_count == 1
+        assert Path(results[0], "concert_singer.sqlite").read_bytes() == b"\x00" * 4096
+        assert not Path(dest_dir, "spider_data", "database", "pets_1").exists()
+
+    def test_extract_unknown_database_raises(self, zip_path, temp_dir):
+        """
+        Given: zip에 없는 db_id
+        When: extract()를 호출할 때
+        Then: KeyError가 발생해야 함
+        """
+        archive = LazyArchive(zip_path, "spider_data/database/", Path(temp_dir, "data"))
+
+        with pytest.raises(KeyError):
+            archive.extract("missing_db")
+        archive.close()
@@ -0,0 +1,181 @@
+import json
+import os
+import pytest
+import sqlite3
+import tempfile
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+from src.text_to_sql import cli
+from src.text_to_sql.evaluation import CORRECT
+from src.text_to_sql.extractor import ExtractionManifest, ManifestEntry
+from src.text_to_sql.gold_cache import GoldResultCache, normalize_sql, result_key
+from src.text_to_sql.spider_loader import SpiderLoader
+
+
+def _create_database(path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE singer (singer_id INTEGER PRIMARY KEY, name TEXT)")
+    connection.executemany("INSERT INTO singer VALUES (?, ?)", [(1, "Joe"), (2, "Ann")])
+    connection.commit()
+    connection.close()
+
+
+class TestGoldResultCache:
+    """GoldResultCache와 gold 결과 warm-up에 대한 테스트 케이스들"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """테스트용 임시 디렉토리 생성"""
+        temp_path = tempfile.mkdtemp()
+        yield temp_path
+        shutil.rmtree(temp_path)
+
+    @pytest.fixture
+    def spider_loader(self, temp_dir):
+        """dev.json과 sqlite 데이터베이스가 준비된 SpiderLoader 인스턴스 생성"""
+        loader = SpiderLoader(save_path=temp_dir)
+        _create_database(Path(loader.get_sqlite_database(), "concert_singer", "concert_singer.sqlite"))
+        records = [
+            {"db_id": "concert_singer", "question": "names", "query": "SELECT name FROM singer"},
+            {"db_id": "concert_singer", "question": "count", "query": "SELECT count(*) FROM singer"},
+        ]
+        loader.get_split_files()["dev"][0].write_text(json.dumps(records), encoding="utf-8")
+        return loader
+
+    def test_normalize_sql_keeps_literals(self):
+        """
+        Given: 공백, 대소문자, 세미콜론만 다른 SQL
+        When: normalize_sql()로 정규화할 때
+        Then: 같은 문자열이 되고 따옴표 안의 내용은 유지되어야 함
+        """
+        assert normalize_sql("SELECT  name\nFROM singer;") == normalize_sql("select name from singer")
+        assert normalize_sql("SELECT * FROM t WHERE name = 'Joe  X'") == "select * from t where name = 'Joe  X'"
+        assert result_key("SELECT 1", "1:1") != result_key("SELECT 1", "1:2")
+
+    def test_least_recently_used_entries_are_evicted(self, temp_dir):
+        """
+        Given: 최대 2개 항목으로 제한된 캐시
+        When: 세 번째 항목을 저장할 때
+        Then: 가장 오래 사용하지 않은 항목이 삭제되어야 함
+        """
+        cache = GoldResultCache(Path(temp_dir, "gold.sqlite"), max_entries=2)
+        cache.put("a", [(1,)])
+        cache.put("b", [(2,)])
+        with patch("src.text_to_sql.gold_cache.time.time", return_value=1e12):
+            assert cache.get("a") == [(1,)]
+            cache.put("c", [(3,)])
+
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get_many(["a", "c"]) == {"a": [(1,)], "c": [(3,)]}
+        cache.close()
+
+    def test_size_cap_is_enforced(self, temp_dir):
+        """
+        Given: 전체 크기가 제한된 캐시
+        When: 제한보다 큰 결과들을 저장할 때
+        Then: 전체 크기가 제한 이하로 유지되어야 함
+        """
+        cache = GoldResultCache(Path(temp_dir, "gold.sqlite"), max_entries=None, max_bytes=2000)
+        cache.put_many([(str(i), [("x" * 500,)]) for i in range(10)])
+
+        assert 0 < cache.total_bytes() <= 2000
+        cache.close()
+
+    def test_warm_up_skips_gold_execution_during_evaluation(self, spider_loader):
+        """
+        Given: gold 결과를 warm-up 해 둔 상태
+        When: 새 Loader에서 evaluate_execution()을 호출할 때
+        Then: gold SQL을 다시 실행하지 않고 채점해야 함
+        """
+        assert spider_loader.warm_gold_cache(jobs=1) == 2
+        assert spider_loader.warm_gold_cache(jobs=1) == 0
+
+        fresh_loader = SpiderLoader(save_path=spider_loader.save_path)
+        executed = []
+        with patch("src.text_to_sql.evaluation.ConnectionManager.execute", autospec=True,
+                   side_effect=lambda self, path, sql, timeout=None: executed.append(sql) or [(2,)]):
+            report = fresh_loader.evaluate_execution({1: "SELECT COUNT(*) FROM singer"}, jobs=1)
+
+        assert executed == ["SELECT COUNT(*) FROM singer"]
+        assert report.results[0].status == CORRECT
+
+    def test_cache_is_invalidated_when_database_changes(self, spider_loader):
+        """
+        Given: gold 결과를 warm-up 해 둔 상태
+        When: sqlite 파일의 내용이 바뀐 뒤 다시 warm-up 할 때
+        Then: 모든 gold SQL을 다시 실행해야 함
+        """
+        spider_loader.warm_gold_cache(jobs=1)
+        connection = sqlite3.connect(spider_loader.get_sqlite_path("concert_singer"))
+        connection.execute("INSERT INTO singer VALUES (3, 'Kim')")
+        connection.commit()
+        connection.close()
+
+        assert spider_loader.warm_gold_cache(jobs=1) == 2
+
+    def test_cache_survives_reextracting_same_database(self, spider_loader):
+        """
+        Given: gold 결과를 warm-up 해 둔 상태
+        When: 같은 내용의 sqlite 파일을 다시 압축 해제해 mtime만 바뀐 뒤 새 Loader로 warm-up 할 때
+        Then: 캐시된 결과를 그대로 사용해야 함
+        """
+        spider_loader.warm_gold_cache(jobs=1)
+        sqlite_path = spider_loader.get_sqlite_path("concert_singer")
+        content = sqlite_path.read_bytes()
+        sqlite_path.unlink()
+        sqlite_path.write_bytes(content)
+        stat = sqlite_path.stat()
+        os.utime(sqlite_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert SpiderLoader(save_path=spider_loader.save_path).warm_gold_cache(jobs=1) == 0
+
+    def test_fingerprint_uses_extraction_manifest_crc(self, spider_loader):
+        """
+        Given: sqlite 파일의 크기, CRC, mtime이 기록된 압축 해제 manifest
+        When: get_database_fingerprint()를 호출할 때
+        Then: 파일을 다시 읽지 않고 manifest의 CRC로 fingerprint를 만들어야 함
+        """
+        sqlite_path = spider_loader.get_sqlite_path("concert_singer")
+        stat = sqlite_path.stat()
+        name = sqlite_path.relative_to(spider_loader.save_path).as_posix()
+        ExtractionManifest(Path(spider_loader.save_path), [ManifestEntry(name, stat.st_size, 0xabc, stat.st_mtime_ns)]) \
+            .save(spider_loader._get_extraction_manifest_path())
+
+        with patch("src.text_to_sql.gold_cache.file_crc32") as mock_crc:
+            fingerprint = spider_loader.get_database_fingerprint("concert_singer")
+
+        mock_crc.assert_not_called()
+        assert fingerprint == f"{stat.st_size}:00000abc"
+
+    def test_results_are_stored_as_json_with_types(self, temp_dir):
+        """
+        Given: 정수, 실수, 문자열, NULL, BLOB 값을 담은 결과
+        When: 캐시에 저장한 뒤 다시 열어 읽을 때
+        Then: 같은 타입의 tuple로 돌아오고 저장된 형태는 JSON이어야 함
+        """
+        rows = [(1, 2.5, "Joe", None, b"\x00\xff")]
+        cache = GoldResultCache(Path(temp_dir, "gold.sqlite"))
+        cache.put("key", rows)
+        cache.close()
+
+        cache = GoldResultCache(Path(temp_dir, "gold.sqlite"))
+        assert cache.get("key") == rows
+        stored, = cache._connection.execute("SELECT rows FROM results").fetchone()
+        assert json.loads(stored) == [[1, 2.5, "Joe", None, {"blob": "AP8="}]]
+        cache.close()
+
+    def test_cli_warm_gold(self, spider_loader, capsys):
+        """
+        Given: dev.json과 sqlite 데이터베이스가 준비된 save_path
+        When: cli.main(["warm-gold", ...])을 호출할 때
+        Then: gold 결과를 캐시에 저장하고 0을 반환해야 함
+        """
+        exit_code = cli.main(["warm-gold", "--datasets", "spider", "--save-path", spider_loader.save_path,
+                              "--jobs", "1", "--max-entries", "10"])
+
+        assert exit_code == 0
+        assert "spider: cached 2 gold results" in capsys.readouterr().out
+        assert len(spider_loader.get_gold_cache()) == 2
@@ -0,0 +1,55 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# import 및 경로 조회에 허용되는 시간(초). 느린 CI에서도 통과할 만큼 넉넉하지만,
+# datasets(pyarrow, pandas)를 import 하면 넘어가는 수준으로 잡습니다.
+IMPORT_BUDGET_SECONDS = 0.5
+
+HEAVY_MODULES = ["datasets", "pyarrow", "pandas", "mecab", "gdown"]
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import src.text_to_sql as text_to_sql
+loader = text_to_sql.SpiderKoLoader(save_path="data")
+loader.get_sqlite_database()
+loader.get_sqlite_json_files()
+elapsed = time.perf_counter() - started
+print(json.dumps({"elapsed": elapsed, "modules": sorted(m for m in %r if m in sys.modules)}))
+"""
+
+
+class TestImportTime:
+    """패키지 import 비용에 대한 회귀 테스트"""
+
+    def _probe(self):
+        output = subprocess.run(
+            [sys.executable, "-c", _PROBE % HEAVY_MODULES],
+            cwd=PROJECT_ROOT, check=True, capture_output=True, text=True,
+        ).stdout
+        return json.loads(output.strip().splitlines()[-1])
+
+    def test_path_lookup_does_not_import_heavy_dependencies(self):
+        """
+        Given: 새 인터프리터
+        When: 패키지를 import 하고 SpiderKoLoader로 경로만 조회할 때
+        Then: datasets, mecab 등 무거운 의존성은 import 되지 않아야 함
+        """
+        result = self._probe()
+
+        assert result["modules"] == []
+
+    def test_path_lookup_within_startup_budget(self):
+        """
+        Given: 새 인터프리터
+        When: 패키지를 import 하고 SpiderKoLoader로 경로만 조회할 때
+        Then: 시작 시간 예산 안에 끝나야 함
+        """
+        result = self._probe()
+
+        assert result["elapsed"] < IMPORT_BUDGET_SECONDS
@@ -0,0 +1,121 @@
+import os
+import pytest
+import sqlite3
+import tempfile
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+from src.text_to_sql import introspection
+from src.text_to_sql.introspection import ColumnInfo, ForeignKeyInfo
+from src.text_to_sql.bird_loader import BirdMiniDevLoader
+
+
+def _create_database(path: Path, rows: int = 3) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(path)
+    connection.executescript("""
+        CREATE TABLE "school districts" (district_id INTEGER PRIMARY KEY, name TEXT NOT NULL DEFAULT 'unknown');
+        CREATE TABLE schools (
+            cds TEXT, year INTEGER, district_id INTEGER REFERENCES "school districts"(district_id),
+            enrollment REAL,
+            PRIMARY KEY (cds, year)
+        );
+        CREATE INDEX idx_schools_district ON schools (district_id, year);
+    """)
+    connection.executemany('INSERT INTO "school districts" VALUES (?, ?)', [(i + 1, f"district {i}") for i in range(rows)])
+    connection.commit()
+    connection.close()
+
+
+class TestIntrospection:
+    """sqlite 스키마 introspection에 대한 테스트 케이스들"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """테스트용 임시 디렉토리 생성"""
+        temp_path = tempfile.mkdtemp()
+        yield temp_path
+        shutil.rmtree(temp_path)
+
+    @pytest.fixture
+    def bird_loader(self, temp_dir):
+        """sqlite 데이터베이스 세 개가 준비된 BirdMiniDevLoader 인스턴스 생성"""
+        loader = BirdMiniDevLoader(save_path=temp_dir)
+        for db_id in ["california_schools", "debit_card_specializing", "financial"]:
+            _create_database(Path(loader.get_sqlite_database(), db_id, f"{db_id}.sqlite"))
+        return loader
+
+    def test_introspect_reads_types_keys_and_indexes(self, bird_loader):
+        """
+        Given: 공백이 있는 테이블 이름, 복합 기본 키, 외래 키, 인덱스를 가진 sqlite 데이터베이스
+        When: introspect_database()를 호출할 때
+        Then: 실제 컬럼 타입, 외래 키, 인덱스와 추정 행 수를 반환해야 함
+        """
+        info = bird_loader.introspect_database("california_schools")
+
+        assert [table.name for table in info.tables] == ["school districts", "schools"]
+        districts = info.table("School Districts")
+        assert districts.columns[1] == ColumnInfo("name", "TEXT", True, "'unknown'", 0)
+        assert districts.estimated_rows == 3
+
+        schools = info.table("schools")
+        assert [column.primary_key for column in schools.columns] == [1, 2, 0, 0]
+        assert schools.foreign_keys == [ForeignKeyInfo(("district_id",), "school districts", ("district_id",),
+                                                       "NO ACTION", "NO ACTION")]
+        indexes = {index.name: index for index in schools.indexes}
+        assert indexes["idx_schools_district"].columns == ("district_id", "year")
+        assert any(index.origin == "pk" and index.unique for index in schools.indexes)
+
+    def test_results_are_cached_by_file_fingerprint(self, bird_loader):
+        """
+        Given: 한 번 introspect 한 데이터베이스들
+        When: 한 데이터베이스 파일만 바뀐 뒤 새 Loader로 다시 introspect_databases()를 호출할 때
+        Then: 바뀐 파일만 다시 읽고 나머지는 캐시에서 같은 결과를 반환해야 함
+        """
+        first = bird_loader.introspect_databases(jobs=3)
+        changed = bird_loader.get_sqlite_path("financial")
+        connection = sqlite3.connect(changed)
+        connection.execute("CREATE TABLE loan (loan_id INTEGER PRIMARY KEY)")
+        connection.commit()
+        connection.close()
+        stat = changed.stat()
+        os.utime(changed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        reloaded = BirdMiniDevLoader(save_path=bird_loader.save_path)
+        with patch("src.text_to_sql.introspection.introspect_database",
+                   wraps=introspection.introspect_database) as mock_introspect:
+            second = reloaded.introspect_databases(jobs=3)
+
+        assert [call[0][0] for call in mock_introspect.call_args_list] == ["financial"]
+        assert list(second) == ["california_schools", "debit_card_specializing", "financial"]
+        assert second["california_schools"] == first["california_schools"]
+        assert second["financial"].table("loan") is not None
+
+    def test_concurrent_writers_keep_each_others_results(self, bird_loader, temp_dir):
+        """
+        Given: 같은 캐시 파일을 쓰는 두 introspect_databases() 호출
+        When: 첫 호출이 캐시를 읽은 뒤 기록하기 전에 다른 호출이 다른 데이터베이스를 기록할 때
+        Then: 캐시에는 두 호출의 결과가 모두 남아야 함
+        """
+        cache_path = Path(temp_dir, "introspection.json")
+        paths = {db_id: bird_loader.get_sqlite_path(db_id) for db_id in ["california_schools", "financial"]}
+        introspect = introspection.introspect_database
+
+        def introspect_while_other_writes(db_id, sqlite_path, manifest=None):
+            if db_id == "california_schools":
+                introspection.introspect_databases({"financial": paths["financial"]}, cache_path)
+            return introspect(db_id, sqlite_path, manifest)
+
+        with patch("src.text_to_sql.introspection.introspect_database", side_effect=introspect_while_other_writes):
+            introspection.introspect_databases({"california_schools": paths["california_schools"]}, cache_path)
+
+        assert sorted(introspection._read_cache(cache_path)) == ["california_schools", "financial"]
+
+    def test_missing_database_raises(self, bird_loader):
+        """
+        Given: sqlite 파일이 없는 db_id
+        When: introspect_database()를 호출할 때
+        Then: FileNotFoundError가 발생해야 함
+        """
+        with pytest.raises(FileNotFoundError):
+            bird_loader.introspect_database("missing_db")
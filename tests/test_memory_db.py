@@ -0,0 +1,145 @@
+import json
+import pytest
+import sqlite3
+import tempfile
+import shutil
+import threading
+from pathlib import Path
+from src.text_to_sql.connection import ConnectionManager
+from src.text_to_sql.evaluation import CORRECT, GOLD_ERROR
+from src.text_to_sql.memory_db import MemoryDatabases, MemoryPolicy
+from src.text_to_sql.spider_loader import SpiderLoader
+
+
+def _create_database(path: Path, rows: int) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE singer (singer_id INTEGER PRIMARY KEY, name TEXT)")
+    connection.executemany("INSERT INTO singer VALUES (?, ?)", [(i, f"singer {i:0100d}") for i in range(rows)])
+    connection.commit()
+    connection.close()
+
+
+class TestMemoryDatabases:
+    """메모리 데이터베이스 모드에 대한 테스트 케이스들"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """테스트용 임시 디렉토리 생성"""
+        temp_path = tempfile.mkdtemp()
+        yield temp_path
+        shutil.rmtree(temp_path)
+
+    @pytest.fixture
+    def spider_loader(self, temp_dir):
+        """작은 데이터베이스 세 개와 큰 데이터베이스 하나, dev.json이 준비된 SpiderLoader 인스턴스 생성"""
+        loader = SpiderLoader(save_path=temp_dir)
+        for db_id in ["concert_singer", "orchestra", "pets_1"]:
+            _create_database(Path(loader.get_sqlite_database(), db_id, f"{db_id}.sqlite"), rows=10)
+        _create_database(Path(loader.get_sqlite_database(), "big", "big.sqlite"), rows=2000)
+        records = [
+            {"db_id": "concert_singer", "question": "count", "query": "SELECT count(*) FROM singer"},
+            {"db_id": "big", "question": "count", "query": "SELECT count(*) FROM singer"},
+            {"db_id": "orchestra", "question": "broken", "query": "SELECT missing FROM singer"},
+        ]
+        loader.get_split_files()["dev"][0].write_text(json.dumps(records), encoding="utf-8")
+        return loader
+
+    def test_selects_small_databases_and_falls_back_to_file(self, spider_loader):
+        """
+        Given: 크기 기준 MemoryPolicy와 기준보다 큰 데이터베이스
+        When: ConnectionManager로 쿼리를 실행할 때
+        Then: 작은 데이터베이스만 메모리에 올리고 큰 데이터베이스는 파일에서 같은 결과를 반환해야 함
+        """
+        memory = MemoryDatabases(spider_loader.get_sqlite_path, MemoryPolicy(max_size=64 * 1024))
+        connections = ConnectionManager(spider_loader.get_sqlite_path, memory=memory)
+
+        assert connections.execute("concert_singer", "SELECT count(*) FROM singer") == [(10,)]
+        assert connections.execute("big", "SELECT count(*) FROM singer") == [(2000,)]
+        assert "concert_singer" in memory and "big" not in memory
+        assert memory.used_bytes == spider_loader.get_sqlite_path("concert_singer").stat().st_size
+        with pytest.raises(sqlite3.OperationalError):
+            connections.execute("concert_singer", "DELETE FROM singer")
+        connections.close()
+        assert len(memory) == 0
+
+    def test_explicit_db_ids_and_lru_eviction(self, spider_loader):
+        """
+        Given: db_id 목록으로 고르고 budget이 데이터베이스 두 개 크기인 MemoryPolicy
+        When: 세 데이터베이스를 차례로 사용한 뒤 처음 데이터베이스를 다시 사용할 때
+        Then: 가장 오래 사용하지 않은 것부터 내리고, 내려간 데이터베이스의 연결은 다시 열어 같은 결과를 반환해야 함
+        """
+        size = spider_loader.get_sqlite_path("concert_singer").stat().st_size
+        policy = MemoryPolicy.for_db_ids(["concert_singer", "orchestra", "pets_1", "big"], budget=2 * size)
+        memory = MemoryDatabases(spider_loader.get_sqlite_path, policy)
+        connections = ConnectionManager(spider_loader.get_sqlite_path, memory=memory)
+
+        for db_id in ["concert_singer", "orchestra", "concert_singer", "pets_1"]:
+            assert connections.execute(db_id, "SELECT count(*) FROM singer") == [(10,)]
+        assert list(memory._residents) == ["concert_singer", "pets_1"]
+        assert connections.execute("orchestra", "SELECT count(*) FROM singer") == [(10,)]
+        assert list(memory._residents) == ["pets_1", "orchestra"]
+        # budget보다 큰 데이터베이스는 목록에 있어도 파일에서 실행
+        assert connections.execute("big", "SELECT count(*) FROM singer") == [(2000,)]
+        assert "big" not in memory
+        assert memory.used_bytes <= policy.budget
+        connections.close()
+
+    def test_eviction_closes_connections_of_every_thread(self, spider_loader):
+        """
+        Given: 여러 스레드가 연결한 메모리 데이터베이스와 쿼리를 실행 중인 연결
+        When: 데이터베이스를 메모리에서 내릴 때
+        Then: 쉬고 있는 연결은 바로, 실행 중인 연결은 사용이 끝날 때 닫혀 메모리 사본이 사라져야 함
+        """
+        memory = MemoryDatabases(spider_loader.get_sqlite_path, MemoryPolicy(max_size=64 * 1024))
+        connections = ConnectionManager(spider_loader.get_sqlite_path, memory=memory)
+        connected, evicted = threading.Barrier(4), threading.Event()
+
+        def connect_and_wait():
+            connections.execute("concert_singer", "SELECT 1")
+            connected.wait()
+            evicted.wait()
+
+        threads = [threading.Thread(target=connect_and_wait) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        connected.wait()
+        resident = memory.load("concert_singer")
+        busy, _ = connections._checkout("concert_singer")
+        assert resident.connection_count == 4
+
+        assert memory.evict("concert_singer")
+        evicted.set()
+        for thread in threads:
+            thread.join()
+
+        assert resident.connection_count == 1
+        assert busy.execute("SELECT count(*) FROM singer").fetchone() == (10,)
+        resident.release(busy)
+        assert resident.connection_count == 0
+        with pytest.raises(sqlite3.ProgrammingError):
+            busy.execute("SELECT 1")
+        # 마지막 연결이 닫혔으므로 같은 URI로 연결하면 빈 데이터베이스가 새로 만들어짐
+        probe = sqlite3.connect(resident.uri, uri=True)
+        assert probe.execute("SELECT count(*) FROM sqlite_master").fetchone() == (0,)
+        probe.close()
+        assert connections.execute("concert_singer", "SELECT count(*) FROM singer") == [(10,)]
+        connections.close()
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_loader_in_memory_evaluation_matches_files(self, spider_loader, jobs):
+        """
+        Given: in_memory=True인 SpiderLoader
+        When: evaluate_execution()과 execute()를 호출할 때
+        Then: 파일에서 실행한 것과 같은 결과를 반환해야 함
+        """
+        loader = SpiderLoader(save_path=spider_loader.save_path, in_memory=MemoryPolicy(max_size=64 * 1024))
+        predictions = ["SELECT count(*) FROM singer", "SELECT count(*) FROM singer", "SELECT 1"]
+
+        report = loader.evaluate_execution(predictions, jobs=jobs, use_gold_cache=False)
+
+        assert [result.status for result in report.results] == [CORRECT, CORRECT, GOLD_ERROR]
+        assert loader.execute("concert_singer", "SELECT name FROM singer WHERE singer_id = 3") == \
+            spider_loader.execute("concert_singer", "SELECT name FROM singer WHERE singer_id = 3")
+        assert "concert_singer" in loader.get_connection_manager().memory
+        assert SpiderLoader(save_path=spider_loader.save_path).get_connection_manager().memory is None
@@ -0,0 +1,108 @@
+import io
+import os
+import pytest
+import tempfile
+import shutil
+import zipfile
+from pathlib import Path
+from src.text_to_sql.downloader import DownloadError
+from src.text_to_sql.observers import NULL_OBSERVER, LoaderObserver, RecordingObserver
+from src.text_to_sql.spider_loader import SpiderLoader
+from src.text_to_sql.transport import HttpMirror
+from tests.http_server import serve_files
+
+
+def _zip_bytes() -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("spider_data/tables.json", "[]")
+        zf.writestr("spider_data/database/concert_singer/concert_singer.sqlite", os.urandom(64 * 1024))
+    return buffer.getvalue()
+
+
+class TestObservers:
+    """Loader 단계 측정과 observer에 대한 테스트 케이스들"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """테스트용 임시 디렉토리 생성"""
+        temp_path = tempfile.mkdtemp()
+        yield temp_path
+        shutil.rmtree(temp_path)
+
+    def test_download_reports_phases_bytes_and_cache_lookups(self, temp_dir):
+        """
+        Given: zip 파일을 제공하는 HTTP mirror와 RecordingObserver를 지정한 SpiderLoader
+        When: download_dataset()을 두 번 호출할 때
+        Then: 처음에는 verify, download, extract 단계와 받은 byte 수를, 두 번째에는 verify 단계와 캐시 적중을 기록해야 함
+        """
+        data = _zip_bytes()
+        observer = RecordingObserver()
+
+        with serve_files({"Spider.zip": data}) as server:
+            loader = SpiderLoader(str(Path(temp_dir, "data")), mirrors=[HttpMirror(server.url(""))], observer=observer)
+            loader.download_dataset()
+            first_phases = [event.phase for event in observer.phases]
+            loader.download_dataset()
+
+        assert first_phases == ["verify", "download", "extract"]
+        download = observer.phase("download")
+        assert download.metrics["bytes"] == len(data)
+        assert download.metrics["bytes_per_second"] > 0
+        assert download.error is None
+        extract = observer.phase("extract")
+        assert extract.metrics["members"] == 2
+        assert extract.metrics["bytes"] == 64 * 1024 + 2
+        assert observer.received_bytes == {"Spider": len(data)}
+        assert [event.phase for event in observer.phases[3:]] == ["verify"]
+        assert observer.cache_lookups == [("Spider", "dataset", False), ("Spider", "dataset", True)]
+
+    def test_streaming_install_reports_stream_phase(self, temp_dir):
+        """
+        Given: streaming=True이고 RecordingObserver를 지정한 SpiderLoader
+        When: download_dataset()을 호출할 때
+        Then: download와 extract 대신 받은 byte 수와 압축 해제한 파일 수를 담은 stream 단계를 기록해야 함
+        """
+        data = _zip_bytes()
+        observer = RecordingObserver()
+
+        with serve_files({"Spider.zip": data}) as server:
+            loader = SpiderLoader(str(Path(temp_dir, "data")), mirrors=[HttpMirror(server.url(""))],
+                                  streaming=True, observer=observer)
+            loader.download_dataset()
+
+        assert [event.phase for event in observer.phases] == ["verify", "stream"]
+        stream = observer.phase("stream")
+        assert stream.metrics["bytes"] == len(data)
+        assert stream.metrics["extracted_members"] == 2
+
+    def test_failed_phase_is_reported_with_error(self, temp_dir):
+        """
+        Given: 503을 반환하는 HTTP mirror
+        When: download_dataset()이 실패할 때
+        Then: download 단계가 예외와 함께 기록되고 예외는 호출한 쪽으로 전달되어야 함
+        """
+        observer = RecordingObserver()
+
+        with serve_files({}) as server:
+            server.failing_paths.add("Spider.zip")
+            loader = SpiderLoader(str(Path(temp_dir, "data")), mirrors=[HttpMirror(server.url(""))], observer=observer)
+            loader.downloader.retries = 0
+            with pytest.raises(DownloadError):
+                loader.download_dataset()
+
+        assert isinstance(observer.phase("download").error, DownloadError)
+
+    def test_default_observer_adds_no_progress_callback(self, temp_dir):
+        """
+        Given: observer를 지정하지 않은 SpiderLoader와 일부 메서드만 override 한 observer
+        When: Loader를 만들 때
+        Then: 기본값은 아무것도 하지 않는 observer이며 다운로드 chunk마다의 callback을 두지 않아야 함
+        """
+        class PhaseOnly(LoaderObserver):
+            def phase_finished(self, event):
+                pass
+
+        assert SpiderLoader(temp_dir).observer is NULL_OBSERVER
+        assert SpiderLoader(temp_dir).downloader.on_progress is None
+        assert SpiderLoader(temp_dir, observer=PhaseOnly()).downloader.on_progress is not None
@@ -0,0 +1,144 @@
+import pytest
+import tempfile
+import shutil
+import threading
+import zipfile
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import patch
+from src.text_to_sql import cli
+from src.text_to_sql.bird_loader import BirdMiniDevLoader
+from src.text_to_sql.prefetch import DOWNLOADED, FAILED, SKIPPED, prefetch
+from src.text_to_sql.spider_ko_loader import SpiderKoLoader
+from src.text_to_sql.spider_loader import SpiderLoader
+
+
+class TestPrefetch:
+    """prefetch 함수와 prefetch CLI 명령에 대한 테스트 케이스들"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """테스트용 임시 디렉토리 생성"""
+        temp_path = tempfile.mkdtemp()
+        yield temp_path
+        shutil.rmtree(temp_path)
+
+    @pytest.fixture
+    def source_zips(self, temp_dir):
+        """Spider, Bird Mini Dev zip 구조를 흉내낸 원본 zip 파일 생성"""
+        spider = Path(temp_dir, "spider.zip")
+        with zipfile.ZipFile(spider, "w") as zf:
+            zf.writestr("spider_data/dev.json", "[]")
+        bird = Path(temp_dir, "bird.zip")
+        with zipfile.ZipFile(bird, "w") as zf:
+            zf.writestr("data_minidev/MINIDEV/mini_dev_sqlite_dev.json", "[]")
+        return {"Spider.zip": spider, "Bird_Mini_Dev.zip": bird}
+
+    def _fake_download(self, source_zips, barrier=None):
+        calls = []
+
+        def fake_download(url, dest, manifest):
+            calls.append(dest.name)
+            if barrier is not None:
+                # 모든 다운로드가 동시에 진행 중이어야 barrier를 통과할 수 있음
+                barrier.wait()
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy(source_zips[dest.name], dest)
+            return dest
+
+        return fake_download, calls
+
+    def test_prefetch_downloads_datasets_concurrently(self, temp_dir, source_zips):
+        """
+        Given: 서로 다른 데이터셋의 Loader 두 개
+        When: prefetch()를 호출할 때
+        Then: 두 다운로드가 동시에 진행되고 두 데이터셋 모두 압축 해제되어야 함
+        """
+        # Arrange
+        save_path = str(Path(temp_dir, "data"))
+        loaders = [SpiderLoader(save_path=save_path), BirdMiniDevLoader(save_path=save_path)]
+        fake_download, calls = self._fake_download(source_zips, threading.Barrier(2, timeout=10))
+
+        # Act
+        with patch("src.text_to_sql.loader.Downloader.download", side_effect=fake_download):
+            results = prefetch(loaders, jobs=2)
+
+        # Assert
+        assert [result.status for result in results] == [DOWNLOADED, DOWNLOADED]
+        assert sorted(calls) == ["Bird_Mini_Dev.zip", "Spider.zip"]
+        assert loaders[0].get_sqlite_json_files()["dev"].exists()
+        assert loaders[1].get_sqlite_json_files()["dev"].exists()
+
+    def test_prefetch_shares_spider_archive_with_spider_ko(self, temp_dir, source_zips):
+        """
+        Given: 같은 save_path를 쓰는 SpiderLoader와 SpiderKoLoader
+        When: prefetch()를 호출할 때
+        Then: Spider zip은 한 번만 받고, SpiderKoLoader의 후처리는 prefetch의 프로세스 풀로 실행되어야 함
+        """
+        # Arrange
+        save_path = str(Path(temp_dir, "data"))
+        spider_ko_loader = SpiderKoLoader(save_path=save_path)
+        loaders = [SpiderLoader(save_path=save_path), spider_ko_loader]
+        fake_download, calls = self._fake_download(source_zips)
+
+        # Act
+        with patch("src.text_to_sql.loader.Downloader.download", side_effect=fake_download), \
+             patch.object(spider_ko_loader, "_post_process") as mock_post_process:
+            results = prefetch(loaders, jobs=2)
+
+        # Assert
+        assert calls == ["Spider.zip"]
+        assert [result.status for result in results] == [DOWNLOADED, DOWNLOADED]
+        mock_post_process.assert_called_once()
+        executor, = mock_post_process.call_args.args
+        assert isinstance(executor, ProcessPoolExecutor)
+
+    def test_prefetch_reports_failures_without_stopping_others(self, temp_dir, source_zips):
+        """
+        Given: 다운로드가 실패하는 Loader와 이미 다운로드된 Loader
+        When: prefetch()를 호출할 때
+        Then: 실패는 결과로 전달되고 다른 Loader는 정상 처리되어야 함
+        """
+        # Arrange
+        save_path = str(Path(temp_dir, "data"))
+        spider_loader = SpiderLoader(save_path=save_path)
+        bird_loader = BirdMiniDevLoader(save_path=save_path)
+
+        # Act
+        with patch.object(spider_loader, "_is_dataset_already_downloaded", return_value=True), \
+             patch("src.text_to_sql.loader.Downloader.download", side_effect=OSError("network down")):
+            results = prefetch([spider_loader, bird_loader], jobs=2)
+
+        # Assert
+        assert results[0].status == SKIPPED
+        assert results[1].status == FAILED
+        assert isinstance(results[1].error, OSError)
+
+    def test_cli_prefetch_builds_requested_loaders(self, temp_dir):
+        """
+        Given: text-to-sql prefetch --datasets spider,bird --jobs 3 명령
+        When: cli.main()을 호출할 때
+        Then: 요청한 Loader들로 prefetch가 호출되어야 함
+        """
+        # Arrange
+        save_path = str(Path(temp_dir, "data"))
+
+        # Act
+        with patch("src.text_to_sql.cli.prefetch", return_value=[]) as mock_prefetch:
+            exit_code = cli.main(["prefetch", "--datasets", "spider,bird", "--jobs", "3", "--save-path", save_path])
+
+        # Assert
+        assert exit_code == 0
+        loaders = mock_prefetch.call_args[0][0]
+        assert [type(loader) for loader in loaders] == [SpiderLoader, BirdMiniDevLoader]
+        assert all(loader.save_path == save_path for loader in loaders)
+        assert mock_prefetch.call_args[1]["jobs"] == 3
+
+    def test_cli_prefetch_rejects_unknown_dataset(self):
+        """
+        Given: 알 수 없는 데이터셋 이름
+        When: cli.main()을 호출할 때
+        Then: argparse 오류로 종료되어야 함
+        """
+        with pytest.raises(SystemExit):
+            cli.main(["prefetch", "--datasets", "spider,wikisql"])
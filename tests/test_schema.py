@@ -0,0 +1,121 @@
+import json
+import os
+import pytest
+import tempfile
+import shutil
+from pathlib import Path
+from src.text_to_sql.bird_loader import BirdMiniDevLoader
+from src.text_to_sql.schema import SchemaCatalog, clear_catalog_cache
+from src.text_to_sql.spider_loader import SpiderLoader
+
+
+CONCERT_SINGER = {
+    "db_id": "concert_singer",
+    "table_names_original": ["stadium", "singer", "singer_in_concert"],
+    "table_names": ["stadium", "singer", "singer in concert"],
+    "column_names_original": [
+        [-1, "*"], [0, "Stadium_ID"], [0, "Name"], [1, "Singer_ID"], [1, "Name"],
+        [2, "concert_ID"], [2, "Singer_ID"],
+    ],
+    "column_names": [
+        [-1, "*"], [0, "stadium id"], [0, "name"], [1, "singer id"], [1, "name"],
+        [2, "concert id"], [2, "singer id"],
+    ],
+    "column_types": ["text", "number", "text", "number", "text", "number", "text"],
+    "primary_keys": [1, 3, [5, 6]],
+    "foreign_keys": [[6, 3]],
+}
+
+
+class TestSchemaCatalog:
+    """SchemaCatalog와 Loader.get_schema에 대한 테스트 케이스들"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """테스트용 임시 디렉토리 생성"""
+        temp_path = tempfile.mkdtemp()
+        yield temp_path
+        shutil.rmtree(temp_path)
+        clear_catalog_cache()
+
+    @pytest.fixture
+    def spider_loader(self, temp_dir):
+        """tables.json이 준비된 SpiderLoader 인스턴스 생성"""
+        loader = SpiderLoader(save_path=temp_dir)
+        table_path = loader.get_sqlite_json_files()["table"]
+        table_path.parent.mkdir(parents=True)
+        table_path.write_text(json.dumps([CONCERT_SINGER]), encoding="utf-8")
+        return loader
+
+    def test_get_schema_indexes_tables_and_columns(self, spider_loader):
+        """
+        Given: tables.json이 준비된 SpiderLoader
+        When: get_schema(db_id)로 스키마를 조회할 때
+        Then: 테이블과 컬럼을 대소문자 구분 없이 조회할 수 있어야 함
+        """
+        schema = spider_loader.get_schema("concert_singer")
+
+        assert schema.table("SINGER").name == "singer"
+        assert schema.column("singer", "name").index == 4
+        assert schema.column("singer", "name").table is schema.table("singer")
+        assert schema.column("singer", "age") is None
+        assert schema.column("unknown", "name") is None
+        assert schema.columns[0].name == "*" and schema.columns[0].table is None
+
+    def test_primary_and_foreign_keys(self, spider_loader):
+        """
+        Given: 복합 기본 키와 외래 키가 있는 스키마
+        When: primary_keys(), neighbors(), join_keys()를 호출할 때
+        Then: 기본 키 목록과 양방향 외래 키 그래프를 반환해야 함
+        """
+        schema = spider_loader.get_schema("concert_singer")
+
+        assert [column.name for column in schema.primary_keys("singer_in_concert")] == ["concert_ID", "Singer_ID"]
+        assert schema.column("stadium", "stadium_id").is_primary_key
+        assert list(schema.neighbors("singer")) == ["singer_in_concert"]
+        assert list(schema.neighbors("singer_in_concert")) == ["singer"]
+        join = schema.join_keys("singer", "singer_in_concert")[0]
+        assert (join.source.table.name, join.target.table.name) == ("singer_in_concert", "singer")
+        assert schema.neighbors("stadium") == {}
+
+    def test_catalog_is_parsed_once_per_file_version(self, spider_loader):
+        """
+        Given: 같은 tables.json
+        When: 여러 Loader에서 get_schema_catalog()를 호출할 때
+        Then: 같은 객체를 반환하고, 파일이 바뀐 뒤에는 다시 파싱해야 함
+        """
+        first = spider_loader.get_schema_catalog()
+        second = SpiderLoader(save_path=spider_loader.save_path).get_schema_catalog()
+        assert first is second
+
+        table_path = spider_loader.get_sqlite_json_files()["table"]
+        renamed = dict(CONCERT_SINGER, db_id="concert_singer_v2")
+        table_path.write_text(json.dumps([CONCERT_SINGER, renamed]), encoding="utf-8")
+        stat = table_path.stat()
+        os.utime(table_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        third = spider_loader.get_schema_catalog()
+        assert third is not first
+        assert third.db_ids() == ["concert_singer", "concert_singer_v2"]
+
+    def test_unknown_db_id_raises(self, spider_loader):
+        """
+        Given: tables.json이 준비된 SpiderLoader
+        When: 없는 db_id로 get_schema()를 호출할 때
+        Then: KeyError가 발생해야 함
+        """
+        with pytest.raises(KeyError):
+            spider_loader.get_schema("missing_db")
+
+    def test_bird_loader_uses_dev_tables(self, temp_dir):
+        """
+        Given: dev_tables.json이 준비된 BirdMiniDevLoader
+        When: get_schema_catalog()를 호출할 때
+        Then: dev_tables.json의 스키마를 반환해야 함
+        """
+        loader = BirdMiniDevLoader(save_path=temp_dir)
+        table_path = loader.get_sqlite_json_files()["table"]
+        table_path.parent.mkdir(parents=True)
+        table_path.write_text(json.dumps([dict(CONCERT_SINGER, db_id="california_schools")]), encoding="utf-8")
+
+        assert "california_schools" in loader.get_schema_catalog()
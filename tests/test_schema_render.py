@@ -0,0 +1,168 @@
+import json
+import pytest
+import sqlite3
+import tempfile
+import shutil
+import threading
+from pathlib import Path
+from unittest.mock import patch
+from src.text_to_sql.schema import clear_catalog_cache
+from src.text_to_sql.schema_render import SchemaRenderings, clear_renderings_cache
+from src.text_to_sql.spider_loader import SpiderLoader
+
+
+CONCERT_SINGER = {
+    "db_id": "concert_singer",
+    "table_names_original": ["singer", "singer in concert"],
+    "table_names": ["singer", "singer in concert"],
+    "column_names_original": [[-1, "*"], [0, "Singer_ID"], [0, "Name"], [1, "concert_ID"], [1, "Singer_ID"]],
+    "column_names": [[-1, "*"], [0, "singer id"], [0, "name"], [1, "concert id"], [1, "singer id"]],
+    "column_types": ["text", "number", "text", "number", "number"],
+    "primary_keys": [1, [3, 4]],
+    "foreign_keys": [[4, 1]],
+}
+
+
+class TestSchemaRender:
+    """미리 렌더링한 스키마 문자열에 대한 테스트 케이스들"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """테스트용 임시 디렉토리 생성"""
+        temp_path = tempfile.mkdtemp()
+        yield temp_path
+        shutil.rmtree(temp_path)
+        clear_catalog_cache()
+        clear_renderings_cache()
+
+    @pytest.fixture
+    def spider_loader(self, temp_dir):
+        """tables.json과 sqlite 데이터베이스가 준비된 SpiderLoader 인스턴스 생성"""
+        loader = SpiderLoader(save_path=temp_dir)
+        table_path = loader.get_sqlite_json_files()["table"]
+        table_path.parent.mkdir(parents=True)
+        table_path.write_text(json.dumps([CONCERT_SINGER]), encoding="utf-8")
+
+        sqlite_path = Path(loader.get_sqlite_database(), "concert_singer", "concert_singer.sqlite")
+        sqlite_path.parent.mkdir(parents=True)
+        connection = sqlite3.connect(sqlite_path)
+        connection.executescript("""
+            CREATE TABLE singer (Singer_ID INTEGER PRIMARY KEY, Name TEXT);
+            CREATE TABLE "singer in concert" (concert_ID INTEGER, Singer_ID INTEGER);
+            INSERT INTO singer VALUES (1, 'Joe Sharp'), (2, 'Timbaland'), (3, 'Justin Brown');
+        """)
+        connection.commit()
+        connection.close()
+        return loader
+
+    def test_ddl_includes_keys(self, spider_loader):
+        """
+        Given: 복합 기본 키와 외래 키, 공백이 있는 테이블 이름을 가진 스키마
+        When: render_schema()를 ddl 형식으로 호출할 때
+        Then: 키 제약을 포함한 CREATE TABLE 문을 반환하고 길이도 함께 보관해야 함
+        """
+        text = spider_loader.render_schema("concert_singer")
+
+        assert text == (
+            "CREATE TABLE singer (\n  Singer_ID number,\n  Name text,\n  PRIMARY KEY (Singer_ID)\n);\n\n"
+            'CREATE TABLE "singer in concert" (\n  concert_ID number,\n  Singer_ID number,\n'
+            "  PRIMARY KEY (concert_ID, Singer_ID),\n  FOREIGN KEY (Singer_ID) REFERENCES singer(Singer_ID)\n);"
+        )
+        assert spider_loader.get_schema_renderings().length("concert_singer") == len(text)
+
+    def test_compact_with_sample_rows(self, spider_loader):
+        """
+        Given: 행이 있는 sqlite 데이터베이스
+        When: render_schema()를 compact 형식과 sample_rows로 호출할 때
+        Then: 테이블마다 한 줄과 앞에서부터 지정한 수의 예시 행을 반환해야 함
+        """
+        text = spider_loader.render_schema("concert_singer", format="compact", sample_rows=2)
+
+        assert text == ("singer(Singer_ID, Name)\n  (1, Joe Sharp)\n  (2, Timbaland)\n"
+                        "singer in concert(concert_ID, Singer_ID)")
+
+    def test_keyword_identifiers_are_quoted(self, temp_dir):
+        """
+        Given: order 테이블과 group 컬럼처럼 SQLite 키워드를 이름으로 쓰는 스키마
+        When: render_schema()를 ddl 형식과 sample_rows로 호출할 때
+        Then: 키워드 이름은 따옴표로 감싸고 예시 행도 읽을 수 있어야 함
+        """
+        loader = SpiderLoader(save_path=temp_dir)
+        table_path = loader.get_sqlite_json_files()["table"]
+        table_path.parent.mkdir(parents=True)
+        table_path.write_text(json.dumps([{
+            "db_id": "shop", "table_names_original": ["order"], "table_names": ["order"],
+            "column_names_original": [[-1, "*"], [0, "id"], [0, "group"]],
+            "column_names": [[-1, "*"], [0, "id"], [0, "group"]],
+            "column_types": ["text", "number", "text"], "primary_keys": [1], "foreign_keys": [],
+        }]), encoding="utf-8")
+        sqlite_path = Path(loader.get_sqlite_database(), "shop", "shop.sqlite")
+        sqlite_path.parent.mkdir(parents=True)
+        connection = sqlite3.connect(sqlite_path)
+        connection.executescript("""
+            CREATE TABLE "order" (id INTEGER PRIMARY KEY, "group" TEXT);
+            INSERT INTO "order" VALUES (1, 'a');
+        """)
+        connection.commit()
+        connection.close()
+
+        text = loader.render_schema("shop", sample_rows=1)
+
+        assert text.startswith('CREATE TABLE "order" (\n  id number,\n  "group" text,\n  PRIMARY KEY (id)\n);')
+        assert 'SELECT * FROM "order" LIMIT 1;' in text
+
+    def test_renderings_are_persisted_and_reused(self, spider_loader):
+        """
+        Given: 한 번 렌더링한 스키마
+        When: 새 Loader로 같은 형식을 다시 요청하거나, tables.json이 바뀐 뒤 요청할 때
+        Then: 저장된 결과를 다시 렌더링하지 않고 사용하고, 원본이 바뀌었을 때만 다시 렌더링해야 함
+        """
+        first = spider_loader.render_schema("concert_singer")
+        reloaded = SpiderLoader(save_path=spider_loader.save_path)
+
+        with patch("src.text_to_sql.schema_render.render_database") as mock_render:
+            assert reloaded.render_schema("concert_singer") == first
+            assert reloaded.render_schema("concert_singer") == first
+        assert mock_render.call_count == 0
+
+        table_path = spider_loader.get_sqlite_json_files()["table"]
+        changed = dict(CONCERT_SINGER, db_id="concert_singer_v2")
+        table_path.write_text(json.dumps([CONCERT_SINGER, changed]), encoding="utf-8")
+
+        assert "concert_singer_v2" in reloaded.get_schema_renderings()
+        assert isinstance(SchemaRenderings.load(
+            reloaded._get_schema_renderings_path(table_path, "ddl", 0)), SchemaRenderings)
+
+    def test_concurrent_first_requests_render_once(self, spider_loader):
+        """
+        Given: 아직 렌더링하지 않은 스키마
+        When: 여러 스레드가 동시에 get_schema_renderings()를 처음 호출할 때
+        Then: 한 번만 렌더링하고 모든 스레드가 같은 결과를 받아야 함
+        """
+        started = threading.Barrier(8)
+        results = []
+
+        def request():
+            started.wait()
+            results.append(spider_loader.get_schema_renderings())
+
+        with patch("src.text_to_sql.loader.SchemaRenderings.build", wraps=SchemaRenderings.build) as mock_build:
+            threads = [threading.Thread(target=request) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert mock_build.call_count == 1
+        assert all(result is results[0] for result in results)
+
+    def test_unknown_format_or_db_id_raises(self, spider_loader):
+        """
+        Given: 준비된 스키마
+        When: 지원하지 않는 형식이나 없는 db_id로 render_schema()를 호출할 때
+        Then: 각각 ValueError와 KeyError가 발생해야 함
+        """
+        with pytest.raises(ValueError):
+            spider_loader.render_schema("concert_singer", format="markdown")
+        with pytest.raises(KeyError):
+            spider_loader.render_schema("missing_db")
@@ -0,0 +1,131 @@
+import json
+import pytest
+import sqlite3
+import tempfile
+import shutil
+import zipfile
+from pathlib import Path
+from src.text_to_sql.sharding import estimate_costs, plan_shards
+from src.text_to_sql.spider_loader import SpiderLoader
+from src.text_to_sql.transport import FileMirror
+
+
+# db_id -> 예제 수
+EXAMPLE_COUNTS = {"concert_singer": 6, "pets_1": 4, "car_1": 3, "flight_2": 3, "orchestra": 2}
+
+
+def _database_bytes(rows: int) -> bytes:
+    directory = tempfile.mkdtemp()
+    try:
+        path = Path(directory, "db.sqlite")
+        connection = sqlite3.connect(path)
+        connection.execute("CREATE TABLE t (x TEXT)")
+        connection.executemany("INSERT INTO t VALUES (?)", [("x" * 100,)] * rows)
+        connection.commit()
+        connection.close()
+        return path.read_bytes()
+    finally:
+        shutil.rmtree(directory)
+
+
+def _records():
+    # db_id가 섞인 순서로 예제를 배치
+    pending = dict(EXAMPLE_COUNTS)
+    records = []
+    while pending:
+        for db_id in list(pending):
+            records.append({"db_id": db_id, "question": f"q{len(records)}", "query": "SELECT count(*) FROM t"})
+            pending[db_id] -= 1
+            if not pending[db_id]:
+                del pending[db_id]
+    return records
+
+
+class TestSharding:
+    """db_id 단위 shard 분할에 대한 테스트 케이스들"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """테스트용 임시 디렉토리 생성"""
+        temp_path = tempfile.mkdtemp()
+        yield temp_path
+        shutil.rmtree(temp_path)
+
+    @pytest.fixture
+    def lazy_loader(self, temp_dir):
+        """데이터베이스를 zip에 남겨 둔 lazy 모드 SpiderLoader 인스턴스 생성"""
+        mirror_dir = Path(temp_dir, "mirror")
+        mirror_dir.mkdir()
+        with zipfile.ZipFile(Path(mirror_dir, "Spider.zip"), "w") as zf:
+            zf.writestr("spider_data/dev.json", json.dumps(_records()))
+            for db_id in EXAMPLE_COUNTS:
+                zf.writestr(f"spider_data/database/{db_id}/{db_id}.sqlite",
+                            _database_bytes(400 if db_id == "orchestra" else 10))
+        loader = SpiderLoader(save_path=str(Path(temp_dir, "data")), lazy=True, mirrors=[FileMirror(mirror_dir)])
+        loader.download_dataset()
+        return loader
+
+    def test_shards_are_db_affine_complete_and_deterministic(self, lazy_loader):
+        """
+        Given: 데이터베이스 5개에 예제가 섞여 있는 split
+        When: shard_examples(2)를 호출하고, 새 Loader로 다시 호출할 때
+        Then: 모든 예제가 정확히 한 shard에 들어가고, 한 db_id는 한 shard에만 있으며, 결과가 같아야 함
+        """
+        shards = lazy_loader.shard_examples(2)
+        again = SpiderLoader(save_path=lazy_loader.save_path, lazy=True).shard_examples(2)
+
+        assert shards == again
+        indices = sorted(index for shard in shards for index in shard.example_indices)
+        assert indices == list(range(sum(EXAMPLE_COUNTS.values())))
+        assert not set(shards[0].db_ids) & set(shards[1].db_ids)
+        cache = lazy_loader.get_example_cache("dev")
+        for shard in shards:
+            assert {cache[index].db_id for index in shard.example_indices} == set(shard.db_ids)
+        # 샤딩은 데이터베이스를 압축 해제하지 않음
+        assert not lazy_loader.get_sqlite_database().exists()
+
+    def test_costs_use_database_size_and_query_times(self, lazy_loader):
+        """
+        Given: 다른 데이터베이스보다 훨씬 큰 orchestra 데이터베이스
+        When: shard 비용을 추정할 때
+        Then: 크기가 비용에 반영되고, 과거 실행 시간을 주면 그 값이 크기 추정보다 우선해야 함
+        """
+        by_size = {shard.index: shard for shard in lazy_loader.shard_examples(3)}
+        timed = lazy_loader.shard_examples(3, query_times={"pets_1": 10.0})
+
+        assert lazy_loader.get_database_size("orchestra") > 40 * 1024
+        orchestra_shard = next(shard for shard in by_size.values() if "orchestra" in shard.db_ids)
+        assert orchestra_shard.cost > estimate_costs({"orchestra": [0, 1]}, {})["orchestra"]
+        assert [shard.db_ids for shard in timed if "pets_1" in shard.db_ids] == [["pets_1"]]
+        assert timed[0].cost == 40.0
+
+    def test_prepare_shard_extracts_only_its_databases(self, lazy_loader):
+        """
+        Given: lazy 모드 Loader의 shard 하나
+        When: prepare_shard()를 호출할 때
+        Then: 그 shard의 데이터베이스만 압축 해제되고 evaluate_execution()으로 그 shard만 채점할 수 있어야 함
+        """
+        shard = lazy_loader.get_shard(1, 2)
+
+        paths = lazy_loader.prepare_shard(shard)
+        report = lazy_loader.evaluate_execution({index: "SELECT count(*) FROM t" for index in shard.example_indices},
+                                                jobs=1)
+
+        assert sorted(p.name for p in lazy_loader.get_sqlite_database().iterdir()) == shard.db_ids
+        assert all(path.exists() for path in paths)
+        assert len(report) == len(shard.example_indices) and report.accuracy == 1.0
+
+    def test_plan_balances_and_validates(self):
+        """
+        Given: 비용이 다른 db_id들
+        When: plan_shards()를 호출할 때
+        Then: 비용이 큰 것부터 가벼운 shard에 넣고, shard 수가 잘못되면 ValueError가 발생해야 함
+        """
+        examples = {"a": [0], "b": [1], "c": [2], "d": [3]}
+        shards = plan_shards(examples, {"a": 5.0, "b": 4.0, "c": 3.0, "d": 2.0}, 2)
+
+        assert [shard.db_ids for shard in shards] == [["a", "d"], ["b", "c"]]
+        assert [shard.cost for shard in shards] == [7.0, 7.0]
+        assert plan_shards(examples, {"a": 1.0, "b": 1.0, "c": 1.0, "d": 1.0}, 6)[5].db_ids == []
+        with pytest.raises(ValueError):
+            plan_shards(examples, {}, 0)
@@ -1,9 +1,12 @@
+import json
 import pytest
 import tempfile
 import shutil
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 from src.text_to_sql.spider_ko_loader import SpiderKoLoader
+from src.text_to_sql.spider_ko_sources import SpiderKoSource
+from src.text_to_sql.tokenization import tokenize_questions
 
 
 class TestSpiderKoLoader:
@@ -16,98 +19,179 @@ class TestSpiderKoLoader:
         yield temp_path
         shutil.rmtree(temp_path)
 
+    @pytest.fixture(autouse=True)
+    def hub_revision(self):
+        """huggingface hub에 접근하지 않도록 기본 브랜치의 커밋 sha 조회를 mock으로 대체"""
+        with patch('src.text_to_sql.spider_ko_sources.dataset_revision', return_value="sha-1") as mock_revision:
+            yield mock_revision
+
     @pytest.fixture
     def spider_ko_loader(self, temp_dir):
         """SpiderKoLoader 인스턴스 생성"""
         return SpiderKoLoader(save_path=temp_dir)
 
-    def test_download_dataset_pipeline(self, spider_ko_loader):
+    def _prepare_spider_files(self, loader):
+        """Spider 원본 dev.json, train_spider.json, train_others.json 생성"""
+        root = Path(loader.save_path, "spider_data")
+        root.mkdir(parents=True, exist_ok=True)
+        Path(root, "dev.json").write_text(json.dumps([{"query": "SELECT * FROM table", "sql": {"select": []}}]),
+                                          encoding="utf-8")
+        Path(root, "train_spider.json").write_text(json.dumps([{"query": "SELECT 1", "sql": {"from": []}}]),
+                                                   encoding="utf-8")
+        Path(root, "train_others.json").write_text(json.dumps([{"query": "SELECT 2", "sql": {"where": []}}]),
+                                                   encoding="utf-8")
+
+    def _hf_row(self, query, question):
+        return {
+            "db_id": "test_db",
+            "query": query,
+            "query_toks": query.split(),
+            "query_toks_no_value": query.split(),
+            "question_ko": question,
+        }
+
+    def test_download_dataset_pipeline(self, temp_dir):
         """
-        Arrange: SpiderKoLoader 인스턴스 생성
+        Arrange: Spider 원본 파일과 huggingface 데이터셋 mock 준비
         Act: download_dataset() 호출
         Assert: 다음 파이프라인이 순서대로 실행되어야 함:
         1. super의 download_dataset 호출
         2. huggingface에서 spider-ko 데이터셋 다운로드
-        3. dev.json 파일 읽기
-        4. dev_ko.json 파일 생성 (dev.json의 sql 정보 포함)
-        """
-        # Arrange: Mock 설정 및 예상 동작 정의
-        mock_dataset = MagicMock()
-        mock_validation_data = [
-            {
-                "db_id": "test_db",
-                "query": "SELECT * FROM table",
-                "query_toks": ["SELECT", "*", "FROM", "table"],
-                "query_toks_no_value": ["SELECT", "*", "FROM", "table"],
-                "question_ko": "테이블에서 모든 데이터를 조회해주세요"
-            }
-        ]
-        mock_dataset.__getitem__.return_value = mock_validation_data
-        
-        # dev.json 데이터 모킹
-        mock_dev_data = [
-            {
-                "query": "SELECT * FROM table",
-                "sql": "SELECT * FROM table"
-            }
-        ]
-        
+        3. dev_ko.json, train_ko.json 파일 생성 (Spider 원본의 sql 정보 포함)
+        """
+        # Arrange
+        spider_ko_loader = SpiderKoLoader(save_path=temp_dir, tokenize_jobs=1)
+        self._prepare_spider_files(spider_ko_loader)
+        mock_dataset = {
+            "validation": [self._hf_row("SELECT * FROM table", "테이블에서 모든 데이터를 조회해주세요")],
+            "train": [self._hf_row("SELECT 1", "하나"), self._hf_row("SELECT 2", "둘")],
+        }
+
         with patch('src.text_to_sql.spider_ko_loader.SpiderLoader.download_dataset') as mock_super_download, \
-             patch('src.text_to_sql.spider_ko_loader.load_dataset', return_value=mock_dataset) as mock_load_dataset, \
-             patch('builtins.open', create=True) as mock_open, \
-             patch('json.dump') as mock_json_dump, \
-             patch('json.load', return_value=mock_dev_data) as mock_json_load:
-            
-            # Act: download_dataset() 호출
+             patch('src.text_to_sql.spider_ko_loader.SpiderLoader._is_dataset_already_downloaded', return_value=True), \
+             patch('src.text_to_sql.spider_ko_sources.load_dataset',
+                   side_effect=lambda name, split, **kwargs: mock_dataset[split]) as mock_load_dataset, \
+             patch('src.text_to_sql.spider_ko_loader.create_tokenizer', return_value=self._whitespace_tokenizer()):
+
+            # Act
             spider_ko_loader.download_dataset()
-            
-            # Assert: 파이프라인 순서대로 실행되었는지 확인
-            
-            # 1. super의 download_dataset이 호출되었는지 확인
-            mock_super_download.assert_called_once()
-            
-            # 2. huggingface에서 spider-ko 데이터셋 다운로드 확인
-            mock_load_dataset.assert_called_once_with(spider_ko_loader.hf_dataset_name)
-            
-            # 3. dev.json 파일 읽기 확인
-            mock_json_load.assert_called_once()
-            
-            # 4. dev_ko.json 파일 생성 확인 (dev.json의 sql 정보가 포함된 content로 저장)
-            mock_open.assert_called_once()
-            mock_json_dump.assert_called_once()
-            
-            # 5. 저장된 content에 sql 정보가 포함되었는지 확인
-            saved_content = mock_json_dump.call_args[0][0]
-            assert len(saved_content) == 1
-            assert saved_content[0]["sql"] == "SELECT * FROM table"  # dev.json에서 가져온 sql
-            assert saved_content[0]["question"] == "테이블에서 모든 데이터를 조회해주세요"  # 한국어 질문
 
-    def test_is_dataset_already_downloaded(self, spider_ko_loader):
+        # Assert
+        mock_super_download.assert_called_once()
+        # huggingface에서는 필요한 split만 가져와야 함
+        assert sorted(call.kwargs["split"] for call in mock_load_dataset.call_args_list) == ["train", "validation"]
+        assert all(call.args == (spider_ko_loader.hf_dataset_name,) for call in mock_load_dataset.call_args_list)
+        assert all(call.kwargs["streaming"] and call.kwargs["revision"] == "sha-1"
+                   for call in mock_load_dataset.call_args_list)
+
+        dev_path, = spider_ko_loader.get_split_files()["dev"]
+        saved_content = json.loads(dev_path.read_text(encoding="utf-8"))
+        assert len(saved_content) == 1
+        assert saved_content[0]["sql"] == {"select": []}  # dev.json에서 가져온 sql
+        assert saved_content[0]["question"] == "테이블에서 모든 데이터를 조회해주세요"  # 한국어 질문
+        assert saved_content[0]["question_toks"] == ["테이블에서", "모든", "데이터를", "조회해주세요"]
+
+        train_path, = spider_ko_loader.get_split_files()["train"]
+        train_content = json.loads(train_path.read_text(encoding="utf-8"))
+        assert [item["sql"] for item in train_content] == [{"from": []}, {"where": []}]
+
+    def test_questions_are_tokenized_in_parallel(self, temp_dir):
         """
-        Arrange: SpiderKoLoader 인스턴스 생성
-        Act: _is_dataset_already_downloaded() 호출
-        Assert: 부모 클래스의 결과와 dev_ko.json 파일 존재 여부를 모두 확인해야 함
+        Arrange: 여러 질문이 있는 huggingface 데이터셋 mock
+        Act: 프로세스 2개로 토큰화하도록 설정하고 _post_process() 호출
+        Assert: 질문 순서대로 Mecab 형태소 토큰이 기록되어야 함
         """
-        # Arrange: Mock 설정
-        with patch.object(spider_ko_loader, '_get_dataset_detail_path_root') as mock_get_path, \
-             patch('src.text_to_sql.spider_ko_loader.SpiderLoader._is_dataset_already_downloaded', return_value=True) as mock_super_check, \
-             patch('src.text_to_sql.spider_ko_loader.Path.exists') as mock_path_exists:
-            
-            mock_path = MagicMock()
-            mock_get_path.return_value = mock_path
-            mock_path_exists.return_value = True
-            
-            # Act: _is_dataset_already_downloaded() 호출
+        # Arrange
+        spider_ko_loader = SpiderKoLoader(save_path=temp_dir, tokenize_jobs=2, source=Path(temp_dir, "ko_source"))
+        self._prepare_spider_files(spider_ko_loader)
+        questions = ["가수는 몇 명인가요?", "테이블에서 모든 데이터를 조회해주세요"] * 5
+        self._write_source(spider_ko_loader, {
+            "validation": [self._hf_row("SELECT * FROM table", question) for question in questions],
+            "train": [],
+        })
+
+        with patch('src.text_to_sql.spider_ko_loader.SpiderLoader._is_dataset_already_downloaded', return_value=True):
+            # Act
+            spider_ko_loader._post_process()
+
+        # Assert
+        dev_path, = spider_ko_loader.get_split_files()["dev"]
+        saved_content = json.loads(dev_path.read_text(encoding="utf-8"))
+        assert [item["question"] for item in saved_content] == questions
+        assert saved_content[0]["question_toks"] == ["가수", "는", "몇", "명", "인가요", "?"]
+        assert saved_content[1]["question_toks"][:2] == ["테이블", "에서"]
+
+    def test_parallel_tokenization_reads_questions_in_bounded_window(self):
+        """
+        Arrange: 많은 질문을 하나씩 내주며 읽힌 개수를 세는 iterable
+        Act: 프로세스 2개, batch 크기 1로 tokenize_questions()의 첫 결과만 받음
+        Assert: 모든 질문을 읽지 않고 worker 수의 몇 배 batch까지만 읽어야 함
+        """
+        # Arrange
+        consumed = []
+
+        def questions():
+            for i in range(1000):
+                consumed.append(i)
+                yield f"질문 {i}"
+
+        # Act
+        tokens = tokenize_questions(questions(), jobs=2, batch_size=1)
+        first = next(tokens)
+        tokens.close()
+
+        # Assert
+        assert first == ["질문", "0"]
+        assert len(consumed) <= 2 * 2 + 1
+
+    def _write_source(self, loader, dataset):
+        """로컬 source 디렉토리에 split별 <split>.jsonl 파일 생성"""
+        loader.source.root.mkdir(parents=True, exist_ok=True)
+        for split, rows in dataset.items():
+            lines = "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+            path = Path(loader.source.root, f"{split}.jsonl")
+            # 내용이 같은 split 파일은 다시 쓰지 않아 바뀌지 않은 것으로 유지
+            if not path.exists() or path.read_text(encoding="utf-8") != lines:
+                path.write_text(lines, encoding="utf-8")
+
+    def _build(self, loader, dataset, tokenizer=None):
+        """로컬 source에 데이터셋을 기록하고 토크나이저를 mock으로 바꿔 _post_process() 호출"""
+        self._write_source(loader, dataset)
+        tokenizer = tokenizer or self._whitespace_tokenizer()
+        with patch('src.text_to_sql.spider_ko_loader.SpiderLoader._is_dataset_already_downloaded', return_value=True), \
+             patch('src.text_to_sql.spider_ko_loader.create_tokenizer', return_value=tokenizer):
+            loader._tokenizer = None
+            loader._post_process()
+
+    def _whitespace_tokenizer(self):
+        tokenizer = MagicMock()
+        tokenizer.morphs.side_effect = lambda question: question.split()
+        return tokenizer
+
+    def _dataset(self, dev_questions=("테이블 조회",)):
+        return {
+            "validation": [self._hf_row("SELECT * FROM table", question) for question in dev_questions],
+            "train": [self._hf_row("SELECT 1", "하나"), self._hf_row("SELECT 2", "둘")],
+        }
+
+    def test_is_dataset_already_downloaded(self, temp_dir):
+        """
+        Arrange: dev_ko.json, train_ko.json을 만든 SpiderKoLoader
+        Act: _is_spider_ko_dataset_already_downloaded() 호출
+        Assert: 부모 클래스의 결과와 모든 split의 fingerprint를 확인해 True를 반환해야 함
+        """
+        # Arrange
+        spider_ko_loader = SpiderKoLoader(save_path=temp_dir, tokenize_jobs=1, source=Path(temp_dir, "ko_source"))
+        self._prepare_spider_files(spider_ko_loader)
+        self._build(spider_ko_loader, self._dataset())
+
+        with patch('src.text_to_sql.spider_ko_loader.SpiderLoader._is_dataset_already_downloaded', return_value=True) as mock_super_check:
+            # Act
             result = spider_ko_loader._is_spider_ko_dataset_already_downloaded()
-            
-            # Assert: 결과 확인
-            assert result == True
-            mock_super_check.assert_called_once()
-            mock_path_exists.assert_called_once()
-            
-            # dev_ko.json 파일 경로가 올바르게 확인되었는지 검증
-            expected_path = Path(mock_path, "dev_ko.json")
-            mock_path_exists.assert_called_with()
+
+        # Assert
+        assert result == True
+        mock_super_check.assert_called_once()
 
     def test_is_dataset_already_downloaded_false_when_super_false(self, spider_ko_loader):
         """
@@ -125,25 +209,191 @@ class TestSpiderKoLoader:
             assert result == False
             mock_super_check.assert_called_once()
 
-    def test_is_dataset_already_downloaded_false_when_dev_ko_not_exists(self, spider_ko_loader):
+    def test_is_dataset_already_downloaded_false_when_dev_ko_not_exists(self, temp_dir):
         """
-        Arrange: SpiderKoLoader 인스턴스 생성
-        Act: _is_dataset_already_downloaded() 호출 (dev_ko.json이 존재하지 않음)
+        Arrange: dev_ko.json을 만든 뒤 삭제
+        Act: _is_spider_ko_dataset_already_downloaded() 호출
         Assert: False를 반환해야 함
         """
-        # Arrange: Mock 설정
-        with patch.object(spider_ko_loader, '_get_dataset_detail_path_root') as mock_get_path, \
-             patch('src.text_to_sql.spider_ko_loader.SpiderLoader._is_dataset_already_downloaded', return_value=True) as mock_super_check, \
-             patch('src.text_to_sql.spider_ko_loader.Path.exists') as mock_path_exists:
-            
-            mock_path = MagicMock()
-            mock_get_path.return_value = mock_path
-            mock_path_exists.return_value = False  # dev_ko.json이 존재하지 않음
-            
-            # Act: _is_dataset_already_downloaded() 호출
+        # Arrange
+        spider_ko_loader = SpiderKoLoader(save_path=temp_dir, tokenize_jobs=1, source=Path(temp_dir, "ko_source"))
+        self._prepare_spider_files(spider_ko_loader)
+        self._build(spider_ko_loader, self._dataset())
+        spider_ko_loader.get_split_files()["dev"][0].unlink()
+
+        with patch('src.text_to_sql.spider_ko_loader.SpiderLoader._is_dataset_already_downloaded', return_value=True):
+            # Act
             result = spider_ko_loader._is_spider_ko_dataset_already_downloaded()
-            
-            # Assert: 결과 확인
-            assert result == False
-            mock_super_check.assert_called_once()
-            mock_path_exists.assert_called_once()
+
+        # Assert
+        assert result == False
+
+    def test_only_changed_questions_are_retokenized(self, temp_dir):
+        """
+        Arrange: 한 번 빌드한 뒤 dev.json과 huggingface 질문 하나가 바뀐 상태
+        Act: _post_process() 다시 호출
+        Assert: dev만 다시 만들고, 바뀐 질문만 토큰화해야 함
+        """
+        # Arrange
+        spider_ko_loader = SpiderKoLoader(save_path=temp_dir, tokenize_jobs=1, source=Path(temp_dir, "ko_source"))
+        self._prepare_spider_files(spider_ko_loader)
+        self._build(spider_ko_loader, self._dataset(["첫 질문", "두 번째 질문"]))
+        train_path, = spider_ko_loader.get_split_files()["train"]
+        train_mtime = train_path.stat().st_mtime_ns
+
+        dev_path = Path(temp_dir, "spider_data", "dev.json")
+        dev_path.write_text(json.dumps([{"query": "SELECT * FROM table", "sql": {"select": [1]}}]), encoding="utf-8")
+        tokenizer = self._whitespace_tokenizer()
+
+        # Act
+        self._build(spider_ko_loader, self._dataset(["첫 질문", "바뀐 질문"]), tokenizer)
+
+        # Assert
+        assert [call.args[0] for call in tokenizer.morphs.call_args_list] == ["바뀐 질문"]
+        dev_ko_path, = spider_ko_loader.get_split_files()["dev"]
+        saved_content = json.loads(dev_ko_path.read_text(encoding="utf-8"))
+        assert [item["question_toks"] for item in saved_content] == [["첫", "질문"], ["바뀐", "질문"]]
+        assert saved_content[0]["sql"] == {"select": [1]}
+        assert train_path.stat().st_mtime_ns == train_mtime
+
+    def test_tokenizer_upgrade_retokenizes_everything(self, temp_dir):
+        """
+        Arrange: 한 번 빌드한 뒤 토크나이저 버전이 바뀐 상태
+        Act: _post_process() 다시 호출
+        Assert: 모든 질문을 다시 토큰화해야 함
+        """
+        # Arrange
+        spider_ko_loader = SpiderKoLoader(save_path=temp_dir, tokenize_jobs=1, source=Path(temp_dir, "ko_source"))
+        self._prepare_spider_files(spider_ko_loader)
+        self._build(spider_ko_loader, self._dataset(["첫 질문", "두 번째 질문"]))
+        tokenizer = self._whitespace_tokenizer()
+
+        # Act
+        with patch('src.text_to_sql.spider_ko_loader.tokenizer_version', return_value="python-mecab-ko==99"):
+            self._build(spider_ko_loader, self._dataset(["첫 질문", "두 번째 질문"]), tokenizer)
+
+        # Assert
+        assert tokenizer.morphs.call_count == 4  # dev 2개 + train 2개
+
+    def test_snapshot_serves_later_runs_offline(self, temp_dir):
+        """
+        Arrange: huggingface에서 한 번 가져온 뒤 dev_ko.json을 삭제한 상태
+        Act: 새 SpiderKoLoader로 _post_process() 호출
+        Assert: huggingface에 접근하지 않고 spider_ko snapshot에서 dev_ko.json을 다시 만들어야 함
+        """
+        # Arrange
+        mock_dataset = self._dataset()
+        first_loader = SpiderKoLoader(save_path=temp_dir, tokenize_jobs=1)
+        self._prepare_spider_files(first_loader)
+        with patch('src.text_to_sql.spider_ko_loader.SpiderLoader._is_dataset_already_downloaded', return_value=True), \
+             patch('src.text_to_sql.spider_ko_sources.load_dataset',
+                   side_effect=lambda name, split, **kwargs: mock_dataset[split]), \
+             patch('src.text_to_sql.spider_ko_loader.create_tokenizer', return_value=self._whitespace_tokenizer()):
+            first_loader._post_process()
+        first_loader.get_split_files()["dev"][0].unlink()
+
+        # Act
+        second_loader = SpiderKoLoader(save_path=temp_dir, tokenize_jobs=1)
+        with patch('src.text_to_sql.spider_ko_loader.SpiderLoader._is_dataset_already_downloaded', return_value=True), \
+             patch('src.text_to_sql.spider_ko_sources.load_dataset') as mock_load_dataset, \
+             patch('src.text_to_sql.spider_ko_loader.create_tokenizer', return_value=self._whitespace_tokenizer()):
+            second_loader._post_process()
+
+        # Assert
+        mock_load_dataset.assert_not_called()
+        assert Path(temp_dir, "spider_ko", "validation.jsonl.gz").exists()
+        dev_path, = second_loader.get_split_files()["dev"]
+        assert json.loads(dev_path.read_text(encoding="utf-8"))[0]["question"] == "테이블 조회"
+
+    def test_new_hub_revision_refetches_snapshot(self, temp_dir, hub_revision):
+        """
+        Arrange: huggingface에서 한 번 가져온 뒤 기본 브랜치의 커밋이 바뀐 상태
+        Act: refresh_source 없이, 그리고 refresh_source=True로 새 SpiderKoLoader의 _post_process() 호출
+        Assert: refresh_source 없이는 hub에 접근하지 않고, refresh_source=True이면 새 커밋으로 다시 가져와야 함
+        """
+        # Arrange
+        loader = SpiderKoLoader(save_path=temp_dir, tokenize_jobs=1)
+        self._prepare_spider_files(loader)
+        mock_dataset = self._dataset()
+        with patch('src.text_to_sql.spider_ko_loader.SpiderLoader._is_dataset_already_downloaded', return_value=True), \
+             patch('src.text_to_sql.spider_ko_sources.load_dataset',
+                   side_effect=lambda name, split, **kwargs: mock_dataset[split]), \
+             patch('src.text_to_sql.spider_ko_loader.create_tokenizer', return_value=self._whitespace_tokenizer()):
+            loader._post_process()
+            hub_revision.reset_mock()
+
+            # Act
+            hub_revision.return_value = "sha-2"
+            mock_dataset = self._dataset(["새 질문"])
+            SpiderKoLoader(save_path=temp_dir, tokenize_jobs=1)._post_process()
+            calls_without_refresh = hub_revision.call_count
+            refreshed_loader = SpiderKoLoader(save_path=temp_dir, tokenize_jobs=1, refresh_source=True)
+            refreshed_loader._post_process()
+
+        # Assert
+        assert calls_without_refresh == 0
+        snapshot = json.loads(Path(temp_dir, "spider_ko", "snapshot.json").read_text(encoding="utf-8"))
+        assert snapshot["revisions"] == {"validation": "sha-2", "train": "sha-2"}
+        dev_path, = refreshed_loader.get_split_files()["dev"]
+        assert json.loads(dev_path.read_text(encoding="utf-8"))[0]["question"] == "새 질문"
+
+    def test_unreachable_hub_uses_snapshot(self, temp_dir, hub_revision):
+        """
+        Arrange: huggingface에서 한 번 가져온 뒤 커밋 조회가 OSError가 아닌 연결 오류(httpx.ConnectError 등)를 던지는 상태
+        Act: refresh_source=True로 새 SpiderKoLoader의 _post_process() 호출
+        Assert: 오류 없이 snapshot을 그대로 사용하고 다시 가져오지 않아야 함
+        """
+        # Arrange
+        class ConnectError(Exception):
+            pass
+
+        loader = SpiderKoLoader(save_path=temp_dir, tokenize_jobs=1)
+        self._prepare_spider_files(loader)
+        mock_dataset = self._dataset()
+        with patch('src.text_to_sql.spider_ko_loader.SpiderLoader._is_dataset_already_downloaded', return_value=True), \
+             patch('src.text_to_sql.spider_ko_sources.load_dataset',
+                   side_effect=lambda name, split, **kwargs: mock_dataset[split]), \
+             patch('src.text_to_sql.spider_ko_loader.create_tokenizer', return_value=self._whitespace_tokenizer()):
+            loader._post_process()
+        hub_revision.side_effect = ConnectError("[Errno -3] Temporary failure in name resolution")
+
+        # Act
+        offline_loader = SpiderKoLoader(save_path=temp_dir, tokenize_jobs=1, refresh_source=True)
+        with patch('src.text_to_sql.spider_ko_loader.SpiderLoader._is_dataset_already_downloaded', return_value=True), \
+             patch('src.text_to_sql.spider_ko_sources.load_dataset') as mock_load_dataset, \
+             patch('src.text_to_sql.spider_ko_loader.create_tokenizer', return_value=self._whitespace_tokenizer()):
+            offline_loader._post_process()
+
+        # Assert
+        assert hub_revision.call_count == 2
+        mock_load_dataset.assert_not_called()
+        snapshot = json.loads(Path(temp_dir, "spider_ko", "snapshot.json").read_text(encoding="utf-8"))
+        assert snapshot["revisions"] == {"validation": "sha-1", "train": "sha-1"}
+
+    def test_missing_local_split_raises(self, temp_dir):
+        """
+        Arrange: train split 파일이 없는 로컬 source 디렉토리
+        Act: _post_process() 호출
+        Assert: FileNotFoundError가 발생해야 함
+        """
+        # Arrange
+        spider_ko_loader = SpiderKoLoader(save_path=temp_dir, tokenize_jobs=1, source=Path(temp_dir, "ko_source"))
+        self._prepare_spider_files(spider_ko_loader)
+
+        # Act & Assert
+        with pytest.raises(FileNotFoundError):
+            self._build(spider_ko_loader, {"validation": self._dataset()["validation"]})
+
+    def test_source_without_fetch_cannot_be_instantiated(self):
+        """
+        Arrange: fetch()를 구현하지 않은 SpiderKoSource 하위 클래스
+        Act: 인스턴스 생성
+        Assert: TypeError가 발생해야 함
+        """
+        # Arrange
+        class IncompleteSource(SpiderKoSource):
+            key = "incomplete"
+
+        # Act & Assert
+        with pytest.raises(TypeError):
+            IncompleteSource()
@@ -0,0 +1,303 @@
+import hashlib
+import io
+import os
+import pytest
+import tempfile
+import shutil
+import zipfile
+from pathlib import Path
+from src.text_to_sql import cli
+from src.text_to_sql.downloader import Downloader, DownloadError, DownloadManifest
+from src.text_to_sql.spider_loader import SpiderLoader
+from src.text_to_sql.transport import (FileMirror, GoogleDriveMirror, HttpMirror, Mirror, S3Mirror, Transport,
+                                       default_mirrors, parse_mirror)
+from tests.http_server import serve_files
+
+
+PAYLOAD = os.urandom(256 * 1024 + 17)
+
+
+def _zip_bytes() -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("spider_data/tables.json", "[]")
+    return buffer.getvalue()
+
+
+class TestTransport:
+    """Transport와 mirror들에 대한 테스트 케이스들"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """테스트용 임시 디렉토리 생성"""
+        temp_path = tempfile.mkdtemp()
+        yield temp_path
+        shutil.rmtree(temp_path)
+
+    @pytest.fixture
+    def downloader(self):
+        """작은 구간으로도 나눠 받는 Downloader 인스턴스 생성"""
+        return Downloader(chunk_size=4096, timeout=5, retries=1, min_segment_size=32 * 1024)
+
+    def test_http_mirror_downloads_in_parallel_segments(self, downloader, temp_dir):
+        """
+        Given: Range를 지원하는 HTTP mirror
+        When: segments=4로 파일을 가져올 때
+        Then: 여러 Range 요청으로 나눠 받은 파일이 원본과 같아야 함
+        """
+        manifest = DownloadManifest(size=len(PAYLOAD), sha256=hashlib.sha256(PAYLOAD).hexdigest())
+        dest = Path(temp_dir, "Spider.zip")
+
+        with serve_files({"mirror/Spider.zip": PAYLOAD}) as server:
+            transport = Transport([HttpMirror(server.url("mirror"), segments=4)], downloader)
+            transport.fetch("Spider.zip", "gdrive-id", dest, manifest)
+
+        assert dest.read_bytes() == PAYLOAD
+        ranges = [request.get("Range") for request in server.requests]
+        # 크기를 확인하는 요청 1개 + 구간 요청 4개
+        assert ranges[0] == "bytes=0-0"
+        assert len([r for r in ranges[1:] if r]) == 4
+        assert not Path(temp_dir, "Spider.zip.part").exists()
+        assert not Path(temp_dir, "Spider.zip.segments").exists()
+
+    def test_falls_back_to_next_mirror(self, downloader, temp_dir):
+        """
+        Given: 503을 반환하는 HTTP mirror와 파일이 있는 file:// mirror
+        When: fetch()를 호출할 때
+        Then: 다음 mirror에서 파일을 가져와야 함
+        """
+        mirror_dir = Path(temp_dir, "mirror")
+        mirror_dir.mkdir()
+        Path(mirror_dir, "Spider.zip").write_bytes(PAYLOAD)
+        dest = Path(temp_dir, "downloads", "Spider.zip")
+
+        with serve_files({"Spider.zip": PAYLOAD}) as server:
+            server.failing_paths.add("Spider.zip")
+            transport = Transport([HttpMirror(server.url("")), parse_mirror(mirror_dir.as_uri())], downloader)
+            transport.fetch("Spider.zip", "gdrive-id", dest, DownloadManifest(size=len(PAYLOAD)))
+
+        assert dest.read_bytes() == PAYLOAD
+        assert server.requests
+
+    def test_falls_back_when_validation_fails(self, downloader, temp_dir):
+        """
+        Given: 손상된 파일을 제공하는 mirror와 올바른 파일을 제공하는 mirror
+        When: 검증 함수와 함께 fetch()를 호출할 때
+        Then: 손상된 파일은 버리고 다음 mirror의 파일을 사용해야 함
+        """
+        broken, good = Path(temp_dir, "broken"), Path(temp_dir, "good")
+        broken.mkdir()
+        good.mkdir()
+        Path(broken, "Spider.zip").write_bytes(b"PK")
+        Path(good, "Spider.zip").write_bytes(_zip_bytes())
+        dest = Path(temp_dir, "Spider.zip")
+
+        def validate(path):
+            if not zipfile.is_zipfile(path):
+                path.unlink()
+                raise DownloadError("not a zip file")
+
+        Transport([FileMirror(broken), FileMirror(good)], downloader).fetch("Spider.zip", "gdrive-id", dest,
+                                                                            validate=validate)
+
+        assert zipfile.is_zipfile(dest)
+        # 원본 mirror의 파일은 그대로 남아야 함
+        assert Path(broken, "Spider.zip").read_bytes() == b"PK"
+
+    def test_single_mirror_resumes_partial_file_on_next_run(self, downloader, temp_dir):
+        """
+        Given: 전송 도중 연결이 계속 끊겨 실패하는 유일한 HTTP mirror
+        When: 실패한 뒤 같은 mirror로 다시 fetch()를 호출할 때
+        Then: partial 파일이 남아 있어 Range 요청으로 이어받아야 함
+        """
+        dest = Path(temp_dir, "Spider.zip")
+
+        with serve_files({"Spider.zip": PAYLOAD}) as server:
+            transport = Transport([HttpMirror(server.url(""), segments=1)], downloader)
+            server.truncate_after = 50000
+            server.truncate_times = 2
+            with pytest.raises(DownloadError):
+                transport.fetch("Spider.zip", "gdrive-id", dest)
+            assert Downloader.part_path(dest).stat().st_size == 100000
+
+            transport.fetch("Spider.zip", "gdrive-id", dest, DownloadManifest(size=len(PAYLOAD)))
+
+        assert dest.read_bytes() == PAYLOAD
+        assert server.requests[-1]["Range"] == "bytes=100000-"
+        assert not Transport.source_path(dest).exists()
+
+    def test_partial_file_from_other_mirror_is_discarded(self, downloader, temp_dir):
+        """
+        Given: 다른 mirror에서 받다가 남은 partial 파일
+        When: 새 mirror로 fetch()를 호출할 때
+        Then: partial 파일을 이어받지 않고 처음부터 받아야 함
+        """
+        dest = Path(temp_dir, "Spider.zip")
+        Downloader.part_path(dest).write_bytes(b"x" * 1000)
+        Transport.source_path(dest).write_text("HttpMirror('http://elsewhere')", encoding="utf-8")
+
+        with serve_files({"Spider.zip": PAYLOAD}) as server:
+            Transport([HttpMirror(server.url(""), segments=1)], downloader).fetch("Spider.zip", "gdrive-id", dest)
+
+        assert dest.read_bytes() == PAYLOAD
+        assert "Range" not in server.requests[0]
+
+    def test_s3_mirror_uses_path_style_url(self, downloader, temp_dir):
+        """
+        Given: bucket과 prefix를 지정한 S3 호환 mirror
+        When: fetch()를 호출할 때
+        Then: `<endpoint>/<bucket>/<prefix>/<파일 이름>`에서 가져와야 함
+        """
+        dest = Path(temp_dir, "Spider.zip")
+
+        with serve_files({"datasets/text-to-sql/Spider.zip": PAYLOAD}) as server:
+            mirror = parse_mirror(f"s3+{server.url('datasets/text-to-sql')}")
+            Transport([mirror], downloader).fetch("Spider.zip", "gdrive-id", dest)
+
+        assert isinstance(mirror, S3Mirror)
+        assert mirror.bucket == "datasets"
+        assert dest.read_bytes() == PAYLOAD
+
+    def test_raises_when_all_mirrors_fail(self, downloader, temp_dir):
+        """
+        Given: 파일이 없는 mirror들
+        When: fetch()를 호출할 때
+        Then: 모든 mirror의 오류를 담은 DownloadError가 발생해야 함
+        """
+        dest = Path(temp_dir, "Spider.zip")
+
+        with serve_files({}) as server:
+            transport = Transport([HttpMirror(server.url("")), FileMirror(Path(temp_dir, "missing"))], downloader)
+            with pytest.raises(DownloadError) as error:
+                transport.fetch("Spider.zip", "gdrive-id", dest)
+
+        assert "HttpMirror" in str(error.value)
+        assert "FileMirror" in str(error.value)
+        assert not dest.exists()
+
+    def test_mirror_without_open_stream_cannot_be_instantiated(self):
+        """
+        Given: fetch()만 구현하고 open_stream()은 구현하지 않은 Mirror 하위 클래스
+        When: 인스턴스를 만들 때
+        Then: TypeError가 발생해야 함
+        """
+        class FetchOnlyMirror(Mirror):
+            def fetch(self, downloader, archive_name, gdrive_id, dest, manifest):
+                return dest
+
+        with pytest.raises(TypeError):
+            FetchOnlyMirror()
+
+    def test_default_mirrors_from_environment(self, temp_dir, monkeypatch):
+        """
+        Given: TEXT_TO_SQL_MIRRORS 환경 변수
+        When: default_mirrors()를 호출할 때
+        Then: 환경 변수의 mirror들 뒤에 Google Drive가 붙어야 함
+        """
+        monkeypatch.setenv("TEXT_TO_SQL_MIRRORS", f"http://mirror.internal/datasets, {Path(temp_dir).as_uri()}")
+
+        mirrors = default_mirrors()
+
+        assert [type(mirror) for mirror in mirrors] == [HttpMirror, FileMirror, GoogleDriveMirror]
+        assert mirrors[1].root == Path(temp_dir)
+
+    def test_loader_downloads_from_file_mirror(self, temp_dir):
+        """
+        Given: file:// mirror에 Spider.zip이 있는 상태
+        When: mirrors를 지정한 SpiderLoader로 download_dataset()을 호출할 때
+        Then: 네트워크 없이 mirror의 zip 파일로 데이터셋이 설치되어야 함
+        """
+        mirror_dir = Path(temp_dir, "mirror")
+        mirror_dir.mkdir()
+        Path(mirror_dir, "Spider.zip").write_bytes(_zip_bytes())
+        save_path = Path(temp_dir, "data")
+
+        loader = SpiderLoader(str(save_path), mirrors=[FileMirror(mirror_dir)])
+        loader.download_dataset()
+
+        assert Path(save_path, "spider_data", "tables.json").exists()
+        assert Path(mirror_dir, "Spider.zip").exists()
+
+    def test_loader_pins_first_download_when_asked(self, temp_dir):
+        """
+        Given: pin=True로 한 번 설치한 뒤 mirror의 Spider.zip이 다른 파일로 바뀐 상태
+        When: 데이터셋을 지우고 다시 download_dataset()을 호출한 뒤, unpin_download() 후 다시 호출할 때
+        Then: 바뀐 파일은 고정을 푸는 방법을 담은 DownloadError로 거부하고, 고정을 풀면 새 파일로 다시 고정해야 함
+        """
+        mirror_dir = Path(temp_dir, "mirror")
+        mirror_dir.mkdir()
+        data = _zip_bytes()
+        Path(mirror_dir, "Spider.zip").write_bytes(data)
+        save_path = Path(temp_dir, "data")
+        SpiderLoader(str(save_path), mirrors=[FileMirror(mirror_dir)], pin=True).download_dataset()
+
+        loader = SpiderLoader(str(save_path), mirrors=[FileMirror(mirror_dir)], pin=True)
+        pinned = loader._get_download_manifest()
+        assert (pinned.size, pinned.sha256) == (len(data), hashlib.sha256(data).hexdigest())
+
+        shutil.rmtree(Path(save_path, "spider_data"))
+        changed = data + b"tampered"
+        Path(mirror_dir, "Spider.zip").write_bytes(changed)
+        with pytest.raises(DownloadError, match="unpin"):
+            loader.download_dataset()
+
+        assert loader.unpin_download()
+        loader.download_dataset()
+        repinned = loader._get_download_manifest()
+        assert (repinned.size, repinned.sha256) == (len(changed), hashlib.sha256(changed).hexdigest())
+
+    def test_cli_unpin_removes_pinned_manifest(self, temp_dir, capsys):
+        """
+        Given: Spider zip 파일의 크기/sha256이 기록된 save_path
+        When: cli.main(["unpin", ...])을 호출할 때
+        Then: 기록을 지우고 0을 반환해야 함
+        """
+        loader = SpiderLoader(temp_dir)
+        DownloadManifest(size=1, sha256="00").save(loader._get_download_manifest_path())
+
+        exit_code = cli.main(["unpin", "--datasets", "spider", "--save-path", temp_dir])
+
+        assert exit_code == 0
+        assert "spider: unpinned" in capsys.readouterr().out
+        assert loader._get_download_manifest() is None
+
+    def test_loader_does_not_pin_by_default(self, temp_dir):
+        """
+        Given: pin 없이 한 번 설치한 뒤 mirror의 Spider.zip이 다른 파일로 바뀐 상태
+        When: 데이터셋을 지우고 다시 download_dataset()을 호출할 때
+        Then: 기록된 manifest가 없으므로 바뀐 파일로 설치되어야 함
+        """
+        mirror_dir = Path(temp_dir, "mirror")
+        mirror_dir.mkdir()
+        Path(mirror_dir, "Spider.zip").write_bytes(_zip_bytes())
+        save_path = Path(temp_dir, "data")
+        loader = SpiderLoader(str(save_path), mirrors=[FileMirror(mirror_dir)])
+        loader.download_dataset()
+        assert loader._get_download_manifest() is None
+
+        shutil.rmtree(Path(save_path, "spider_data"))
+        Path(mirror_dir, "Spider.zip").write_bytes(_zip_bytes() + b"updated")
+        loader.download_dataset()
+
+        assert Path(save_path, "spider_data", "tables.json").exists()
+
+    def test_loader_streams_archive_without_saving_it(self, temp_dir):
+        """
+        Given: 첫 mirror는 503을 반환하고 두 번째 HTTP mirror에 Spider.zip이 있는 상태
+        When: streaming=True인 SpiderLoader로 download_dataset()을 호출할 때
+        Then: zip 파일을 저장하지 않고 두 번째 mirror의 스트림에서 바로 설치되어야 함
+        """
+        data = _zip_bytes()
+        save_path = Path(temp_dir, "data")
+
+        with serve_files({"broken/Spider.zip": data, "good/Spider.zip": data}) as server:
+            server.failing_paths.add("broken/Spider.zip")
+            loader = SpiderLoader(str(save_path), streaming=True,
+                                  mirrors=[HttpMirror(server.url("broken")), HttpMirror(server.url("good"))],
+                                  manifest=DownloadManifest(size=len(data)))
+            loader.download_dataset()
+
+        assert Path(save_path, "spider_data", "tables.json").read_text() == "[]"
+        assert loader.verify_dataset()
+        assert not loader._get_archive_path().exists()
+        assert not Downloader.part_path(loader._get_archive_path()).exists()
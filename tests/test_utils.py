@@ -0,0 +1,47 @@
+import pytest
+import tempfile
+import shutil
+from pathlib import Path
+from src.text_to_sql.utils import atomic_write
+
+
+class TestAtomicWrite:
+    """atomic_write 함수에 대한 테스트 케이스들"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """테스트용 임시 디렉토리 생성"""
+        temp_path = tempfile.mkdtemp()
+        yield temp_path
+        shutil.rmtree(temp_path)
+
+    def test_writes_file_and_creates_parent(self, temp_dir):
+        """
+        Given: 상위 디렉토리가 없는 경로
+        When: atomic_write()로 기록할 때
+        Then: 상위 디렉토리가 만들어지고 내용이 기록되며 임시 파일은 남지 않아야 함
+        """
+        path = Path(temp_dir, "nested", "data.json")
+
+        with atomic_write(path) as f:
+            f.write("[]")
+
+        assert path.read_text(encoding="utf-8") == "[]"
+        assert [p.name for p in path.parent.iterdir()] == ["data.json"]
+
+    def test_failure_keeps_previous_file(self, temp_dir):
+        """
+        Given: 이미 내용이 있는 파일
+        When: atomic_write()로 기록하는 도중 예외가 발생할 때
+        Then: 기존 내용이 그대로 남고 임시 파일은 지워져야 함
+        """
+        path = Path(temp_dir, "data.bin")
+        path.write_bytes(b"old")
+
+        with pytest.raises(RuntimeError):
+            with atomic_write(path, "wb") as f:
+                f.write(b"new")
+                raise RuntimeError("interrupted")
+
+        assert path.read_bytes() == b"old"
+        assert [p.name for p in Path(temp_dir).iterdir()] == ["data.bin"]
@@ -0,0 +1,108 @@
+import os
+import pytest
+import sqlite3
+import tempfile
+import shutil
+from pathlib import Path
+from src.text_to_sql.bird_loader import BirdMiniDevLoader
+from src.text_to_sql.value_index import ValueIndex
+
+
+def _create_database(path: Path, cities) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(path)
+    connection.executescript("""
+        CREATE TABLE schools (cds TEXT PRIMARY KEY, "School Name" VARCHAR(100), City TEXT, enrollment INTEGER);
+        CREATE TABLE notes (note);
+    """)
+    connection.executemany("INSERT INTO schools VALUES (?, ?, ?, ?)",
+                           [(f"{i:05d}", f"School {i}", cities[i % len(cities)], i) for i in range(60)])
+    connection.execute("INSERT INTO notes VALUES ('Ümlaut Straße')")
+    connection.commit()
+    connection.close()
+
+
+class TestValueIndex:
+    """컬럼 값 색인에 대한 테스트 케이스들"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """테스트용 임시 디렉토리 생성"""
+        temp_path = tempfile.mkdtemp()
+        yield temp_path
+        shutil.rmtree(temp_path)
+
+    @pytest.fixture
+    def bird_loader(self, temp_dir):
+        """sqlite 데이터베이스 두 개가 준비된 BirdMiniDevLoader 인스턴스 생성"""
+        loader = BirdMiniDevLoader(save_path=temp_dir)
+        _create_database(Path(loader.get_sqlite_database(), "california_schools", "california_schools.sqlite"),
+                         ["Fresno", "Los Angeles", "San Diego"])
+        _create_database(Path(loader.get_sqlite_database(), "financial", "financial.sqlite"),
+                         ["Praha", "Brno"])
+        yield loader
+        for index in loader._value_indexes.values():
+            index.close()
+
+    def test_search_finds_similar_values(self, bird_loader):
+        """
+        Given: 텍스트 컬럼을 가진 데이터베이스
+        When: 오타가 있는 값으로 search()를 호출할 때
+        Then: 해당 값과 그 값이 들어 있는 테이블과 컬럼을 가장 높은 점수로 반환해야 함
+        """
+        index = bird_loader.get_value_index("california_schools")
+
+        exact = index.search("los angeles")[0]
+        fuzzy = index.search("Los Angelos")[0]
+
+        assert (exact.table, exact.column, exact.value, exact.score) == ("schools", "City", "Los Angeles", 1.0)
+        assert (fuzzy.column, fuzzy.value) == ("City", "Los Angeles")
+        assert 0.5 < fuzzy.score < 1.0
+        # 정수 컬럼은 색인하지 않고, 선언 타입이 없는 컬럼은 색인함
+        assert ("schools", "enrollment") not in index.columns
+        assert index.search("umlaut strasse", min_score=0.3)[0].value == "Ümlaut Straße"
+
+    def test_find_mentions_in_question(self, bird_loader):
+        """
+        Given: 텍스트 컬럼을 가진 데이터베이스
+        When: 값이 포함된 자연어 질문으로 find_mentions()를 호출할 때
+        Then: 질문에 등장하는 값을 반환해야 함
+        """
+        index = bird_loader.get_value_index("california_schools")
+
+        mentions = index.find_mentions("How many schools are located in San Diego?")
+
+        assert [(match.column, match.value) for match in mentions] == [("City", "San Diego")]
+
+    def test_build_in_parallel_and_rebuild_only_changed(self, bird_loader):
+        """
+        Given: 색인이 없는 데이터베이스 두 개
+        When: build_value_indexes()를 두 번 호출하되 사이에 한 데이터베이스만 바꿀 때
+        Then: 처음에는 둘 다 만들고, 두 번째에는 바뀐 데이터베이스만 다시 만들어야 함
+        """
+        built = bird_loader.build_value_indexes(jobs=2)
+        changed = bird_loader.get_sqlite_path("financial")
+        connection = sqlite3.connect(changed)
+        connection.execute("UPDATE schools SET City = 'Ostrava' WHERE City = 'Brno'")
+        connection.commit()
+        connection.close()
+        stat = changed.stat()
+        os.utime(changed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        rebuilt = bird_loader.build_value_indexes(jobs=2)
+
+        assert sorted(built) == ["california_schools", "financial"]
+        assert list(rebuilt) == ["financial"]
+        assert bird_loader.get_value_index("financial").search("Ostrava")[0].score == 1.0
+
+    def test_invalid_file_is_rejected(self, temp_dir):
+        """
+        Given: 색인 형식이 아닌 파일
+        When: ValueIndex를 열 때
+        Then: ValueError가 발생해야 함
+        """
+        path = Path(temp_dir, "broken.idx")
+        path.write_bytes(b"not an index")
+
+        with pytest.raises(ValueError):
+            ValueIndex(path)